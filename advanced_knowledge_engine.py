@@ -13,18 +13,57 @@
 import os
 import re
 import json
+import time
 import logging
+import threading
 from datetime import datetime, timedelta
 from typing import Dict, List, Any, Optional, Tuple
 from dataclasses import dataclass
 from enum import Enum
-from neo4j import GraphDatabase
-import anthropic
+
+from graph_statistics import LABEL_COUNT_QUERY, get_snapshot
+from memory_graph import open_driver, is_memory_uri
+from query_recorder import recorder_from_env
+from query_tracing import tracer_from_env, current_span, timings_summary, server_time_ms, NOOP_SPAN
+from slow_query_log import slow_query_log_from_env
 
 # 로깅 설정
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# 질의 결과 캐시 유지 시간 (초, 0이면 사용 안 함)
+RESULT_CACHE_TTL = float(os.getenv('RESULT_CACHE_TTL', '0'))
+
+# 결과 캐시 최대 항목 수 (넘으면 가장 오래된 항목부터 제거)
+RESULT_CACHE_MAX_ENTRIES = 256
+
+# 개발자 엔티티 패턴 → 엔티티 이름
+DEVELOPER_ENTITY_PATTERNS = [
+    (r"infrastructure.*architect.*ai", "infrastructure"),
+    (r"code.*architect.*ai", "code"),
+    (r"인프라.*아키텍트", "infrastructure"),
+    (r"코드.*아키텍트", "code")
+]
+
+# 기술/스킬 엔티티 (대소문자 무시)
+SKILL_KEYWORDS = [
+    "terraform", "python", "neo4j", "cypher",
+    "gcp", "클라우드", "보안", "파이프라인"
+]
+
+# 엔티티 → 개발자 ID ({dev_id} 자리표시자 치환)
+DEVELOPER_ID_MAP = {
+    "infrastructure": "infrastructure_architect_ai",
+    "infra": "infrastructure_architect_ai",
+    "인프라": "infrastructure_architect_ai",
+    "code": "code_architect_ai",
+    "코드": "code_architect_ai"
+}
+
+def index_advisor_on_connect() -> bool:
+    """INDEX_ADVISOR_ON_CONNECT=true면 연결(또는 워밍업) 시 인덱스 어드바이저 실행 (기본 꺼짐)"""
+    return os.getenv('INDEX_ADVISOR_ON_CONNECT', 'false').lower() == 'true'
+
 class QueryType(Enum):
     """질의 유형 분류"""
     WHO = "who"           # 누구 (개발자, 사용자 관련)
@@ -46,6 +85,43 @@ class QueryComplexity(Enum):
     COMPLEX = "complex"   # 다중 노드, 복잡한 패턴
     ADVANCED = "advanced" # 집계, 분석, 추론 필요
 
+class ResultCache:
+    """질의 결과 TTL 캐시 (Cypher + 파라미터 기준, 스레드 안전)"""
+    
+    def __init__(self, ttl: float, max_entries: int = RESULT_CACHE_MAX_ENTRIES):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: Dict[Tuple[str, str], Tuple[float, List[Dict[str, Any]]]] = {}
+        self._lock = threading.Lock()
+    
+    @staticmethod
+    def key(cypher_query: str, parameters: Optional[Dict[str, Any]]) -> Tuple[str, str]:
+        return cypher_query, json.dumps(parameters or {}, sort_keys=True, default=str)
+    
+    def get(self, cypher_query: str, parameters: Optional[Dict[str, Any]] = None) -> Optional[List[Dict[str, Any]]]:
+        key = self.key(cypher_query, parameters)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if time.monotonic() - entry[0] > self.ttl:
+                del self._entries[key]
+                return None
+            return list(entry[1])
+    
+    def put(self, cypher_query: str, parameters: Optional[Dict[str, Any]], records: List[Dict[str, Any]]):
+        with self._lock:
+            self._entries[self.key(cypher_query, parameters)] = (time.monotonic(), list(records))
+            while len(self._entries) > self.max_entries:
+                del self._entries[next(iter(self._entries))]
+    
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+    
+    def __len__(self):
+        return len(self._entries)
+
 @dataclass
 class QueryAnalysis:
     """질의 분석 결과"""
@@ -56,30 +132,64 @@ class QueryAnalysis:
     intent: str
     keywords: List[str]
     time_constraint: Optional[str] = None
+    pattern_name: Optional[str] = None
     
 class AdvancedKnowledgeEngine:
     """고급 지식 추출 엔진"""
     
-    def __init__(self):
+    def __init__(self, driver=None):
+        """
+        Args:
+            driver: 이미 연결된 드라이버 (벤치마크/기록된 드라이버 주입용, 지정하면 connect() 불필요)
+        
+        NEO4J_URI=memory://이름 이면 인메모리 그래프(내장 모드)에 연결하며 비밀번호가 필요 없습니다.
+        """
         self.instance_id = "3e875bd7"
-        self.uri = f"neo4j+s://{self.instance_id}.databases.neo4j.io"
+        self.uri = os.getenv('NEO4J_URI', f"neo4j+s://{self.instance_id}.databases.neo4j.io")
         self.username = "neo4j"
         self.password = os.getenv('NEO4J_PASSWORD')
-        self.driver = None
+        self.driver = driver
         self.schema_cache = None
         
-        # Claude API 클라이언트 (향후 고급 분석용)
+        # 질의 기록 (QUERY_RECORD_FILE 설정 시에만)
+        self.recorder = recorder_from_env()
+        
+        # 질의 결과 캐시 (RESULT_CACHE_TTL 설정 시에만)
+        self.result_cache = ResultCache(RESULT_CACHE_TTL) if RESULT_CACHE_TTL > 0 else None
+        
+        # 단계별 시간 span (QUERY_TRACE_FILE / OTEL_EXPORTER_OTLP_ENDPOINT 설정 시 내보내기)
+        self.tracer = tracer_from_env()
+        
+        # 느린 질의 로그 (SLOW_QUERY_MS 이상 걸린 DB 질의 + 표본 PROFILE, SLOW_QUERY_MS=0이면 끔)
+        self.slow_queries = slow_query_log_from_env()
+        
+        # Claude API 클라이언트 (향후 고급 분석용, 처음 사용할 때 생성)
         self.claude_api_key = os.getenv('ANTHROPIC_API_KEY')
-        self.claude_client = None
-        if self.claude_api_key:
-            self.claude_client = anthropic.Anthropic(api_key=self.claude_api_key)
+        self._claude_client = None
         
-        # 질의 패턴 라이브러리
+        # 질의 패턴 라이브러리 (정규식은 compile_patterns()에서, 또는 첫 질의 시 컴파일)
         self.query_patterns = self._load_query_patterns()
+        self._compiled_patterns = None
         
-        if not self.password:
+        if not self.password and driver is None and not is_memory_uri(self.uri):
             raise ValueError("NEO4J_PASSWORD 환경변수가 설정되지 않았습니다.")
     
+    @property
+    def claude_client(self):
+        """Claude API 클라이언트 (ANTHROPIC_API_KEY가 없으면 None, anthropic은 이때 import)"""
+        if self._claude_client is None and self.claude_api_key:
+            import anthropic
+            self._claude_client = anthropic.Anthropic(api_key=self.claude_api_key)
+        return self._claude_client
+    
+    def compile_patterns(self) -> List[Tuple[str, Dict, Any]]:
+        """질의 패턴 정규식 컴파일 → [(패턴 이름, 패턴 정보, 정규식)] (패턴 순서 유지)"""
+        if self._compiled_patterns is None:
+            self._compiled_patterns = [
+                (name, info, re.compile(info["pattern"])) for name, info in self.query_patterns.items()
+            ]
+        return self._compiled_patterns
+    
     def _load_query_patterns(self) -> Dict[str, Dict]:
         """질의 패턴 라이브러리 로드"""
         return {
@@ -90,14 +200,15 @@ class AdvancedKnowledgeEngine:
                 "complexity": QueryComplexity.MEDIUM,
                 "cypher_template": """
                     MATCH (dev:Developer)
-                    OPTIONAL MATCH (dev)-[r:CREATED|AUTHORED|COMPLETED]->(activity)
-                    WHERE r.timestamp IS NOT NULL
+                    WHERE dev.last_activity IS NOT NULL
                     RETURN dev.name as developer, dev.role as role, 
-                           max(r.timestamp) as last_activity,
-                           count(activity) as activity_count
+                           dev.last_activity as last_activity,
+                           coalesce(dev.total_activities, 0) as activity_count
                     ORDER BY last_activity DESC
                     LIMIT 5
-                """
+                """,
+                # 파이프라인이 기록 시 갱신하는 개발자 카운터를 사용하므로 시간 조건도 여기에 적용
+                "time_field": "dev.last_activity"
             },
             
             "skilled_developer": {
@@ -172,7 +283,7 @@ class AdvancedKnowledgeEngine:
                 "type": QueryType.SKILL,
                 "complexity": QueryComplexity.MEDIUM,
                 "cypher_template": """
-                    MATCH (dev:Developer {{id: '{dev_id}'}})-[r:HAS_SKILL]->(skill:Skill)
+                    MATCH (dev:Developer {id: '{dev_id}'})-[r:HAS_SKILL]->(skill:Skill)
                     RETURN skill.name as skill, skill.category as category,
                            r.level as level, r.proficiency as proficiency
                     ORDER BY r.proficiency DESC
@@ -219,11 +330,17 @@ class AdvancedKnowledgeEngine:
             }
         }
     
-    def connect(self) -> bool:
-        """AuraDB 연결"""
+    def connect(self, index_advisor: Optional[bool] = None) -> bool:
+        """
+        AuraDB 연결
+        
+        Args:
+            index_advisor: 연결 직후 인덱스 어드바이저 실행 여부 (None이면 INDEX_ADVISOR_ON_CONNECT,
+                           워밍업이 뒤따르면 False로 두고 워밍업의 실행 계획을 재사용)
+        """
         try:
             logger.info(f"🔌 고급 지식 엔진 AuraDB 연결: {self.uri}")
-            self.driver = GraphDatabase.driver(self.uri, auth=(self.username, self.password))
+            self.driver = open_driver(self.uri, auth=(self.username, self.password))
             
             with self.driver.session() as session:
                 result = session.run("RETURN 'Advanced Knowledge Engine Connected!' as status")
@@ -232,6 +349,12 @@ class AdvancedKnowledgeEngine:
             
             # 스키마 캐시 로드
             self._load_schema_cache()
+            
+            # 질의 패턴이 바뀌었으면 인덱스 어드바이저 재실행 (INDEX_ADVISOR_ON_CONNECT=true일 때만)
+            if index_advisor is None:
+                index_advisor = index_advisor_on_connect()
+            if index_advisor:
+                self._run_index_advisor()
             return True
             
         except Exception as e:
@@ -242,6 +365,7 @@ class AdvancedKnowledgeEngine:
         """연결 종료"""
         if self.driver:
             self.driver.close()
+            self.driver = None
             logger.info("🔌 고급 지식 엔진 연결 종료")
     
     def _load_schema_cache(self):
@@ -269,6 +393,19 @@ class AdvancedKnowledgeEngine:
         except Exception as e:
             logger.error(f"❌ 스키마 캐시 로드 실패: {e}")
     
+    def _run_index_advisor(self, plans: Optional[Dict[str, Any]] = None,
+                           plan_errors: Optional[Dict[str, str]] = None) -> Optional[Dict[str, Any]]:
+        """
+        패턴 지문이 바뀐 경우에만 인덱스 분석 (추천만 기록, 적용은 index_advisor.py --apply)
+        plans/plan_errors가 있으면 그 EXPLAIN 결과를 재사용 → 새 분석 결과 (변경 없거나 실패하면 None)
+        """
+        try:
+            from index_advisor import IndexAdvisor
+            return IndexAdvisor(self).run_if_changed(plans=plans, plan_errors=plan_errors)
+        except Exception as e:
+            logger.warning(f"⚠️  인덱스 어드바이저 실행 실패: {e}")
+            return None
+    
     def analyze_query(self, natural_query: str) -> QueryAnalysis:
         """자연어 질의 분석"""
         logger.info(f"🧠 질의 분석 시작: '{natural_query}'")
@@ -281,8 +418,8 @@ class AdvancedKnowledgeEngine:
         query_type = QueryType.UNKNOWN
         complexity = QueryComplexity.SIMPLE
         
-        for pattern_name, pattern_info in self.query_patterns.items():
-            if re.search(pattern_info["pattern"], clean_query):
+        for pattern_name, pattern_info, regex in self.compile_patterns():
+            if regex.search(clean_query):
                 matched_pattern = pattern_name
                 query_type = pattern_info["type"]
                 complexity = pattern_info["complexity"]
@@ -308,7 +445,8 @@ class AdvancedKnowledgeEngine:
             entities=entities,
             intent=intent,
             keywords=keywords,
-            time_constraint=time_constraint
+            time_constraint=time_constraint,
+            pattern_name=matched_pattern
         )
         
         logger.info(f"  🎯 분석 결과: {query_type.value}, {complexity.value}, 엔티티 {len(entities)}개")
@@ -319,24 +457,12 @@ class AdvancedKnowledgeEngine:
         entities = []
         
         # 개발자명 패턴
-        dev_patterns = [
-            (r"infrastructure.*architect.*ai", "infrastructure"),
-            (r"code.*architect.*ai", "code"), 
-            (r"인프라.*아키텍트", "infrastructure"),
-            (r"코드.*아키텍트", "code")
-        ]
-        
-        for pattern, entity in dev_patterns:
+        for pattern, entity in DEVELOPER_ENTITY_PATTERNS:
             if re.search(pattern, query, re.IGNORECASE):
                 entities.append(entity)
         
         # 기술/스킬명 패턴 (대소문자 무시)
-        skill_patterns = [
-            "terraform", "python", "neo4j", "cypher",
-            "gcp", "클라우드", "보안", "파이프라인"
-        ]
-        
-        for skill in skill_patterns:
+        for skill in SKILL_KEYWORDS:
             if skill.lower() in query.lower():
                 entities.append(skill)
         
@@ -400,18 +526,23 @@ class AdvancedKnowledgeEngine:
         # 엔티티 기반 쿼리 커스터마이징
         customized_query = self._customize_query(base_query, analysis)
         
-        # 시간 제약 적용
-        if analysis.time_constraint:
-            customized_query = self._apply_time_constraint(customized_query, analysis.time_constraint)
+        # 시간 제약 적용 (카운트 스토어 통계 쿼리는 시점 구분이 없고 WHERE를 붙일 수 없으므로 제외)
+        if analysis.time_constraint and base_query.strip() != LABEL_COUNT_QUERY.strip():
+            time_field = self.query_patterns.get(analysis.pattern_name, {}).get("time_field", "r.timestamp")
+            customized_query = self._apply_time_constraint(customized_query, analysis.time_constraint, time_field)
         
         logger.info(f"  🔧 생성된 쿼리 길이: {len(customized_query)} 문자")
         return customized_query
     
     def _find_matching_template(self, analysis: QueryAnalysis) -> str:
         """분석 결과와 매칭되는 쿼리 템플릿 찾기"""
+        # 분석 단계에서 매칭된 패턴이 있으면 다시 매칭하지 않음
+        if analysis.pattern_name in self.query_patterns:
+            return self.query_patterns[analysis.pattern_name]["cypher_template"]
+        
         # 질의 패턴 매칭
-        for pattern_name, pattern_info in self.query_patterns.items():
-            if re.search(pattern_info["pattern"], analysis.original_query.lower()):
+        for pattern_name, pattern_info, regex in self.compile_patterns():
+            if regex.search(analysis.original_query.lower()):
                 return pattern_info["cypher_template"]
         
         # 기본 폴백 쿼리들
@@ -425,11 +556,8 @@ class AdvancedKnowledgeEngine:
                 MATCH (project:Project)
                 RETURN project.name as name, project.phase as phase, project.status as status
             """,
-            QueryType.COUNT: """
-                MATCH (n)
-                RETURN labels(n)[0] as type, count(n) as count
-                ORDER BY count DESC
-            """,
+            # 라벨별 노드 수는 카운트 스토어 통계로 (execute_query가 캐시에서 응답)
+            QueryType.COUNT: LABEL_COUNT_QUERY,
             QueryType.SKILL: """
                 MATCH (skill:Skill)
                 RETURN skill.name as skill, skill.category as category
@@ -443,20 +571,11 @@ class AdvancedKnowledgeEngine:
         """엔티티와 키워드를 기반으로 쿼리 커스터마이징"""
         customized = base_query
         
-        # 개발자 ID 매핑
-        dev_id_map = {
-            "infrastructure": "infrastructure_architect_ai",
-            "infra": "infrastructure_architect_ai",
-            "인프라": "infrastructure_architect_ai",
-            "code": "code_architect_ai", 
-            "코드": "code_architect_ai"
-        }
-        
-        # 엔티티 기반 치환
+        # 엔티티 기반 치환 (개발자 ID 매핑은 DEVELOPER_ID_MAP)
         for entity in analysis.entities:
             entity_lower = entity.lower()
-            if entity_lower in dev_id_map:
-                customized = customized.replace('{dev_id}', dev_id_map[entity_lower])
+            if entity_lower in DEVELOPER_ID_MAP:
+                customized = customized.replace('{dev_id}', DEVELOPER_ID_MAP[entity_lower])
             # 스킬명 치환 (대소문자 고려)
             if '{skill_name}' in customized:
                 # Python, python 등을 제대로 매칭하기 위해 capitalize
@@ -465,13 +584,13 @@ class AdvancedKnowledgeEngine:
         
         return customized
     
-    def _apply_time_constraint(self, query: str, time_constraint: str) -> str:
+    def _apply_time_constraint(self, query: str, time_constraint: str, time_field: str = "r.timestamp") -> str:
         """시간 제약 조건 적용"""
         time_filters = {
-            "recent": "r.timestamp > datetime() - duration('P7D')",
-            "today": "date(r.timestamp) = date()",
-            "this_week": "r.timestamp > datetime() - duration('P7D')",
-            "this_month": "r.timestamp > datetime() - duration('P30D')"
+            "recent": f"{time_field} > datetime() - duration('P7D')",
+            "today": f"date({time_field}) = date()",
+            "this_week": f"{time_field} > datetime() - duration('P7D')",
+            "this_month": f"{time_field} > datetime() - duration('P30D')"
         }
         
         time_filter = time_filters.get(time_constraint, "")
@@ -485,33 +604,90 @@ class AdvancedKnowledgeEngine:
         
         return query
     
-    def execute_query(self, cypher_query: str) -> List[Dict[str, Any]]:
-        """Cypher 쿼리 실행"""
+    def execute_query(self, cypher_query: str, parameters: Optional[Dict[str, Any]] = None,
+                      question: Optional[str] = None, template: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Cypher 쿼리 실행 (question/template은 질의 기록과 느린 질의 로그용)"""
         logger.info(f"🚀 쿼리 실행 시작")
+        started = time.perf_counter()
+        span = current_span()
+        
+        if cypher_query.strip() == LABEL_COUNT_QUERY.strip():
+            # 전체 스캔 대신 공유 그래프 통계 캐시 사용 (TTL 내 반복 질의는 DB 호출 없음)
+            span.set(cache='stats')
+            try:
+                records = get_snapshot(self.driver).label_rows()
+                logger.info(f"  ✅ {len(records)}개 결과 반환 (그래프 통계)")
+                self._record(cypher_query, parameters, question, records, started, source='stats')
+                return records
+            except Exception as e:
+                logger.error(f"❌ 그래프 통계 조회 실패: {e}")
+                self._record(cypher_query, parameters, question, [], started, source='stats', error=str(e))
+                return []
+        
+        if self.result_cache is not None:
+            cached = self.result_cache.get(cypher_query, parameters)
+            if cached is not None:
+                logger.info(f"  ✅ {len(cached)}개 결과 반환 (결과 캐시)")
+                span.set(cache='hit')
+                self._record(cypher_query, parameters, question, cached, started, source='cache')
+                return cached
+        span.set(cache='miss' if self.result_cache is not None else 'off')
         
         try:
             with self.driver.session() as session:
-                result = session.run(cypher_query)
-                records = []
+                # DB 왕복 (전송 + 서버 실행 + 결과 수신)과 Python 변환을 따로 측정
+                with self.tracer.span('execute.db') as db_span:
+                    result = session.run(cypher_query, parameters or {})
+                    raw_records = list(result)
+                    if db_span is not NOOP_SPAN:
+                        db_span.set(rows=len(raw_records), server_ms=server_time_ms(result))
                 
-                for record in result:
-                    record_dict = {}
-                    for key in record.keys():
-                        value = record[key]
-                        # datetime 객체 처리
-                        if hasattr(value, 'isoformat'):
-                            record_dict[key] = value.isoformat()
-                        else:
-                            record_dict[key] = value
-                    records.append(record_dict)
+                with self.tracer.span('execute.convert'):
+                    records = self._convert_records(raw_records)
                 
                 logger.info(f"  ✅ {len(records)}개 결과 반환")
+                # 질의 기록(다이제스트/파일 쓰기) 시간은 느린 질의 판정에서 제외
+                elapsed_ms = (time.perf_counter() - started) * 1000
+                self._record(cypher_query, parameters, question, records, started)
+                if self.slow_queries is not None and elapsed_ms >= self.slow_queries.threshold_ms:
+                    self.slow_queries.observe(cypher_query, parameters, elapsed_ms, len(records), self.driver,
+                                              template=template, question=question,
+                                              server_ms=server_time_ms(result))
+                if self.result_cache is not None:
+                    self.result_cache.put(cypher_query, parameters, records)
                 return records
                 
         except Exception as e:
             logger.error(f"❌ 쿼리 실행 실패: {e}")
+            self._record(cypher_query, parameters, question, [], started, error=str(e))
             return []
     
+    def _convert_records(self, raw_records) -> List[Dict[str, Any]]:
+        """드라이버 레코드 → dict 목록 (datetime 등은 ISO 문자열로)"""
+        records = []
+        for record in raw_records:
+            record_dict = {}
+            for key in record.keys():
+                value = record[key]
+                # datetime 객체 처리
+                if hasattr(value, 'isoformat'):
+                    record_dict[key] = value.isoformat()
+                else:
+                    record_dict[key] = value
+            records.append(record_dict)
+        return records
+    
+    def _record(self, cypher_query: str, parameters: Optional[Dict[str, Any]], question: Optional[str],
+                records: List[Dict[str, Any]], started: float, source: str = 'db', error: Optional[str] = None):
+        """질의 기록기가 켜져 있으면 실행 결과 기록 (기록 실패는 질의 처리에 영향 없음)"""
+        if self.recorder is None:
+            return
+        try:
+            self.recorder.record(cypher_query, records, time.perf_counter() - started, question=question,
+                                 parameters=parameters, source=source, error=error)
+        except Exception as e:
+            logger.warning(f"⚠️  질의 기록 실패: {e}")
+    
     def format_answer(self, query_analysis: QueryAnalysis, results: List[Dict[str, Any]]) -> Dict[str, Any]:
         """결과를 사용자 친화적으로 포맷팅"""
         logger.info(f"📝 답변 포맷팅: {len(results)}개 결과")
@@ -612,40 +788,62 @@ class AdvancedKnowledgeEngine:
         
         return f"{result_count}개의 결과를 찾았습니다."
     
-    def process_natural_query(self, natural_query: str) -> Dict[str, Any]:
-        """자연어 질의 전체 처리 파이프라인"""
+    def process_natural_query(self, natural_query: str, timings: bool = False) -> Dict[str, Any]:
+        """
+        자연어 질의 전체 처리 파이프라인
+        
+        Args:
+            natural_query: 자연어 질문
+            timings: True면 응답에 단계별 시간(timings) 블록 추가
+                     (QUERY_TRACE_FILE / OTEL_EXPORTER_OTLP_ENDPOINT 설정 시 span 내보내기)
+        """
         logger.info(f"🎯 자연어 질의 처리 시작: '{natural_query}'")
         
-        try:
-            # 1. 질의 분석
-            analysis = self.analyze_query(natural_query)
-            
-            # 2. Cypher 쿼리 생성
-            cypher_query = self.generate_cypher_query(analysis)
-            
-            # 3. 쿼리 실행
-            results = self.execute_query(cypher_query)
-            
-            # 4. 결과 포맷팅
-            formatted_answer = self.format_answer(analysis, results)
-            
-            # 디버그 정보 추가
-            formatted_answer["debug"] = {
-                "generated_cypher": cypher_query,
-                "raw_results_count": len(results)
-            }
-            
-            logger.info(f"✅ 질의 처리 완료: {formatted_answer['success']}")
-            return formatted_answer
-            
-        except Exception as e:
-            logger.error(f"❌ 질의 처리 실패: {e}")
-            return {
-                "success": False,
-                "message": f"질의 처리 중 오류가 발생했습니다: {str(e)}",
-                "error": str(e),
-                "timestamp": datetime.now().isoformat()
-            }
+        with self.tracer.trace('process_natural_query', force=timings, question_length=len(natural_query)) as root:
+            try:
+                # 1. 질의 분석
+                with self.tracer.span('analyze') as span:
+                    analysis = self.analyze_query(natural_query)
+                    span.set(query_type=analysis.query_type.value, pattern=analysis.pattern_name,
+                             entities=len(analysis.entities))
+                
+                # 2. Cypher 쿼리 생성
+                with self.tracer.span('generate') as span:
+                    cypher_query = self.generate_cypher_query(analysis)
+                    span.set(cypher_length=len(cypher_query))
+                
+                # 3. 쿼리 실행 (캐시 결과와 DB 왕복/변환 하위 span은 execute_query에서 기록)
+                with self.tracer.span('execute') as span:
+                    results = self.execute_query(cypher_query, question=natural_query,
+                                                 template=analysis.pattern_name)
+                    span.set(rows=len(results))
+                
+                # 4. 결과 포맷팅
+                with self.tracer.span('format') as span:
+                    formatted_answer = self.format_answer(analysis, results)
+                    span.set(items=len(formatted_answer.get('data', [])))
+                
+                # 디버그 정보 추가
+                formatted_answer["debug"] = {
+                    "generated_cypher": cypher_query,
+                    "raw_results_count": len(results)
+                }
+                
+                logger.info(f"✅ 질의 처리 완료: {formatted_answer['success']}")
+                
+            except Exception as e:
+                logger.error(f"❌ 질의 처리 실패: {e}")
+                root.set_error(str(e))
+                formatted_answer = {
+                    "success": False,
+                    "message": f"질의 처리 중 오류가 발생했습니다: {str(e)}",
+                    "error": str(e),
+                    "timestamp": datetime.now().isoformat()
+                }
+        
+        if timings:
+            formatted_answer["timings"] = timings_summary(root)
+        return formatted_answer
 
 def main():
     """테스트 및 예시 실행"""
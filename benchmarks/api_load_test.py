@@ -0,0 +1,540 @@
+#!/usr/bin/env python3
+"""
+지식 API 부하 생성기 및 지연 시간 리포트
+/api/v1/query, /api/v1/query/batch, /api/v1/health를 동시성/도착률/질문 비율을 바꿔가며 호출
+
+대상:
+- test-client : Flask 테스트 클라이언트 (네트워크 없음, 가짜 그래프)
+- inprocess   : 같은 프로세스에서 띄운 werkzeug 서버 (HTTP 포함, 가짜 그래프)
+- http://...  : 이미 실행 중인 서버 (실제 AuraDB)
+
+부하 모델:
+- 닫힌 루프 (기본): --concurrency개 작업자가 응답을 받으면 바로 다음 요청
+- 열린 루프 (--rate): 초당 rate개 요청이 포아송 도착, 지연 시간은 예정 시각부터 측정
+  (서버가 밀리면 대기 시간까지 포함되어 포화 지점이 그대로 드러남)
+- --sweep 1 2 4 8 16: 동시성 단계별 처리량/p99로 포화 지점 탐색
+
+사용 예:
+    python benchmarks/api_load_test.py --concurrency 8 --duration 10
+    python benchmarks/api_load_test.py --target inprocess --rate 200 --duration 20 --db-latency 15
+    python benchmarks/api_load_test.py --target http://localhost:5001 --mix query=70,batch=10,health=20
+    python benchmarks/api_load_test.py --sweep 1 2 4 8 16 32 --duration 5
+"""
+
+import os
+import sys
+import json
+import math
+import time
+import random
+import bisect
+import argparse
+import logging
+import threading
+import http.client
+from urllib.parse import urlparse
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Any, Optional, Tuple
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.join(BENCH_DIR, '..'))
+from query_pipeline_bench import CORPUS_FILE, load_corpus, expand_rows, to_records
+
+logger = logging.getLogger(__name__)
+
+ENDPOINTS = {
+    'query': ('POST', '/api/v1/query'),
+    'batch': ('POST', '/api/v1/query/batch'),
+    'health': ('GET', '/api/v1/health'),
+}
+
+DEFAULT_MIX = "query=80,batch=10,health=10"
+
+class LatencyHistogram:
+    """
+    로그 간격 버킷 히스토그램 (0.05ms ~ 120초, 버킷 폭 약 5%)
+    
+    값을 모두 저장하지 않으므로 긴 부하 테스트에서도 메모리가 일정합니다.
+    """
+    
+    BOUNDS = [0.05 * 1.05 ** i for i in range(int(math.log(120000 / 0.05, 1.05)) + 2)]
+    
+    def __init__(self):
+        self.counts = [0] * (len(self.BOUNDS) + 1)
+        self.total = 0
+        self.sum = 0.0
+        self.max = 0.0
+    
+    def record(self, millis: float):
+        self.counts[bisect.bisect_left(self.BOUNDS, millis)] += 1
+        self.total += 1
+        self.sum += millis
+        self.max = max(self.max, millis)
+    
+    def merge(self, other: 'LatencyHistogram'):
+        for index, count in enumerate(other.counts):
+            self.counts[index] += count
+        self.total += other.total
+        self.sum += other.sum
+        self.max = max(self.max, other.max)
+    
+    def percentile(self, percent: float) -> float:
+        """버킷 상한 기준 백분위 (ms)"""
+        if not self.total:
+            return 0.0
+        rank = math.ceil(self.total * percent / 100)
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank:
+                return min(self.BOUNDS[index] if index < len(self.BOUNDS) else self.max, self.max)
+        return self.max
+    
+    @property
+    def mean(self) -> float:
+        return self.sum / self.total if self.total else 0.0
+    
+    def buckets(self, width: int = 12) -> List[Tuple[float, float, int]]:
+        """출력용으로 합친 (하한, 상한, 개수) 목록"""
+        filled = [index for index, count in enumerate(self.counts) if count]
+        if not filled:
+            return []
+        first, last = filled[0], filled[-1]
+        step = max(1, math.ceil((last - first + 1) / width))
+        merged = []
+        for start in range(first, last + 1, step):
+            end = min(start + step, last + 1)
+            lower = self.BOUNDS[start - 1] if start > 0 else 0.0
+            upper = self.BOUNDS[end - 1] if end - 1 < len(self.BOUNDS) else self.max
+            merged.append((lower, upper, sum(self.counts[start:end])))
+        return merged
+
+class EndpointStats:
+    """엔드포인트별 지연 시간/성공/오류 집계"""
+    
+    def __init__(self):
+        self.latency = LatencyHistogram()
+        self.ok = 0
+        self.errors: Dict[str, int] = {}
+    
+    def record(self, millis: float, error: Optional[str]):
+        self.latency.record(millis)
+        if error:
+            self.errors[error] = self.errors.get(error, 0) + 1
+        else:
+            self.ok += 1
+    
+    def merge(self, other: 'EndpointStats'):
+        self.latency.merge(other.latency)
+        self.ok += other.ok
+        for error, count in other.errors.items():
+            self.errors[error] = self.errors.get(error, 0) + count
+
+class FakeGraphResult(list):
+    def single(self):
+        return self[0] if self else None
+    
+    def consume(self):
+        return None
+
+class FakeGraphSession:
+    def __init__(self, graph: 'FakeGraphDriver'):
+        self.graph = graph
+    
+    def run(self, query, parameters=None, **kwargs):
+        return self.graph.answer(query)
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc):
+        return False
+
+class FakeGraphDriver:
+    """
+    코퍼스 결과 행을 돌려주는 가짜 그래프 (쿼리 모양으로 결과 유형 선택)
+    
+    db_latency_ms만큼 대기해 실제 DB 왕복 시간을 흉내 냅니다 (GIL을 놓으므로 동시 요청과 겹침).
+    """
+    
+    # (쿼리에 포함된 문자열, 결과 유형) - 앞에서부터 검사
+    ROUTES = [
+        ('skill_count <', 'relationship'), ('dev1', 'relationship'),
+        ('count(', 'count'), ('apoc.meta.stats', 'count'),
+        ('Project', 'what'), ('Achievement', 'what'),
+        ('{id:', 'skill'), ('Skill', 'skill'),
+    ]
+    
+    def __init__(self, corpus: Dict[str, Any], result_size: int = 10, db_latency_ms: float = 0.0):
+        self.db_latency = db_latency_ms / 1000
+        self.results = {
+            type_name: to_records(expand_rows(templates, result_size))
+            for type_name, templates in corpus['results'].items()
+        }
+        labels = {row['type']: row['count'] for row in corpus['results']['count']}
+        self.stats = to_records([{
+            'nodeCount': sum(labels.values()), 'relCount': sum(labels.values()) * 2,
+            'labels': labels, 'relTypesCount': {'HAS_SKILL': 120, 'AUTHORED': sum(labels.values())},
+        }])
+        self.ping = to_records([{'test': 1}])
+    
+    def session(self, **kwargs):
+        return FakeGraphSession(self)
+    
+    def answer(self, query: str) -> FakeGraphResult:
+        if self.db_latency:
+            time.sleep(self.db_latency)
+        if 'RETURN 1 as test' in query:
+            return FakeGraphResult(self.ping)
+        if 'YIELD nodeCount' in query:
+            return FakeGraphResult(self.stats)
+        for needle, type_name in self.ROUTES:
+            if needle in query:
+                return FakeGraphResult(self.results[type_name])
+        return FakeGraphResult(self.results['who'])
+    
+    def close(self):
+        pass
+
+class Transport:
+    """요청 하나 전송 → (HTTP 상태, 본문 JSON 또는 None)"""
+    
+    def request(self, method: str, path: str, body: Optional[Dict[str, Any]]) -> Tuple[int, Any]:
+        raise NotImplementedError
+    
+    def close(self):
+        pass
+
+class TestClientTransport(Transport):
+    """Flask 테스트 클라이언트 (작업 스레드마다 하나)"""
+    
+    def __init__(self, app):
+        self.app = app
+        self.local = threading.local()
+    
+    def request(self, method, path, body):
+        client = getattr(self.local, 'client', None)
+        if client is None:
+            client = self.local.client = self.app.test_client()
+        response = client.open(path, method=method, json=body)
+        return response.status_code, response.get_json(silent=True)
+
+class HttpTransport(Transport):
+    """HTTP 서버 (작업 스레드마다 keep-alive 연결 하나, 끊기면 다시 연결)"""
+    
+    def __init__(self, base_url: str, timeout: float = 30.0):
+        parsed = urlparse(base_url)
+        self.host = parsed.hostname
+        self.port = parsed.port or (443 if parsed.scheme == 'https' else 80)
+        self.https = parsed.scheme == 'https'
+        self.prefix = parsed.path.rstrip('/')
+        self.timeout = timeout
+        self.local = threading.local()
+    
+    def _connection(self):
+        connection = getattr(self.local, 'connection', None)
+        if connection is None:
+            factory = http.client.HTTPSConnection if self.https else http.client.HTTPConnection
+            connection = self.local.connection = factory(self.host, self.port, timeout=self.timeout)
+        return connection
+    
+    def request(self, method, path, body):
+        payload = json.dumps(body).encode('utf-8') if body is not None else None
+        headers = {'Content-Type': 'application/json'} if payload else {}
+        for attempt in range(2):
+            connection = self._connection()
+            try:
+                connection.request(method, self.prefix + path, body=payload, headers=headers)
+                response = connection.getresponse()
+                data = response.read()
+                if response.getheader('Connection', '').lower() == 'close' or response.version == 10:
+                    connection.close()
+                    self.local.connection = None
+                try:
+                    return response.status, json.loads(data) if data else None
+                except ValueError:
+                    return response.status, None
+            except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError):
+                # 서버가 닫은 keep-alive 연결 - 한 번만 새 연결로 재시도
+                connection.close()
+                self.local.connection = None
+                if attempt:
+                    raise
+
+class InProcessServer:
+    """같은 프로세스의 werkzeug 멀티스레드 서버 (임의 포트)"""
+    
+    def __init__(self, app):
+        from werkzeug.serving import make_server
+        self.server = make_server('127.0.0.1', 0, app, threaded=True)
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+    
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server.server_port}"
+    
+    def start(self):
+        self.thread.start()
+        return self
+    
+    def stop(self):
+        self.server.shutdown()
+        self.thread.join(timeout=5)
+
+class RequestMix:
+    """엔드포인트 비율과 질문 코퍼스로 다음 요청 생성"""
+    
+    def __init__(self, mix: Dict[str, float], questions: List[str], batch_size: int = 5, seed: int = 42):
+        unknown = set(mix) - set(ENDPOINTS)
+        if unknown:
+            raise ValueError(f"알 수 없는 엔드포인트: {', '.join(sorted(unknown))} (가능: {', '.join(ENDPOINTS)})")
+        self.names = [name for name, weight in mix.items() if weight > 0]
+        self.weights = [mix[name] for name in self.names]
+        self.questions = questions
+        self.batch_size = batch_size
+        self.seed = seed
+        self.local = threading.local()
+    
+    def _rng(self) -> random.Random:
+        # 작업 스레드별 난수 (스레드 이름으로 재현 가능)
+        rng = getattr(self.local, 'rng', None)
+        if rng is None:
+            rng = self.local.rng = random.Random(f"{self.seed}:{threading.current_thread().name}")
+        return rng
+    
+    def next(self) -> Tuple[str, Optional[Dict[str, Any]]]:
+        rng = self._rng()
+        name = rng.choices(self.names, self.weights)[0]
+        if name == 'query':
+            return name, {'query': rng.choice(self.questions)}
+        if name == 'batch':
+            return name, {'queries': rng.sample(self.questions, min(self.batch_size, len(self.questions)))}
+        return name, None
+
+class LoadGenerator:
+    """
+    닫힌/열린 루프 부하 실행
+    
+    사용 예:
+        generator = LoadGenerator(transport, RequestMix(parse_mix(DEFAULT_MIX), questions))
+        report = generator.run_closed(concurrency=8, duration=10)
+    """
+    
+    def __init__(self, transport: Transport, mix: RequestMix):
+        self.transport = transport
+        self.mix = mix
+        self.lock = threading.Lock()
+        self.stats: Dict[str, EndpointStats] = {}
+    
+    def _send(self, scheduled: Optional[float] = None) -> None:
+        name, body = self.mix.next()
+        method, path = ENDPOINTS[name]
+        started = time.perf_counter()
+        error = None
+        try:
+            status, payload = self.transport.request(method, path, body)
+            if status >= 400:
+                error = f"HTTP {status}"
+            elif name == 'health' and isinstance(payload, dict) and payload.get('status') != 'healthy':
+                error = "unhealthy"
+        except Exception as e:
+            error = type(e).__name__
+        # 열린 루프는 예정 시각부터 (대기 시간 포함)
+        millis = (time.perf_counter() - (scheduled if scheduled is not None else started)) * 1000
+        with self.lock:
+            self.stats.setdefault(name, EndpointStats()).record(millis, error)
+    
+    def run_closed(self, concurrency: int, duration: Optional[float] = None,
+                   requests: Optional[int] = None, think_ms: float = 0.0) -> Dict[str, Any]:
+        """concurrency개 작업자가 응답 즉시 다음 요청 (duration초 또는 총 requests개)"""
+        self.stats = {}
+        remaining = [requests]
+        deadline = time.perf_counter() + duration if duration else None
+        
+        def take() -> bool:
+            if deadline and time.perf_counter() >= deadline:
+                return False
+            if requests is not None:
+                with self.lock:
+                    if remaining[0] <= 0:
+                        return False
+                    remaining[0] -= 1
+            return True
+        
+        def worker():
+            while take():
+                self._send()
+                if think_ms:
+                    time.sleep(think_ms / 1000)
+        
+        started = time.perf_counter()
+        threads = [threading.Thread(target=worker, name=f"load-{index}") for index in range(concurrency)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return self._report('closed', time.perf_counter() - started, concurrency=concurrency)
+    
+    def run_open(self, rate: float, duration: float, concurrency: int = 64,
+                 poisson: bool = True) -> Dict[str, Any]:
+        """초당 rate개 도착 (포아송 또는 고정 간격), 최대 concurrency개 동시 처리"""
+        self.stats = {}
+        rng = random.Random(self.mix.seed)
+        started = time.perf_counter()
+        scheduled = started
+        late = 0
+        with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="load") as pool:
+            while True:
+                scheduled += rng.expovariate(rate) if poisson else 1 / rate
+                if scheduled - started >= duration:
+                    break
+                wait = scheduled - time.perf_counter()
+                if wait > 0:
+                    time.sleep(wait)
+                else:
+                    late += 1
+                pool.submit(self._send, scheduled)
+        report = self._report('open', time.perf_counter() - started, concurrency=concurrency, rate=rate)
+        report['late_dispatches'] = late
+        return report
+    
+    def _report(self, mode: str, elapsed: float, **settings) -> Dict[str, Any]:
+        total = EndpointStats()
+        for stats in self.stats.values():
+            total.merge(stats)
+        endpoints = {name: _summary(stats, elapsed) for name, stats in sorted(self.stats.items())}
+        return {
+            'mode': mode,
+            'elapsed': elapsed,
+            **settings,
+            'endpoints': endpoints,
+            'total': _summary(total, elapsed),
+            '_histograms': {name: stats.latency for name, stats in self.stats.items()},
+        }
+
+def _summary(stats: EndpointStats, elapsed: float) -> Dict[str, Any]:
+    latency = stats.latency
+    return {
+        'requests': latency.total,
+        'ok': stats.ok,
+        'errors': dict(sorted(stats.errors.items(), key=lambda item: -item[1])),
+        'throughput': latency.total / elapsed if elapsed else 0.0,
+        'mean_ms': latency.mean,
+        'p50_ms': latency.percentile(50),
+        'p90_ms': latency.percentile(90),
+        'p99_ms': latency.percentile(99),
+        'p999_ms': latency.percentile(99.9),
+        'max_ms': latency.max,
+    }
+
+def parse_mix(text: str) -> Dict[str, float]:
+    """"query=80,batch=10,health=10" → {'query': 80.0, ...}"""
+    mix = {}
+    for part in text.split(','):
+        name, _, weight = part.partition('=')
+        mix[name.strip()] = float(weight or 1)
+    return mix
+
+def print_report(report: Dict[str, Any], histogram: bool = False):
+    settings = f"동시성 {report['concurrency']}" + (f", 도착률 {report['rate']:g}/s" if report.get('rate') else "")
+    print(f"\n📊 {'열린' if report['mode'] == 'open' else '닫힌'} 루프 ({settings}, {report['elapsed']:.1f}초)")
+    print(f"{'엔드포인트':<10}{'요청':>8}{'req/s':>9}{'평균':>9}{'p50':>9}{'p90':>9}{'p99':>9}{'p99.9':>9}{'최대':>9}  오류")
+    for name, summary in list(report['endpoints'].items()) + [('total', report['total'])]:
+        errors = ", ".join(f"{error} {count}" for error, count in summary['errors'].items()) or "-"
+        print(f"{name:<10}{summary['requests']:>8}{summary['throughput']:>9.1f}{summary['mean_ms']:>9.1f}"
+              f"{summary['p50_ms']:>9.1f}{summary['p90_ms']:>9.1f}{summary['p99_ms']:>9.1f}"
+              f"{summary['p999_ms']:>9.1f}{summary['max_ms']:>9.1f}  {errors}")
+    if report.get('late_dispatches'):
+        print(f"⚠️  예정보다 늦게 보낸 요청 {report['late_dispatches']}개 (부하 생성기 자체가 포화)")
+    if histogram:
+        for name, latency in sorted(report['_histograms'].items()):
+            print(f"\n  {name} 지연 시간 분포 (ms)")
+            buckets = latency.buckets()
+            peak = max(count for _, _, count in buckets)
+            for lower, upper, count in buckets:
+                print(f"  {lower:>9.2f} ~ {upper:>9.2f} | {'█' * max(1, round(count * 40 / peak)) if count else '':<40} {count}")
+
+def build_target(target: str, corpus: Dict[str, Any], result_size: int, db_latency_ms: float):
+    """(Transport, 정리 함수) - 로컬 대상이면 가짜 그래프 엔진을 API에 연결"""
+    if target.startswith('http://') or target.startswith('https://'):
+        return HttpTransport(target), lambda: None
+    
+    import knowledge_api
+    from advanced_knowledge_engine import AdvancedKnowledgeEngine
+    
+    driver = FakeGraphDriver(corpus, result_size=result_size, db_latency_ms=db_latency_ms)
+    knowledge_api.knowledge_engine = AdvancedKnowledgeEngine(driver=driver)
+    if target == 'test-client':
+        return TestClientTransport(knowledge_api.app), lambda: None
+    if target == 'inprocess':
+        server = InProcessServer(knowledge_api.app).start()
+        return HttpTransport(server.url), server.stop
+    raise ValueError(f"알 수 없는 대상: {target} (test-client, inprocess, http://...)")
+
+def main():
+    """부하 테스트 실행"""
+    parser = argparse.ArgumentParser(description="지식 API 부하 생성기")
+    parser.add_argument("--target", default="test-client", help="test-client | inprocess | http://host:port")
+    parser.add_argument("--concurrency", type=int, default=8, help="동시 작업자 수 (열린 루프는 최대 동시 처리 수)")
+    parser.add_argument("--rate", type=float, help="열린 루프 도착률 (req/s, 지정하지 않으면 닫힌 루프)")
+    parser.add_argument("--constant-rate", action="store_true", help="열린 루프 도착 간격을 포아송 대신 고정")
+    parser.add_argument("--duration", type=float, default=10.0, help="실행 시간(초)")
+    parser.add_argument("--requests", type=int, help="닫힌 루프 총 요청 수 (duration 대신)")
+    parser.add_argument("--think-ms", type=float, default=0.0, help="닫힌 루프 요청 사이 대기(ms)")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help="엔드포인트 비율 (예: query=80,batch=10,health=10)")
+    parser.add_argument("--batch-size", type=int, default=5, help="배치 요청당 질문 수")
+    parser.add_argument("--corpus", default=CORPUS_FILE, help="질문/결과 코퍼스")
+    parser.add_argument("--result-size", type=int, default=10, help="가짜 그래프 결과 행 수")
+    parser.add_argument("--db-latency", type=float, default=0.0, help="가짜 그래프 쿼리당 지연(ms)")
+    parser.add_argument("--sweep", type=int, nargs="+", help="닫힌 루프 동시성 단계별 실행 (포화 지점 탐색)")
+    parser.add_argument("--seed", type=int, default=42, help="질문 선택 난수 시드")
+    parser.add_argument("--histogram", action="store_true", help="지연 시간 분포 출력")
+    parser.add_argument("--json", action="store_true", help="결과를 JSON으로 출력")
+    parser.add_argument("--verbose", action="store_true", help="API/엔진 요청 로그 출력")
+    args = parser.parse_args()
+    
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    if not args.verbose:
+        for name in ('knowledge_api', 'advanced_knowledge_engine', 'graph_statistics', 'werkzeug'):
+            logging.getLogger(name).setLevel(logging.WARNING)
+    
+    corpus = load_corpus(args.corpus)
+    transport, cleanup = build_target(args.target, corpus, args.result_size, args.db_latency)
+    generator = LoadGenerator(transport, RequestMix(parse_mix(args.mix), corpus['questions'],
+                                                    batch_size=args.batch_size, seed=args.seed))
+    reports = []
+    try:
+        if args.sweep:
+            for concurrency in args.sweep:
+                reports.append(generator.run_closed(concurrency, duration=args.duration, think_ms=args.think_ms))
+        elif args.rate:
+            reports.append(generator.run_open(args.rate, args.duration, concurrency=args.concurrency,
+                                              poisson=not args.constant_rate))
+        else:
+            reports.append(generator.run_closed(args.concurrency, duration=None if args.requests else args.duration,
+                                                requests=args.requests, think_ms=args.think_ms))
+    finally:
+        cleanup()
+    
+    if args.json:
+        print(json.dumps([{key: value for key, value in report.items() if not key.startswith('_')}
+                          for report in reports], ensure_ascii=False, indent=2))
+        return True
+    
+    for report in reports:
+        print_report(report, histogram=args.histogram)
+    if args.sweep:
+        print(f"\n📈 동시성별 처리량 (target: {args.target})")
+        # 처리량이 최고치의 95%에 처음 도달한 단계 이후로는 지연 시간만 늘어남 = 포화 지점
+        best = max(report['total']['throughput'] for report in reports)
+        saturated = next(report for report in reports if report['total']['throughput'] >= best * 0.95)
+        for report in reports:
+            total = report['total']
+            marker = " ← 포화" if report is saturated and report is not reports[-1] else ""
+            print(f"  {report['concurrency']:>4}: {total['throughput']:>9.1f} req/s, "
+                  f"p99 {total['p99_ms']:>8.1f}ms{marker}")
+    return True
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,448 @@
+#!/usr/bin/env python3
+"""
+활동 파이프라인 적재 처리량 벤치마크
+커밋/파일/작업/인사이트 이벤트 흐름을 만들어 ClaudeNeo4jPipeline의 적재 경로별로 밀어 넣고
+초당 이벤트 수, 대기열 투입 → 커밋 지연 시간(p50/p99), 쓰기 충돌 재시도 횟수를 비교
+
+적재 경로:
+- single      : 이벤트마다 log_development_activity (트랜잭션 1개/이벤트)
+- batch       : batch_size개씩 모아 log_development_activities (호출자가 직접 모음)
+- buffered    : 수집 API와 같은 PartitionedIngestionWriter를 워커 1개로 (batch_size개 또는 max_delay_ms마다 기록)
+- partitioned : PartitionedIngestionWriter 워커 N개 (개발자 기준 분할로 같은 노드 쓰기가 한 워커에 모임)
+
+이벤트 흐름:
+- --mix commit=50,file=25,task=15,insight=10 : 활동 종류 비율
+- --skew 1.1 : 개발자/개념 선택 Zipf 지수 (클수록 소수 허브에 쓰기 집중)
+- --duplicate-rate 0.1 : 이미 보낸 키를 다시 보내는 비율 (재전송 흉내, MERGE 일치 경로)
+- --dedupe : 배치 안의 같은 키 이벤트를 마지막 것만 남기고 합침 (single 제외)
+- --rate : 초당 도착 이벤트 수 (0이면 최대 속도), 지연 시간은 예정 도착 시각부터 측정
+
+재시도 횟수는 execute_write 트랜잭션 함수가 두 번 이상 호출된 횟수입니다
+(인메모리 그래프는 트랜잭션을 직렬화하므로 항상 0, 실제 Neo4j에서만 의미 있음).
+
+사용 예:
+    python benchmarks/ingest_bench.py                                   # 인메모리 그래프, 전체 경로
+    python benchmarks/ingest_bench.py --paths buffered,partitioned --batch-sizes 50 200 --workers 2 4 8
+    python benchmarks/ingest_bench.py --uri bolt://localhost:7687 --events 5000 --rate 500 --cleanup
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import logging
+import threading
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Any, Optional, Iterator, Tuple
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.join(BENCH_DIR, '..'))
+sys.path.append(os.path.join(BENCH_DIR, '..', 'poc', 'ai_pipeline'))
+sys.path.append(os.path.join(BENCH_DIR, '..', 'poc', 'seed_content'))
+from api_load_test import LatencyHistogram, parse_mix
+from memory_graph import MemoryGraph, open_driver, is_memory_uri
+from claude_neo4j_pipeline import ClaudeNeo4jPipeline, ACTIVITY_TYPES
+from ingestion_workers import PartitionedIngestionWriter
+from synthetic_graph import PowerLawSampler
+from schema_migrations import SchemaMigrator
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MIX = "commit=50,file=25,task=15,insight=10"
+
+PATHS = ['single', 'batch', 'buffered', 'partitioned']
+
+# 믹스 이름 → 파이프라인 활동 타입
+_MIX_TYPES = {'commit': 'commit', 'file': 'file_creation', 'task': 'task_completion', 'insight': 'knowledge_insight'}
+
+class ActivityStream:
+    """
+    재현 가능한 활동 이벤트 생성기
+    
+    사용 예:
+        stream = ActivityStream(parse_mix(DEFAULT_MIX), developers=50, skew=1.1, duplicate_rate=0.1)
+        activity = stream.next()
+    """
+    
+    def __init__(self, mix: Dict[str, float], developers: int = 50, concepts: int = 200,
+                 skew: float = 1.1, duplicate_rate: float = 0.0, seed: int = 42, prefix: str = 'bench'):
+        unknown = set(mix) - set(_MIX_TYPES)
+        if unknown:
+            raise ValueError(f"알 수 없는 활동 종류: {', '.join(sorted(unknown))} (commit, file, task, insight)")
+        self.rng = random.Random(seed)
+        self.types = [_MIX_TYPES[name] for name in mix]
+        self.weights = list(mix.values())
+        self.prefix = prefix
+        self.duplicate_rate = duplicate_rate
+        self.developer_ids = [f"{prefix}-dev-{index:04d}" for index in range(developers)]
+        self.concept_ids = [f"{prefix}-concept-{index:05d}" for index in range(concepts)]
+        developer_order = list(range(developers))
+        concept_order = list(range(concepts))
+        self.rng.shuffle(developer_order)
+        self.rng.shuffle(concept_order)
+        self._developers = PowerLawSampler(developers, skew, developer_order)
+        self._concepts = PowerLawSampler(concepts, skew, concept_order)
+        self._sent: Dict[str, List[Dict[str, Any]]] = {}
+        self._counter = 0
+        self._clock = datetime.now(timezone.utc) - timedelta(days=1)
+    
+    def next(self) -> Dict[str, Any]:
+        activity_type = self.rng.choices(self.types, self.weights)[0]
+        sent = self._sent.setdefault(activity_type, [])
+        if sent and self.rng.random() < self.duplicate_rate:
+            return dict(self.rng.choice(sent))
+        self._counter += 1
+        self._clock += timedelta(milliseconds=self.rng.randint(1, 2000))
+        activity = getattr(self, f"_{activity_type}")(self._counter, self._clock.isoformat())
+        if len(sent) < 10000:
+            sent.append(activity)
+        return dict(activity)
+    
+    def _developer(self) -> str:
+        return self.developer_ids[self._developers.sample(self.rng)]
+    
+    def _commit(self, index: int, timestamp: str) -> Dict[str, Any]:
+        return {'type': 'commit', 'hash': f"{self.prefix}{index:010x}", 'message': f"Update module {index % 97}",
+                'author': self._developer(), 'timestamp': timestamp, 'files_changed': self.rng.randint(1, 12),
+                'lines_added': self.rng.randint(0, 400), 'lines_deleted': self.rng.randint(0, 200)}
+    
+    def _file_creation(self, index: int, timestamp: str) -> Dict[str, Any]:
+        return {'type': 'file_creation', 'path': f"{self.prefix}/src/module_{index}.py", 'name': f"module_{index}.py",
+                'extension': 'py', 'size': self.rng.randint(200, 40000), 'created': timestamp,
+                'purpose': 'benchmark', 'complexity': self.rng.randint(1, 10), 'creator': self._developer()}
+    
+    def _task_completion(self, index: int, timestamp: str) -> Dict[str, Any]:
+        return {'type': 'task_completion', 'task_id': f"{self.prefix}-task-{index}", 'name': f"Task {index}",
+                'description': 'benchmark task', 'status': 'completed', 'completion_date': timestamp,
+                'duration': self.rng.randint(5, 240), 'complexity': self.rng.randint(1, 10),
+                'assignee': self._developer(), 'effort': self.rng.randint(1, 13)}
+    
+    def _knowledge_insight(self, index: int, timestamp: str) -> Dict[str, Any]:
+        concepts = [self.concept_ids[position] for position in self._concepts.sample_many(self.rng, 3)]
+        return {'type': 'knowledge_insight', 'insight_id': f"{self.prefix}-insight-{index}",
+                'title': f"Insight {index}", 'description': 'benchmark insight', 'category': 'productivity',
+                'confidence': self.rng.randint(50, 100), 'generated': timestamp, 'source': 'ingest_bench',
+                'related_concepts': [{'id': concept, 'name': concept, 'strength': self.rng.randint(1, 10)}
+                                     for concept in concepts]}
+
+def activity_key(activity: Dict[str, Any]) -> Tuple[str, Any]:
+    """중복 판정 키 (활동 타입, 고유 키)"""
+    return activity['type'], activity.get(ACTIVITY_TYPES[activity['type']])
+
+class CountingDriver:
+    """execute_write 트랜잭션 함수 호출 수를 세는 드라이버 래퍼 (호출 수 - 트랜잭션 수 = 재시도)"""
+    
+    def __init__(self, driver):
+        self.driver = driver
+        self.transactions = 0
+        self.attempts = 0
+        self._lock = threading.Lock()
+    
+    def session(self, **config):
+        return _CountingSession(self, self.driver.session(**config))
+    
+    def close(self):
+        self.driver.close()
+    
+    def count(self, transactions: int = 0, attempts: int = 0):
+        with self._lock:
+            self.transactions += transactions
+            self.attempts += attempts
+    
+    @property
+    def retries(self) -> int:
+        return self.attempts - self.transactions
+
+class _CountingSession:
+    def __init__(self, counter: CountingDriver, session):
+        self.counter = counter
+        self.session = session
+        self.last_ok = False
+    
+    def execute_write(self, work, *args, **kwargs):
+        def counted(tx, *inner_args, **inner_kwargs):
+            self.counter.count(attempts=1)
+            return work(tx, *inner_args, **inner_kwargs)
+        self.last_ok = False
+        result = self.session.execute_write(counted, *args, **kwargs)
+        self.counter.count(transactions=1)
+        self.last_ok = True
+        return result
+    
+    def __getattr__(self, name):
+        return getattr(self.session, name)
+    
+    def __enter__(self):
+        self.session.__enter__()
+        return self
+    
+    def __exit__(self, *exc):
+        return self.session.__exit__(*exc)
+
+class IngestStats:
+    """경로 하나의 실행 결과 집계 (여러 작업자 스레드에서 기록)"""
+    
+    def __init__(self):
+        self.latency = LatencyHistogram()
+        self.committed = 0
+        self.failed = 0
+        self.deduped = 0
+        self.calls = 0
+        self.first_enqueue: Optional[float] = None
+        self.last_commit = 0.0
+        self._lock = threading.Lock()
+    
+    def enqueued(self, at: float):
+        with self._lock:
+            if self.first_enqueue is None or at < self.first_enqueue:
+                self.first_enqueue = at
+    
+    def committed_batch(self, enqueue_times: List[float], ok: bool, deduped: int = 0):
+        now = time.perf_counter()
+        with self._lock:
+            self.calls += 1
+            self.deduped += deduped
+            if ok:
+                self.committed += len(enqueue_times)
+                for at in enqueue_times:
+                    self.latency.record((now - at) * 1000)
+            else:
+                self.failed += len(enqueue_times)
+            self.last_commit = max(self.last_commit, now)
+
+def flush_batch(pipeline: ClaudeNeo4jPipeline, stats: IngestStats,
+                batch: List[Tuple[float, Dict[str, Any]]], dedupe: bool = False):
+    """이벤트 묶음 하나를 트랜잭션 하나로 기록 (dedupe면 같은 키는 마지막 이벤트만)"""
+    activities = [activity for _, activity in batch]
+    deduped = 0
+    if dedupe:
+        unique = dedupe_activities(activities)
+        deduped = len(activities) - len(unique)
+        activities = unique
+    written = pipeline.log_development_activities(activities)
+    stats.committed_batch([at for at, _ in batch], ok=written == len(activities), deduped=deduped)
+
+def dedupe_activities(activities: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """같은 키 이벤트는 마지막 것만 남김 (순서는 키가 처음 나온 위치)"""
+    return list({activity_key(activity): activity for activity in activities}.values())
+
+class TimedIngestionWriter(PartitionedIngestionWriter):
+    """
+    배치가 커밋될 때 이벤트별 대기열 투입 → 커밋 지연 시간을 기록하는 PartitionedIngestionWriter
+    (기록 경로는 수집 API와 같고, dedupe면 트랜잭션에 넘기기 전에 같은 키를 합침)
+    """
+    
+    def __init__(self, pipeline: ClaudeNeo4jPipeline, stats: IngestStats, dedupe: bool = False, **kwargs):
+        super().__init__(_DedupingPipeline(pipeline) if dedupe else pipeline, **kwargs)
+        self.bench_stats = stats
+        self.dedupe = dedupe
+        self._enqueued: Dict[int, float] = {}
+    
+    def submit_at(self, enqueued_at: float, activity: Dict[str, Any]):
+        self._enqueued[id(activity)] = enqueued_at
+        self.submit(activity)
+    
+    def _write_batch(self, session, index: int, batch: List[Tuple[Dict[str, Any], Optional[str]]]):
+        super()._write_batch(session, index, batch)
+        activities = [activity for activity, _ in batch]
+        deduped = len(activities) - len(dedupe_activities(activities)) if self.dedupe else 0
+        self.bench_stats.committed_batch([self._enqueued.pop(id(activity)) for activity in activities],
+                                         ok=session.last_ok, deduped=deduped)
+
+class _DedupingPipeline:
+    """배치 기록 직전에 같은 키 이벤트를 합치는 파이프라인 래퍼"""
+    
+    def __init__(self, pipeline: ClaudeNeo4jPipeline):
+        self.pipeline = pipeline
+    
+    def _write_activity_batch(self, tx, activities: List[Dict[str, Any]]):
+        return self.pipeline._write_activity_batch(tx, dedupe_activities(activities))
+    
+    def __getattr__(self, name):
+        return getattr(self.pipeline, name)
+
+def arrivals(stream: ActivityStream, count: int, rate: float) -> Iterator[Tuple[float, Dict[str, Any]]]:
+    """(예정 도착 시각, 이벤트) - rate > 0이면 고정 간격으로 도착 시각까지 대기"""
+    started = time.perf_counter()
+    for index in range(count):
+        activity = stream.next()
+        if rate > 0:
+            scheduled = started + index / rate
+            wait = scheduled - time.perf_counter()
+            if wait > 0:
+                time.sleep(wait)
+            yield scheduled, activity
+        else:
+            yield time.perf_counter(), activity
+
+def ingest(path: str, pipeline: ClaudeNeo4jPipeline, events: Iterator[Tuple[float, Dict[str, Any]]],
+           batch_size: int = 100, workers: int = 4, max_delay_ms: float = 50.0, dedupe: bool = False) -> IngestStats:
+    """적재 경로 하나로 이벤트 흐름 전체 기록"""
+    stats = IngestStats()
+    if path == 'single':
+        for enqueued_at, activity in events:
+            stats.enqueued(enqueued_at)
+            ok = pipeline.log_development_activity(activity)
+            stats.committed_batch([enqueued_at], ok=ok)
+    elif path == 'batch':
+        batch = []
+        for item in events:
+            stats.enqueued(item[0])
+            batch.append(item)
+            if len(batch) >= batch_size:
+                flush_batch(pipeline, stats, batch, dedupe)
+                batch = []
+        if batch:
+            flush_batch(pipeline, stats, batch, dedupe)
+    elif path in ('buffered', 'partitioned'):
+        writer = TimedIngestionWriter(pipeline, stats, dedupe=dedupe, workers=1 if path == 'buffered' else workers,
+                                      batch_size=batch_size, flush_interval=max_delay_ms / 1000)
+        writer.start()
+        try:
+            for enqueued_at, activity in events:
+                stats.enqueued(enqueued_at)
+                writer.submit_at(enqueued_at, activity)
+        finally:
+            writer.close()
+    else:
+        raise ValueError(f"알 수 없는 적재 경로: {path} ({', '.join(PATHS)})")
+    return stats
+
+def prepare_backend(uri: str, username: str, stream: ActivityStream, run: int):
+    """(CountingDriver, 정리 함수) - 인메모리 그래프는 실행마다 새 그래프 + 스키마 마이그레이션"""
+    if is_memory_uri(uri):
+        name = f"{uri[len('memory://'):] or 'ingest'}-{run}"
+        MemoryGraph.drop(name)
+        driver = open_driver(f"memory://{name}")
+        SchemaMigrator(driver).migrate()
+        cleanup = lambda: MemoryGraph.drop(name)
+    else:
+        driver = open_driver(uri, auth=(username, os.getenv('NEO4J_PASSWORD')))
+        cleanup = lambda: None
+    with driver.session() as session:
+        session.run("""
+            UNWIND $ids AS id
+            MERGE (dev:Developer {id: id})
+            ON CREATE SET dev.name = id, dev.type = 'Benchmark'
+        """, ids=stream.developer_ids).consume()
+    return CountingDriver(driver), cleanup
+
+def remove_benchmark_data(driver, prefix: str):
+    """외부 데이터베이스에 남은 벤치마크 노드 삭제 (키가 prefix로 시작하는 노드)"""
+    with driver.session() as session:
+        for label, key in (('Commit', 'hash'), ('File', 'path'), ('Task', 'id'), ('Insight', 'id'),
+                           ('Concept', 'id'), ('Developer', 'id')):
+            summary = session.run(f"""
+                MATCH (n:{label}) WHERE n.{key} STARTS WITH $prefix
+                CALL {{ WITH n DETACH DELETE n }} IN TRANSACTIONS OF 1000 ROWS
+            """, prefix=prefix).consume()
+            if summary.counters.nodes_deleted:
+                logger.info(f"🧹 {label} {summary.counters.nodes_deleted}개 삭제")
+
+def run_case(args, case: Dict[str, Any], run: int) -> Dict[str, Any]:
+    stream = ActivityStream(parse_mix(args.mix), developers=args.developers, concepts=args.concepts,
+                            skew=args.skew, duplicate_rate=args.duplicate_rate, seed=args.seed, prefix=args.prefix)
+    driver, cleanup = prepare_backend(args.uri, args.username, stream, run)
+    pipeline = ClaudeNeo4jPipeline(password=os.getenv('NEO4J_PASSWORD') or 'unused')
+    pipeline.uri = args.uri
+    pipeline.driver = driver
+    try:
+        stats = ingest(case['path'], pipeline, arrivals(stream, args.events, args.rate),
+                       batch_size=case['batch_size'], workers=case['workers'],
+                       max_delay_ms=args.max_delay_ms, dedupe=args.dedupe)
+    finally:
+        if args.cleanup and not is_memory_uri(args.uri):
+            remove_benchmark_data(driver.driver, args.prefix)
+        driver.close()
+        cleanup()
+    
+    elapsed = (stats.last_commit - stats.first_enqueue) if stats.first_enqueue is not None else 0.0
+    return {
+        **case,
+        'events': args.events,
+        'committed': stats.committed,
+        'failed': stats.failed,
+        'deduped': stats.deduped,
+        'transactions': driver.transactions,
+        'avg_batch': stats.committed / stats.calls if stats.calls else 0.0,
+        'elapsed': elapsed,
+        'events_per_sec': stats.committed / elapsed if elapsed else 0.0,
+        'p50_ms': stats.latency.percentile(50),
+        'p99_ms': stats.latency.percentile(99),
+        'max_ms': stats.latency.max,
+        'retries': driver.retries,
+    }
+
+def build_cases(args) -> List[Dict[str, Any]]:
+    cases = []
+    for path in args.paths.split(','):
+        path = path.strip()
+        if path not in PATHS:
+            raise ValueError(f"알 수 없는 적재 경로: {path} ({', '.join(PATHS)})")
+        if path == 'single':
+            cases.append({'path': path, 'batch_size': 1, 'workers': 1})
+        for batch_size in (args.batch_sizes if path != 'single' else []):
+            for workers in (args.workers if path == 'partitioned' else [1]):
+                cases.append({'path': path, 'batch_size': batch_size, 'workers': workers})
+    return cases
+
+def print_report(results: List[Dict[str, Any]], args):
+    rate = f"{args.rate:g}/s 도착" if args.rate else "최대 속도"
+    print(f"\n📥 활동 적재 벤치마크 ({args.events}개 이벤트, {rate}, 믹스 {args.mix}, skew {args.skew}, "
+          f"중복 {args.duplicate_rate:.0%}{', dedupe' if args.dedupe else ''}, 대상 {args.uri})")
+    print(f"{'경로':<13}{'배치':>6}{'작업자':>7}{'events/s':>11}{'트랜잭션':>9}{'평균 배치':>10}"
+          f"{'p50 ms':>9}{'p99 ms':>9}{'최대 ms':>9}{'재시도':>7}{'실패':>6}{'합침':>6}")
+    for row in results:
+        print(f"{row['path']:<13}{row['batch_size']:>6}{row['workers']:>7}{row['events_per_sec']:>11.0f}"
+              f"{row['transactions']:>9}{row['avg_batch']:>10.1f}{row['p50_ms']:>9.1f}{row['p99_ms']:>9.1f}"
+              f"{row['max_ms']:>9.1f}{row['retries']:>7}{row['failed']:>6}{row['deduped']:>6}")
+
+def main():
+    """적재 벤치마크 실행"""
+    parser = argparse.ArgumentParser(description="활동 파이프라인 적재 처리량 벤치마크")
+    parser.add_argument("--uri", default="memory://ingest",
+                        help="대상 (memory://이름 = 인메모리 그래프, bolt://localhost:7687 = 로컬 Neo4j)")
+    parser.add_argument("--username", default=os.getenv('NEO4J_USERNAME', "neo4j"))
+    parser.add_argument("--paths", default=",".join(PATHS), help="적재 경로 (쉼표 구분)")
+    parser.add_argument("--events", type=int, default=2000, help="경로별 이벤트 수")
+    parser.add_argument("--rate", type=float, default=0.0, help="초당 도착 이벤트 수 (0 = 최대 속도)")
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[10, 100], help="배치/버퍼 크기")
+    parser.add_argument("--workers", type=int, nargs="+", default=[4], help="partitioned 작업자 수")
+    parser.add_argument("--max-delay-ms", type=float, default=50.0, help="버퍼 최대 대기 시간(ms)")
+    parser.add_argument("--dedupe", action="store_true", help="버퍼 안의 같은 키 이벤트 합치기")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help="활동 비율 (commit, file, task, insight)")
+    parser.add_argument("--developers", type=int, default=50, help="개발자 수")
+    parser.add_argument("--concepts", type=int, default=200, help="인사이트 개념 수")
+    parser.add_argument("--skew", type=float, default=1.1, help="개발자/개념 선택 Zipf 지수")
+    parser.add_argument("--duplicate-rate", type=float, default=0.0, help="이미 보낸 키 재전송 비율")
+    parser.add_argument("--seed", type=int, default=42, help="이벤트 난수 시드")
+    parser.add_argument("--prefix", default="bench", help="벤치마크 데이터 키 접두사")
+    parser.add_argument("--cleanup", action="store_true", help="외부 DB 대상이면 실행 후 벤치마크 노드 삭제")
+    parser.add_argument("--json", action="store_true", help="결과를 JSON으로 출력")
+    parser.add_argument("--verbose", action="store_true", help="파이프라인 로그 출력")
+    args = parser.parse_args()
+    
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    if not args.verbose:
+        for name in ('claude_neo4j_pipeline', 'schema_migrations', 'memory_graph'):
+            logging.getLogger(name).setLevel(logging.WARNING)
+    if not is_memory_uri(args.uri) and not os.getenv('NEO4J_PASSWORD'):
+        logger.error("❌ NEO4J_PASSWORD 환경변수가 설정되지 않았습니다.")
+        return False
+    
+    results = []
+    for run, case in enumerate(build_cases(args)):
+        logger.info(f"▶️  {case['path']} (배치 {case['batch_size']}, 작업자 {case['workers']})")
+        results.append(run_case(args, case, run))
+    
+    if args.json:
+        print(json.dumps(results, ensure_ascii=False, indent=2))
+    else:
+        print_report(results, args)
+    return all(row['failed'] == 0 for row in results)
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,292 @@
+#!/usr/bin/env python3
+"""
+지식 엔진 질의 처리 파이프라인 마이크로벤치마크
+기록된 코퍼스(한국어 질문 + 질의 유형별 결과 행)로 DB 없이 각 단계의 처리량과 할당량 측정
+
+측정 단계:
+- analyze_query          : 코퍼스 질문 전체 분석
+- generate_cypher_query  : 분석 결과 → Cypher 생성
+- execute_query[N]       : 기록된 드라이버가 돌려주는 N개 레코드 → dict 변환
+- format_answer[N]       : 질의 유형별 N개 결과 포맷팅 (요약 포함)
+- generate_summary[N]    : 질의 유형별 N개 결과 요약
+
+결과는 ops/sec (질문/결과 집합 단위), op당 할당 블록 수, op당 최대 메모리(KiB)이며
+저장된 기준값(baseline.json)과 비교합니다.
+
+사용 예:
+    python benchmarks/query_pipeline_bench.py                   # 실행 + 기준값 비교
+    python benchmarks/query_pipeline_bench.py --save-baseline   # 기준값 갱신
+    python benchmarks/query_pipeline_bench.py --check           # 기준 대비 회귀 시 종료 코드 1
+"""
+
+import os
+import sys
+import gc
+import json
+import time
+import argparse
+import logging
+import tracemalloc
+from datetime import datetime
+from typing import Dict, List, Any, Callable, Optional
+
+from neo4j import Record
+from neo4j.time import DateTime
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.join(BENCH_DIR, '..'))
+from advanced_knowledge_engine import AdvancedKnowledgeEngine, QueryAnalysis, QueryType, QueryComplexity
+
+CORPUS_FILE = os.path.join(BENCH_DIR, 'query_corpus.json')
+BASELINE_FILE = os.path.join(BENCH_DIR, 'baseline.json')
+
+# 기준 대비 이 비율 이상 느려지면 회귀로 표시
+DEFAULT_THRESHOLD = 0.15
+
+class RecordedSession:
+    """기록된 레코드를 그대로 돌려주는 세션"""
+    
+    def __init__(self, driver):
+        self.driver = driver
+    
+    def run(self, query, parameters=None, **kwargs):
+        return iter(self.driver.records)
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc):
+        return False
+
+class RecordedDriver:
+    """DB 없이 execute_query의 레코드 변환만 측정하기 위한 드라이버 (records를 교체하며 사용)"""
+    
+    def __init__(self, records: Optional[List[Record]] = None):
+        self.records = records or []
+    
+    def session(self, **kwargs):
+        return RecordedSession(self)
+    
+    def close(self):
+        pass
+
+class Benchmark:
+    """측정 대상 하나 (fn 한 번 호출 = ops_per_call개 작업)"""
+    
+    def __init__(self, name: str, fn: Callable[[], Any], ops_per_call: int = 1, setup: Optional[Callable] = None):
+        self.name = name
+        self.fn = fn
+        self.ops_per_call = ops_per_call
+        self.setup = setup
+    
+    def run(self, repeat: int, min_time: float) -> Dict[str, Any]:
+        if self.setup:
+            self.setup()
+        
+        # 호출 횟수 보정: min_time 이상 걸리는 반복 수 찾기
+        loops = 1
+        while True:
+            elapsed = self._time(loops)
+            if elapsed >= min_time:
+                break
+            loops *= 10 if elapsed < min_time / 10 else 2
+        
+        best = min(self._time(loops) for _ in range(repeat))
+        ops_per_sec = loops * self.ops_per_call / best
+        blocks, peak = self._allocations(max(1, min(loops, 100)))
+        return {
+            'ops_per_sec': ops_per_sec,
+            'us_per_op': 1e6 / ops_per_sec,
+            'blocks_per_op': blocks / self.ops_per_call,
+            'peak_kib_per_op': peak / 1024 / self.ops_per_call,
+            'loops': loops,
+        }
+    
+    def _time(self, loops: int) -> float:
+        fn = self.fn
+        gc_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            started = time.perf_counter()
+            for _ in range(loops):
+                fn()
+            return time.perf_counter() - started
+        finally:
+            if gc_enabled:
+                gc.enable()
+    
+    def _allocations(self, loops: int):
+        """호출당 남는 메모리 블록 수(결과 객체 포함)와 호출 중 최대 추가 메모리"""
+        gc.collect()
+        keep = []
+        before = sys.getallocatedblocks()
+        for _ in range(loops):
+            keep.append(self.fn())
+        blocks = (sys.getallocatedblocks() - before) / loops
+        keep.clear()
+        
+        tracemalloc.start()
+        try:
+            current, _ = tracemalloc.get_traced_memory()
+            tracemalloc.reset_peak()
+            result = self.fn()
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        del result
+        return max(blocks, 0), max(peak - current, 0)
+
+def load_corpus(path: str = CORPUS_FILE) -> Dict[str, Any]:
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def expand_rows(templates: List[Dict[str, Any]], size: int) -> List[Dict[str, Any]]:
+    """결과 행 템플릿을 size개로 확장 (숫자 값은 행마다 조금씩 다르게)"""
+    rows = []
+    for index in range(size):
+        row = {}
+        for name, value in templates[index % len(templates)].items():
+            if isinstance(value, dict) and '$datetime' in value:
+                value = DateTime.from_native(datetime.fromisoformat(value['$datetime'].replace('Z', '+00:00')))
+            elif isinstance(value, int) and not isinstance(value, bool):
+                value = value + index % 7
+            row[name] = value
+        rows.append(row)
+    return rows
+
+def to_records(rows: List[Dict[str, Any]]) -> List[Record]:
+    return [Record(row.items()) for row in rows]
+
+def build_benchmarks(engine: AdvancedKnowledgeEngine, corpus: Dict[str, Any],
+                     sizes: Optional[List[int]] = None) -> List[Benchmark]:
+    """코퍼스로 단계별 벤치마크 구성"""
+    questions = corpus['questions']
+    sizes = sizes or corpus['sizes']
+    analyses = [engine.analyze_query(question) for question in questions]
+    
+    # 질의 유형별 대표 분석 (코퍼스에서 해당 유형으로 분석된 첫 질문)
+    typed_analyses = {}
+    for analysis in analyses:
+        typed_analyses.setdefault(analysis.query_type.value, analysis)
+    for type_name in corpus['results']:
+        typed_analyses.setdefault(type_name, QueryAnalysis(
+            original_query=type_name, query_type=QueryType(type_name), complexity=QueryComplexity.SIMPLE,
+            entities=[], intent="", keywords=[]
+        ))
+    
+    benchmarks = [
+        Benchmark("analyze_query", lambda: [engine.analyze_query(q) for q in questions], len(questions)),
+        Benchmark("generate_cypher_query", lambda: [engine.generate_cypher_query(a) for a in analyses], len(analyses)),
+    ]
+    
+    driver = engine.driver
+    for size in sizes:
+        # execute_query: 결과 유형을 섞은 size개 레코드
+        mixed = [row for templates in corpus['results'].values() for row in templates]
+        records = to_records(expand_rows(mixed, size))
+        benchmarks.append(Benchmark(
+            f"execute_query[{size}]", lambda: engine.execute_query("MATCH (n) RETURN n"), 1,
+            setup=lambda records=records: setattr(driver, 'records', records)
+        ))
+        
+        # format_answer / _generate_summary: execute_query가 돌려주는 형태(날짜는 문자열)
+        cases = []
+        for type_name, templates in corpus['results'].items():
+            driver.records = to_records(expand_rows(templates, size))
+            cases.append((typed_analyses[type_name], engine.execute_query("MATCH (n) RETURN n")))
+        benchmarks.append(Benchmark(
+            f"format_answer[{size}]", lambda cases=cases: [engine.format_answer(a, r) for a, r in cases], len(cases)
+        ))
+        benchmarks.append(Benchmark(
+            f"generate_summary[{size}]", lambda cases=cases: [engine._generate_summary(a, r) for a, r in cases],
+            len(cases)
+        ))
+    return benchmarks
+
+def compare(results: Dict[str, Dict[str, Any]], baseline: Dict[str, Dict[str, Any]],
+            threshold: float = DEFAULT_THRESHOLD) -> List[str]:
+    """기준값 대비 변화율 기록, 회귀한 벤치마크 이름 목록 반환"""
+    regressions = []
+    for name, result in results.items():
+        base = baseline.get(name)
+        if not base:
+            result['change'] = None
+            continue
+        result['change'] = result['ops_per_sec'] / base['ops_per_sec'] - 1
+        if result['change'] < -threshold:
+            regressions.append(name)
+    return regressions
+
+def print_report(results: Dict[str, Dict[str, Any]], regressions: List[str]):
+    print(f"\n{'벤치마크':<26}{'ops/sec':>14}{'µs/op':>11}{'블록/op':>10}{'KiB/op':>10}{'기준 대비':>12}")
+    print("-" * 83)
+    for name, result in results.items():
+        change = result.get('change')
+        change_text = "-" if change is None else f"{change * 100:+.1f}%"
+        marker = " ❌" if name in regressions else ""
+        print(f"{name:<26}{result['ops_per_sec']:>14,.0f}{result['us_per_op']:>11.2f}"
+              f"{result['blocks_per_op']:>10.1f}{result['peak_kib_per_op']:>10.1f}{change_text:>12}{marker}")
+
+def main():
+    """파이프라인 벤치마크 실행"""
+    parser = argparse.ArgumentParser(description="지식 엔진 질의 처리 마이크로벤치마크")
+    parser.add_argument("--corpus", default=CORPUS_FILE, help="기록된 질문/결과 코퍼스")
+    parser.add_argument("--baseline", default=BASELINE_FILE, help="비교할 기준값 파일")
+    parser.add_argument("--save-baseline", action="store_true", help="이번 결과를 기준값으로 저장")
+    parser.add_argument("--check", action="store_true", help="기준 대비 회귀가 있으면 종료 코드 1")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD, help="회귀로 볼 처리량 감소 비율")
+    parser.add_argument("--filter", help="이름에 이 문자열이 포함된 벤치마크만 실행")
+    parser.add_argument("--sizes", type=int, nargs="+", help="결과 집합 크기 (기본: 코퍼스 sizes)")
+    parser.add_argument("--repeat", type=int, default=5, help="반복 측정 횟수 (최소값 사용)")
+    parser.add_argument("--min-time", type=float, default=0.2, help="측정 1회의 최소 시간(초)")
+    parser.add_argument("--json", action="store_true", help="결과를 JSON으로 출력")
+    args = parser.parse_args()
+    
+    # 엔진의 단계별 INFO 로그는 측정 대상에서 출력만 제외 (호출 비용은 포함)
+    logging.getLogger().setLevel(logging.WARNING)
+    logging.getLogger('advanced_knowledge_engine').setLevel(logging.WARNING)
+    
+    corpus = load_corpus(args.corpus)
+    engine = AdvancedKnowledgeEngine(driver=RecordedDriver())
+    benchmarks = [
+        benchmark for benchmark in build_benchmarks(engine, corpus, args.sizes)
+        if not args.filter or args.filter in benchmark.name
+    ]
+    
+    results = {}
+    for benchmark in benchmarks:
+        results[benchmark.name] = benchmark.run(args.repeat, args.min_time)
+        if not args.json:
+            print(f"  ⏱️  {benchmark.name}: {results[benchmark.name]['ops_per_sec']:,.0f} ops/sec", file=sys.stderr)
+    
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            baseline = json.load(f).get('results', {})
+    regressions = compare(results, baseline, args.threshold)
+    
+    if args.json:
+        print(json.dumps({'results': results, 'regressions': regressions}, ensure_ascii=False, indent=2))
+    else:
+        print_report(results, regressions)
+        if not baseline:
+            print("\nℹ️  기준값 없음 - --save-baseline으로 저장하세요")
+        elif regressions:
+            print(f"\n❌ 기준 대비 {args.threshold * 100:.0f}% 이상 느려진 벤치마크: {', '.join(regressions)}")
+    
+    if args.save_baseline:
+        saved = {name: {key: round(result[key], 2) for key in ('ops_per_sec', 'blocks_per_op', 'peak_kib_per_op')}
+                 for name, result in results.items()}
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump({
+                'python': sys.version.split()[0],
+                'saved_at': datetime.now().isoformat(timespec='seconds'),
+                'results': {**baseline, **saved},
+            }, f, ensure_ascii=False, indent=2)
+        print(f"💾 기준값 저장: {args.baseline}", file=sys.stderr)
+    
+    return not (args.check and regressions)
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
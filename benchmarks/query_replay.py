@@ -0,0 +1,283 @@
+#!/usr/bin/env python3
+"""
+질의 기록 재실행 (Query Replay)
+QUERY_RECORD_FILE로 기록한 실제 질의 흐름을 다른 백엔드/코드에서 다시 실행하고
+기록 당시와 소요 시간 분포 / 결과 다이제스트를 비교
+
+재실행 모드:
+- cypher   : 기록된 Cypher와 파라미터를 그대로 실행 (백엔드/인덱스/캐시 변경 검증)
+- question : 기록된 질문으로 질의 분석 → Cypher 생성부터 다시 실행 (템플릿 변경 검증,
+             생성된 Cypher가 달라진 호출은 별도 집계)
+
+속도:
+- --speed 1     : 기록 당시 간격 그대로 (기본)
+- --speed 10    : 10배 빠르게
+- --speed 0     : 간격 없이 최대 속도
+
+사용 예:
+    QUERY_RECORD_FILE=/tmp/queries.jsonl.gz python knowledge_api.py      # 기록
+    python benchmarks/query_replay.py /tmp/queries.jsonl.gz --uri memory:///tmp/graph.pickle --speed 0
+    python benchmarks/query_replay.py /tmp/queries.jsonl.gz --mode question --check --record-to /tmp/after.jsonl
+    python benchmarks/query_replay.py /tmp/before.jsonl --compare /tmp/after.jsonl      # 두 기록 비교만
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Any, Optional, Tuple
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.join(BENCH_DIR, '..'))
+from api_load_test import LatencyHistogram
+from query_recorder import (read_log, query_id, decode_value, result_digest, is_ordered,
+                            normalize_question, QueryRecorder)
+
+logger = logging.getLogger(__name__)
+
+# 기록 대비 p95가 이 비율 이상, 그리고 이 시간 이상 느려지면 회귀로 표시
+DEFAULT_THRESHOLD = 0.25
+DEFAULT_MIN_DELTA_MS = 1.0
+
+class Replayer:
+    """
+    기록된 호출을 엔진으로 다시 실행
+    
+    사용 예:
+        queries, calls = read_log(path)
+        results = Replayer(engine, queries).run(calls, speed=0)
+    """
+    
+    def __init__(self, engine, queries: Dict[str, str], mode: str = 'cypher'):
+        self.engine = engine
+        self.queries = queries
+        self.mode = mode
+    
+    def replay_one(self, call: Dict[str, Any]) -> Dict[str, Any]:
+        """호출 하나 재실행 → 기록과 같은 형식 {'q', 'rows', 'ms', 'digest', 'changed'}"""
+        cypher = self.queries.get(call['q'])
+        changed = False
+        if self.mode == 'question' and call.get('question'):
+            analysis = self.engine.analyze_query(call['question'])
+            generated = self.engine.generate_cypher_query(analysis)
+            changed = query_id(generated) != call['q']
+            cypher = generated
+        if cypher is None:
+            return {'q': call['q'], 'rows': 0, 'ms': 0.0, 'digest': None, 'changed': False,
+                    'error': '기록에 Cypher 본문이 없음'}
+        
+        started = time.perf_counter()
+        rows = self.engine.execute_query(cypher, decode_value(call.get('params') or {}), question=call.get('question'))
+        elapsed = time.perf_counter() - started
+        return {'q': query_id(cypher), 'rows': len(rows), 'ms': elapsed * 1000,
+                'digest': result_digest(rows, is_ordered(cypher)), 'changed': changed}
+    
+    def run(self, calls: List[Dict[str, Any]], speed: float = 1.0, concurrency: int = 8) -> List[Dict[str, Any]]:
+        """기록 간격(speed배)으로 호출 (speed <= 0이면 간격 없이 순서대로)"""
+        results: List[Optional[Dict[str, Any]]] = [None] * len(calls)
+        if speed <= 0 or len(calls) < 2:
+            for index, call in enumerate(calls):
+                results[index] = self.replay_one(call)
+            return results
+        
+        late = 0
+        
+        def task(index: int):
+            results[index] = self.replay_one(calls[index])
+        
+        origin = calls[0]['t']
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="replay") as pool:
+            for index, call in enumerate(calls):
+                wait = started + (call['t'] - origin) / speed - time.perf_counter()
+                if wait > 0:
+                    time.sleep(wait)
+                elif wait < -0.05:
+                    late += 1
+                pool.submit(task, index)
+        if late:
+            logger.warning(f"⚠️  예정보다 50ms 이상 늦게 보낸 호출 {late}개 (재실행 속도를 낮추거나 --concurrency 증가)")
+        return results
+
+def diff(queries: Dict[str, str], base: List[Dict[str, Any]], new: List[Dict[str, Any]],
+         threshold: float = DEFAULT_THRESHOLD, min_delta_ms: float = DEFAULT_MIN_DELTA_MS) -> Dict[str, Any]:
+    """기록(base)과 재실행/다른 기록(new)의 시간 분포와 다이제스트 비교 (같은 순서의 호출 쌍)"""
+    total_base, total_new = LatencyHistogram(), LatencyHistogram()
+    groups: Dict[str, Dict[str, Any]] = {}
+    mismatches = []
+    changed = 0
+    for before, after in zip(base, new):
+        group = groups.setdefault(before['q'], {'base': LatencyHistogram(), 'new': LatencyHistogram(),
+                                                'mismatches': 0, 'rows_base': 0, 'rows_new': 0})
+        group['base'].record(before['ms'])
+        group['new'].record(after['ms'])
+        group['rows_base'] += before['rows']
+        group['rows_new'] += after['rows']
+        total_base.record(before['ms'])
+        total_new.record(after['ms'])
+        if after.get('changed'):
+            changed += 1
+        elif before.get('digest') != after.get('digest'):
+            group['mismatches'] += 1
+            if len(mismatches) < 20:
+                mismatches.append({'q': before['q'], 'question': before.get('question'),
+                                   'rows': [before['rows'], after['rows']], 'error': after.get('error')})
+    
+    rows = []
+    regressions = []
+    for qid, group in groups.items():
+        base_p95, new_p95 = group['base'].percentile(95), group['new'].percentile(95)
+        row = {
+            'q': qid,
+            'calls': group['base'].total,
+            'base_p50_ms': group['base'].percentile(50), 'new_p50_ms': group['new'].percentile(50),
+            'base_p95_ms': base_p95, 'new_p95_ms': new_p95,
+            'ratio_p95': new_p95 / base_p95 if base_p95 else 0.0,
+            'rows_base': group['rows_base'], 'rows_new': group['rows_new'],
+            'mismatches': group['mismatches'],
+            'cypher': ' '.join(queries.get(qid, '').split())[:80],
+        }
+        if base_p95 and new_p95 > base_p95 * (1 + threshold) and new_p95 - base_p95 >= min_delta_ms:
+            regressions.append(qid)
+        rows.append(row)
+    rows.sort(key=lambda row: -row['base_p95_ms'] * row['calls'])
+    
+    return {
+        'calls': len(base),
+        'matched': sum(1 for before, after in zip(base, new)
+                       if not after.get('changed') and before.get('digest') == after.get('digest')),
+        'mismatched': sum(row['mismatches'] for row in rows),
+        'changed_queries': changed,
+        'total': {
+            'base_p50_ms': total_base.percentile(50), 'new_p50_ms': total_new.percentile(50),
+            'base_p95_ms': total_base.percentile(95), 'new_p95_ms': total_new.percentile(95),
+            'base_p99_ms': total_base.percentile(99), 'new_p99_ms': total_new.percentile(99),
+            'base_sum_ms': total_base.sum, 'new_sum_ms': total_new.sum,
+        },
+        'queries': rows,
+        'regressions': regressions,
+        'mismatch_examples': mismatches,
+    }
+
+def print_report(report: Dict[str, Any], top: int = 15):
+    total = report['total']
+    print(f"\n📼 호출 {report['calls']}건: 결과 일치 {report['matched']}, 불일치 {report['mismatched']}, "
+          f"Cypher 변경 {report['changed_queries']}")
+    print(f"   전체 p50 {total['base_p50_ms']:.2f} → {total['new_p50_ms']:.2f}ms, "
+          f"p95 {total['base_p95_ms']:.2f} → {total['new_p95_ms']:.2f}ms, "
+          f"p99 {total['base_p99_ms']:.2f} → {total['new_p99_ms']:.2f}ms, "
+          f"합계 {total['base_sum_ms']:.0f} → {total['new_sum_ms']:.0f}ms")
+    print(f"\n{'질의':<14}{'호출':>6}{'p50 기록':>10}{'p50 재실행':>11}{'p95 기록':>10}{'p95 재실행':>11}{'배율':>7}{'불일치':>7}  Cypher")
+    for row in report['queries'][:top]:
+        flag = '🔴' if row['q'] in report['regressions'] else '  '
+        print(f"{flag}{row['q']:<12}{row['calls']:>6}{row['base_p50_ms']:>10.2f}{row['new_p50_ms']:>11.2f}"
+              f"{row['base_p95_ms']:>10.2f}{row['new_p95_ms']:>11.2f}{row['ratio_p95']:>7.2f}"
+              f"{row['mismatches']:>7}  {row['cypher']}")
+    for example in report['mismatch_examples'][:5]:
+        print(f"  ⚠️  결과 불일치 {example['q']} ({example['question']}): "
+              f"{example['rows'][0]}행 → {example['rows'][1]}행{' - ' + example['error'] if example['error'] else ''}")
+
+def _match_logs(base: List[Dict[str, Any]], new: List[Dict[str, Any]]) -> Tuple[List, List]:
+    """두 기록의 호출을 (질의, 질문, 파라미터) 기준으로 순서대로 짝짓기"""
+    def key(call):
+        return call['q'], normalize_question(call.get('question')), json.dumps(call.get('params'), sort_keys=True)
+    
+    pending: Dict[Tuple, List[Dict[str, Any]]] = {}
+    for call in new:
+        pending.setdefault(key(call), []).append(call)
+    pairs_base, pairs_new = [], []
+    for call in base:
+        candidates = pending.get(key(call))
+        if candidates:
+            pairs_base.append(call)
+            pairs_new.append(candidates.pop(0))
+    return pairs_base, pairs_new
+
+def build_engine(uri: str, username: str):
+    """재실행 대상 엔진 (memory:// 는 인메모리 그래프, fake 는 코퍼스 가짜 그래프)"""
+    from advanced_knowledge_engine import AdvancedKnowledgeEngine
+    from memory_graph import open_driver
+    
+    if uri == 'fake':
+        from api_load_test import FakeGraphDriver
+        from query_pipeline_bench import load_corpus
+        driver = FakeGraphDriver(load_corpus())
+    else:
+        driver = open_driver(uri, auth=(username, os.getenv('NEO4J_PASSWORD')))
+    engine = AdvancedKnowledgeEngine(driver=driver)
+    # 재실행 자체가 원본 기록에 섞이지 않도록
+    engine.recorder = None
+    return engine
+
+def main():
+    """기록 재실행 / 비교"""
+    parser = argparse.ArgumentParser(description="질의 기록 재실행 및 비교")
+    parser.add_argument("log", help="기준 기록 (QUERY_RECORD_FILE)")
+    parser.add_argument("--compare", help="재실행 대신 이 기록과 비교 (같은 흐름을 다른 환경에서 기록한 파일)")
+    parser.add_argument("--uri", default=os.getenv('NEO4J_URI', "neo4j+s://3e875bd7.databases.neo4j.io"),
+                        help="재실행 백엔드 (neo4j URI, memory://이름, memory:///파일.pickle, fake)")
+    parser.add_argument("--username", default=os.getenv('NEO4J_USERNAME', "neo4j"))
+    parser.add_argument("--mode", choices=['cypher', 'question'], default='cypher')
+    parser.add_argument("--speed", type=float, default=1.0, help="재실행 속도 배율 (0 = 간격 없이)")
+    parser.add_argument("--concurrency", type=int, default=8, help="간격 재실행 시 최대 동시 실행 수")
+    parser.add_argument("--limit", type=int, help="앞에서부터 이 개수만 재실행")
+    parser.add_argument("--record-to", help="재실행 결과를 기록 형식으로 저장 (이후 --compare에 사용)")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD, help="p95 회귀 판정 비율")
+    parser.add_argument("--min-delta-ms", type=float, default=DEFAULT_MIN_DELTA_MS,
+                        help="이 시간(ms) 미만의 p95 증가는 회귀로 보지 않음")
+    parser.add_argument("--check", action="store_true", help="회귀 또는 결과 불일치가 있으면 실패 종료")
+    parser.add_argument("--top", type=int, default=15, help="출력할 질의 수")
+    parser.add_argument("--json", action="store_true", help="결과를 JSON으로 출력")
+    parser.add_argument("--verbose", action="store_true", help="엔진 로그 출력")
+    args = parser.parse_args()
+    
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    if not args.verbose:
+        for name in ('advanced_knowledge_engine', 'graph_statistics', 'memory_graph'):
+            logging.getLogger(name).setLevel(logging.WARNING)
+    
+    queries, calls = read_log(args.log)
+    if args.limit:
+        calls = calls[:args.limit]
+    if not calls:
+        logger.error(f"❌ 기록된 호출이 없습니다: {args.log}")
+        return False
+    
+    if args.compare:
+        other_queries, other_calls = read_log(args.compare)
+        queries = {**other_queries, **queries}
+        base, new = _match_logs(calls, other_calls)
+        logger.info(f"🔍 기록 비교: {len(base)}/{len(calls)}건 짝지음")
+    else:
+        engine = build_engine(args.uri, args.username)
+        if args.record_to:
+            engine.recorder = QueryRecorder(args.record_to)
+        logger.info(f"▶️  재실행: {len(calls)}건, 모드 {args.mode}, 속도 "
+                    f"{'최대' if args.speed <= 0 else f'{args.speed:g}배'}, 대상 {args.uri}")
+        try:
+            base = calls
+            new = Replayer(engine, queries, args.mode).run(calls, speed=args.speed, concurrency=args.concurrency)
+        finally:
+            if engine.recorder:
+                engine.recorder.close()
+            if engine.driver:
+                engine.driver.close()
+    
+    report = diff(queries, base, new, threshold=args.threshold, min_delta_ms=args.min_delta_ms)
+    if args.json:
+        print(json.dumps(report, ensure_ascii=False, indent=2))
+    else:
+        print_report(report, top=args.top)
+    
+    failed = bool(report['regressions']) or bool(report['mismatched'])
+    if args.check and failed:
+        logger.error(f"❌ 회귀 {len(report['regressions'])}종, 결과 불일치 {report['mismatched']}건")
+        return False
+    return True
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""
+프로세스 시작 시간 프로파일 (import 시간 + API 서버 준비 시간)
+짧게 실행되는 CLI/서버리스 진입점이 시작 예산을 넘지 않는지 확인
+
+측정 항목:
+- 모듈별 import 시간: 새 인터프리터에서 `python -X importtime -c "import 모듈"` 실행,
+  인터프리터 기본 import(site 등)를 뺀 누적 시간과 최상위 패키지별 자체 시간 합계
+- --serve : knowledge_api.py를 DEFERRED_CONNECT=true로 띄워
+  첫 /api/v1/health 응답까지(listen) / 지식 엔진 connected까지(ready) 걸린 시간
+
+반복(--repeat) 중 가장 빠른 실행을 보고하며 --budget-ms를 넘는 모듈이 있으면 종료 코드 1
+
+사용 예:
+    python benchmarks/startup_profile.py                                  # 기본 진입점 모듈
+    python benchmarks/startup_profile.py knowledge_api --top 20 --budget-ms 400
+    python benchmarks/startup_profile.py --serve                          # 인메모리 그래프로 서버 준비 시간
+"""
+
+import os
+import re
+import sys
+import json
+import time
+import socket
+import argparse
+import logging
+import subprocess
+import urllib.request
+from typing import Dict, List, Any, Optional, Tuple
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_DIR = os.path.abspath(os.path.join(BENCH_DIR, '..'))
+
+logger = logging.getLogger(__name__)
+
+# 기본 측정 대상 (API 서버, 지식 엔진, 질의 기록 CLI, 통계 CLI)
+DEFAULT_MODULES = ['knowledge_api', 'advanced_knowledge_engine', 'query_recorder', 'graph_statistics']
+
+_LINE = re.compile(r'^import time:\s+(\d+) \|\s+(\d+) \| (\s*)(\S+)$')
+
+def child_env(extra: Optional[Dict[str, str]] = None) -> Dict[str, str]:
+    """저장소 루트와 파이프라인 디렉터리를 PYTHONPATH 앞에 둔 환경"""
+    env = dict(os.environ)
+    paths = [REPO_DIR, os.path.join(REPO_DIR, 'poc', 'ai_pipeline')]
+    if env.get('PYTHONPATH'):
+        paths.append(env['PYTHONPATH'])
+    env['PYTHONPATH'] = os.pathsep.join(paths)
+    env.setdefault('NEO4J_URI', 'memory://startup-profile')
+    env.update(extra or {})
+    return env
+
+def parse_importtime(stderr: str) -> List[Tuple[str, int, int, int]]:
+    """-X importtime 출력 → [(모듈, 자체 us, 누적 us, 깊이)] (완료 순서)"""
+    entries = []
+    for line in stderr.splitlines():
+        match = _LINE.match(line)
+        if match:
+            entries.append((match.group(4), int(match.group(1)), int(match.group(2)), len(match.group(3))))
+    return entries
+
+def run_importtime(statement: str) -> Tuple[List[Tuple[str, int, int, int]], float]:
+    """새 인터프리터에서 statement 실행 → (import 기록, 프로세스 전체 시간 ms)"""
+    started = time.perf_counter()
+    completed = subprocess.run([sys.executable, '-X', 'importtime', '-c', statement], cwd=REPO_DIR,
+                               env=child_env(), capture_output=True, text=True)
+    wall_ms = (time.perf_counter() - started) * 1000
+    if completed.returncode != 0:
+        error = completed.stderr.strip().splitlines()[-1] if completed.stderr.strip() else 'unknown error'
+        raise RuntimeError(f"{statement!r} 실패: {error}")
+    return parse_importtime(completed.stderr), wall_ms
+
+def profile_module(module: str, baseline: set, repeat: int) -> Dict[str, Any]:
+    """모듈 하나의 import 비용 (repeat번 중 가장 빠른 실행)"""
+    best = None
+    for _ in range(repeat):
+        entries, wall_ms = run_importtime(f"import {module}")
+        # 인터프리터가 원래 import하는 모듈은 제외하고, 최상위(가장 얕은) 항목의 누적 시간만 합산
+        own = [entry for entry in entries if entry[0] not in baseline]
+        top_depth = min((entry[3] for entry in own), default=0)
+        total_us = sum(cumulative for _, _, cumulative, depth in own if depth == top_depth)
+        if best is None or total_us < best['import_us']:
+            best = {'import_us': total_us, 'wall_ms': wall_ms, 'entries': own}
+    
+    packages: Dict[str, int] = {}
+    for name, self_us, _, _ in best['entries']:
+        root = name.split('.')[0]
+        packages[root] = packages.get(root, 0) + self_us
+    return {
+        'module': module,
+        'import_ms': best['import_us'] / 1000,
+        'wall_ms': best['wall_ms'],
+        'modules_loaded': len(best['entries']),
+        'packages': sorted(((name, us / 1000) for name, us in packages.items()), key=lambda item: -item[1]),
+    }
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+def profile_serve(timeout: float = 60.0) -> Dict[str, Any]:
+    """API 서버 시작 → 첫 health 응답(listen) / 엔진 connected(ready)까지 시간"""
+    port = free_port()
+    url = f"http://127.0.0.1:{port}/api/v1/health"
+    started = time.perf_counter()
+    process = subprocess.Popen([sys.executable, os.path.join(REPO_DIR, 'knowledge_api.py')], cwd=REPO_DIR,
+                               env=child_env({'PORT': str(port), 'DEFERRED_CONNECT': 'true'}),
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    listen_ms = ready_ms = None
+    try:
+        while time.perf_counter() - started < timeout and process.poll() is None:
+            try:
+                with urllib.request.urlopen(url, timeout=1) as response:
+                    body = json.loads(response.read())
+            except OSError:
+                time.sleep(0.01)
+                continue
+            elapsed = (time.perf_counter() - started) * 1000
+            if listen_ms is None:
+                listen_ms = elapsed
+            if body.get('components', {}).get('knowledge_engine') == 'connected':
+                ready_ms = elapsed
+                break
+            time.sleep(0.01)
+    finally:
+        process.terminate()
+        process.wait(timeout=10)
+    return {'listen_ms': listen_ms, 'ready_ms': ready_ms, 'exit_code': process.returncode}
+
+def print_report(results: List[Dict[str, Any]], baseline_ms: float, top: int, budget_ms: Optional[float]):
+    print(f"\n⏱️  import 시간 프로파일 (인터프리터 기본 시작 {baseline_ms:.0f}ms 제외)")
+    print(f"{'모듈':<30}{'import ms':>11}{'프로세스 ms':>12}{'모듈 수':>9}  예산")
+    for row in results:
+        verdict = ''
+        if budget_ms is not None:
+            verdict = '✅' if row['import_ms'] <= budget_ms else f"❌ (+{row['import_ms'] - budget_ms:.0f}ms)"
+        print(f"{row['module']:<30}{row['import_ms']:>11.1f}{row['wall_ms']:>12.1f}{row['modules_loaded']:>9}  {verdict}")
+    for row in results:
+        print(f"\n📦 {row['module']} - 패키지별 자체 import 시간 상위 {top}")
+        for name, millis in row['packages'][:top]:
+            share = millis / row['import_ms'] * 100 if row['import_ms'] else 0
+            print(f"  {name:<28}{millis:>9.1f}ms {share:>5.1f}%")
+
+def main():
+    """시작 시간 프로파일 실행"""
+    parser = argparse.ArgumentParser(description="import 시간 / API 서버 준비 시간 프로파일")
+    parser.add_argument("modules", nargs="*", default=DEFAULT_MODULES, help="측정할 모듈")
+    parser.add_argument("--repeat", type=int, default=3, help="모듈별 반복 횟수 (가장 빠른 실행 보고)")
+    parser.add_argument("--top", type=int, default=10, help="패키지 상위 N개")
+    parser.add_argument("--budget-ms", type=float, help="모듈별 import 시간 예산 (초과 시 종료 코드 1)")
+    parser.add_argument("--serve", action="store_true", help="API 서버 listen/ready 시간도 측정")
+    parser.add_argument("--json", action="store_true", help="결과를 JSON으로 출력")
+    args = parser.parse_args()
+    
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    
+    try:
+        baseline_entries, baseline_ms = run_importtime("pass")
+        baseline = {entry[0] for entry in baseline_entries}
+        results = [profile_module(module, baseline, max(1, args.repeat)) for module in args.modules]
+    except RuntimeError as e:
+        logger.error(f"❌ {e}")
+        return False
+    serve = profile_serve() if args.serve else None
+    
+    if args.json:
+        print(json.dumps({'interpreter_ms': baseline_ms, 'modules': results, 'serve': serve},
+                         ensure_ascii=False, indent=2))
+    else:
+        print_report(results, baseline_ms, args.top, args.budget_ms)
+        if serve:
+            listen = f"{serve['listen_ms']:.0f}ms" if serve['listen_ms'] is not None else "응답 없음"
+            ready = f"{serve['ready_ms']:.0f}ms" if serve['ready_ms'] is not None else "준비 안 됨"
+            print(f"\n🚀 API 서버 (DEFERRED_CONNECT=true): 첫 응답 {listen}, 지식 엔진 준비 {ready}")
+    
+    over_budget = args.budget_ms is not None and any(row['import_ms'] > args.budget_ms for row in results)
+    return not over_budget and (serve is None or serve['ready_ms'] is not None)
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
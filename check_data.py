@@ -4,6 +4,8 @@
 import os
 from neo4j import GraphDatabase
 
+from graph_statistics import get_snapshot
+
 instance_id = "3e875bd7"
 uri = f"neo4j+s://{instance_id}.databases.neo4j.io"
 username = "neo4j"
@@ -11,6 +13,12 @@ password = os.getenv('NEO4J_PASSWORD')
 
 driver = GraphDatabase.driver(uri, auth=(username, password))
 
+# 노드/관계 현황 (카운트 스토어 통계 - 전체 스캔 없음)
+snapshot = get_snapshot(driver)
+print(f'=== 그래프 현황: 노드 {snapshot.nodes}개, 관계 {snapshot.relationships}개 ===')
+print(f'Developer {snapshot.label_count("Developer")}개, Skill {snapshot.label_count("Skill")}개, '
+      f'HAS_SKILL {snapshot.relationship_count("HAS_SKILL")}개\n')
+
 with driver.session() as session:
     print('=== 개발자별 스킬 확인 ===')
     result = session.run('MATCH (dev:Developer)-[r:HAS_SKILL]->(skill:Skill) RETURN dev.name, skill.name, r.proficiency ORDER BY dev.name, r.proficiency DESC')
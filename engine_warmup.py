@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+"""
+지식 엔진 워밍업 (Engine Warmup)
+connect() 직후 첫 요청들이 치르는 콜드 비용을 미리 지불하여 배포 직후 p99를 낮춤
+
+워밍업 단계:
+- patterns : 질의 패턴 정규식 컴파일 (템플릿 변형 생성으로 Cypher 생성 경로도 함께 실행)
+- plans    : 엔진이 만들 수 있는 모든 템플릿 변형(패턴 × 엔티티 × 시간 조건)을 EXPLAIN → 서버 쿼리 계획 캐시
+- advisor  : (INDEX_ADVISOR_ON_CONNECT=true) plans 단계의 실행 계획을 재사용하여 인덱스 어드바이저 실행
+- stats    : 그래프 통계 캐시 적재 (COUNT 질의 응답용)
+- pool     : 드라이버 연결 풀을 최소 N개까지 동시에 열어 둠
+- prime    : (선택) 예시 질문을 실제로 처리하여 결과 캐시(RESULT_CACHE_TTL)까지 채움
+
+템플릿 EXPLAIN 실패는 보고만 하고 준비 상태를 막지 않습니다 (템플릿 자체 오류는 인덱스 어드바이저 보고서와 같음).
+
+사용 예:
+    python engine_warmup.py                        # 연결 후 워밍업 단계별 시간 출력
+    python engine_warmup.py --pool-floor 8 --prime "전체 개발자는 몇 명인가?" "프로젝트 상태는 어떠한가?"
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import logging
+import threading
+from typing import Dict, List, Any, Optional
+
+from advanced_knowledge_engine import (
+    QueryAnalysis, QueryType, QueryComplexity, LABEL_COUNT_QUERY,
+    DEVELOPER_ENTITY_PATTERNS, SKILL_KEYWORDS, index_advisor_on_connect
+)
+from graph_statistics import get_snapshot
+from memory_graph import is_memory_uri
+
+logger = logging.getLogger(__name__)
+
+# 엔진이 인식하는 시간 조건 (None = 시간 조건 없음)
+TIME_CONSTRAINTS = [None, 'recent', 'today', 'yesterday', 'this_week', 'last_week', 'this_month', 'last_month']
+
+# 기본으로 미리 열어 둘 연결 수
+DEFAULT_POOL_FLOOR = int(os.getenv('WARMUP_POOL_FLOOR', '4'))
+
+def entity_variants() -> List[List[str]]:
+    """템플릿 자리표시자를 채우는 엔티티 조합 (없음 + 개발자/스킬 각각 하나)"""
+    developers = list(dict.fromkeys(entity for _, entity in DEVELOPER_ENTITY_PATTERNS))
+    return [[]] + [[entity] for entity in developers + SKILL_KEYWORDS]
+
+class EngineWarmup:
+    """
+    연결된 AdvancedKnowledgeEngine 워밍업
+    
+    사용 예:
+        engine.connect()
+        report = EngineWarmup(engine).run(pool_floor=4, prime_questions=["전체 개발자는 몇 명인가?"])
+    """
+    
+    def __init__(self, engine):
+        self.engine = engine
+        self.driver = engine.driver
+        # plans 단계에서 세운 실행 계획 {쿼리: plan} (인덱스 어드바이저가 재사용)
+        self.plans: Dict[str, Any] = {}
+        self.plan_errors: Dict[str, str] = {}
+    
+    def template_variants(self) -> List[str]:
+        """엔진의 generate_cypher_query가 만들 수 있는 쿼리 본문 (중복 제거)"""
+        analyses = []
+        for name, info in self.engine.query_patterns.items():
+            for entities in entity_variants():
+                for time_constraint in TIME_CONSTRAINTS:
+                    analyses.append(QueryAnalysis(
+                        original_query='', query_type=info['type'], complexity=info['complexity'],
+                        entities=entities, intent='', keywords=[], time_constraint=time_constraint,
+                        pattern_name=name
+                    ))
+        # 패턴에 걸리지 않은 질의의 유형별 기본 쿼리
+        for query_type in QueryType:
+            for time_constraint in TIME_CONSTRAINTS:
+                analyses.append(QueryAnalysis(
+                    original_query='', query_type=query_type, complexity=QueryComplexity.SIMPLE,
+                    entities=[], intent='', keywords=[], time_constraint=time_constraint
+                ))
+        
+        previous = logging.getLogger('advanced_knowledge_engine').level
+        logging.getLogger('advanced_knowledge_engine').setLevel(logging.WARNING)
+        try:
+            queries = [self.engine.generate_cypher_query(analysis) for analysis in analyses]
+        finally:
+            logging.getLogger('advanced_knowledge_engine').setLevel(previous)
+        return [query for query in dict.fromkeys(queries) if query.strip() != LABEL_COUNT_QUERY.strip()]
+    
+    def warm_patterns(self) -> Dict[str, Any]:
+        compiled = self.engine.compile_patterns()
+        return {'patterns': len(compiled)}
+    
+    def warm_plans(self) -> Dict[str, Any]:
+        """모든 템플릿 변형을 EXPLAIN (실행 없이 계획만 세워 서버 쿼리 캐시에 올림)"""
+        queries = self.template_variants()
+        errors = []
+        with self.driver.session() as session:
+            for query in queries:
+                try:
+                    self.plans[query] = session.run(f"EXPLAIN {query}").consume().plan
+                except Exception as e:
+                    self.plan_errors[query] = str(e)[:200]
+                    errors.append({'query': ' '.join(query.split())[:120], 'error': str(e)[:200]})
+        return {'planned': len(queries) - len(errors), 'errors': errors}
+    
+    def warm_advisor(self) -> Dict[str, Any]:
+        """plans 단계의 실행 계획으로 인덱스 어드바이저 실행 (템플릿을 다시 EXPLAIN 하지 않음)"""
+        report = self.engine._run_index_advisor(plans=self.plans, plan_errors=self.plan_errors)
+        if report is None:
+            return {'analyzed': False}
+        return {'analyzed': True, 'explained': report['explained'],
+                'recommendations': len(report['recommendations'])}
+    
+    def warm_stats(self) -> Dict[str, Any]:
+        snapshot = get_snapshot(self.driver, refresh=True)
+        return {'labels': len(snapshot.label_rows())}
+    
+    def warm_pool(self, floor: int) -> Dict[str, Any]:
+        """트랜잭션 floor개를 동시에 열어 연결 풀에 연결을 만들어 둠 (자동 커밋 세션은 연결을 바로 반납)"""
+        if floor <= 0 or is_memory_uri(getattr(self.engine, 'uri', '') or ''):
+            # 인메모리 그래프는 연결 풀이 없고 트랜잭션이 직렬화됨
+            return {'connections': 0}
+        barrier = threading.Barrier(floor)
+        failures = []
+        
+        def hold():
+            try:
+                with self.driver.session() as session, session.begin_transaction() as tx:
+                    tx.run("RETURN 1 AS warm").consume()
+                    barrier.wait(timeout=10)
+            except Exception as e:
+                failures.append(str(e))
+                barrier.abort()
+        
+        threads = [threading.Thread(target=hold, name=f"warmup-pool-{index}") for index in range(floor)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return {'connections': floor - len(failures), 'errors': failures[:3]}
+    
+    def prime(self, questions: List[str]) -> Dict[str, Any]:
+        """예시 질문을 실제로 처리 (결과 캐시가 켜져 있으면 캐시에 남음)"""
+        answered = sum(1 for question in questions if self.engine.process_natural_query(question).get('success'))
+        cached = len(self.engine.result_cache) if self.engine.result_cache is not None else None
+        return {'questions': len(questions), 'answered': answered, 'cached_results': cached}
+    
+    def run(self, pool_floor: int = DEFAULT_POOL_FLOOR,
+            prime_questions: Optional[List[str]] = None,
+            index_advisor: Optional[bool] = None) -> Dict[str, Any]:
+        """
+        전체 워밍업 실행
+        
+        index_advisor가 None이면 INDEX_ADVISOR_ON_CONNECT를 따름
+        (엔진은 connect(index_advisor=False)로 연결해야 템플릿을 두 번 EXPLAIN 하지 않음)
+        
+        Returns:
+            {'ready': bool, 'seconds': float, 'phases': {단계: {..., 'ms': 소요 시간}}}
+            ready는 연결 풀/통계 단계가 성공했는지 (템플릿 EXPLAIN 오류는 보고만)
+        """
+        logger.info("🔥 지식 엔진 워밍업 시작")
+        started = time.perf_counter()
+        if index_advisor is None:
+            index_advisor = index_advisor_on_connect()
+        phases = [
+            ('patterns', self.warm_patterns),
+            ('plans', self.warm_plans),
+        ]
+        if index_advisor:
+            phases.append(('advisor', self.warm_advisor))
+        phases += [
+            ('stats', self.warm_stats),
+            ('pool', lambda: self.warm_pool(pool_floor)),
+        ]
+        if prime_questions:
+            phases.append(('prime', lambda: self.prime(prime_questions)))
+        
+        report: Dict[str, Any] = {'phases': {}}
+        ready = True
+        for name, phase in phases:
+            phase_started = time.perf_counter()
+            try:
+                result = phase()
+            except Exception as e:
+                result = {'error': str(e)}
+                ready = False
+                logger.warning(f"  ⚠️  워밍업 단계 실패 [{name}]: {e}")
+            result['ms'] = round((time.perf_counter() - phase_started) * 1000, 1)
+            report['phases'][name] = result
+            if name == 'pool' and result.get('errors'):
+                ready = False
+        
+        report['ready'] = ready
+        report['seconds'] = round(time.perf_counter() - started, 3)
+        log_report(report)
+        return report
+
+def log_report(report: Dict[str, Any]):
+    """워밍업 결과 요약 로그"""
+    phases = report['phases']
+    # 같은 템플릿 오류가 엔티티/시간 조건 변형마다 반복되므로 오류 메시지 앞부분 기준으로 묶어서 기록
+    grouped: Dict[str, List[Dict[str, str]]] = {}
+    for error in phases.get('plans', {}).get('errors', []):
+        grouped.setdefault(error['error'].split('(')[0].strip(), []).append(error)
+    for message, errors in grouped.items():
+        logger.warning(f"  ⚠️  EXPLAIN 실패 {len(errors)}개: {message} (예: {errors[0]['query']})")
+    summary = ", ".join(f"{name} {result['ms']:.0f}ms" for name, result in phases.items())
+    plans = phases.get('plans', {})
+    state = "✅ 준비 완료" if report['ready'] else "⚠️  일부 실패"
+    logger.info(f"🔥 워밍업 {state}: {report['seconds']:.2f}초 ({summary}), "
+                f"계획 {plans.get('planned', 0)}개 / 오류 {len(plans.get('errors', []))}개")
+
+def main():
+    """연결 후 워밍업 실행"""
+    from advanced_knowledge_engine import AdvancedKnowledgeEngine
+    
+    parser = argparse.ArgumentParser(description="지식 엔진 워밍업")
+    parser.add_argument("--pool-floor", type=int, default=DEFAULT_POOL_FLOOR, help="미리 열어 둘 연결 수")
+    parser.add_argument("--prime", nargs="+", metavar="QUESTION", help="미리 처리할 질문 (결과 캐시 채우기)")
+    parser.add_argument("--json", action="store_true", help="결과를 JSON으로 출력")
+    args = parser.parse_args()
+    
+    engine = AdvancedKnowledgeEngine()
+    try:
+        if not engine.connect(index_advisor=False):
+            return False
+        report = EngineWarmup(engine).run(pool_floor=args.pool_floor, prime_questions=args.prime)
+        if args.json:
+            print(json.dumps(report, ensure_ascii=False, indent=2))
+        return report['ready']
+    finally:
+        engine.close()
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -6,10 +6,22 @@ Phase 0 스키마 격차 해결 및 데이터 보완 스크립트
 
 import os
 import sys
+import argparse
 from datetime import datetime
 from neo4j import GraphDatabase
 import logging
 
+SEED_CONTENT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'poc', 'seed_content')
+sys.path.append(SEED_CONTENT_DIR)
+from seed_plan import SeedPlan
+from schema_migrations import SchemaMigrator
+from seed_manifest import load_manifest, compile_manifest
+from seed_sync import SeedSync
+from graph_statistics import get_snapshot, log_snapshot
+
+# 보완 데이터 매니페스트 (Skill, Concept, 관계)
+MANIFEST_FILE = os.path.join(SEED_CONTENT_DIR, 'manifests', 'schema_gap_fixes.json')
+
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
@@ -47,30 +59,61 @@ class SchemaGapFixer:
             self.driver.close()
             logger.info("🔌 연결 종료")
     
+    def _execute_steps(self, steps, description, max_workers=8):
+        """Seed 단계 목록을 의존성 레벨별로 병렬 실행"""
+        try:
+            result = SeedPlan(steps).execute(self.driver, max_workers=max_workers)
+            if not result['success']:
+                logger.error(f"❌ {description} 실패: {result['failed']}개 단계 실패")
+                return False
+            
+            logger.info(f"✅ {description} 완료 ({result['steps']}개 단계, "
+                        f"{result['levels']}개 레벨, {result['elapsed']:.2f}초)")
+            return True
+            
+        except Exception as e:
+            logger.error(f"❌ {description} 실패: {e}")
+            return False
+    
+    def manifest_steps(self, labels=None, relationship_types=None):
+        """
+        보완 데이터 매니페스트(schema_gap_fixes.json)를 UNWIND 단계로 컴파일
+        
+        labels / relationship_types를 주면 해당 섹션만 컴파일합니다.
+        """
+        manifest = load_manifest(MANIFEST_FILE)
+        if labels is not None or relationship_types is not None:
+            manifest = {
+                "nodes": [spec for spec in manifest.get("nodes", []) if spec["label"] in (labels or [])],
+                "relationships": [spec for spec in manifest.get("relationships", [])
+                                  if spec["type"] in (relationship_types or [])],
+            }
+        return compile_manifest(manifest)
+    
+    def skill_steps(self):
+        """누락된 Skill 노드 및 HAS_SKILL 관계"""
+        return self.manifest_steps(labels=["Skill"], relationship_types=["HAS_SKILL"])
+    
+    def learning_steps(self):
+        """새 Concept 노드 및 LEARNED 관계"""
+        return self.manifest_steps(labels=["Concept"], relationship_types=["LEARNED"])
+    
+    def achievement_steps(self):
+        """Achievement → Project PART_OF 관계"""
+        return self.manifest_steps(relationship_types=["PART_OF"])
+    
+    def optimization_steps(self):
+        """개발자가 존재하지 않는 경우를 위한 개발자 노드 (pipeline_tester)"""
+        return self.manifest_steps(labels=["Developer"])
+    
     def fix_missing_schema_elements(self):
-        """누락된 스키마 요소들 추가"""
+        """누락된 스키마 요소들 추가 (대기 중인 스키마 마이그레이션 적용)"""
         logger.info("🔧 누락된 스키마 요소 추가 시작...")
         
         try:
-            with self.driver.session() as session:
-                # 1. 누락된 Skill 노드 제약조건 및 인덱스 추가
-                logger.info("📋 Skill 노드 제약조건 생성...")
-                session.run("CREATE CONSTRAINT skill_id_unique IF NOT EXISTS FOR (s:Skill) REQUIRE s.id IS UNIQUE")
-                session.run("CREATE INDEX skill_category_index IF NOT EXISTS FOR (s:Skill) ON (s.category)")
-                session.run("CREATE INDEX skill_name_index IF NOT EXISTS FOR (s:Skill) ON (s.name)")
-                
-                # 2. Session 노드 제약조건 추가 (누락되었던 것)
-                logger.info("📋 Session 노드 제약조건 생성...")
-                session.run("CREATE CONSTRAINT session_id_unique IF NOT EXISTS FOR (s:Session) REQUIRE s.id IS UNIQUE")
-                session.run("CREATE INDEX session_date_index IF NOT EXISTS FOR (s:Session) ON (s.startTime)")
-                
-                # 3. Achievement 노드 제약조건 추가
-                logger.info("📋 Achievement 노드 제약조건 생성...")
-                session.run("CREATE CONSTRAINT achievement_id_unique IF NOT EXISTS FOR (a:Achievement) REQUIRE a.id IS UNIQUE")
-                
-                logger.info("✅ 스키마 제약조건 추가 완료")
-                return True
-                
+            SchemaMigrator(self.driver).migrate()
+            return True
+            
         except Exception as e:
             logger.error(f"❌ 스키마 요소 추가 실패: {e}")
             return False
@@ -78,180 +121,49 @@ class SchemaGapFixer:
     def add_missing_skill_data(self):
         """누락된 Skill 데이터 추가"""
         logger.info("🎯 Skill 데이터 생성 시작...")
-        
-        try:
-            with self.driver.session() as session:
-                # Infrastructure Architect AI 스킬
-                infra_skills = [
-                    {"id": "terraform", "name": "Terraform", "category": "Infrastructure", "level": "Expert", "proficiency": 95},
-                    {"id": "gcp", "name": "Google Cloud Platform", "category": "Cloud", "level": "Expert", "proficiency": 90},
-                    {"id": "neo4j", "name": "Neo4j", "category": "Database", "level": "Advanced", "proficiency": 85},
-                    {"id": "secret_management", "name": "Secret Management", "category": "Security", "level": "Expert", "proficiency": 90}
-                ]
-                
-                # Code Architect AI 스킬
-                code_skills = [
-                    {"id": "python", "name": "Python", "category": "Programming", "level": "Expert", "proficiency": 95},
-                    {"id": "cypher", "name": "Cypher Query Language", "category": "Database", "level": "Advanced", "proficiency": 88},
-                    {"id": "knowledge_architecture", "name": "Knowledge Architecture", "category": "Design", "level": "Expert", "proficiency": 92},
-                    {"id": "ai_pipeline", "name": "AI Pipeline Development", "category": "AI/ML", "level": "Advanced", "proficiency": 87}
-                ]
-                
-                all_skills = infra_skills + code_skills
-                
-                # Skill 노드 생성
-                for skill in all_skills:
-                    session.run("""
-                        MERGE (s:Skill {id: $id})
-                        SET s.name = $name,
-                            s.category = $category,
-                            s.level = $level,
-                            s.proficiency = $proficiency,
-                            s.created = datetime(),
-                            s.last_updated = datetime()
-                    """, **skill)
-                    logger.info(f"  ✅ Skill 생성: {skill['name']} ({skill['level']})")
-                
-                # Infrastructure AI와 스킬 연결
-                for skill in infra_skills:
-                    session.run("""
-                        MATCH (dev:Developer {id: "infrastructure_architect_ai"}), (s:Skill {id: $skill_id})
-                        MERGE (dev)-[:HAS_SKILL {
-                            level: $level,
-                            proficiency: $proficiency,
-                            acquired_date: datetime("2025-08-05T00:00:00Z"),
-                            last_used: datetime()
-                        }]->(s)
-                    """, skill_id=skill['id'], level=skill['level'], proficiency=skill['proficiency'])
-                
-                # Code AI와 스킬 연결
-                for skill in code_skills:
-                    session.run("""
-                        MATCH (dev:Developer {id: "code_architect_ai"}), (s:Skill {id: $skill_id})
-                        MERGE (dev)-[:HAS_SKILL {
-                            level: $level,
-                            proficiency: $proficiency,
-                            acquired_date: datetime("2025-08-05T00:00:00Z"),
-                            last_used: datetime()
-                        }]->(s)
-                    """, skill_id=skill['id'], level=skill['level'], proficiency=skill['proficiency'])
-                
-                logger.info(f"✅ 총 {len(all_skills)}개 스킬 및 관계 생성 완료")
-                return True
-                
-        except Exception as e:
-            logger.error(f"❌ Skill 데이터 추가 실패: {e}")
-            return False
+        return self._execute_steps(self.skill_steps(), "Skill 및 관계 생성")
     
     def add_learning_relationships(self):
         """학습 관계 추가"""
         logger.info("📚 학습 관계 생성 시작...")
-        
-        try:
-            with self.driver.session() as session:
-                # Infrastructure AI가 학습한 개념들
-                infra_concepts = [
-                    {"concept_id": "t1-risk-verification", "mastery": 95, "time_spent": 40},
-                    {"concept_id": "gcp_standardization", "mastery": 90, "time_spent": 30}
-                ]
-                
-                # 새로운 개념들 추가
-                new_concepts = [
-                    {"id": "infrastructure_as_code", "name": "Infrastructure as Code", "category": "DevOps", "difficulty": "Advanced"},
-                    {"id": "cloud_security", "name": "Cloud Security", "category": "Security", "difficulty": "Expert"},
-                    {"id": "ai_collaboration", "name": "AI Agent Collaboration", "category": "AI", "difficulty": "Advanced"}
-                ]
-                
-                # 새 개념 노드 생성
-                for concept in new_concepts:
-                    session.run("""
-                        MERGE (c:Concept {id: $id})
-                        SET c.name = $name,
-                            c.category = $category,
-                            c.difficulty = $difficulty,
-                            c.created = datetime()
-                    """, **concept)
-                    logger.info(f"  ✅ 개념 생성: {concept['name']}")
-                
-                # Infrastructure AI 학습 관계
-                session.run("""
-                    MATCH (dev:Developer {id: "infrastructure_architect_ai"}), (c:Concept {id: "infrastructure_as_code"})
-                    MERGE (dev)-[:LEARNED {
-                        learned_date: datetime("2025-08-05T00:00:00Z"),
-                        mastery_level: 95,
-                        time_spent: 50
-                    }]->(c)
-                """)
-                
-                session.run("""
-                    MATCH (dev:Developer {id: "infrastructure_architect_ai"}), (c:Concept {id: "cloud_security"})
-                    MERGE (dev)-[:LEARNED {
-                        learned_date: datetime("2025-08-05T00:00:00Z"),
-                        mastery_level: 90,
-                        time_spent: 35
-                    }]->(c)
-                """)
-                
-                # Code AI 학습 관계
-                session.run("""
-                    MATCH (dev:Developer {id: "code_architect_ai"}), (c:Concept {id: "ai_collaboration"})
-                    MERGE (dev)-[:LEARNED {
-                        learned_date: datetime("2025-08-05T00:00:00Z"),
-                        mastery_level: 88,
-                        time_spent: 45
-                    }]->(c)
-                """)
-                
-                logger.info("✅ 학습 관계 생성 완료")
-                return True
-                
-        except Exception as e:
-            logger.error(f"❌ 학습 관계 추가 실패: {e}")
-            return False
+        return self._execute_steps(self.learning_steps(), "학습 관계 생성")
     
     def fix_achievement_relationships(self):
         """Achievement와 Project 관계 수정"""
         logger.info("🏆 Achievement-Project 관계 수정...")
-        
-        try:
-            with self.driver.session() as session:
-                # PART_OF 관계 추가
-                session.run("""
-                    MATCH (achievement:Achievement {id: "t1_risk_verification"}), (project:Project {id: "mindlog_v4"})
-                    MERGE (achievement)-[:PART_OF {
-                        importance: "Critical",
-                        contribution: "T1 리스크 완전 해결",
-                        completion_date: datetime("2025-08-05T00:00:00Z")
-                    }]->(project)
-                """)
-                
-                logger.info("✅ Achievement-Project 관계 수정 완료")
-                return True
-                
-        except Exception as e:
-            logger.error(f"❌ Achievement 관계 수정 실패: {e}")
-            return False
+        return self._execute_steps(self.achievement_steps(), "Achievement-Project 관계 수정")
     
     def optimize_queries(self):
         """성능 최적화를 위한 쿼리 개선"""
         logger.info("⚡ 쿼리 성능 최적화...")
+        return self._execute_steps(self.optimization_steps(), "쿼리 최적화")
+    
+    def apply_all_fixes(self, max_workers=8):
+        """
+        모든 보완 단계를 하나의 의존성 그래프로 실행
+        (스키마 마이그레이션 후 노드 → 관계, 각 레벨은 병렬)
+        """
+        if not self.fix_missing_schema_elements():
+            return False
         
+        logger.info("🔧 스키마 격차 보완 단계 병렬 실행 시작...")
+        return self._execute_steps(self.manifest_steps(), "스키마 격차 보완", max_workers=max_workers)
+    
+    def sync_all_fixes(self, dry_run=False, max_workers=8):
+        """
+        변경분만 반영하는 보완 (대기 중인 마이그레이션 + 매니페스트와 달라진 노드/관계만 기록)
+        
+        dry_run=True면 대기 중인 마이그레이션과 동기화 계획만 출력합니다.
+        """
         try:
-            with self.driver.session() as session:
-                # 1. 개발자가 존재하지 않는 경우를 위한 개발자 노드 생성
-                session.run("""
-                    MERGE (dev:Developer {id: "pipeline_tester"})
-                    SET dev.name = "Pipeline Tester",
-                        dev.role = "Automated Testing Agent",
-                        dev.created = datetime(),
-                        dev.status = "active"
-                """)
-                
-                logger.info("✅ 쿼리 최적화 완료")
-                return True
-                
+            SchemaMigrator(self.driver).migrate(dry_run=dry_run)
+            logger.info(f"🔄 스키마 격차 보완 동기화{' (dry-run)' if dry_run else ''}...")
+            result = SeedSync(self.driver).sync(load_manifest(MANIFEST_FILE), dry_run=dry_run,
+                                                max_workers=max_workers)
+            return result['success']
+            
         except Exception as e:
-            logger.error(f"❌ 쿼리 최적화 실패: {e}")
+            logger.error(f"❌ 스키마 격차 보완 동기화 실패: {e}")
             return False
     
     def verify_fixes(self):
@@ -259,48 +171,17 @@ class SchemaGapFixer:
         logger.info("🔍 수정사항 검증 시작...")
         
         try:
-            with self.driver.session() as session:
-                # 1. 노드 수 확인
-                result = session.run("MATCH (n) RETURN labels(n)[0] as type, count(n) as count ORDER BY count DESC")
-                logger.info("📊 노드 타입별 현황:")
-                total_nodes = 0
-                for record in result:
-                    count = record['count']
-                    total_nodes += count
-                    logger.info(f"  {record['type']}: {count}개")
-                
-                logger.info(f"총 노드: {total_nodes}개")
-                
-                # 2. 관계 수 확인
-                result = session.run("MATCH ()-[r]->() RETURN type(r) as rel_type, count(r) as count ORDER BY count DESC")
-                logger.info("🔗 관계 타입별 현황:")
-                total_rels = 0
-                for record in result:
-                    count = record['count']
-                    total_rels += count
-                    logger.info(f"  {record['rel_type']}: {count}개")
-                
-                logger.info(f"총 관계: {total_rels}개")
-                
-                # 3. 핵심 관계 검증
-                logger.info("🎯 핵심 관계 검증:")
-                
-                # HAS_SKILL 관계 확인
-                result = session.run("MATCH ()-[r:HAS_SKILL]->() RETURN count(r) as count")
-                has_skill_count = result.single()['count']
-                logger.info(f"  HAS_SKILL 관계: {has_skill_count}개 {'✅' if has_skill_count > 0 else '❌'}")
-                
-                # LEARNED 관계 확인
-                result = session.run("MATCH ()-[r:LEARNED]->() RETURN count(r) as count")
-                learned_count = result.single()['count']
-                logger.info(f"  LEARNED 관계: {learned_count}개 {'✅' if learned_count > 0 else '❌'}")
-                
-                # PART_OF 관계 확인
-                result = session.run("MATCH ()-[r:PART_OF]->() RETURN count(r) as count")
-                part_of_count = result.single()['count']
-                logger.info(f"  PART_OF 관계: {part_of_count}개 {'✅' if part_of_count > 0 else '❌'}")
-                
-                return True
+            # 카운트 스토어 통계 한 번으로 노드/관계 현황과 핵심 관계 확인 (전체 스캔 없음)
+            snapshot = get_snapshot(self.driver, refresh=True)
+            log_snapshot(snapshot)
+            
+            # 핵심 관계 검증
+            logger.info("🎯 핵심 관계 검증:")
+            for rel_type in ("HAS_SKILL", "LEARNED", "PART_OF"):
+                count = snapshot.relationship_count(rel_type)
+                logger.info(f"  {rel_type} 관계: {count}개 {'✅' if count > 0 else '❌'}")
+            
+            return True
                 
         except Exception as e:
             logger.error(f"❌ 검증 실패: {e}")
@@ -308,6 +189,11 @@ class SchemaGapFixer:
 
 def main():
     """메인 실행 함수"""
+    parser = argparse.ArgumentParser(description="Phase 0 스키마 격차 해결")
+    parser.add_argument("--full", action="store_true", help="변경 여부와 관계없이 모든 MERGE 재실행")
+    parser.add_argument("--dry-run", action="store_true", help="동기화 계획만 출력")
+    args = parser.parse_args()
+    
     logger.info("🚀 Phase 0 스키마 격차 해결 시작")
     logger.info("=" * 60)
     
@@ -318,25 +204,15 @@ def main():
         if not fixer.connect():
             return False
         
-        # 2. 누락된 스키마 요소 추가
-        if not fixer.fix_missing_schema_elements():
-            return False
-        
-        # 3. Skill 데이터 추가
-        if not fixer.add_missing_skill_data():
-            return False
-        
-        # 4. 학습 관계 추가
-        if not fixer.add_learning_relationships():
-            return False
-        
-        # 5. Achievement 관계 수정
-        if not fixer.fix_achievement_relationships():
-            return False
-        
-        # 6. 쿼리 최적화
-        if not fixer.optimize_queries():
+        # 2~6. 스키마 요소, Skill, 학습 관계, Achievement 관계, 쿼리 최적화 (기본: 변경분만 동기화)
+        if args.full:
+            fixed = fixer.apply_all_fixes()
+        else:
+            fixed = fixer.sync_all_fixes(dry_run=args.dry_run)
+        if not fixed:
             return False
+        if args.dry_run:
+            return True
         
         # 7. 검증
         if not fixer.verify_fixes():
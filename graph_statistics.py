@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+"""
+그래프 통계 (Graph Statistics)
+라벨별 노드 수 / 관계 타입별 관계 수를 전체 스캔 없이 데이터베이스 카운트 스토어에서 조회
+
+주요 기능:
+- apoc.meta.stats() 한 번 호출로 전체 통계 조회 (카운트 스토어 기반)
+- APOC이 없으면 라벨/관계 타입별 count() UNION 쿼리 하나로 대체 (역시 카운트 스토어 조회)
+- 짧은 TTL 캐시: 진단 스크립트와 COUNT 질의가 같은 드라이버로 반복 조회해도 한 번만 실행
+
+주의: 카운트 스토어는 라벨 단위로 세므로 여러 라벨을 가진 노드(Commit:Activity 등)는
+각 라벨에 모두 포함됩니다 (labels(n)[0] 기준 집계와 다름). 총 노드 수는 중복 없이 셉니다.
+"""
+
+import os
+import sys
+import time
+import json
+import argparse
+import logging
+import threading
+from dataclasses import dataclass, field
+from typing import Dict, List, Any, Optional
+
+logger = logging.getLogger(__name__)
+
+# 기본 캐시 유지 시간 (초)
+DEFAULT_TTL = float(os.getenv('GRAPH_STATS_TTL', '30'))
+
+# 라벨별 노드 수 (카운트 스토어) - 지식 엔진의 COUNT 폴백 쿼리
+LABEL_COUNT_QUERY = """
+                CALL apoc.meta.stats() YIELD labels
+                UNWIND keys(labels) AS type
+                RETURN type, labels[type] AS count
+                ORDER BY count DESC
+            """
+
+# 프로시저 미등록 오류 코드 (APOC 미설치 또는 허용 목록에 없음)
+PROCEDURE_NOT_FOUND = 'Neo.ClientError.Procedure.ProcedureNotFound'
+
+_APOC_STATS_QUERY = """
+    CALL apoc.meta.stats() YIELD nodeCount, relCount, labels, relTypesCount
+    RETURN nodeCount, relCount, labels, relTypesCount
+"""
+
+@dataclass
+class GraphSnapshot:
+    """한 시점의 그래프 통계"""
+    nodes: int
+    relationships: int
+    labels: Dict[str, int] = field(default_factory=dict)
+    relationship_types: Dict[str, int] = field(default_factory=dict)
+    source: str = 'apoc'
+    fetched_at: float = field(default_factory=time.time)
+    
+    def label_count(self, label: str) -> int:
+        return self.labels.get(label, 0)
+    
+    def relationship_count(self, rel_type: str) -> int:
+        return self.relationship_types.get(rel_type, 0)
+    
+    def label_rows(self, type_key: str = 'type', count_key: str = 'count') -> List[Dict[str, Any]]:
+        """[{type, count}] 노드 수 내림차순 (기존 labels(n)[0] 집계 쿼리 결과 형식)"""
+        return [{type_key: label, count_key: count}
+                for label, count in sorted(self.labels.items(), key=lambda item: -item[1])]
+    
+    def relationship_rows(self, type_key: str = 'rel_type', count_key: str = 'count') -> List[Dict[str, Any]]:
+        """[{rel_type, count}] 관계 수 내림차순"""
+        return [{type_key: rel_type, count_key: count}
+                for rel_type, count in sorted(self.relationship_types.items(), key=lambda item: -item[1])]
+
+class GraphStatistics:
+    """
+    카운트 스토어 기반 그래프 통계 (TTL 캐시)
+    
+    사용 예:
+        stats = GraphStatistics(driver).snapshot()
+        stats.label_count("Developer"), stats.relationship_count("HAS_SKILL")
+    """
+    
+    def __init__(self, driver, ttl: float = DEFAULT_TTL, database: Optional[str] = None):
+        self.driver = driver
+        self.ttl = ttl
+        self.database = database
+        self._snapshot: Optional[GraphSnapshot] = None
+        self._apoc = True
+        self._lock = threading.Lock()
+    
+    def snapshot(self, refresh: bool = False) -> GraphSnapshot:
+        """캐시된 통계 (TTL이 지났거나 refresh=True면 다시 조회)"""
+        with self._lock:
+            snapshot = self._snapshot
+            if refresh or snapshot is None or time.time() - snapshot.fetched_at > self.ttl:
+                snapshot = self._snapshot = self._fetch()
+            return snapshot
+    
+    def invalidate(self):
+        """캐시 무효화 (대량 쓰기 직후 등)"""
+        with self._lock:
+            self._snapshot = None
+    
+    def _session(self):
+        return self.driver.session(database=self.database) if self.database else self.driver.session()
+    
+    def _fetch(self) -> GraphSnapshot:
+        with self._session() as session:
+            if self._apoc:
+                try:
+                    record = session.run(_APOC_STATS_QUERY).single()
+                    return GraphSnapshot(
+                        nodes=record['nodeCount'],
+                        relationships=record['relCount'],
+                        labels=dict(record['labels']),
+                        relationship_types=dict(record['relTypesCount']),
+                        source='apoc'
+                    )
+                except Exception as e:
+                    if getattr(e, 'code', None) != PROCEDURE_NOT_FOUND:
+                        # 일시적 오류 (연결 끊김, 타임아웃 등) - 이번만 대체하고 다음 조회 때 APOC 다시 시도
+                        logger.warning(f"  ⚠️  apoc.meta.stats 실패, 이번 조회만 카운트 스토어 쿼리로 대체: {e}")
+                        return session.execute_read(self._count_store_snapshot)
+                    # APOC 미설치 환경 - 이후에는 바로 카운트 스토어 쿼리 사용
+                    logger.info(f"  ℹ️  apoc.meta.stats 사용 불가, 카운트 스토어 쿼리로 대체: {e}")
+                    self._apoc = False
+            return session.execute_read(self._count_store_snapshot)
+    
+    @staticmethod
+    def _count_store_snapshot(tx) -> GraphSnapshot:
+        """
+        라벨/관계 타입별 count()를 UNION 쿼리 하나로 조회
+        
+        단일 라벨/단일 관계 타입 count()는 플래너가 카운트 스토어 조회로 바꾸므로 스캔이 없습니다.
+        """
+        labels = [record['label'] for record in tx.run("CALL db.labels() YIELD label RETURN label")]
+        rel_types = [record['relationshipType'] for record in
+                     tx.run("CALL db.relationshipTypes() YIELD relationshipType RETURN relationshipType")]
+        
+        parts = [
+            "MATCH (n) RETURN 'total' AS kind, '' AS name, count(n) AS count",
+            "MATCH ()-[r]->() RETURN 'total_relationships' AS kind, '' AS name, count(r) AS count",
+        ]
+        parts += [f"MATCH (n:`{_escape(label)}`) RETURN 'label' AS kind, $labels[{index}] AS name, count(n) AS count"
+                  for index, label in enumerate(labels)]
+        parts += [f"MATCH ()-[r:`{_escape(rel_type)}`]->() RETURN 'type' AS kind, $types[{index}] AS name, "
+                  f"count(r) AS count" for index, rel_type in enumerate(rel_types)]
+        
+        snapshot = GraphSnapshot(nodes=0, relationships=0, source='count_store')
+        for record in tx.run("\nUNION ALL\n".join(parts), labels=labels, types=rel_types):
+            kind, name, count = record['kind'], record['name'], record['count']
+            if kind == 'total':
+                snapshot.nodes = count
+            elif kind == 'total_relationships':
+                snapshot.relationships = count
+            elif kind == 'label':
+                snapshot.labels[name] = count
+            else:
+                snapshot.relationship_types[name] = count
+        return snapshot
+
+# 드라이버별 공유 인스턴스 (여러 스크립트/엔진이 같은 캐시 사용)
+_shared: Dict[int, GraphStatistics] = {}
+_shared_lock = threading.Lock()
+
+def graph_statistics(driver, ttl: float = DEFAULT_TTL) -> GraphStatistics:
+    """드라이버에 연결된 공유 GraphStatistics"""
+    with _shared_lock:
+        stats = _shared.get(id(driver))
+        if stats is None or stats.driver is not driver:
+            stats = _shared[id(driver)] = GraphStatistics(driver, ttl=ttl)
+        return stats
+
+def get_snapshot(driver, refresh: bool = False) -> GraphSnapshot:
+    """공유 캐시에서 통계 조회"""
+    return graph_statistics(driver).snapshot(refresh=refresh)
+
+def log_snapshot(snapshot: GraphSnapshot, top: Optional[int] = None, log=None):
+    """노드/관계 타입별 현황 출력"""
+    log = log or logger.info
+    log(f"📊 노드 타입별 현황 ({snapshot.source}):")
+    for row in snapshot.label_rows()[:top]:
+        log(f"  {row['type']}: {row['count']}개")
+    log(f"총 노드: {snapshot.nodes}개")
+    log("🔗 관계 타입별 현황:")
+    for row in snapshot.relationship_rows()[:top]:
+        log(f"  {row['rel_type']}: {row['count']}개")
+    log(f"총 관계: {snapshot.relationships}개")
+
+def _escape(name: str) -> str:
+    return name.replace('`', '``')
+
+def main():
+    """그래프 통계 출력"""
+    from neo4j import GraphDatabase
+    
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    
+    parser = argparse.ArgumentParser(description="카운트 스토어 기반 그래프 통계")
+    parser.add_argument("--uri", default=os.getenv('NEO4J_URI', "neo4j+s://3e875bd7.databases.neo4j.io"))
+    parser.add_argument("--username", default=os.getenv('NEO4J_USERNAME', "neo4j"))
+    parser.add_argument("--json", action="store_true", help="JSON으로 출력")
+    args = parser.parse_args()
+    
+    password = os.getenv('NEO4J_PASSWORD')
+    if not password:
+        logger.error("❌ NEO4J_PASSWORD 환경변수가 설정되지 않았습니다.")
+        return False
+    
+    driver = GraphDatabase.driver(args.uri, auth=(args.username, password))
+    try:
+        snapshot = get_snapshot(driver)
+        if args.json:
+            print(json.dumps({
+                'nodes': snapshot.nodes,
+                'relationships': snapshot.relationships,
+                'labels': snapshot.labels,
+                'relationship_types': snapshot.relationship_types,
+                'source': snapshot.source,
+            }, ensure_ascii=False, indent=2))
+        else:
+            log_snapshot(snapshot)
+        return True
+    finally:
+        driver.close()
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,431 @@
+#!/usr/bin/env python3
+"""
+인덱스 어드바이저 (Index Advisor)
+질의 패턴 라이브러리의 모든 템플릿을 EXPLAIN으로 분석하여
+라벨/관계 스캔으로 처리되는 조건·정렬 속성을 찾고 필요한 인덱스를 추천
+
+주요 기능:
+- 템플릿별 WHERE / ORDER BY / 인라인 속성 조건 추출 (변수 → 라벨/관계 타입 매핑)
+- EXPLAIN 실행 계획에서 인덱스 사용 여부와 스캔 연산자 확인
+- RANGE / TEXT / 관계 속성 인덱스 추천 (기존 인덱스는 제외)
+- 추천 인덱스를 새 스키마 마이그레이션 파일로 적용 (--apply)
+- 패턴 지문(fingerprint)이 바뀌었을 때만 다시 분석 (run_if_changed)
+- 분석 결과는 지식 그래프가 아닌 로컬 파일(INDEX_ADVISOR_REPORT)에 저장
+"""
+
+import os
+import re
+import sys
+import json
+import hashlib
+import argparse
+import logging
+from datetime import datetime
+from typing import Dict, List, Any, Optional, Set, Tuple
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'poc', 'seed_content'))
+from schema_migrations import MIGRATIONS_DIR, SchemaMigrator, discover_migrations
+
+logger = logging.getLogger(__name__)
+
+# EXPLAIN 시 템플릿 자리표시자에 넣을 예시 값
+PLACEHOLDER_SAMPLES = {
+    'skill_name': 'Python',
+    'dev_id': 'code_architect_ai',
+}
+
+# 최근 분석 결과 파일 (패턴 지문 비교용)
+DEFAULT_REPORT_PATH = os.path.join(os.path.expanduser('~'), '.cache', 'mindlog', 'index_advisor_report.json')
+
+# 분석할 시간 조건 변형 (None = 시간 조건 없음)
+TIME_CONSTRAINT_VARIANTS = [None, 'recent']
+
+# 전체 스캔으로 간주하는 연산자
+SCAN_OPERATORS = {
+    'AllNodesScan',
+    'NodeByLabelScan',
+    'UnionNodeByLabelsScan',
+    'DirectedRelationshipTypeScan',
+    'UndirectedRelationshipTypeScan',
+    'DirectedAllRelationshipsScan',
+    'UndirectedAllRelationshipsScan',
+}
+
+_NODE_PATTERN = re.compile(r'\(\s*(\w+)\s*:\s*(\w+)(?:\s*\{+\s*(\w+)\s*:)?')
+_REL_PATTERN = re.compile(r'\[\s*(\w+)\s*:\s*:?(\w+)(?:\s*\{+\s*(\w+)\s*:)?')
+_ALIAS_PATTERN = re.compile(r'(\w+)\.(\w+)\s+as\s+(\w+)', re.IGNORECASE)
+_PREDICATE_PATTERN = re.compile(
+    r'(\w+)\.(\w+)\s*(CONTAINS|ENDS\s+WITH|STARTS\s+WITH|IS\s+NOT\s+NULL|<>|<=|>=|=|<|>)',
+    re.IGNORECASE
+)
+_FUNCTION_PREDICATE_PATTERN = re.compile(r'\w+\(\s*(\w+)\.(\w+)\s*\)\s*(=|<|>|<=|>=)')
+_INDEXED_DETAILS = re.compile(r':(\w+)\((\w+)')
+
+def _clause(query: str, keyword: str, terminators: Tuple[str, ...]) -> List[str]:
+    """WHERE / ORDER BY 절 본문 목록"""
+    pattern = re.compile(
+        rf'\b{keyword}\b(.*?)(?=\b(?:{"|".join(terminators)})\b|$)',
+        re.IGNORECASE | re.DOTALL
+    )
+    return [match.group(1) for match in pattern.finditer(query)]
+
+def extract_property_usages(query: str) -> List[Dict[str, Any]]:
+    """
+    쿼리에서 인덱스 후보 속성 사용 위치 추출
+    
+    Returns:
+        [{'variable', 'entity', 'label', 'property', 'usage'}]
+        entity: 'node' | 'relationship', usage: 'equality' | 'range' | 'text' | 'exists' | 'sort'
+    """
+    variables: Dict[str, Tuple[str, str]] = {}
+    usages = []
+    
+    for variable, label, inline_property in _NODE_PATTERN.findall(query):
+        variables.setdefault(variable, ('node', label))
+        if inline_property:
+            usages.append((variable, inline_property, 'equality'))
+    for variable, rel_type, inline_property in _REL_PATTERN.findall(query):
+        variables.setdefault(variable, ('relationship', rel_type))
+        if inline_property:
+            usages.append((variable, inline_property, 'equality'))
+    
+    for where in _clause(query, 'WHERE', ('RETURN', 'WITH', 'ORDER', 'MATCH', 'OPTIONAL')):
+        for variable, prop, operator in _PREDICATE_PATTERN.findall(where):
+            operator = ' '.join(operator.upper().split())
+            if operator in ('CONTAINS', 'ENDS WITH'):
+                usage = 'text'
+            elif operator == 'IS NOT NULL':
+                usage = 'exists'
+            elif operator == '=':
+                usage = 'equality'
+            else:
+                usage = 'range'
+            usages.append((variable, prop, usage))
+        for variable, prop, _ in _FUNCTION_PREDICATE_PATTERN.findall(where):
+            usages.append((variable, prop, 'range'))
+    
+    aliases = {alias: (variable, prop) for variable, prop, alias in _ALIAS_PATTERN.findall(query)}
+    for order_by in _clause(query, 'ORDER\\s+BY', ('LIMIT', 'SKIP', 'RETURN', 'WITH', 'UNION')):
+        for item in order_by.split(','):
+            expression = item.strip().split()[0] if item.strip() else ''
+            if '.' in expression:
+                variable, prop = expression.split('.', 1)
+            elif expression in aliases:
+                variable, prop = aliases[expression]
+            else:
+                continue
+            usages.append((variable, prop, 'sort'))
+    
+    results = []
+    seen = set()
+    for variable, prop, usage in usages:
+        if variable not in variables or (variable, prop, usage) in seen:
+            continue
+        seen.add((variable, prop, usage))
+        entity, label = variables[variable]
+        results.append({
+            'variable': variable,
+            'entity': entity,
+            'label': label,
+            'property': prop,
+            'usage': usage,
+        })
+    return results
+
+def walk_plan(plan: Dict[str, Any]):
+    """EXPLAIN 실행 계획 트리 순회 (operatorType, details)"""
+    if not plan:
+        return
+    operator = plan.get('operatorType', '').split('@')[0]
+    arguments = plan.get('args') or plan.get('arguments') or {}
+    yield operator, str(arguments.get('Details', '')), plan.get('identifiers', [])
+    for child in plan.get('children', []):
+        yield from walk_plan(child)
+
+def required_index_type(usage: str) -> str:
+    """사용 형태별 필요한 인덱스 종류"""
+    return 'TEXT' if usage == 'text' else 'RANGE'
+
+def index_statement(recommendation: Dict[str, Any]) -> str:
+    """추천 인덱스 생성 DDL"""
+    kind = "TEXT INDEX" if recommendation['index_type'] == 'TEXT' else "INDEX"
+    label = recommendation['label']
+    prop = recommendation['property']
+    if recommendation['entity'] == 'relationship':
+        target = f"()-[r:{label}]-() ON (r.{prop})"
+    else:
+        target = f"(n:{label}) ON (n.{prop})"
+    return f"CREATE {kind} {recommendation['name']} IF NOT EXISTS FOR {target}"
+
+class IndexAdvisor:
+    """
+    질의 패턴 라이브러리 기반 인덱스 어드바이저
+    
+    사용 예:
+        advisor = IndexAdvisor(engine)   # 연결된 AdvancedKnowledgeEngine
+        report = advisor.analyze()
+        advisor.apply(report)            # 새 마이그레이션 파일로 적용
+    """
+    
+    def __init__(self, engine, migrations_dir=MIGRATIONS_DIR, report_path: Optional[str] = None):
+        self.engine = engine
+        self.driver = engine.driver
+        self.migrations_dir = migrations_dir
+        self.report_path = report_path or os.getenv('INDEX_ADVISOR_REPORT', DEFAULT_REPORT_PATH)
+    
+    def fingerprint(self) -> str:
+        """패턴 템플릿과 시간 필드 기준 지문 (패턴이 바뀌면 달라짐)"""
+        payload = {
+            name: [info.get('cypher_template', ''), info.get('time_field', '')]
+            for name, info in self.engine.query_patterns.items()
+        }
+        return hashlib.sha256(json.dumps(payload, sort_keys=True).encode('utf-8')).hexdigest()
+    
+    def template_variants(self) -> List[Tuple[str, Optional[str], str]]:
+        """(패턴 이름, 시간 조건, 쿼리) 목록"""
+        variants = []
+        for name, info in self.engine.query_patterns.items():
+            query = info['cypher_template']
+            for placeholder, sample in PLACEHOLDER_SAMPLES.items():
+                query = query.replace('{' + placeholder + '}', sample)
+            for time_constraint in TIME_CONSTRAINT_VARIANTS:
+                variant = query
+                if time_constraint:
+                    time_field = info.get('time_field', 'r.timestamp')
+                    variant = self.engine._apply_time_constraint(query, time_constraint, time_field)
+                variants.append((name, time_constraint, variant))
+        return variants
+    
+    def existing_indexes(self) -> Set[Tuple[str, str, str, str]]:
+        """기존 단일 속성 인덱스 {(entity, label, property, type)}"""
+        existing = set()
+        with self.driver.session() as session:
+            records = session.run("""
+                SHOW INDEXES YIELD type, entityType, labelsOrTypes, properties, state
+                WHERE labelsOrTypes IS NOT NULL AND size(properties) = 1
+                RETURN type, entityType, labelsOrTypes, properties
+            """).data()
+        for record in records:
+            entity = 'relationship' if record['entityType'] == 'RELATIONSHIP' else 'node'
+            for label in record['labelsOrTypes']:
+                existing.add((entity, label, record['properties'][0], record['type']))
+        return existing
+    
+    def analyze(self, plans: Optional[Dict[str, Any]] = None,
+                plan_errors: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
+        """
+        모든 템플릿을 EXPLAIN 하고 추천 인덱스 계산
+        
+        Args:
+            plans: 이미 세운 실행 계획 {쿼리: plan} (엔진 워밍업 결과 재사용, 없는 쿼리만 EXPLAIN)
+            plan_errors: 이미 EXPLAIN이 실패한 쿼리 {쿼리: 오류} (다시 시도하지 않음)
+        
+        Returns:
+            {'fingerprint', 'generated_at', 'findings', 'recommendations', 'errors', 'explained'}
+        """
+        existing = self.existing_indexes()
+        findings = []
+        errors = []
+        seen = set()
+        explained = 0
+        recommendations: Dict[str, Dict[str, Any]] = {}
+        plans = plans or {}
+        plan_errors = plan_errors or {}
+        
+        with self.driver.session() as session:
+            for name, time_constraint, query in self.template_variants():
+                if query in plan_errors:
+                    errors.append({'pattern': name, 'time_constraint': time_constraint,
+                                   'error': plan_errors[query]})
+                    continue
+                plan = plans.get(query)
+                if plan is None:
+                    try:
+                        plan = session.run(f"EXPLAIN {query}").consume().plan
+                        explained += 1
+                    except Exception as e:
+                        errors.append({'pattern': name, 'time_constraint': time_constraint, 'error': str(e)[:200]})
+                        continue
+                
+                operators = list(walk_plan(plan))
+                scans = sorted({operator for operator, _, _ in operators if operator in SCAN_OPERATORS})
+                served = {
+                    match
+                    for operator, details, _ in operators if 'Index' in operator
+                    for match in _INDEXED_DETAILS.findall(details)
+                }
+                if not scans:
+                    continue
+                
+                for usage in extract_property_usages(query):
+                    key = (usage['label'], usage['property'])
+                    if key in served or (name, *key, usage['usage']) in seen:
+                        continue
+                    seen.add((name, *key, usage['usage']))
+                    
+                    index_type = required_index_type(usage['usage'])
+                    covered = (usage['entity'], usage['label'], usage['property'], index_type) in existing
+                    findings.append({
+                        'pattern': name,
+                        'time_constraint': time_constraint,
+                        **usage,
+                        'scan_operators': scans,
+                        'index_exists': covered,
+                    })
+                    if covered:
+                        continue
+                    
+                    index_name = f"advisor_{usage['label'].lower()}_{usage['property'].lower()}_{index_type.lower()}"
+                    recommendation = recommendations.setdefault(index_name, {
+                        'name': index_name,
+                        'entity': usage['entity'],
+                        'label': usage['label'],
+                        'property': usage['property'],
+                        'index_type': index_type,
+                        'patterns': [],
+                    })
+                    if name not in recommendation['patterns']:
+                        recommendation['patterns'].append(name)
+        
+        for recommendation in recommendations.values():
+            recommendation['statement'] = index_statement(recommendation)
+        
+        return {
+            'fingerprint': self.fingerprint(),
+            'generated_at': datetime.now().isoformat(),
+            'findings': findings,
+            'recommendations': sorted(recommendations.values(), key=lambda r: r['name']),
+            'errors': errors,
+            'explained': explained,
+        }
+    
+    def apply(self, report: Dict[str, Any]) -> Optional[str]:
+        """
+        추천 인덱스를 새 마이그레이션 파일로 작성하고 마이그레이션 실행
+        
+        Returns:
+            작성한 마이그레이션 파일 경로 (추천이 없으면 None)
+        """
+        recommendations = report['recommendations']
+        if not recommendations:
+            logger.info("✅ 추가할 인덱스가 없습니다")
+            return None
+        
+        migrations = discover_migrations(self.migrations_dir)
+        version = (migrations[-1].version if migrations else 0) + 1
+        path = os.path.join(self.migrations_dir, f"V{version:03d}__index_advisor_{datetime.now():%Y%m%d}.cypher")
+        
+        lines = [
+            "// " + "=" * 77,
+            f"// V{version:03d} - 인덱스 어드바이저 추천 (index_advisor.py, 패턴 지문 {report['fingerprint'][:12]})",
+            "// " + "=" * 77,
+            "",
+        ]
+        for recommendation in recommendations:
+            lines.append(f"// 사용 패턴: {', '.join(recommendation['patterns'])}")
+            lines.append(f"{recommendation['statement']};")
+            lines.append("")
+        
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write("\n".join(lines))
+        logger.info(f"📝 마이그레이션 작성: {path}")
+        
+        SchemaMigrator(self.driver, migrations_dir=self.migrations_dir).migrate()
+        return path
+    
+    def last_report(self) -> Optional[Dict[str, Any]]:
+        """로컬 파일에 저장된 최근 분석 결과 (없거나 읽을 수 없으면 None)"""
+        try:
+            with open(self.report_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning(f"⚠️  인덱스 어드바이저 보고서를 읽을 수 없습니다: {self.report_path} - {e}")
+            return None
+    
+    def save_report(self, report: Dict[str, Any]):
+        """분석 결과를 로컬 파일에 저장 (다음 실행 시 지문 비교용, 그래프에는 쓰지 않음)"""
+        os.makedirs(os.path.dirname(os.path.abspath(self.report_path)), exist_ok=True)
+        temporary = f"{self.report_path}.tmp"
+        with open(temporary, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        os.replace(temporary, self.report_path)
+    
+    def run_if_changed(self, force: bool = False, plans: Optional[Dict[str, Any]] = None,
+                       plan_errors: Optional[Dict[str, str]] = None) -> Optional[Dict[str, Any]]:
+        """
+        패턴 지문이 마지막 분석과 다를 때만 분석 (변경 없으면 조회 한 번)
+        
+        Returns:
+            새 분석 결과 (변경이 없으면 None)
+        """
+        fingerprint = self.fingerprint()
+        last = None if force else self.last_report()
+        if last and last.get('fingerprint') == fingerprint:
+            return None
+        
+        logger.info("🔎 질의 패턴 변경 감지 - 인덱스 어드바이저 실행")
+        report = self.analyze(plans, plan_errors)
+        self.save_report(report)
+        log_report(report)
+        return report
+
+def log_report(report: Dict[str, Any]):
+    """분석 결과 요약 로그"""
+    for error in report['errors']:
+        logger.warning(f"  ⚠️  EXPLAIN 실패 [{error['pattern']}/{error['time_constraint']}]: {error['error']}")
+    for finding in report['findings']:
+        target = f"{finding['label']}.{finding['property']}"
+        state = "인덱스 있음(미사용)" if finding['index_exists'] else "인덱스 없음"
+        logger.info(f"  🔍 [{finding['pattern']}] {target} ({finding['usage']}) → "
+                    f"{', '.join(finding['scan_operators'])} / {state}")
+    for recommendation in report['recommendations']:
+        logger.info(f"  💡 추천: {recommendation['statement']}")
+    logger.info(f"📋 인덱스 어드바이저: 발견 {len(report['findings'])}건, "
+                f"추천 {len(report['recommendations'])}개, 오류 {len(report['errors'])}건")
+
+def main():
+    """질의 패턴 라이브러리 인덱스 분석"""
+    from advanced_knowledge_engine import AdvancedKnowledgeEngine
+    
+    parser = argparse.ArgumentParser(description="질의 패턴 기반 인덱스 어드바이저")
+    parser.add_argument("--apply", action="store_true", help="추천 인덱스를 마이그레이션으로 적용")
+    parser.add_argument("--if-changed", action="store_true", help="패턴 지문이 바뀐 경우에만 분석")
+    parser.add_argument("--json", action="store_true", help="분석 결과를 JSON으로 출력")
+    args = parser.parse_args()
+    
+    engine = AdvancedKnowledgeEngine()
+    try:
+        if not engine.connect():
+            return False
+        
+        advisor = IndexAdvisor(engine)
+        if args.if_changed:
+            report = advisor.run_if_changed()
+            if report is None:
+                logger.info("✅ 질의 패턴 변경 없음 - 분석 생략")
+                return True
+        else:
+            report = advisor.analyze()
+            advisor.save_report(report)
+            log_report(report)
+        
+        if args.json:
+            print(json.dumps(report, ensure_ascii=False, indent=2))
+        
+        if args.apply:
+            advisor.apply(report)
+        
+        return True
+    
+    except Exception as e:
+        logger.error(f"❌ 인덱스 분석 실패: {e}")
+        return False
+    
+    finally:
+        engine.close()
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
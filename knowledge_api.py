@@ -4,20 +4,34 @@
 애플리케이션 개발자 AI가 사용할 수 있는 RESTful API 제공
 
 엔드포인트:
-- POST /api/v1/query - 자연어 질의 처리
+- POST /api/v1/query - 자연어 질의 처리 ({"timings": true} 또는 ?timings=1 이면 단계별 시간 포함)
+- POST /api/v1/activities - 개발 활동 일괄 수집 (비동기)
 - GET /api/v1/schema - 데이터베이스 스키마 정보
 - GET /api/v1/health - 서비스 상태 확인
 - GET /api/v1/stats - 사용 통계
+- GET /api/v1/debug/slow-queries - 느린 질의 로그 (DEBUG_ENDPOINTS=true일 때만 등록, 질문/파라미터/Cypher 노출)
+
+연결 후 워밍업(engine_warmup.py)까지 끝나야 준비 완료로 보고합니다 (ENGINE_WARMUP=false로 끔,
+WARMUP_PRIME_EXAMPLES=true면 /api/v1/examples 질문으로 결과 캐시까지 채움).
+DEFERRED_CONNECT=true 면 지식 엔진 연결/스키마 로드를 백그라운드에서 진행하고 서버는 바로 요청을 받습니다.
+준비 전 질의는 503 + Retry-After, /api/v1/health 는 "starting" 상태를 돌려줍니다.
 """
 
 from flask import Flask, request, jsonify
 from flask_cors import CORS
 import os
+import sys
+import time
+import uuid
+import queue
 import logging
+import threading
 from datetime import datetime
-from advanced_knowledge_engine import AdvancedKnowledgeEngine
 import json
 
+# 지식 엔진/활동 파이프라인(neo4j 드라이버 포함)은 처음 쓰는 시점에 import (서버 시작 시간 단축)
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'poc', 'ai_pipeline'))
+
 # 로깅 설정
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
@@ -26,9 +40,56 @@ logger = logging.getLogger(__name__)
 app = Flask(__name__)
 CORS(app)  # CORS 허용
 
-# 글로벌 지식 엔진 인스턴스
+# 글로벌 지식 엔진 인스턴스 (연결과 스키마 로드가 끝난 뒤에 설정)
 knowledge_engine = None
 
+# 지식 엔진 준비 상태 (not_started → starting → warming → ready / failed)
+engine_state = {
+    "status": "not_started",
+    "deferred": False,
+    "attempts": 0,
+    "error": None,
+    "ready_at": None,
+    "warmup": None
+}
+
+# 백그라운드 연결 실패 시 재시도 간격 (초)
+ENGINE_RETRY_SECONDS = float(os.getenv('ENGINE_RETRY_SECONDS', '5'))
+
+# 디버그 엔드포인트(/api/v1/debug/*)는 인증 없이 질문/파라미터/Cypher를 보여주므로 명시적으로 켤 때만 등록
+DEBUG_ENDPOINTS = os.getenv('DEBUG_ENDPOINTS', 'false').lower() == 'true'
+
+# /api/v1/examples 기본 질의 예시 (WARMUP_PRIME_EXAMPLES=true면 워밍업에서 미리 처리)
+EXAMPLE_QUERIES = [
+    {
+        "question": "가장 최근에 작업한 개발자는 누구인가?",
+        "type": "WHO",
+        "description": "최근 활동한 개발자 조회"
+    },
+    {
+        "question": "전체 개발자는 몇 명인가?",
+        "type": "COUNT",
+        "description": "개발자 수 통계"
+    },
+    {
+        "question": "Infrastructure Architect AI가 가진 스킬은 무엇인가?",
+        "type": "SKILL",
+        "description": "특정 개발자의 스킬 조회"
+    },
+    {
+        "question": "프로젝트 상태는 어떠한가?",
+        "type": "WHAT",
+        "description": "프로젝트 현황 조회"
+    }
+]
+
+# 활동 수집기 (첫 수집 요청 시 초기화)
+activity_writer = None
+activity_writer_lock = threading.Lock()
+
+# 요청당 최대 활동 수
+MAX_ACTIVITIES_PER_REQUEST = 5000
+
 # API 사용 통계
 api_stats = {
     "total_queries": 0,
@@ -42,18 +103,129 @@ api_stats = {
 def init_knowledge_engine():
     """지식 엔진 초기화"""
     global knowledge_engine
+    engine_state["status"] = "starting"
+    engine_state["attempts"] += 1
+    engine = None
     try:
-        knowledge_engine = AdvancedKnowledgeEngine()
-        if knowledge_engine.connect():
+        from advanced_knowledge_engine import AdvancedKnowledgeEngine
+        engine = AdvancedKnowledgeEngine()
+        warmup = os.getenv('ENGINE_WARMUP', 'true').lower() == 'true'
+        # 워밍업이 있으면 인덱스 어드바이저는 워밍업의 실행 계획으로 실행 (템플릿 EXPLAIN 한 번)
+        if engine.connect(index_advisor=False if warmup else None):
+            if warmup:
+                engine_state["status"] = "warming"
+                warm_up_engine(engine)
+            knowledge_engine = engine
+            engine_state.update(status="ready", error=None, ready_at=datetime.now().isoformat())
             logger.info("✅ 지식 엔진 초기화 성공")
             return True
         else:
+            engine_state.update(status="failed", error="연결 실패")
             logger.error("❌ 지식 엔진 연결 실패")
+            # connect()가 드라이버를 만든 뒤 실패했을 수 있음 (재시도마다 연결 풀이 새지 않도록 닫음)
+            close_engine(engine)
             return False
     except Exception as e:
+        engine_state.update(status="failed", error=str(e))
         logger.error(f"❌ 지식 엔진 초기화 실패: {e}")
+        close_engine(engine)
         return False
 
+def close_engine(engine):
+    """초기화에 실패한 엔진의 드라이버 정리 (정리 실패는 기록만)"""
+    if engine is None:
+        return
+    try:
+        engine.close()
+    except Exception as e:
+        logger.warning(f"⚠️  지식 엔진 연결 종료 실패: {e}")
+
+def warm_up_engine(engine):
+    """연결된 엔진 워밍업 (실패해도 엔진은 사용 가능, 결과는 health의 startup.warmup)"""
+    from engine_warmup import EngineWarmup
+    
+    prime = os.getenv('WARMUP_PRIME_EXAMPLES', 'false').lower() == 'true'
+    questions = [example["question"] for example in EXAMPLE_QUERIES] if prime else None
+    try:
+        report = EngineWarmup(engine).run(prime_questions=questions)
+    except Exception as e:
+        logger.warning(f"⚠️  지식 엔진 워밍업 실패: {e}")
+        engine_state["warmup"] = {"ready": False, "error": str(e)}
+        return
+    engine_state["warmup"] = {
+        "ready": report["ready"],
+        "seconds": report["seconds"],
+        "phases_ms": {name: phase["ms"] for name, phase in report["phases"].items()},
+        "planned_templates": report["phases"].get("plans", {}).get("planned", 0),
+        "plan_errors": len(report["phases"].get("plans", {}).get("errors", []))
+    }
+
+def start_knowledge_engine_in_background():
+    """지식 엔진 연결을 백그라운드에서 진행 (성공할 때까지 ENGINE_RETRY_SECONDS 간격으로 재시도)"""
+    engine_state["deferred"] = True
+    engine_state["status"] = "starting"
+    
+    def warm_up():
+        while not init_knowledge_engine():
+            logger.warning(f"⏳ {ENGINE_RETRY_SECONDS:g}초 후 지식 엔진 연결 재시도")
+            time.sleep(ENGINE_RETRY_SECONDS)
+    
+    thread = threading.Thread(target=warm_up, name="knowledge-engine-warmup", daemon=True)
+    thread.start()
+    return thread
+
+def engine_unavailable():
+    """지식 엔진이 아직 없을 때의 응답 (백그라운드 준비 중이면 503 + Retry-After)"""
+    if engine_state["deferred"]:
+        response = jsonify({
+            "success": False,
+            "error": "지식 엔진 준비 중입니다. 잠시 후 다시 시도하세요",
+            "engine_status": engine_state["status"],
+            "timestamp": datetime.now().isoformat()
+        })
+        response.headers["Retry-After"] = str(max(1, int(ENGINE_RETRY_SECONDS)))
+        return response, 503
+    return jsonify({
+        "success": False,
+        "error": "지식 엔진이 초기화되지 않았습니다",
+        "timestamp": datetime.now().isoformat()
+    }), 500
+
+def init_activity_writer():
+    """활동 수집기 초기화 (파이프라인 드라이버 하나를 모든 생산자가 공유)"""
+    global activity_writer
+    with activity_writer_lock:
+        if activity_writer is None:
+            from claude_neo4j_pipeline import ClaudeNeo4jPipeline
+            from ingestion_workers import PartitionedIngestionWriter
+            pipeline = ClaudeNeo4jPipeline()
+            if not pipeline.connect():
+                raise RuntimeError("활동 파이프라인 연결 실패")
+            writer = PartitionedIngestionWriter(
+                pipeline,
+                workers=int(os.getenv('INGESTION_WORKERS', 4)),
+                batch_size=int(os.getenv('INGESTION_BATCH_SIZE', 500))
+            )
+            writer.start()
+            activity_writer = writer
+            logger.info("✅ 활동 수집기 초기화 성공")
+    return activity_writer
+
+def parse_activity_payload():
+    """요청 본문을 활동 목록으로 변환 (NDJSON 또는 JSON 배열/객체)"""
+    if request.mimetype in ('application/x-ndjson', 'application/ndjson'):
+        lines = request.get_data(as_text=True).splitlines()
+        return [json.loads(line) for line in lines if line.strip()]
+    
+    data = request.get_json(silent=True)
+    if isinstance(data, dict) and 'activities' in data:
+        data = data['activities']
+    if isinstance(data, dict):
+        data = [data]
+    if not isinstance(data, list):
+        raise ValueError("활동 배열이 필요합니다. [{'type': 'commit', ...}] 또는 NDJSON")
+    return data
+
 def update_stats(query_type: str, success: bool, query: str):
     """API 사용 통계 업데이트"""
     global api_stats
@@ -84,8 +256,13 @@ def update_stats(query_type: str, success: bool, query: str):
 def health_check():
     """서비스 상태 확인"""
     try:
-        # 지식 엔진 연결 상태 확인
-        engine_status = "connected" if knowledge_engine and knowledge_engine.driver else "disconnected"
+        # 지식 엔진 연결 상태 확인 (백그라운드 연결 중이면 starting)
+        if knowledge_engine and knowledge_engine.driver:
+            engine_status = "connected"
+        elif engine_state["deferred"] and engine_state["status"] != "ready":
+            engine_status = "starting"
+        else:
+            engine_status = "disconnected"
         
         # 간단한 DB 테스트
         if knowledge_engine and knowledge_engine.driver:
@@ -99,13 +276,26 @@ def health_check():
         else:
             db_status = "disconnected"
         
+        if engine_status == "starting":
+            status = "starting"
+        else:
+            status = "healthy" if engine_status == "connected" and db_status == "healthy" else "unhealthy"
+        
         return jsonify({
-            "status": "healthy" if engine_status == "connected" and db_status == "healthy" else "unhealthy",
+            "status": status,
             "timestamp": datetime.now().isoformat(),
             "components": {
                 "knowledge_engine": engine_status,
                 "auradb_connection": db_status
             },
+            "startup": {
+                "deferred": engine_state["deferred"],
+                "attempts": engine_state["attempts"],
+                "phase": engine_state["status"],
+                "ready_at": engine_state["ready_at"],
+                "last_error": engine_state["error"],
+                "warmup": engine_state["warmup"]
+            },
             "version": "1.0.0"
         })
         
@@ -121,6 +311,8 @@ def get_schema():
     """데이터베이스 스키마 정보"""
     try:
         if not knowledge_engine:
+            if engine_state["deferred"]:
+                return engine_unavailable()
             return jsonify({"error": "지식 엔진이 초기화되지 않았습니다"}), 500
         
         schema_info = {
@@ -172,6 +364,12 @@ def get_stats():
             "timestamp": datetime.now().isoformat()
         }), 500
 
+def timings_requested(data) -> bool:
+    """요청 본문 {"timings": true} 또는 ?timings=1 이면 응답에 단계별 시간 포함"""
+    if data.get('timings') is True:
+        return True
+    return request.args.get('timings', '').lower() in ('1', 'true', 'yes')
+
 @app.route('/api/v1/query', methods=['POST'])
 def process_query():
     """자연어 질의 처리"""
@@ -197,14 +395,10 @@ def process_query():
         
         # 지식 엔진 상태 확인
         if not knowledge_engine:
-            return jsonify({
-                "success": False,
-                "error": "지식 엔진이 초기화되지 않았습니다",
-                "timestamp": datetime.now().isoformat()
-            }), 500
+            return engine_unavailable()
         
         # 질의 처리
-        result = knowledge_engine.process_natural_query(natural_query)
+        result = knowledge_engine.process_natural_query(natural_query, timings=timings_requested(data))
         
         # 통계 업데이트
         query_type = result.get('query_analysis', {}).get('type', 'unknown')
@@ -259,10 +453,14 @@ def process_batch_queries():
         
         logger.info(f"📨 배치 질의 수신: {len(queries)}개")
         
+        if not knowledge_engine:
+            return engine_unavailable()
+        
+        timings = timings_requested(data)
         results = []
         for i, query in enumerate(queries):
             try:
-                result = knowledge_engine.process_natural_query(query.strip())
+                result = knowledge_engine.process_natural_query(query.strip(), timings=timings)
                 result["batch_index"] = i
                 results.append(result)
                 
@@ -303,32 +501,105 @@ def process_batch_queries():
             "timestamp": datetime.now().isoformat()
         }), 500
 
+@app.route('/api/v1/activities', methods=['POST'])
+def ingest_activities():
+    """개발 활동 일괄 수집 (검증 후 배치 수집기에 적재, 202 반환)"""
+    try:
+        try:
+            activities = parse_activity_payload()
+        except ValueError as e:
+            return jsonify({
+                "success": False,
+                "error": f"활동 데이터를 해석할 수 없습니다: {str(e)}",
+                "timestamp": datetime.now().isoformat()
+            }), 400
+        
+        if not activities:
+            return jsonify({
+                "success": False,
+                "error": "최소 1개 이상의 활동이 필요합니다",
+                "timestamp": datetime.now().isoformat()
+            }), 400
+        
+        if len(activities) > MAX_ACTIVITIES_PER_REQUEST:
+            return jsonify({
+                "success": False,
+                "error": f"요청당 최대 {MAX_ACTIVITIES_PER_REQUEST}개 활동까지 수집 가능합니다",
+                "timestamp": datetime.now().isoformat()
+            }), 413
+        
+        # 전체 검증 후 하나라도 잘못되면 아무것도 적재하지 않음
+        from claude_neo4j_pipeline import validate_activity
+        validation_errors = []
+        for i, activity in enumerate(activities):
+            for error in validate_activity(activity):
+                validation_errors.append({"index": i, "error": error})
+        
+        if validation_errors:
+            return jsonify({
+                "success": False,
+                "error": f"{len(validation_errors)}개 검증 오류",
+                "validation_errors": validation_errors[:50],
+                "timestamp": datetime.now().isoformat()
+            }), 400
+        
+        writer = init_activity_writer()
+        token = uuid.uuid4().hex
+        
+        try:
+            # 전부 적재하거나 하나도 적재하지 않음 (503이면 아무것도 기록되지 않음)
+            writer.submit_many(activities, token=token, timeout=5)
+        except queue.Full:
+            status = writer.token_status(token)
+            return jsonify({
+                "success": False,
+                "error": "수집 대기열이 가득 찼습니다. 잠시 후 다시 시도하세요",
+                "ingestion_token": token,
+                "accepted": (status or {}).get('accepted', 0),
+                "timestamp": datetime.now().isoformat()
+            }), 503
+        
+        logger.info(f"📥 활동 {len(activities)}개 수집 대기열 적재: {token}")
+        
+        return jsonify({
+            "success": True,
+            "ingestion_token": token,
+            "accepted": len(activities),
+            "status_url": f"/api/v1/activities/{token}",
+            "timestamp": datetime.now().isoformat()
+        }), 202
+        
+    except Exception as e:
+        logger.error(f"❌ 활동 수집 실패: {e}")
+        return jsonify({
+            "success": False,
+            "error": f"수집 오류: {str(e)}",
+            "timestamp": datetime.now().isoformat()
+        }), 500
+
+@app.route('/api/v1/activities/<token>', methods=['GET'])
+def get_ingestion_status(token):
+    """수집 토큰 처리 현황"""
+    status = activity_writer.token_status(token) if activity_writer else None
+    if status is None:
+        return jsonify({
+            "success": False,
+            "error": "알 수 없는 수집 토큰입니다",
+            "timestamp": datetime.now().isoformat()
+        }), 404
+    
+    return jsonify({
+        "success": True,
+        "ingestion_token": token,
+        "data": {**status, "completed": status['pending'] == 0},
+        "timestamp": datetime.now().isoformat()
+    })
+
 @app.route('/api/v1/examples', methods=['GET'])
 def get_examples():
     """사용 예시 제공"""
     examples = {
-        "basic_queries": [
-            {
-                "question": "가장 최근에 작업한 개발자는 누구인가?",
-                "type": "WHO",
-                "description": "최근 활동한 개발자 조회"
-            },
-            {
-                "question": "전체 개발자는 몇 명인가?",
-                "type": "COUNT",
-                "description": "개발자 수 통계"
-            },
-            {
-                "question": "Infrastructure Architect AI가 가진 스킬은 무엇인가?",
-                "type": "SKILL",
-                "description": "특정 개발자의 스킬 조회"
-            },
-            {
-                "question": "프로젝트 상태는 어떠한가?",
-                "type": "WHAT",
-                "description": "프로젝트 현황 조회"
-            }
-        ],
+        "basic_queries": EXAMPLE_QUERIES,
         "api_usage": {
             "single_query": {
                 "url": "/api/v1/query",
@@ -368,6 +639,41 @@ def get_examples():
         "timestamp": datetime.now().isoformat()
     })
 
+def get_slow_queries():
+    """느린 질의 로그 (?limit=50&template=collaboration_network, DEBUG_ENDPOINTS=true일 때만 등록)"""
+    if not knowledge_engine:
+        return engine_unavailable()
+    
+    slow_queries = knowledge_engine.slow_queries
+    if slow_queries is None:
+        return jsonify({
+            "success": False,
+            "error": "느린 질의 로그가 꺼져 있습니다 (SLOW_QUERY_MS > 0 으로 설정)",
+            "timestamp": datetime.now().isoformat()
+        }), 404
+    
+    try:
+        limit = max(1, min(int(request.args.get('limit', 50)), 500))
+    except ValueError:
+        return jsonify({
+            "success": False,
+            "error": "limit은 정수여야 합니다",
+            "timestamp": datetime.now().isoformat()
+        }), 400
+    
+    return jsonify({
+        "success": True,
+        "data": {
+            "config": slow_queries.config(),
+            "by_template": slow_queries.summary(),
+            "entries": slow_queries.entries(limit=limit, template=request.args.get('template'))
+        },
+        "timestamp": datetime.now().isoformat()
+    })
+
+if DEBUG_ENDPOINTS:
+    app.add_url_rule('/api/v1/debug/slow-queries', view_func=get_slow_queries, methods=['GET'])
+
 @app.errorhandler(404)
 def not_found(error):
     """404 오류 처리"""
@@ -377,11 +683,13 @@ def not_found(error):
         "available_endpoints": [
             "POST /api/v1/query",
             "POST /api/v1/query/batch",
+            "POST /api/v1/activities",
+            "GET /api/v1/activities/<token>",
             "GET /api/v1/schema",
             "GET /api/v1/health",
             "GET /api/v1/stats",
             "GET /api/v1/examples"
-        ],
+        ] + (["GET /api/v1/debug/slow-queries"] if DEBUG_ENDPOINTS else []),
         "timestamp": datetime.now().isoformat()
     }), 404
 
@@ -397,19 +705,25 @@ def internal_error(error):
 if __name__ == '__main__':
     logger.info("🚀 지식 추출 엔진 API 서버 시작")
     
-    # 지식 엔진 초기화
-    if not init_knowledge_engine():
+    # 지식 엔진 초기화 (DEFERRED_CONNECT=true면 서버를 먼저 띄우고 백그라운드에서 연결)
+    if os.getenv('DEFERRED_CONNECT', 'false').lower() == 'true':
+        logger.info("⏳ 지식 엔진을 백그라운드에서 준비합니다 (준비 전 질의는 503)")
+        start_knowledge_engine_in_background()
+    elif not init_knowledge_engine():
         logger.error("❌ 지식 엔진 초기화 실패, 서버 종료")
         exit(1)
-    
-    logger.info("✅ 지식 엔진 API 서버 준비 완료")
+    else:
+        logger.info("✅ 지식 엔진 API 서버 준비 완료")
     logger.info("📋 사용 가능한 엔드포인트:")
     logger.info("  - POST /api/v1/query - 자연어 질의 처리")
     logger.info("  - POST /api/v1/query/batch - 배치 질의 처리")
+    logger.info("  - POST /api/v1/activities - 개발 활동 일괄 수집")
     logger.info("  - GET /api/v1/schema - 스키마 정보")
     logger.info("  - GET /api/v1/health - 서비스 상태")
     logger.info("  - GET /api/v1/stats - 사용 통계")
     logger.info("  - GET /api/v1/examples - 사용 예시")
+    if DEBUG_ENDPOINTS:
+        logger.info("  - GET /api/v1/debug/slow-queries - 느린 질의 로그")
     
     # 개발 서버 실행 (프로덕션에서는 WSGI 서버 사용 권장)
     app.run(
@@ -0,0 +1,3040 @@
+#!/usr/bin/env python3
+"""
+인메모리 그래프 백엔드 (Memory Graph)
+Neo4j 드라이버의 driver/session/run/result/record 인터페이스를 그대로 제공하는 내장 속성 그래프
+
+주요 기능:
+- 질의 템플릿, 파이프라인 기록 쿼리, Seed 매니페스트/마이그레이션이 쓰는 Cypher 부분집합 실행
+  (MATCH/OPTIONAL MATCH/WHERE/WITH/UNWIND/RETURN/ORDER BY/SKIP/LIMIT/UNION,
+   MERGE/CREATE/SET/REMOVE/DELETE, CALL 프로시저와 CALL {} 서브쿼리, CASE/리스트 컴프리헨션/집계)
+- 제약조건/인덱스 DDL, SHOW CONSTRAINTS/INDEXES, 유일성 제약 검사
+- 선언된 제약조건/인덱스가 있는 라벨·속성의 동등 조건은 인덱스로 바로 조회
+- execute_read/execute_write/begin_transaction 트랜잭션 (실패 시 롤백)
+- EXPLAIN은 실제 탐색 방식(인덱스 조회/라벨 스캔)을 실행 계획으로 반환 (PROFILE은 실행 후 같은 계획 + 결과 행 수)
+
+사용 예:
+    driver = open_driver("memory://test")                 # 같은 이름이면 같은 그래프 공유
+    driver = open_driver("memory:///var/lib/mindlog/graph.pickle")   # 파일 스냅샷 (close 시 저장)
+    driver = open_driver(os.getenv('NEO4J_URI'), auth=(user, password))  # 그 외 URI는 Neo4j 드라이버
+
+지원하지 않는 구문(가변 길이 관계, 경로 변수, FOREACH 등)은 MemoryGraphError로 실패합니다.
+시간 값은 내부적으로 파이썬 datetime/date/timedelta로 저장하고 결과에서는 neo4j.time 타입으로 돌려줍니다.
+"""
+
+import os
+import re
+import math
+import time
+import uuid
+import pickle
+import random
+import logging
+import threading
+from datetime import datetime, date, timedelta, timezone
+from functools import cmp_to_key
+from typing import Dict, List, Any, Optional, Tuple, Set, Callable, Iterable
+
+from neo4j import Record, EagerResult
+from neo4j import time as neo4j_time
+
+logger = logging.getLogger(__name__)
+
+# 파싱한 쿼리 캐시 크기 (같은 템플릿 반복 실행 시 재파싱 방지)
+PARSE_CACHE_SIZE = 512
+
+class MemoryGraphError(Exception):
+    """지원하지 않는 구문 또는 실행 오류"""
+
+class ConstraintViolation(MemoryGraphError):
+    """유일성 제약조건 위반"""
+
+class ProcedureNotFound(MemoryGraphError):
+    """등록되지 않은 프로시저 (Neo4j와 같은 오류 코드)"""
+    code = 'Neo.ClientError.Procedure.ProcedureNotFound'
+
+# ---------------------------------------------------------------------------
+# 저장 구조
+# ---------------------------------------------------------------------------
+
+class _Node:
+    __slots__ = ('id', 'labels', 'props', 'deleted')
+    
+    def __init__(self, node_id: int, labels: Iterable[str], props: Dict[str, Any]):
+        self.id = node_id
+        self.labels = dict.fromkeys(labels)
+        self.props = props
+        self.deleted = False
+
+class _Rel:
+    __slots__ = ('id', 'type', 'start', 'end', 'props', 'deleted')
+    
+    def __init__(self, rel_id: int, rel_type: str, start: _Node, end: _Node, props: Dict[str, Any]):
+        self.id = rel_id
+        self.type = rel_type
+        self.start = start
+        self.end = end
+        self.props = props
+        self.deleted = False
+
+class _PropertyIndex:
+    """라벨(또는 관계 타입) + 속성 목록 인덱스 {속성 값 튜플: {id}}"""
+    
+    def __init__(self, name: str, entity: str, token: str, properties: Tuple[str, ...],
+                 index_type: str = 'RANGE', owning_constraint: Optional[str] = None, unique: bool = False):
+        self.name = name
+        self.entity = entity
+        self.token = token
+        self.properties = properties
+        self.index_type = index_type
+        self.owning_constraint = owning_constraint
+        self.unique = unique
+        self.data: Dict[Tuple, Set[int]] = {}
+    
+    def key_of(self, item) -> Optional[Tuple]:
+        values = []
+        for name in self.properties:
+            value = item.props.get(name)
+            if value is None:
+                return None
+            values.append(_hashable(value))
+        return tuple(values)
+    
+    def add(self, item):
+        key = self.key_of(item)
+        if key is None:
+            return
+        ids = self.data.setdefault(key, set())
+        if self.unique and ids and item.id not in ids:
+            raise ConstraintViolation(
+                f"유일성 제약조건 '{self.owning_constraint}' 위반: "
+                f":{self.token}({', '.join(self.properties)}) = {key if len(key) > 1 else key[0]!r}"
+            )
+        ids.add(item.id)
+    
+    def remove(self, item):
+        key = self.key_of(item)
+        if key is None:
+            return
+        ids = self.data.get(key)
+        if ids:
+            ids.discard(item.id)
+            if not ids:
+                del self.data[key]
+
+class _Constraint:
+    def __init__(self, name: str, kind: str, entity: str, token: str, properties: Tuple[str, ...]):
+        self.name = name
+        self.kind = kind            # UNIQUENESS | NODE_KEY | NODE_PROPERTY_EXISTENCE | RELATIONSHIP_UNIQUENESS
+        self.entity = entity
+        self.token = token
+        self.properties = properties
+
+class SummaryCounters:
+    """neo4j.SummaryCounters와 같은 이름의 카운터"""
+    
+    FIELDS = ('nodes_created', 'nodes_deleted', 'relationships_created', 'relationships_deleted',
+              'properties_set', 'labels_added', 'labels_removed', 'indexes_added', 'indexes_removed',
+              'constraints_added', 'constraints_removed')
+    
+    def __init__(self):
+        for name in self.FIELDS:
+            setattr(self, name, 0)
+        self.system_updates = 0
+    
+    @property
+    def contains_updates(self) -> bool:
+        return any(getattr(self, name) for name in self.FIELDS)
+    
+    @property
+    def contains_system_updates(self) -> bool:
+        return bool(self.system_updates)
+    
+    def merge(self, other: 'SummaryCounters'):
+        for name in self.FIELDS:
+            setattr(self, name, getattr(self, name) + getattr(other, name))
+    
+    def __repr__(self):
+        return "{" + ", ".join(f"'{name}': {getattr(self, name)}" for name in self.FIELDS if getattr(self, name)) + "}"
+
+class MemoryNode:
+    """결과로 반환되는 노드 (neo4j.graph.Node와 같은 속성/매핑 인터페이스)"""
+    
+    def __init__(self, node: _Node):
+        self.id = node.id
+        self.element_id = f"4:memory:{node.id}"
+        self.labels = frozenset(node.labels)
+        self._properties = dict(node.props)
+    
+    def __getitem__(self, key):
+        return self._properties[key]
+    
+    def __contains__(self, key):
+        return key in self._properties
+    
+    def __iter__(self):
+        return iter(self._properties)
+    
+    def __len__(self):
+        return len(self._properties)
+    
+    def get(self, key, default=None):
+        return self._properties.get(key, default)
+    
+    def keys(self):
+        return self._properties.keys()
+    
+    def values(self):
+        return self._properties.values()
+    
+    def items(self):
+        return self._properties.items()
+    
+    def __eq__(self, other):
+        return isinstance(other, MemoryNode) and other.element_id == self.element_id
+    
+    def __hash__(self):
+        return hash(self.element_id)
+    
+    def __repr__(self):
+        return f"<Node element_id={self.element_id!r} labels={set(self.labels)!r} properties={self._properties!r}>"
+
+class MemoryRelationship(MemoryNode):
+    """결과로 반환되는 관계 (neo4j.graph.Relationship와 같은 속성)"""
+    
+    def __init__(self, rel: _Rel):
+        self.id = rel.id
+        self.element_id = f"5:memory:{rel.id}"
+        self.type = rel.type
+        self.start_node = MemoryNode(rel.start)
+        self.end_node = MemoryNode(rel.end)
+        self.nodes = (self.start_node, self.end_node)
+        self._properties = dict(rel.props)
+    
+    def __repr__(self):
+        return f"<Relationship element_id={self.element_id!r} type={self.type!r} properties={self._properties!r}>"
+
+# ---------------------------------------------------------------------------
+# 값 변환 / 비교
+# ---------------------------------------------------------------------------
+
+_FRACTION = re.compile(r'(\.\d{6})\d+')
+
+def _parse_datetime(text: str) -> datetime:
+    text = _FRACTION.sub(r'\1', text.strip())
+    text = re.sub(r'\[[^\]]+\]$', '', text)
+    parsed = datetime.fromisoformat(text.replace('Z', '+00:00'))
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+_DURATION = re.compile(
+    r'^P(?:(?P<years>[-\d.]+)Y)?(?:(?P<months>[-\d.]+)M)?(?:(?P<weeks>[-\d.]+)W)?(?:(?P<days>[-\d.]+)D)?'
+    r'(?:T(?:(?P<hours>[-\d.]+)H)?(?:(?P<minutes>[-\d.]+)M)?(?:(?P<seconds>[-\d.]+)S)?)?$'
+)
+
+def _parse_duration(value) -> timedelta:
+    """ISO 8601 기간 또는 {days: .., hours: ..} 맵 (월=30일, 년=365일 근사)"""
+    if isinstance(value, dict):
+        parts = {key.lower(): float(amount) for key, amount in value.items()}
+    else:
+        match = _DURATION.match(value.strip().upper())
+        if not match:
+            raise MemoryGraphError(f"기간 형식이 아닙니다: {value!r}")
+        parts = {key: float(amount) for key, amount in match.groupdict().items() if amount}
+    days = parts.get('years', 0) * 365 + parts.get('months', 0) * 30 + parts.get('weeks', 0) * 7 + parts.get('days', 0)
+    return timedelta(days=days, hours=parts.get('hours', 0), minutes=parts.get('minutes', 0),
+                     seconds=parts.get('seconds', 0), milliseconds=parts.get('milliseconds', 0))
+
+def _to_internal(value: Any) -> Any:
+    """파라미터 → 내부 값 (neo4j.time 타입은 파이썬 타입으로, 시간대 없는 datetime은 UTC)"""
+    if isinstance(value, (str, int, float, bool)) or value is None:
+        return value
+    if isinstance(value, neo4j_time.Duration):
+        return timedelta(days=value.months * 30 + value.days, seconds=value.seconds,
+                         microseconds=value.nanoseconds // 1000)
+    to_native = getattr(value, 'to_native', None)
+    if callable(to_native):
+        value = to_native()
+    if isinstance(value, datetime):
+        return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+    if isinstance(value, dict):
+        return {key: _to_internal(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_to_internal(item) for item in value]
+    return value
+
+def _to_output(value: Any) -> Any:
+    """내부 값 → 결과 값 (드라이버와 같은 타입)"""
+    if isinstance(value, (str, int, float, bool)) or value is None:
+        return value
+    if isinstance(value, datetime):
+        return neo4j_time.DateTime.from_native(value)
+    if isinstance(value, date):
+        return neo4j_time.Date.from_native(value)
+    if isinstance(value, timedelta):
+        return neo4j_time.Duration(days=value.days, seconds=value.seconds, microseconds=value.microseconds)
+    if isinstance(value, _Node):
+        return MemoryNode(value)
+    if isinstance(value, _Rel):
+        return MemoryRelationship(value)
+    if isinstance(value, dict):
+        return {key: _to_output(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_to_output(item) for item in value]
+    return value
+
+def _hashable(value: Any) -> Any:
+    if isinstance(value, list):
+        return tuple(_hashable(item) for item in value)
+    if isinstance(value, dict):
+        return tuple(sorted((key, _hashable(item)) for key, item in value.items()))
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    return value
+
+def _is_number(value) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+def _equals(left, right) -> Optional[bool]:
+    """Cypher 동등 비교 (null이 섞이면 null)"""
+    if left is None or right is None:
+        return None
+    if _is_number(left) and _is_number(right):
+        return left == right
+    if isinstance(left, list) and isinstance(right, list):
+        if len(left) != len(right):
+            return False
+        result = True
+        for a, b in zip(left, right):
+            equal = _equals(a, b)
+            if equal is False:
+                return False
+            if equal is None:
+                result = None
+        return result
+    if type(left) is not type(right) and not (isinstance(left, datetime) and isinstance(right, datetime)):
+        if isinstance(left, bool) or isinstance(right, bool) or not (
+                isinstance(left, type(right)) or isinstance(right, type(left))):
+            return False
+    return left == right
+
+def _compare(left, right) -> Optional[int]:
+    """Cypher 크기 비교 (비교할 수 없으면 None)"""
+    if left is None or right is None:
+        return None
+    if _is_number(left) and _is_number(right) or \
+            isinstance(left, str) and isinstance(right, str) or \
+            isinstance(left, bool) and isinstance(right, bool) or \
+            isinstance(left, datetime) and isinstance(right, datetime) or \
+            isinstance(left, date) and isinstance(right, date) and \
+            not isinstance(left, datetime) and not isinstance(right, datetime) or \
+            isinstance(left, timedelta) and isinstance(right, timedelta):
+        return (left > right) - (left < right)
+    if isinstance(left, list) and isinstance(right, list):
+        for a, b in zip(left, right):
+            result = _compare(a, b)
+            if result is None or result != 0:
+                return result
+        return (len(left) > len(right)) - (len(left) < len(right))
+    return None
+
+# ORDER BY 정렬 순서 (오름차순 기준, null은 마지막)
+_TYPE_ORDER = [(dict, 0), (_Node, 1), (_Rel, 2), (list, 3), (datetime, 5), (date, 6),
+               (timedelta, 7), (str, 8), (bool, 9), (int, 10), (float, 10)]
+
+def _order_compare(left, right) -> int:
+    if left is None or right is None:
+        return (left is None) - (right is None)
+    left_rank = next(rank for kind, rank in _TYPE_ORDER if isinstance(left, kind)) \
+        if not isinstance(left, bool) else 9
+    right_rank = next(rank for kind, rank in _TYPE_ORDER if isinstance(right, kind)) \
+        if not isinstance(right, bool) else 9
+    if left_rank != right_rank:
+        return (left_rank > right_rank) - (left_rank < right_rank)
+    if isinstance(left, (_Node, _Rel)):
+        return (left.id > right.id) - (left.id < right.id)
+    if isinstance(left, dict):
+        return 0
+    result = _compare(left, right)
+    return result or 0
+
+def _truthy(value) -> bool:
+    return value is True
+
+# ---------------------------------------------------------------------------
+# 토크나이저
+# ---------------------------------------------------------------------------
+
+_TOKEN = re.compile(r"""
+    (?P<ws>\s+|//[^\n]*|/\*.*?\*/)
+  | (?P<string>'(?:[^'\\]|\\.)*'|"(?:[^"\\]|\\.)*")
+  | (?P<quoted>`(?:[^`]|``)*`)
+  | (?P<number>\d+\.\d+(?:[eE][-+]?\d+)?|\d+(?:[eE][-+]?\d+)?)
+  | (?P<param>\$(?:[A-Za-z_][A-Za-z0-9_]*|\d+))
+  | (?P<ident>[A-Za-z_][A-Za-z0-9_]*)
+  | (?P<op><>|!=|<=|>=|=~|\+=|\.\.|->|<-|[-+*/%^=<>(){}\[\],.:;|])
+""", re.X | re.S)
+
+_ESCAPES = {'n': '\n', 't': '\t', 'r': '\r', '\\': '\\', "'": "'", '"': '"', 'b': '\b', 'f': '\f'}
+
+class _Token:
+    __slots__ = ('kind', 'value', 'upper', 'start', 'end')
+    
+    def __init__(self, kind, value, start, end):
+        self.kind = kind
+        self.value = value
+        self.upper = value.upper() if kind == 'ident' else None
+        self.start = start
+        self.end = end
+    
+    def __repr__(self):
+        return f"{self.kind}:{self.value}"
+
+def _tokenize(text: str) -> List[_Token]:
+    tokens = []
+    position = 0
+    while position < len(text):
+        match = _TOKEN.match(text, position)
+        if not match:
+            raise MemoryGraphError(f"Cypher 구문 오류 (위치 {position}): {text[position:position + 30]!r}")
+        kind = match.lastgroup
+        value = match.group()
+        if kind == 'string':
+            body = value[1:-1]
+            value = re.sub(r'\\(u[0-9a-fA-F]{4}|.)',
+                           lambda m: chr(int(m.group(1)[1:], 16)) if m.group(1)[0] == 'u'
+                           else _ESCAPES.get(m.group(1), m.group(1)), body)
+        elif kind == 'quoted':
+            kind, value = 'name', value[1:-1].replace('``', '`')
+        elif kind == 'param':
+            value = value[1:]
+        if kind != 'ws':
+            tokens.append(_Token(kind, value, match.start(), match.end()))
+        position = match.end()
+    tokens.append(_Token('eof', '', len(text), len(text)))
+    return tokens
+
+# ---------------------------------------------------------------------------
+# 파서 (AST는 튜플: ('종류', ...))
+# ---------------------------------------------------------------------------
+
+_CLAUSE_KEYWORDS = {'MATCH', 'OPTIONAL', 'WHERE', 'WITH', 'RETURN', 'UNWIND', 'MERGE', 'CREATE', 'SET',
+                    'REMOVE', 'DELETE', 'DETACH', 'CALL', 'ORDER', 'SKIP', 'LIMIT', 'UNION', 'ON',
+                    'YIELD', 'FOREACH', 'LOAD', 'USE'}
+
+_AGGREGATES = {'count', 'sum', 'avg', 'min', 'max', 'collect', 'stdev'}
+
+class _NodePattern:
+    def __init__(self, var, labels, props):
+        self.var = var
+        self.labels = labels
+        self.props = props              # [(key, ast)] 또는 None
+
+class _RelPattern:
+    def __init__(self, var, types, props, direction):
+        self.var = var
+        self.types = types
+        self.props = props
+        self.direction = direction      # 'out' | 'in' | 'both'
+
+class _PathPattern:
+    def __init__(self, nodes: List[_NodePattern], rels: List[_RelPattern]):
+        self.nodes = nodes
+        self.rels = rels
+    
+    def variables(self) -> List[str]:
+        return [item.var for item in self.nodes + self.rels if item.var]
+
+class _Parser:
+    def __init__(self, text: str):
+        self.text = text
+        self.tokens = _tokenize(text)
+        self.position = 0
+        self.anonymous = 0
+    
+    # -- 토큰 도우미 --
+    
+    def peek(self, offset: int = 0) -> _Token:
+        return self.tokens[min(self.position + offset, len(self.tokens) - 1)]
+    
+    def next(self) -> _Token:
+        token = self.tokens[self.position]
+        self.position += 1
+        return token
+    
+    def at_kw(self, *words, offset: int = 0) -> bool:
+        token = self.peek(offset)
+        return token.kind == 'ident' and token.upper in words
+    
+    def accept_kw(self, *words) -> bool:
+        if self.at_kw(*words):
+            self.position += 1
+            return True
+        return False
+    
+    def expect_kw(self, *words):
+        if not self.accept_kw(*words):
+            self.error(f"{' '.join(words)} 필요")
+    
+    def at_op(self, *ops, offset: int = 0) -> bool:
+        token = self.peek(offset)
+        return token.kind == 'op' and token.value in ops
+    
+    def accept_op(self, *ops) -> bool:
+        if self.at_op(*ops):
+            self.position += 1
+            return True
+        return False
+    
+    def expect_op(self, op):
+        if not self.accept_op(op):
+            self.error(f"'{op}' 필요")
+    
+    def name(self) -> str:
+        token = self.next()
+        if token.kind not in ('ident', 'name'):
+            self.position -= 1
+            self.error("이름 필요")
+        return token.value
+    
+    def error(self, message: str):
+        token = self.peek()
+        raise MemoryGraphError(f"Cypher 구문 오류: {message} (위치 {token.start}: "
+                               f"{self.text[token.start:token.start + 40]!r})")
+    
+    def unsupported(self, what: str):
+        raise MemoryGraphError(f"인메모리 그래프가 지원하지 않는 Cypher: {what}")
+    
+    # -- 쿼리 / 절 --
+    
+    def parse_query(self):
+        parts = [self.parse_single()]
+        union_all = []
+        while self.accept_kw('UNION'):
+            union_all.append(self.accept_kw('ALL'))
+            parts.append(self.parse_single())
+        self.accept_op(';')
+        if self.peek().kind != 'eof':
+            self.error("쿼리 끝 필요")
+        return parts, union_all
+    
+    def parse_single(self, subquery: bool = False):
+        clauses = []
+        while True:
+            token = self.peek()
+            if token.kind == 'eof' or self.at_op(';') or self.at_kw('UNION') or (subquery and self.at_op('}')):
+                break
+            clauses.append(self.parse_clause())
+        if not clauses:
+            self.error("절 필요")
+        return clauses
+    
+    def parse_clause(self):
+        if self.accept_kw('OPTIONAL'):
+            self.expect_kw('MATCH')
+            return self.parse_match(optional=True)
+        if self.accept_kw('MATCH'):
+            return self.parse_match(optional=False)
+        if self.accept_kw('UNWIND'):
+            expression = self.parse_expression()
+            self.expect_kw('AS')
+            return ('unwind', expression, self.name())
+        if self.accept_kw('WITH'):
+            return ('with', self.parse_projection(allow_where=True))
+        if self.accept_kw('RETURN'):
+            return ('return', self.parse_projection(allow_where=False))
+        if self.accept_kw('MERGE'):
+            path = self.parse_path()
+            actions = []
+            while self.at_kw('ON'):
+                self.next()
+                kind = 'create' if self.accept_kw('CREATE') else ('match' if self.accept_kw('MATCH') else None)
+                if kind is None:
+                    self.error("ON CREATE 또는 ON MATCH 필요")
+                self.expect_kw('SET')
+                actions.append((kind, self.parse_set_items()))
+            return ('merge', path, actions)
+        if self.accept_kw('CREATE'):
+            paths = [self.parse_path()]
+            while self.accept_op(','):
+                paths.append(self.parse_path())
+            return ('create', paths)
+        if self.accept_kw('SET'):
+            return ('set', self.parse_set_items())
+        if self.accept_kw('REMOVE'):
+            items = []
+            while True:
+                target = self.name()
+                if self.accept_op('.'):
+                    items.append(('prop', target, self.name()))
+                else:
+                    labels = []
+                    while self.accept_op(':'):
+                        labels.append(self.name())
+                    if not labels:
+                        self.error("REMOVE 대상 필요")
+                    items.append(('labels', target, labels))
+                if not self.accept_op(','):
+                    break
+            return ('remove', items)
+        if self.at_kw('DETACH') or self.at_kw('DELETE'):
+            detach = self.accept_kw('DETACH')
+            self.expect_kw('DELETE')
+            expressions = [self.parse_expression()]
+            while self.accept_op(','):
+                expressions.append(self.parse_expression())
+            return ('delete', expressions, detach)
+        if self.accept_kw('CALL'):
+            return self.parse_call()
+        if self.at_kw('FOREACH', 'LOAD', 'USE'):
+            self.unsupported(self.peek().value.upper())
+        self.error("알 수 없는 절")
+    
+    def parse_match(self, optional: bool):
+        paths = [self.parse_path()]
+        while self.accept_op(','):
+            paths.append(self.parse_path())
+        where = self.parse_expression() if self.accept_kw('WHERE') else None
+        return ('match', paths, where, optional)
+    
+    def parse_call(self):
+        if self.accept_op('{'):
+            inner = self.parse_single(subquery=True)
+            self.expect_op('}')
+            batch = None
+            if self.accept_kw('IN'):
+                self.expect_kw('TRANSACTIONS')
+                if self.accept_kw('OF'):
+                    batch = self.parse_expression()
+                    self.expect_kw('ROWS', 'ROW')
+            return ('subquery', inner, batch)
+        name = self.name()
+        while self.accept_op('.'):
+            name += '.' + self.name()
+        arguments = []
+        if self.accept_op('('):
+            if not self.accept_op(')'):
+                arguments.append(self.parse_expression())
+                while self.accept_op(','):
+                    arguments.append(self.parse_expression())
+                self.expect_op(')')
+        yields = None
+        where = None
+        if self.accept_kw('YIELD'):
+            if self.accept_op('*'):
+                yields = '*'
+            else:
+                yields = []
+                while True:
+                    column = self.name()
+                    alias = self.name() if self.accept_kw('AS') else column
+                    yields.append((column, alias))
+                    if not self.accept_op(','):
+                        break
+            if self.accept_kw('WHERE'):
+                where = self.parse_expression()
+        return ('call', name.lower(), arguments, yields, where)
+    
+    def parse_set_items(self):
+        items = []
+        while True:
+            target = self.name()
+            if self.accept_op('.'):
+                key = self.name()
+                self.expect_op('=')
+                items.append(('prop', target, key, self.parse_expression()))
+            elif self.accept_op('+='):
+                items.append(('merge', target, self.parse_expression()))
+            elif self.accept_op('='):
+                items.append(('replace', target, self.parse_expression()))
+            elif self.at_op(':'):
+                labels = []
+                while self.accept_op(':'):
+                    labels.append(self.name())
+                items.append(('labels', target, labels))
+            else:
+                self.error("SET 항목 필요")
+            if not self.accept_op(','):
+                break
+        return items
+    
+    def parse_projection(self, allow_where: bool):
+        distinct = self.accept_kw('DISTINCT')
+        star = self.accept_op('*')
+        items = []
+        if not star or self.accept_op(','):
+            while True:
+                start = self.peek().start
+                expression = self.parse_expression()
+                end = self.tokens[self.position - 1].end
+                alias = self.name() if self.accept_kw('AS') else self.text[start:end].strip()
+                items.append((alias, expression))
+                if not self.accept_op(','):
+                    break
+        order = []
+        if self.accept_kw('ORDER'):
+            self.expect_kw('BY')
+            while True:
+                expression = self.parse_expression()
+                descending = False
+                if self.accept_kw('DESC', 'DESCENDING'):
+                    descending = True
+                else:
+                    self.accept_kw('ASC', 'ASCENDING')
+                order.append((expression, descending))
+                if not self.accept_op(','):
+                    break
+        skip = self.parse_expression() if self.accept_kw('SKIP') else None
+        limit = self.parse_expression() if self.accept_kw('LIMIT') else None
+        where = self.parse_expression() if allow_where and self.accept_kw('WHERE') else None
+        return {'distinct': distinct, 'star': star, 'items': items, 'order': order,
+                'skip': skip, 'limit': limit, 'where': where}
+    
+    # -- 패턴 --
+    
+    def parse_path(self) -> _PathPattern:
+        if self.peek().kind in ('ident', 'name') and self.at_op('=', offset=1):
+            self.unsupported("경로 변수 (p = ...)")
+        nodes = [self.parse_node_pattern()]
+        rels = []
+        while self.at_op('-', '<-'):
+            rels.append(self.parse_rel_pattern())
+            nodes.append(self.parse_node_pattern())
+        return _PathPattern(nodes, rels)
+    
+    def parse_node_pattern(self) -> _NodePattern:
+        self.expect_op('(')
+        var = None
+        if self.peek().kind in ('ident', 'name') and not self.at_op(':'):
+            var = self.name()
+        labels = []
+        while self.accept_op(':'):
+            labels.append(self.name())
+            while self.accept_op('&'):
+                labels.append(self.name())
+        props = self.parse_map_literal() if self.at_op('{') else None
+        if self.at_kw('WHERE'):
+            self.unsupported("패턴 내부 WHERE")
+        self.expect_op(')')
+        return _NodePattern(var or self._anonymous(), labels, props)
+    
+    def parse_rel_pattern(self) -> _RelPattern:
+        incoming = self.accept_op('<-')
+        if not incoming:
+            self.expect_op('-')
+        var, types, props = None, [], None
+        if self.accept_op('['):
+            if self.peek().kind in ('ident', 'name'):
+                var = self.name()
+            if self.accept_op(':'):
+                types.append(self.name())
+                while self.accept_op('|'):
+                    self.accept_op(':')
+                    types.append(self.name())
+            if self.at_op('*'):
+                self.unsupported("가변 길이 관계 (*)")
+            if self.at_op('{'):
+                props = self.parse_map_literal()
+            self.expect_op(']')
+        outgoing = self.accept_op('->')
+        if not outgoing:
+            self.expect_op('-')
+        if incoming and outgoing:
+            self.error("양쪽 방향 화살표")
+        direction = 'out' if outgoing else ('in' if incoming else 'both')
+        return _RelPattern(var or self._anonymous(), types, props, direction)
+    
+    def _anonymous(self) -> str:
+        self.anonymous += 1
+        return f"  anon_{self.anonymous}"
+    
+    def parse_map_literal(self):
+        self.expect_op('{')
+        entries = []
+        if not self.accept_op('}'):
+            while True:
+                key = self.name() if self.peek().kind in ('ident', 'name') else self.next().value
+                self.expect_op(':')
+                entries.append((key, self.parse_expression()))
+                if not self.accept_op(','):
+                    break
+            self.expect_op('}')
+        return entries
+    
+    # -- 식 --
+    
+    def parse_expression(self):
+        return self.parse_or()
+    
+    def parse_or(self):
+        left = self.parse_xor()
+        while self.accept_kw('OR'):
+            left = ('or', left, self.parse_xor())
+        return left
+    
+    def parse_xor(self):
+        left = self.parse_and()
+        while self.accept_kw('XOR'):
+            left = ('xor', left, self.parse_and())
+        return left
+    
+    def parse_and(self):
+        left = self.parse_not()
+        while self.accept_kw('AND'):
+            left = ('and', left, self.parse_not())
+        return left
+    
+    def parse_not(self):
+        if self.accept_kw('NOT'):
+            return ('not', self.parse_not())
+        return self.parse_comparison()
+    
+    def parse_comparison(self):
+        left = self.parse_additive()
+        while True:
+            if self.at_op('=', '<>', '!=', '<', '>', '<=', '>=', '=~'):
+                op = self.next().value
+                left = ('cmp', '<>' if op == '!=' else op, left, self.parse_additive())
+            elif self.at_kw('IN'):
+                self.next()
+                left = ('in', left, self.parse_additive())
+            elif self.at_kw('CONTAINS'):
+                self.next()
+                left = ('str', 'contains', left, self.parse_additive())
+            elif self.at_kw('STARTS') and self.at_kw('WITH', offset=1):
+                self.position += 2
+                left = ('str', 'starts', left, self.parse_additive())
+            elif self.at_kw('ENDS') and self.at_kw('WITH', offset=1):
+                self.position += 2
+                left = ('str', 'ends', left, self.parse_additive())
+            elif self.at_kw('IS'):
+                self.next()
+                negate = self.accept_kw('NOT')
+                self.expect_kw('NULL')
+                left = ('isnull', left, negate)
+            else:
+                return left
+    
+    def parse_additive(self):
+        left = self.parse_multiplicative()
+        while self.at_op('+', '-'):
+            op = self.next().value
+            left = ('arith', op, left, self.parse_multiplicative())
+        return left
+    
+    def parse_multiplicative(self):
+        left = self.parse_power()
+        while self.at_op('*', '/', '%'):
+            op = self.next().value
+            left = ('arith', op, left, self.parse_power())
+        return left
+    
+    def parse_power(self):
+        left = self.parse_unary()
+        while self.accept_op('^'):
+            left = ('arith', '^', left, self.parse_unary())
+        return left
+    
+    def parse_unary(self):
+        if self.accept_op('-'):
+            return ('neg', self.parse_unary())
+        if self.accept_op('+'):
+            return self.parse_unary()
+        return self.parse_postfix()
+    
+    def parse_postfix(self):
+        expression = self.parse_atom()
+        while True:
+            if self.accept_op('.'):
+                expression = ('prop', expression, self.name())
+            elif self.at_op('['):
+                self.next()
+                if self.accept_op('..'):
+                    upper = None if self.at_op(']') else self.parse_expression()
+                    self.expect_op(']')
+                    expression = ('slice', expression, None, upper)
+                    continue
+                index = self.parse_expression()
+                if self.accept_op('..'):
+                    upper = None if self.at_op(']') else self.parse_expression()
+                    self.expect_op(']')
+                    expression = ('slice', expression, index, upper)
+                else:
+                    self.expect_op(']')
+                    expression = ('index', expression, index)
+            elif self.at_op(':') and self.peek(1).kind in ('ident', 'name'):
+                labels = []
+                while self.accept_op(':'):
+                    labels.append(self.name())
+                expression = ('haslabels', expression, labels)
+            else:
+                return expression
+    
+    def parse_atom(self):
+        token = self.peek()
+        if token.kind == 'number':
+            self.next()
+            text = token.value
+            return ('lit', float(text) if ('.' in text or 'e' in text.lower()) else int(text))
+        if token.kind == 'string':
+            self.next()
+            return ('lit', token.value)
+        if token.kind == 'param':
+            self.next()
+            return ('param', token.value)
+        if self.at_op('('):
+            self.next()
+            expression = self.parse_expression()
+            self.expect_op(')')
+            return expression
+        if self.at_op('['):
+            return self.parse_list()
+        if self.at_op('{'):
+            return ('map', self.parse_map_literal())
+        if token.kind == 'name':
+            self.next()
+            return self.parse_identifier_tail(token.value)
+        if token.kind == 'ident':
+            upper = token.upper
+            if upper == 'TRUE':
+                self.next()
+                return ('lit', True)
+            if upper == 'FALSE':
+                self.next()
+                return ('lit', False)
+            if upper == 'NULL':
+                self.next()
+                return ('lit', None)
+            if upper == 'CASE':
+                self.next()
+                return self.parse_case()
+            if upper in ('COUNT', 'EXISTS') and self.at_op('{', offset=1):
+                self.position += 2
+                return self.parse_pattern_subquery(upper.lower())
+            if upper in ('ANY', 'ALL', 'NONE', 'SINGLE') and self.at_op('(', offset=1) and \
+                    self.peek(3).kind == 'ident' and self.peek(3).upper == 'IN':
+                self.position += 2
+                var = self.name()
+                self.expect_kw('IN')
+                source = self.parse_expression()
+                self.expect_kw('WHERE')
+                predicate = self.parse_expression()
+                self.expect_op(')')
+                return ('quantifier', upper.lower(), var, source, predicate)
+            if upper == 'REDUCE' and self.at_op('(', offset=1):
+                self.position += 2
+                accumulator = self.name()
+                self.expect_op('=')
+                initial = self.parse_expression()
+                self.expect_op(',')
+                var = self.name()
+                self.expect_kw('IN')
+                source = self.parse_expression()
+                self.expect_op('|')
+                expression = self.parse_expression()
+                self.expect_op(')')
+                return ('reduce', accumulator, initial, var, source, expression)
+            self.next()
+            return self.parse_identifier_tail(token.value)
+        self.error("식 필요")
+    
+    def parse_identifier_tail(self, name: str):
+        # 함수 이름은 점으로 이어질 수 있음 (apoc.text.join 등)
+        if self.at_op('.') and self.peek(1).kind == 'ident' and self._is_function_path():
+            while self.accept_op('.'):
+                name += '.' + self.name()
+        if self.accept_op('('):
+            function = name.lower()
+            if function == 'count' and self.accept_op('*'):
+                self.expect_op(')')
+                return ('countstar',)
+            distinct = self.accept_kw('DISTINCT')
+            arguments = []
+            if not self.accept_op(')'):
+                arguments.append(self.parse_expression())
+                while self.accept_op(','):
+                    arguments.append(self.parse_expression())
+                self.expect_op(')')
+            return ('call', function, distinct, arguments)
+        return ('var', name)
+    
+    def _is_function_path(self) -> bool:
+        offset = 0
+        while self.at_op('.', offset=offset) and self.peek(offset + 1).kind == 'ident':
+            offset += 2
+        return self.at_op('(', offset=offset)
+    
+    def parse_list(self):
+        self.expect_op('[')
+        if self.peek().kind in ('ident', 'name') and self.at_kw('IN', offset=1):
+            var = self.name()
+            self.next()
+            source = self.parse_expression()
+            predicate = self.parse_expression() if self.accept_kw('WHERE') else None
+            projection = self.parse_expression() if self.accept_op('|') else None
+            self.expect_op(']')
+            return ('listcomp', var, source, predicate, projection)
+        items = []
+        if not self.accept_op(']'):
+            items.append(self.parse_expression())
+            while self.accept_op(','):
+                items.append(self.parse_expression())
+            self.expect_op(']')
+        return ('list', items)
+    
+    def parse_case(self):
+        subject = None if self.at_kw('WHEN') else self.parse_expression()
+        branches = []
+        while self.accept_kw('WHEN'):
+            condition = self.parse_expression()
+            self.expect_kw('THEN')
+            branches.append((condition, self.parse_expression()))
+        default = self.parse_expression() if self.accept_kw('ELSE') else None
+        self.expect_kw('END')
+        return ('case', subject, branches, default)
+    
+    def parse_pattern_subquery(self, kind: str):
+        if self.at_kw('MATCH'):
+            self.next()
+        path = self.parse_path()
+        where = self.parse_expression() if self.accept_kw('WHERE') else None
+        self.expect_op('}')
+        return ('patternquery', kind, path, where)
+
+def _walk(ast):
+    """AST 하위 노드 순회"""
+    if not isinstance(ast, tuple):
+        return
+    yield ast
+    for part in ast[1:]:
+        if isinstance(part, tuple):
+            yield from _walk(part)
+        elif isinstance(part, list):
+            for item in part:
+                if isinstance(item, tuple):
+                    if item and isinstance(item[0], str):
+                        yield from _walk(item)
+                    else:
+                        for sub in item:
+                            yield from _walk(sub)
+
+def _variables(ast) -> Set[str]:
+    return {node[1] for node in _walk(ast) if node[0] == 'var'}
+
+def _has_aggregate(ast) -> bool:
+    return any(node[0] == 'countstar' or (node[0] == 'call' and node[1] in _AGGREGATES) for node in _walk(ast))
+
+# ---------------------------------------------------------------------------
+# 식 컴파일 (AST → fn(row, ctx))
+# ---------------------------------------------------------------------------
+
+class _Context:
+    """쿼리 실행 하나의 상태 (파라미터, 트랜잭션, 현재 시각)"""
+    
+    def __init__(self, graph: 'MemoryGraph', tx: '_WriteLog', params: Dict[str, Any]):
+        self.graph = graph
+        self.tx = tx
+        self.params = params
+        self.now = datetime.now(timezone.utc)
+
+def _compile(ast) -> Callable:
+    kind = ast[0]
+    
+    if kind == 'lit':
+        value = ast[1]
+        return lambda row, ctx: value
+    
+    if kind == 'param':
+        name = ast[1]
+        
+        def param(row, ctx):
+            if name not in ctx.params:
+                raise MemoryGraphError(f"파라미터가 전달되지 않았습니다: ${name}")
+            return ctx.params[name]
+        return param
+    
+    if kind == 'var':
+        name = ast[1]
+        
+        def variable(row, ctx):
+            try:
+                return row[name]
+            except KeyError:
+                raise MemoryGraphError(f"정의되지 않은 변수: {name}") from None
+        return variable
+    
+    if kind == 'aggref':
+        slot = ast[1]
+        return lambda row, ctx: row[slot]
+    
+    if kind == 'prop':
+        target, key = _compile(ast[1]), ast[2]
+        
+        def prop(row, ctx):
+            value = target(row, ctx)
+            if value is None:
+                return None
+            if isinstance(value, (_Node, _Rel)):
+                return value.props.get(key)
+            if isinstance(value, dict):
+                return value.get(key)
+            if isinstance(value, (datetime, date)):
+                return _temporal_field(value, key)
+            if isinstance(value, timedelta):
+                return _duration_field(value, key)
+            raise MemoryGraphError(f"속성을 읽을 수 없는 값: {type(value).__name__}.{key}")
+        return prop
+    
+    if kind == 'index':
+        target, index = _compile(ast[1]), _compile(ast[2])
+        
+        def subscript(row, ctx):
+            value, position = target(row, ctx), index(row, ctx)
+            if value is None or position is None:
+                return None
+            if isinstance(value, (_Node, _Rel)):
+                return value.props.get(position)
+            if isinstance(value, dict):
+                return value.get(position)
+            if not _is_number(position):
+                raise MemoryGraphError("리스트 인덱스는 정수여야 합니다")
+            position = int(position)
+            return value[position] if -len(value) <= position < len(value) else None
+        return subscript
+    
+    if kind == 'slice':
+        target = _compile(ast[1])
+        lower = _compile(ast[2]) if ast[2] else None
+        upper = _compile(ast[3]) if ast[3] else None
+        
+        def slicer(row, ctx):
+            value = target(row, ctx)
+            if value is None:
+                return None
+            start = lower(row, ctx) if lower else None
+            stop = upper(row, ctx) if upper else None
+            return value[start:stop]
+        return slicer
+    
+    if kind == 'haslabels':
+        target, labels = _compile(ast[1]), ast[2]
+        
+        def haslabels(row, ctx):
+            value = target(row, ctx)
+            if value is None:
+                return None
+            if isinstance(value, _Rel):
+                return value.type in labels
+            return all(label in value.labels for label in labels)
+        return haslabels
+    
+    if kind == 'list':
+        items = [_compile(item) for item in ast[1]]
+        return lambda row, ctx: [item(row, ctx) for item in items]
+    
+    if kind == 'map':
+        entries = [(key, _compile(value)) for key, value in ast[1]]
+        return lambda row, ctx: {key: value(row, ctx) for key, value in entries}
+    
+    if kind in ('and', 'or', 'xor'):
+        left, right = _compile(ast[1]), _compile(ast[2])
+        if kind == 'and':
+            def conjunction(row, ctx):
+                a = left(row, ctx)
+                if a is False:
+                    return False
+                b = right(row, ctx)
+                if b is False:
+                    return False
+                return None if a is None or b is None else True
+            return conjunction
+        if kind == 'or':
+            def disjunction(row, ctx):
+                a = left(row, ctx)
+                if a is True:
+                    return True
+                b = right(row, ctx)
+                if b is True:
+                    return True
+                return None if a is None or b is None else False
+            return disjunction
+        
+        def exclusive(row, ctx):
+            a, b = left(row, ctx), right(row, ctx)
+            return None if a is None or b is None else a != b
+        return exclusive
+    
+    if kind == 'not':
+        operand = _compile(ast[1])
+        
+        def negation(row, ctx):
+            value = operand(row, ctx)
+            return None if value is None else not value
+        return negation
+    
+    if kind == 'cmp':
+        op, left, right = ast[1], _compile(ast[2]), _compile(ast[3])
+        if op == '=':
+            return lambda row, ctx: _equals(left(row, ctx), right(row, ctx))
+        if op == '<>':
+            def not_equal(row, ctx):
+                result = _equals(left(row, ctx), right(row, ctx))
+                return None if result is None else not result
+            return not_equal
+        if op == '=~':
+            def regex(row, ctx):
+                value, pattern = left(row, ctx), right(row, ctx)
+                if not isinstance(value, str) or not isinstance(pattern, str):
+                    return None
+                return re.fullmatch(pattern, value) is not None
+            return regex
+        check = {'<': lambda c: c < 0, '>': lambda c: c > 0, '<=': lambda c: c <= 0, '>=': lambda c: c >= 0}[op]
+        
+        def comparison(row, ctx):
+            result = _compare(left(row, ctx), right(row, ctx))
+            return None if result is None else check(result)
+        return comparison
+    
+    if kind == 'in':
+        left, right = _compile(ast[1]), _compile(ast[2])
+        
+        def membership(row, ctx):
+            value, items = left(row, ctx), right(row, ctx)
+            if items is None:
+                return None
+            found_null = False
+            for item in items:
+                result = _equals(value, item)
+                if result:
+                    return True
+                if result is None:
+                    found_null = True
+            return None if found_null else False
+        return membership
+    
+    if kind == 'str':
+        op, left, right = ast[1], _compile(ast[2]), _compile(ast[3])
+        method = {'contains': str.__contains__, 'starts': str.startswith, 'ends': str.endswith}[op]
+        
+        def string_predicate(row, ctx):
+            value, other = left(row, ctx), right(row, ctx)
+            if not isinstance(value, str) or not isinstance(other, str):
+                return None
+            return method(value, other)
+        return string_predicate
+    
+    if kind == 'isnull':
+        operand, negate = _compile(ast[1]), ast[2]
+        if negate:
+            return lambda row, ctx: operand(row, ctx) is not None
+        return lambda row, ctx: operand(row, ctx) is None
+    
+    if kind == 'arith':
+        op, left, right = ast[1], _compile(ast[2]), _compile(ast[3])
+        return lambda row, ctx: _arithmetic(op, left(row, ctx), right(row, ctx))
+    
+    if kind == 'neg':
+        operand = _compile(ast[1])
+        
+        def negative(row, ctx):
+            value = operand(row, ctx)
+            return None if value is None else -value
+        return negative
+    
+    if kind == 'case':
+        subject = _compile(ast[1]) if ast[1] else None
+        branches = [(_compile(condition), _compile(result)) for condition, result in ast[2]]
+        default = _compile(ast[3]) if ast[3] else (lambda row, ctx: None)
+        
+        def case(row, ctx):
+            if subject is not None:
+                value = subject(row, ctx)
+                for condition, result in branches:
+                    if _equals(value, condition(row, ctx)):
+                        return result(row, ctx)
+            else:
+                for condition, result in branches:
+                    if condition(row, ctx) is True:
+                        return result(row, ctx)
+            return default(row, ctx)
+        return case
+    
+    if kind == 'listcomp':
+        var, source = ast[1], _compile(ast[2])
+        predicate = _compile(ast[3]) if ast[3] else None
+        projection = _compile(ast[4]) if ast[4] else None
+        
+        def comprehension(row, ctx):
+            items = source(row, ctx)
+            if items is None:
+                return None
+            result = []
+            scope = dict(row)
+            for item in items:
+                scope[var] = item
+                if predicate is None or predicate(scope, ctx) is True:
+                    result.append(projection(scope, ctx) if projection else item)
+            return result
+        return comprehension
+    
+    if kind == 'quantifier':
+        quantifier, var, source, predicate = ast[1], ast[2], _compile(ast[3]), _compile(ast[4])
+        
+        def quantified(row, ctx):
+            items = source(row, ctx)
+            if items is None:
+                return None
+            scope = dict(row)
+            matches = 0
+            for item in items:
+                scope[var] = item
+                if predicate(scope, ctx) is True:
+                    matches += 1
+            return {'any': matches > 0, 'all': matches == len(items),
+                    'none': matches == 0, 'single': matches == 1}[quantifier]
+        return quantified
+    
+    if kind == 'reduce':
+        accumulator, initial, var = ast[1], _compile(ast[2]), ast[3]
+        source, expression = _compile(ast[4]), _compile(ast[5])
+        
+        def reduction(row, ctx):
+            items = source(row, ctx)
+            if items is None:
+                return None
+            scope = dict(row)
+            scope[accumulator] = initial(row, ctx)
+            for item in items:
+                scope[var] = item
+                scope[accumulator] = expression(scope, ctx)
+            return scope[accumulator]
+        return reduction
+    
+    if kind == 'patternquery':
+        query_kind, path, where = ast[1], ast[2], (_compile(ast[3]) if ast[3] else None)
+        
+        def pattern_query(row, ctx):
+            count = 0
+            for match in ctx.graph._match_path(path, row, ctx, set(), {}):
+                if where is None or where(match, ctx) is True:
+                    count += 1
+                    if query_kind == 'exists':
+                        return True
+            return count if query_kind == 'count' else False
+        return pattern_query
+    
+    if kind == 'countstar':
+        raise MemoryGraphError("count(*)는 WITH/RETURN 에서만 사용할 수 있습니다")
+    
+    if kind == 'call':
+        name, arguments = ast[1], [_compile(argument) for argument in ast[3]]
+        if name in _AGGREGATES:
+            raise MemoryGraphError(f"집계 함수 {name}()는 WITH/RETURN 에서만 사용할 수 있습니다")
+        function = _FUNCTIONS.get(name)
+        if function is None:
+            raise MemoryGraphError(f"인메모리 그래프가 지원하지 않는 함수: {name}()")
+        return lambda row, ctx: function(ctx, *[argument(row, ctx) for argument in arguments])
+    
+    raise MemoryGraphError(f"알 수 없는 식: {kind}")
+
+def _arithmetic(op: str, left, right):
+    if left is None or right is None:
+        return None
+    if op == '+':
+        if isinstance(left, list):
+            return left + (right if isinstance(right, list) else [right])
+        if isinstance(right, list):
+            return [left] + right
+        if isinstance(left, str) or isinstance(right, str):
+            return _to_string(left) + _to_string(right)
+        return left + right
+    if op == '-':
+        return left - right
+    if op == '*':
+        return left * right
+    if op == '/':
+        if isinstance(left, int) and isinstance(right, int) and not isinstance(left, bool):
+            if right == 0:
+                raise MemoryGraphError("0으로 나눌 수 없습니다")
+            quotient = abs(left) // abs(right)
+            return quotient if (left >= 0) == (right >= 0) else -quotient
+        return left / right if right else (math.copysign(math.inf, left) if left else math.nan)
+    if op == '%':
+        return math.fmod(left, right) if isinstance(left, float) or isinstance(right, float) \
+            else int(math.fmod(left, right))
+    if op == '^':
+        return float(left) ** float(right)
+    raise MemoryGraphError(f"알 수 없는 연산자: {op}")
+
+def _temporal_field(value, key: str):
+    fields = {'year': 'year', 'month': 'month', 'day': 'day', 'hour': 'hour', 'minute': 'minute',
+              'second': 'second', 'microsecond': 'microsecond'}
+    if key in fields:
+        return getattr(value, fields[key], None)
+    if key == 'epochSeconds' and isinstance(value, datetime):
+        return int(value.timestamp())
+    if key == 'epochMillis' and isinstance(value, datetime):
+        return int(value.timestamp() * 1000)
+    if key == 'dayOfWeek':
+        return value.isoweekday()
+    return None
+
+def _duration_field(value: timedelta, key: str):
+    return {'days': value.days, 'seconds': int(value.total_seconds()), 'hours': int(value.total_seconds() // 3600),
+            'minutes': int(value.total_seconds() // 60), 'milliseconds': int(value.total_seconds() * 1000)}.get(key)
+
+def _to_string(value) -> Optional[str]:
+    if value is None:
+        return None
+    if isinstance(value, bool):
+        return 'true' if value else 'false'
+    if isinstance(value, (datetime, date)):
+        return value.isoformat().replace('+00:00', 'Z')
+    if isinstance(value, float) and value.is_integer():
+        return f"{value:.1f}"
+    return str(value)
+
+def _fn_datetime(ctx, value=None):
+    if value is None:
+        return ctx.now
+    if isinstance(value, datetime):
+        return value
+    if isinstance(value, date):
+        return datetime(value.year, value.month, value.day, tzinfo=timezone.utc)
+    if isinstance(value, str):
+        return _parse_datetime(value)
+    if isinstance(value, dict):
+        if 'epochMillis' in value:
+            return datetime.fromtimestamp(value['epochMillis'] / 1000, tz=timezone.utc)
+        if 'epochSeconds' in value:
+            return datetime.fromtimestamp(value['epochSeconds'], tz=timezone.utc)
+        return datetime(value.get('year', 1970), value.get('month', 1), value.get('day', 1),
+                        value.get('hour', 0), value.get('minute', 0), value.get('second', 0), tzinfo=timezone.utc)
+    raise MemoryGraphError(f"datetime()에 쓸 수 없는 값: {value!r}")
+
+def _fn_date(ctx, value=None):
+    if value is None:
+        return ctx.now.date()
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    if isinstance(value, str):
+        return date.fromisoformat(value[:10])
+    raise MemoryGraphError(f"date()에 쓸 수 없는 값: {value!r}")
+
+def _fn_size(ctx, value):
+    return None if value is None else len(value)
+
+def _fn_to_integer(ctx, value):
+    if value is None or isinstance(value, bool):
+        return None if value is None else int(value)
+    try:
+        return int(float(value)) if isinstance(value, str) else int(value)
+    except (TypeError, ValueError):
+        return None
+
+def _fn_to_float(ctx, value):
+    try:
+        return None if value is None else float(value)
+    except (TypeError, ValueError):
+        return None
+
+def _fn_round(ctx, value, precision=0):
+    if value is None:
+        return None
+    factor = 10 ** precision
+    # Cypher round()는 .5를 0에서 먼 쪽으로 올림
+    rounded = math.floor(abs(value) * factor + 0.5) / factor
+    return float(math.copysign(rounded, value))
+
+def _fn_labels(ctx, node):
+    return None if node is None else list(node.labels)
+
+def _fn_keys(ctx, value):
+    if value is None:
+        return None
+    return list(value.props) if isinstance(value, (_Node, _Rel)) else list(value)
+
+def _fn_properties(ctx, value):
+    if value is None:
+        return None
+    return dict(value.props) if isinstance(value, (_Node, _Rel)) else dict(value)
+
+_FUNCTIONS: Dict[str, Callable] = {
+    'coalesce': lambda ctx, *values: next((value for value in values if value is not None), None),
+    'labels': _fn_labels,
+    'type': lambda ctx, rel: None if rel is None else rel.type,
+    'keys': _fn_keys,
+    'properties': _fn_properties,
+    'id': lambda ctx, item: None if item is None else item.id,
+    'elementid': lambda ctx, item: None if item is None else
+    (f"4:memory:{item.id}" if isinstance(item, _Node) else f"5:memory:{item.id}"),
+    'startnode': lambda ctx, rel: None if rel is None else rel.start,
+    'endnode': lambda ctx, rel: None if rel is None else rel.end,
+    'size': _fn_size,
+    'length': _fn_size,
+    'head': lambda ctx, items: items[0] if items else None,
+    'last': lambda ctx, items: items[-1] if items else None,
+    'tail': lambda ctx, items: None if items is None else items[1:],
+    'reverse': lambda ctx, items: None if items is None else items[::-1],
+    'range': lambda ctx, start, end, step=1: list(range(start, end + (1 if step > 0 else -1), step)),
+    'tolower': lambda ctx, value: None if value is None else value.lower(),
+    'toupper': lambda ctx, value: None if value is None else value.upper(),
+    'trim': lambda ctx, value: None if value is None else value.strip(),
+    'ltrim': lambda ctx, value: None if value is None else value.lstrip(),
+    'rtrim': lambda ctx, value: None if value is None else value.rstrip(),
+    'replace': lambda ctx, value, old, new: None if value is None else value.replace(old, new),
+    'split': lambda ctx, value, separator: None if value is None else value.split(separator),
+    'substring': lambda ctx, value, start, length=None: None if value is None else
+    (value[start:] if length is None else value[start:start + length]),
+    'left': lambda ctx, value, length: None if value is None else value[:length],
+    'right': lambda ctx, value, length: None if value is None else (value[-length:] if length else ''),
+    'tostring': lambda ctx, value: _to_string(value),
+    'tointeger': _fn_to_integer,
+    'tofloat': _fn_to_float,
+    'toboolean': lambda ctx, value: None if value is None else
+    (value if isinstance(value, bool) else {'true': True, 'false': False}.get(str(value).lower())),
+    'abs': lambda ctx, value: None if value is None else abs(value),
+    'ceil': lambda ctx, value: None if value is None else float(math.ceil(value)),
+    'floor': lambda ctx, value: None if value is None else float(math.floor(value)),
+    'round': _fn_round,
+    'sqrt': lambda ctx, value: None if value is None else math.sqrt(value),
+    'sign': lambda ctx, value: None if value is None else (value > 0) - (value < 0),
+    'rand': lambda ctx: random.random(),
+    'randomuuid': lambda ctx: str(uuid.uuid4()),
+    'timestamp': lambda ctx: int(ctx.now.timestamp() * 1000),
+    'datetime': _fn_datetime,
+    'localdatetime': _fn_datetime,
+    'date': _fn_date,
+    'duration': lambda ctx, value: None if value is None else _parse_duration(value),
+    'exists': lambda ctx, value: value is not None,
+    'valuetype': lambda ctx, value: type(value).__name__.upper(),
+}
+
+# ---------------------------------------------------------------------------
+# 집계
+# ---------------------------------------------------------------------------
+
+class _Aggregate:
+    def __init__(self, name: str, distinct: bool, argument: Optional[Callable]):
+        self.name = name
+        self.distinct = distinct
+        self.argument = argument
+    
+    def compute(self, rows: List[Dict[str, Any]], ctx: _Context):
+        if self.argument is None:           # count(*)
+            return len(rows)
+        values = [value for value in (self.argument(row, ctx) for row in rows) if value is not None]
+        if self.distinct:
+            seen = set()
+            unique = []
+            for value in values:
+                key = _hashable(value) if not isinstance(value, (_Node, _Rel)) else (type(value), value.id)
+                if key not in seen:
+                    seen.add(key)
+                    unique.append(value)
+            values = unique
+        name = self.name
+        if name == 'count':
+            return len(values)
+        if name == 'collect':
+            return values
+        if name == 'sum':
+            return sum(values) if values else 0
+        if name == 'avg':
+            return sum(values) / len(values) if values else None
+        if name == 'stdev':
+            if len(values) < 2:
+                return 0.0
+            mean = sum(values) / len(values)
+            return math.sqrt(sum((value - mean) ** 2 for value in values) / (len(values) - 1))
+        if not values:
+            return None
+        ordered = sorted(values, key=cmp_to_key(_order_compare))
+        return ordered[0] if name == 'min' else ordered[-1]
+
+def _extract_aggregates(ast, aggregates: List[_Aggregate]):
+    """AST의 집계 호출을 ('aggref', 슬롯)으로 바꾸고 집계 목록에 추가"""
+    if not isinstance(ast, tuple):
+        return ast
+    if ast[0] == 'countstar':
+        aggregates.append(_Aggregate('count', False, None))
+        return ('aggref', f"  agg_{len(aggregates) - 1}")
+    if ast[0] == 'call' and ast[1] in _AGGREGATES:
+        if len(ast[3]) != 1:
+            raise MemoryGraphError(f"{ast[1]}()는 인자 하나가 필요합니다")
+        aggregates.append(_Aggregate(ast[1], ast[2], _compile(ast[3][0])))
+        return ('aggref', f"  agg_{len(aggregates) - 1}")
+    rebuilt = [ast[0]]
+    for part in ast[1:]:
+        if isinstance(part, tuple):
+            rebuilt.append(_extract_aggregates(part, aggregates))
+        elif isinstance(part, list):
+            rebuilt.append([
+                _extract_aggregates(item, aggregates) if isinstance(item, tuple) and item and isinstance(item[0], str)
+                else tuple(_extract_aggregates(sub, aggregates) for sub in item) if isinstance(item, tuple)
+                else item
+                for item in part
+            ])
+        else:
+            rebuilt.append(part)
+    return tuple(rebuilt)
+
+def _row_key(values) -> Tuple:
+    return tuple(
+        (type(value).__name__, value.id) if isinstance(value, (_Node, _Rel)) else _hashable(value)
+        for value in values
+    )
+
+_HIDDEN = ' '
+
+def _visible(row: Dict[str, Any]) -> Dict[str, Any]:
+    return {key: value for key, value in row.items() if not key.startswith(_HIDDEN)}
+
+# ---------------------------------------------------------------------------
+# 절 실행기
+# ---------------------------------------------------------------------------
+
+class _Projection:
+    """WITH / RETURN"""
+    
+    def __init__(self, spec: Dict[str, Any]):
+        self.distinct = spec['distinct']
+        self.star = spec['star']
+        self.aliases = [alias for alias, _ in spec['items']]
+        self.aggregates: List[_Aggregate] = []
+        self.grouping = []
+        self.items = []
+        for alias, ast in spec['items']:
+            if _has_aggregate(ast):
+                self.items.append((alias, _compile(_extract_aggregates(ast, self.aggregates)), True))
+            else:
+                compiled = _compile(ast)
+                self.items.append((alias, compiled, False))
+                self.grouping.append(compiled)
+        self.aggregating = bool(self.aggregates)
+        self.order = [(_compile(ast), descending) for ast, descending in spec['order']]
+        self.skip = _compile(spec['skip']) if spec['skip'] else None
+        self.limit = _compile(spec['limit']) if spec['limit'] else None
+        self.where = _compile(spec['where']) if spec['where'] else None
+    
+    def run(self, rows: List[Dict[str, Any]], ctx: _Context) -> List[Dict[str, Any]]:
+        if self.aggregating:
+            projected = self._aggregate(rows, ctx)
+            environments = projected
+        else:
+            projected = []
+            environments = []
+            for row in rows:
+                values = _visible(row) if self.star else {}
+                for alias, compiled, _ in self.items:
+                    values[alias] = compiled(row, ctx)
+                projected.append(values)
+                environments.append({**row, **values} if self.order else values)
+        
+        if self.distinct:
+            seen = set()
+            unique, unique_environments = [], []
+            for values, environment in zip(projected, environments):
+                key = _row_key(values.values())
+                if key not in seen:
+                    seen.add(key)
+                    unique.append(values)
+                    unique_environments.append(environment)
+            projected, environments = unique, unique_environments
+        
+        if self.order:
+            indexed = list(range(len(projected)))
+            keys = [[compiled(environment, ctx) for compiled, _ in self.order] for environment in environments]
+            for position in range(len(self.order) - 1, -1, -1):
+                descending = self.order[position][1]
+                indexed.sort(key=cmp_to_key(
+                    lambda a, b, p=position: _order_compare(keys[a][p], keys[b][p])), reverse=descending)
+            projected = [projected[index] for index in indexed]
+        
+        if self.skip or self.limit:
+            start = _limit_value(self.skip, ctx) if self.skip else 0
+            stop = start + _limit_value(self.limit, ctx) if self.limit else None
+            projected = projected[start:stop]
+        
+        if self.where:
+            projected = [row for row in projected if self.where(row, ctx) is True]
+        return projected
+    
+    def _aggregate(self, rows, ctx):
+        groups: Dict[Tuple, List[Dict[str, Any]]] = {}
+        for row in rows:
+            key = _row_key([compiled(row, ctx) for compiled in self.grouping])
+            groups.setdefault(key, []).append(row)
+        if not groups and not self.grouping:
+            groups[()] = []
+        
+        projected = []
+        for members in groups.values():
+            scope = dict(members[0]) if members else {}
+            for index, aggregate in enumerate(self.aggregates):
+                scope[f"  agg_{index}"] = aggregate.compute(members, ctx)
+            values = _visible(members[0]) if self.star and members else {}
+            for alias, compiled, _ in self.items:
+                values[alias] = compiled(scope, ctx)
+            projected.append(values)
+        return projected
+
+def _limit_value(compiled, ctx) -> int:
+    value = compiled({}, ctx)
+    if not _is_number(value) or value < 0:
+        raise MemoryGraphError(f"SKIP/LIMIT 값이 올바르지 않습니다: {value!r}")
+    return int(value)
+
+class _CompiledPath:
+    """패턴의 속성 맵을 미리 컴파일한 경로"""
+    
+    def __init__(self, path: _PathPattern):
+        self.path = path
+        self.nodes = path.nodes
+        self.rels = path.rels
+        self.node_props = [[(key, _compile(value)) for key, value in node.props] if node.props else []
+                           for node in path.nodes]
+        self.rel_props = [[(key, _compile(value)) for key, value in rel.props] if rel.props else []
+                          for rel in path.rels]
+    
+    def variables(self):
+        return self.path.variables()
+
+class _Query:
+    """파싱/컴파일된 쿼리 (UNION 포함)"""
+    
+    def __init__(self, text: str):
+        parser = _Parser(text)
+        parts, self.union_all = parser.parse_query()
+        self.parts = [self._compile_clauses(clauses) for clauses in parts]
+        self.source = [clauses for clauses in parts]
+    
+    def _compile_clauses(self, clauses):
+        compiled = []
+        for clause in clauses:
+            kind = clause[0]
+            if kind == 'match':
+                _, paths, where, optional = clause
+                compiled.append(('match', [_CompiledPath(path) for path in paths],
+                                 _compile(where) if where else None, optional, _equality_hints(where)))
+            elif kind == 'unwind':
+                compiled.append(('unwind', _compile(clause[1]), clause[2]))
+            elif kind in ('with', 'return'):
+                compiled.append((kind, _Projection(clause[1])))
+            elif kind == 'merge':
+                actions = [(when, self._compile_set(items)) for when, items in clause[2]]
+                compiled.append(('merge', _CompiledPath(clause[1]), actions))
+            elif kind == 'create':
+                compiled.append(('create', [_CompiledPath(path) for path in clause[1]]))
+            elif kind == 'set':
+                compiled.append(('set', self._compile_set(clause[1])))
+            elif kind == 'remove':
+                compiled.append(('remove', clause[1]))
+            elif kind == 'delete':
+                compiled.append(('delete', [_compile(expression) for expression in clause[1]], clause[2]))
+            elif kind == 'call':
+                _, name, arguments, yields, where = clause
+                compiled.append(('call', name, [_compile(argument) for argument in arguments], yields,
+                                 _compile(where) if where else None))
+            elif kind == 'subquery':
+                compiled.append(('subquery', self._compile_clauses(clause[1])))
+            else:
+                raise MemoryGraphError(f"알 수 없는 절: {kind}")
+        return compiled
+    
+    @staticmethod
+    def _compile_set(items):
+        compiled = []
+        for item in items:
+            if item[0] == 'prop':
+                compiled.append(('prop', item[1], item[2], _compile(item[3])))
+            elif item[0] in ('merge', 'replace'):
+                compiled.append((item[0], item[1], _compile(item[2])))
+            else:
+                compiled.append(item)
+        return compiled
+    
+    @property
+    def columns(self) -> List[str]:
+        last = self.parts[0][-1]
+        if last[0] == 'return':
+            return list(last[1].aliases)
+        if last[0] == 'call' and last[3] not in (None, '*'):
+            return [alias for _, alias in last[3]]
+        return []
+
+def _equality_hints(where) -> Dict[str, List[Tuple[str, Callable, Set[str]]]]:
+    """WHERE 최상위 AND 조건 중 var.prop = 식 → {var: [(prop, 식, 식이 참조하는 변수)]} (인덱스 조회용)"""
+    hints: Dict[str, List[Tuple[str, Callable, Set[str]]]] = {}
+    if where is None:
+        return hints
+    stack = [where]
+    while stack:
+        ast = stack.pop()
+        if ast[0] == 'and':
+            stack.extend([ast[1], ast[2]])
+        elif ast[0] == 'cmp' and ast[1] == '=':
+            for left, right in ((ast[2], ast[3]), (ast[3], ast[2])):
+                if left[0] == 'prop' and left[1][0] == 'var' and left[1][1] not in _variables(right):
+                    hints.setdefault(left[1][1], []).append((left[2], _compile(right), _variables(right)))
+    return hints
+
+# ---------------------------------------------------------------------------
+# 쓰기 기록 (롤백용)
+# ---------------------------------------------------------------------------
+
+class _WriteLog:
+    """트랜잭션 하나의 변경과 되돌리기 기록"""
+    
+    def __init__(self, graph: 'MemoryGraph'):
+        self.graph = graph
+        self.undo: List[Callable[[], None]] = []
+        self.counters = SummaryCounters()
+    
+    def rollback(self):
+        for action in reversed(self.undo):
+            action()
+        self.undo.clear()
+
+# ---------------------------------------------------------------------------
+# 그래프
+# ---------------------------------------------------------------------------
+
+class MemoryGraph:
+    """
+    인메모리 속성 그래프
+    
+    사용 예:
+        graph = MemoryGraph()
+        graph.run("CREATE (d:Developer {id: $id})", {'id': 'code_architect_ai'})
+        driver = MemoryDriver(graph)
+    """
+    
+    _registry: Dict[str, 'MemoryGraph'] = {}
+    _registry_lock = threading.Lock()
+    
+    def __init__(self, path: Optional[str] = None):
+        self.path = path
+        self.lock = threading.RLock()
+        self.nodes: Dict[int, _Node] = {}
+        self.rels: Dict[int, _Rel] = {}
+        self.label_index: Dict[str, Set[int]] = {}
+        self.type_index: Dict[str, Set[int]] = {}
+        self.out_adj: Dict[int, Dict[str, Set[int]]] = {}
+        self.in_adj: Dict[int, Dict[str, Set[int]]] = {}
+        self.constraints: Dict[str, _Constraint] = {}
+        self.indexes: Dict[str, _PropertyIndex] = {}
+        self.lookup_indexes = {'index_343aff4e': 'NODE', 'index_f7700477': 'RELATIONSHIP'}
+        self.next_id = 0
+        self.created_at = datetime.now(timezone.utc)
+        self._cache: Dict[str, _Query] = {}
+    
+    # -- 이름/파일 기반 공유 --
+    
+    @classmethod
+    def named(cls, name: str) -> 'MemoryGraph':
+        """같은 이름(또는 파일 경로)이면 같은 그래프 (파일이 있으면 스냅샷에서 로드)"""
+        with cls._registry_lock:
+            graph = cls._registry.get(name)
+            if graph is None:
+                path = name if name.startswith('/') else None
+                graph = cls.load(path) if path and os.path.exists(path) else cls(path=path)
+                cls._registry[name] = graph
+            return graph
+    
+    @classmethod
+    def drop(cls, name: str):
+        with cls._registry_lock:
+            cls._registry.pop(name, None)
+    
+    def __getstate__(self):
+        state = {key: value for key, value in self.__dict__.items() if key not in ('lock', '_cache')}
+        return state
+    
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.lock = threading.RLock()
+        self._cache = {}
+    
+    def save(self, path: Optional[str] = None):
+        """그래프 스냅샷 저장 (임시 파일에 쓴 뒤 교체)"""
+        path = path or self.path
+        if not path:
+            raise MemoryGraphError("저장할 경로가 없습니다")
+        with self.lock:
+            temporary = f"{path}.tmp"
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+            with open(temporary, 'wb') as f:
+                pickle.dump(self, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temporary, path)
+    
+    @classmethod
+    def load(cls, path: str) -> 'MemoryGraph':
+        with open(path, 'rb') as f:
+            graph = pickle.load(f)
+        graph.path = path
+        return graph
+    
+    # -- 실행 --
+    
+    def run(self, query: str, parameters: Optional[Dict[str, Any]] = None,
+            log: Optional[_WriteLog] = None) -> 'MemoryResult':
+        """쿼리 하나 실행 (log를 주지 않으면 자동 커밋 트랜잭션)"""
+        parameters = {key: _to_internal(value) for key, value in (parameters or {}).items()}
+        with self.lock:
+            own = log is None
+            log = log or _WriteLog(self)
+            before = len(log.undo)
+            counters_before = SummaryCounters()
+            counters_before.merge(log.counters)
+            started = time.perf_counter()
+            try:
+                keys, rows, plan = self._execute(query, parameters, log)
+            except Exception:
+                # 문장 단위 원자성: 이 문장의 변경만 되돌림
+                for action in reversed(log.undo[before:]):
+                    action()
+                del log.undo[before:]
+                log.counters = counters_before
+                raise
+            counters = SummaryCounters()
+            for name in SummaryCounters.FIELDS:
+                setattr(counters, name, getattr(log.counters, name) - getattr(counters_before, name))
+            if own:
+                log.undo.clear()
+            records = [Record(zip(keys, [_to_output(row.get(key)) for key in keys])) for row in rows]
+            summary = MemoryResultSummary(query, parameters, counters, plan,
+                                          time.perf_counter() - started)
+            return MemoryResult(keys, records, summary)
+    
+    def _parse(self, text: str) -> _Query:
+        query = self._cache.get(text)
+        if query is None:
+            query = _Query(text)
+            if len(self._cache) >= PARSE_CACHE_SIZE:
+                self._cache.pop(next(iter(self._cache)))
+            self._cache[text] = query
+        return query
+    
+    def _execute(self, text: str, params: Dict[str, Any], log: _WriteLog):
+        stripped = text.strip().rstrip(';').strip()
+        upper = stripped.upper()
+        explain = upper.startswith('EXPLAIN ')
+        profile = upper.startswith('PROFILE ')
+        if explain or profile:
+            stripped = stripped[8:].strip()
+            upper = stripped.upper()
+        
+        schema = _SCHEMA_COMMANDS.match(stripped)
+        if schema:
+            if explain:
+                return [], [], {'operatorType': 'SchemaCommand@memory', 'args': {}, 'identifiers': [], 'children': []}
+            return [], self._schema_command(stripped, log), None
+        
+        show = _SHOW.match(stripped)
+        if show:
+            kind = 'constraints' if show.group(2).upper().startswith('CONSTRAINT') else 'indexes'
+            rest = stripped[show.end():].strip()
+            stripped = f"CALL `__show.{kind}`() " + (rest if rest.upper().startswith('YIELD') else
+                                                    f"YIELD * {rest}" if rest else "")
+        
+        query = self._parse(stripped)
+        ctx = _Context(self, log, params)
+        if explain:
+            return query.columns, [], self._plan(query)
+        
+        results = []
+        for clauses in query.parts:
+            results.append(self._run_clauses(clauses, [{}], ctx))
+        rows = results[0]
+        for part_rows, union_all in zip(results[1:], query.union_all):
+            rows = rows + part_rows
+            if not union_all:
+                seen = set()
+                rows = [row for row in rows if not (_row_key(row.values()) in seen or seen.add(_row_key(row.values())))]
+        
+        last = query.parts[0][-1]
+        if last[0] == 'return':
+            keys = list(last[1].aliases) if not last[1].star else \
+                list(rows[0].keys()) if rows else list(last[1].aliases)
+        elif last[0] == 'call':
+            keys = list(rows[0].keys()) if rows else query.columns
+        else:
+            keys, rows = [], []
+        if profile:
+            # 연산자별 db hits는 없으므로 EXPLAIN 계획에 결과 행 수만 붙임
+            plan = self._plan(query)
+            plan['rows'] = len(rows)
+            return keys, rows, plan
+        return keys, rows, None
+    
+    def _run_clauses(self, clauses, rows: List[Dict[str, Any]], ctx: _Context) -> List[Dict[str, Any]]:
+        for clause in clauses:
+            kind = clause[0]
+            if kind == 'match':
+                rows = self._run_match(clause, rows, ctx)
+            elif kind == 'unwind':
+                _, source, var = clause
+                unwound = []
+                for row in rows:
+                    items = source(row, ctx)
+                    if items is None:
+                        continue
+                    for item in (items if isinstance(items, list) else [items]):
+                        unwound.append({**row, var: item})
+                rows = unwound
+            elif kind in ('with', 'return'):
+                rows = clause[1].run(rows, ctx)
+            elif kind == 'merge':
+                rows = self._run_merge(clause, rows, ctx)
+            elif kind == 'create':
+                for row in rows:
+                    for path in clause[1]:
+                        self._create_path(path, row, ctx)
+            elif kind == 'set':
+                for row in rows:
+                    self._apply_set(clause[1], row, ctx)
+            elif kind == 'remove':
+                for row in rows:
+                    self._apply_remove(clause[1], row, ctx)
+            elif kind == 'delete':
+                for row in rows:
+                    for expression in clause[1]:
+                        self._delete(expression(row, ctx), clause[2], ctx.tx)
+            elif kind == 'call':
+                rows = self._run_call(clause, rows, ctx)
+            elif kind == 'subquery':
+                joined = []
+                returns = clause[1][-1][0] == 'return'
+                for row in rows:
+                    inner = self._run_clauses(clause[1], [dict(row)], ctx)
+                    if returns:
+                        joined.extend({**row, **item} for item in inner)
+                    else:
+                        joined.append(row)
+                rows = joined
+        return rows
+    
+    # -- MATCH --
+    
+    def _run_match(self, clause, rows, ctx):
+        _, paths, where, optional, hints = clause
+        new_variables = {var for path in paths for var in path.variables()}
+        output = []
+        for row in rows:
+            matches = [row]
+            used: Set[int] = set()
+            for path in paths:
+                matches = [match for partial in matches
+                           for match in self._match_path(path, partial, ctx, set(partial.get(' used', ())), hints)]
+                if not matches:
+                    break
+            found = False
+            for match in matches:
+                match.pop(' used', None)
+                if where is None or where(match, ctx) is True:
+                    found = True
+                    output.append(match)
+            if optional and not found:
+                output.append({**row, **{var: None for var in new_variables if var not in row}})
+            del used
+        return output
+    
+    def _match_path(self, path, row, ctx, used_rels: Set[int], hints):
+        """row에 대해 경로 패턴과 맞는 모든 행 (관계는 한 절 안에서 한 번만 사용)"""
+        if not isinstance(path, _CompiledPath):
+            path = _CompiledPath(path)
+        nodes = path.nodes
+        anchor, candidates = self._anchor(path, row, ctx, hints)
+        for node in candidates:
+            if not self._node_matches(path, anchor, node, row, ctx):
+                continue
+            start = dict(row)
+            start[nodes[anchor].var] = node
+            for right in self._extend(path, anchor, 1, start, ctx, used_rels):
+                for full in self._extend(path, anchor, -1, right, ctx, used_rels | set(right.get(' used', ()))):
+                    yield full
+    
+    def _anchor(self, path: _CompiledPath, row, ctx, hints):
+        """시작 노드 선택: 이미 묶인 변수 > 인덱스 조회 > 가장 작은 라벨 > 전체 노드"""
+        best = None
+        for position, node in enumerate(path.nodes):
+            bound = row.get(node.var, _MISSING)
+            if bound is not _MISSING:
+                return position, ([] if bound is None else [bound])
+            candidates = self._candidates(path, position, row, ctx, hints)
+            if best is None or len(candidates) < len(best[1]):
+                best = (position, candidates)
+                if not candidates:
+                    break
+        return best
+    
+    def _candidates(self, path: _CompiledPath, position: int, row, ctx, hints):
+        node = path.nodes[position]
+        equalities = {key: compiled(row, ctx) for key, compiled in path.node_props[position]}
+        for key, compiled, variables in hints.get(node.var, ()):
+            if key not in equalities and all(var in row for var in variables):
+                equalities[key] = compiled(row, ctx)
+        if any(value is None for value in equalities.values()):
+            return []
+        for label in node.labels:
+            for index in self._node_indexes(label):
+                if all(name in equalities for name in index.properties):
+                    key = tuple(_hashable(equalities[name]) for name in index.properties)
+                    return [self.nodes[node_id] for node_id in index.data.get(key, ())]
+        if node.labels:
+            smallest = min((self.label_index.get(label, set()) for label in node.labels), key=len)
+            return [self.nodes[node_id] for node_id in smallest]
+        return list(self.nodes.values())
+    
+    def _node_indexes(self, label: str) -> List[_PropertyIndex]:
+        return [index for index in self.indexes.values() if index.entity == 'NODE' and index.token == label]
+    
+    def _node_matches(self, path: _CompiledPath, position: int, node: _Node, row, ctx) -> bool:
+        pattern = path.nodes[position]
+        if node is None or not isinstance(node, _Node) or node.deleted:
+            return False
+        bound = row.get(pattern.var, _MISSING)
+        if bound is not _MISSING and bound is not node:
+            return False
+        for label in pattern.labels:
+            if label not in node.labels:
+                return False
+        for key, compiled in path.node_props[position]:
+            if _equals(node.props.get(key), compiled(row, ctx)) is not True:
+                return False
+        return True
+    
+    def _extend(self, path: _CompiledPath, position: int, step: int, row, ctx, used_rels: Set[int]):
+        """position 노드에서 step(+1 오른쪽, -1 왼쪽) 방향으로 경로 끝까지 확장"""
+        nodes, rels = path.nodes, path.rels
+        next_position = position + step
+        if next_position < 0 or next_position >= len(nodes):
+            yield row
+            return
+        rel_position = position if step > 0 else position - 1
+        pattern = rels[rel_position]
+        current = row[nodes[position].var]
+        # 패턴 방향을 탐색 방향 기준으로 변환
+        direction = pattern.direction
+        if step < 0 and direction != 'both':
+            direction = 'in' if direction == 'out' else 'out'
+        
+        bound_rel = row.get(pattern.var, _MISSING)
+        if bound_rel is not _MISSING:
+            candidates = [bound_rel] if bound_rel is not None else []
+        else:
+            candidates = []
+            if direction in ('out', 'both'):
+                candidates.extend(self._adjacent(self.out_adj, current, pattern.types))
+            if direction in ('in', 'both'):
+                incoming = self._adjacent(self.in_adj, current, pattern.types)
+                if direction == 'both':
+                    incoming = [rel for rel in incoming if rel.start is not rel.end]
+                candidates.extend(incoming)
+        
+        for rel in candidates:
+            if rel.deleted or rel.id in used_rels:
+                continue
+            if pattern.types and rel.type not in pattern.types:
+                continue
+            if direction == 'out' and rel.start is not current or direction == 'in' and rel.end is not current:
+                continue
+            if any(_equals(rel.props.get(key), compiled(row, ctx)) is not True
+                   for key, compiled in path.rel_props[rel_position]):
+                continue
+            other = rel.end if rel.start is current else rel.start
+            if direction == 'both' and rel.start is current and rel.end is current:
+                other = current
+            if not self._node_matches(path, next_position, other, row, ctx):
+                continue
+            extended = dict(row)
+            extended[pattern.var] = rel
+            extended[nodes[next_position].var] = other
+            extended[' used'] = tuple(row.get(' used', ())) + (rel.id,)
+            yield from self._extend(path, next_position, step, extended, ctx, used_rels | {rel.id})
+    
+    def _adjacent(self, adjacency, node: _Node, types) -> List[_Rel]:
+        by_type = adjacency.get(node.id, {})
+        if types:
+            return [self.rels[rel_id] for rel_type in types for rel_id in by_type.get(rel_type, ())]
+        return [self.rels[rel_id] for ids in by_type.values() for rel_id in ids]
+    
+    # -- MERGE / CREATE --
+    
+    def _run_merge(self, clause, rows, ctx):
+        _, path, actions = clause
+        output = []
+        for row in rows:
+            for position, props in enumerate(path.node_props):
+                if path.nodes[position].var not in row:
+                    for key, compiled in props:
+                        if compiled(row, ctx) is None:
+                            raise MemoryGraphError(
+                                f"null 속성 값으로 MERGE 할 수 없습니다: {path.nodes[position].var}.{key}")
+            matches = list(self._match_path(path, row, ctx, set(), {}))
+            if matches:
+                for match in matches:
+                    match.pop(' used', None)
+                    for when, items in actions:
+                        if when == 'match':
+                            self._apply_set(items, match, ctx)
+                    output.append(match)
+            else:
+                created = self._create_path(path, row, ctx)
+                for when, items in actions:
+                    if when == 'create':
+                        self._apply_set(items, created, ctx)
+                output.append(created)
+        return output
+    
+    def _create_path(self, path: _CompiledPath, row, ctx) -> Dict[str, Any]:
+        for position, node in enumerate(path.nodes):
+            if node.var in row and row[node.var] is not None:
+                if node.labels or path.node_props[position]:
+                    if not isinstance(row[node.var], _Node):
+                        raise MemoryGraphError(f"{node.var}는 노드가 아닙니다")
+                continue
+            props = {key: compiled(row, ctx) for key, compiled in path.node_props[position]}
+            row[node.var] = self.create_node(node.labels, props, ctx.tx)
+        for position, rel in enumerate(path.rels):
+            if len(rel.types) != 1:
+                raise MemoryGraphError("관계를 만들려면 관계 타입이 정확히 하나 필요합니다")
+            if rel.direction == 'both':
+                raise MemoryGraphError("방향 없는 관계는 만들 수 없습니다")
+            left, right = row[path.nodes[position].var], row[path.nodes[position + 1].var]
+            start, end = (left, right) if rel.direction == 'out' else (right, left)
+            props = {key: compiled(row, ctx) for key, compiled in path.rel_props[position]}
+            row[rel.var] = self.create_relationship(rel.types[0], start, end, props, ctx.tx)
+        return row
+    
+    # -- SET / REMOVE / DELETE --
+    
+    def _apply_set(self, items, row, ctx):
+        for item in items:
+            kind, target = item[0], row.get(item[1])
+            if target is None:
+                continue
+            if not isinstance(target, (_Node, _Rel)):
+                raise MemoryGraphError(f"SET 대상이 노드/관계가 아닙니다: {item[1]}")
+            if kind == 'prop':
+                self.set_property(target, item[2], item[3](row, ctx), ctx.tx)
+            elif kind in ('merge', 'replace'):
+                values = item[2](row, ctx)
+                if isinstance(values, (_Node, _Rel)):
+                    values = dict(values.props)
+                if values is None:
+                    values = {}
+                if not isinstance(values, dict):
+                    raise MemoryGraphError("SET += 에는 맵이 필요합니다")
+                if kind == 'replace':
+                    for key in [key for key in target.props if key not in values]:
+                        self.set_property(target, key, None, ctx.tx)
+                for key, value in values.items():
+                    self.set_property(target, key, value, ctx.tx)
+            elif kind == 'labels':
+                for label in item[2]:
+                    self.add_label(target, label, ctx.tx)
+    
+    def _apply_remove(self, items, row, ctx):
+        for kind, var, value in items:
+            target = row.get(var)
+            if target is None:
+                continue
+            if kind == 'prop':
+                self.set_property(target, value, None, ctx.tx)
+            else:
+                for label in value:
+                    self.remove_label(target, label, ctx.tx)
+    
+    def _delete(self, value, detach: bool, log: _WriteLog):
+        if value is None:
+            return
+        if isinstance(value, list):
+            for item in value:
+                self._delete(item, detach, log)
+        elif isinstance(value, _Rel):
+            self.delete_relationship(value, log)
+        elif isinstance(value, _Node):
+            self.delete_node(value, detach, log)
+        else:
+            raise MemoryGraphError(f"삭제할 수 없는 값: {value!r}")
+    
+    # -- 기본 변경 연산 (인덱스 유지 + 되돌리기 기록) --
+    
+    def create_node(self, labels: Iterable[str], props: Dict[str, Any], log: _WriteLog) -> _Node:
+        self.next_id += 1
+        clean = {}
+        for key, value in props.items():
+            if value is not None:
+                clean[key] = _property_value(value, key)
+        node = _Node(self.next_id, labels, clean)
+        self.nodes[node.id] = node
+        for label in node.labels:
+            self.label_index.setdefault(label, set()).add(node.id)
+        try:
+            self._index_node(node)
+        except ConstraintViolation:
+            self._unindex_node(node, strict=False)
+            for label in node.labels:
+                self.label_index[label].discard(node.id)
+            del self.nodes[node.id]
+            raise
+        log.counters.nodes_created += 1
+        log.counters.labels_added += len(node.labels)
+        log.counters.properties_set += len(clean)
+        log.undo.append(lambda: self._drop_node(node))
+        return node
+    
+    def _drop_node(self, node: _Node):
+        self._unindex_node(node, strict=False)
+        for label in node.labels:
+            self.label_index.get(label, set()).discard(node.id)
+        self.nodes.pop(node.id, None)
+        self.out_adj.pop(node.id, None)
+        self.in_adj.pop(node.id, None)
+        node.deleted = True
+    
+    def delete_node(self, node: _Node, detach: bool, log: _WriteLog):
+        if node.deleted:
+            return
+        rel_ids = [rel_id for adjacency in (self.out_adj, self.in_adj)
+                   for ids in adjacency.get(node.id, {}).values() for rel_id in ids]
+        if rel_ids and not detach:
+            raise MemoryGraphError(f"관계가 남아 있는 노드는 DETACH 없이 삭제할 수 없습니다 (id {node.id})")
+        for rel_id in set(rel_ids):
+            self.delete_relationship(self.rels[rel_id], log)
+        self._drop_node(node)
+        log.counters.nodes_deleted += 1
+        
+        def restore():
+            node.deleted = False
+            self.nodes[node.id] = node
+            for label in node.labels:
+                self.label_index.setdefault(label, set()).add(node.id)
+            self._index_node(node)
+        log.undo.append(restore)
+    
+    def create_relationship(self, rel_type: str, start: _Node, end: _Node, props: Dict[str, Any],
+                            log: _WriteLog) -> _Rel:
+        if not isinstance(start, _Node) or not isinstance(end, _Node):
+            raise MemoryGraphError("관계의 양 끝은 노드여야 합니다")
+        self.next_id += 1
+        clean = {key: _property_value(value, key) for key, value in props.items() if value is not None}
+        rel = _Rel(self.next_id, rel_type, start, end, clean)
+        self._attach(rel)
+        try:
+            self._index_rel(rel)
+        except ConstraintViolation:
+            self._detach(rel)
+            raise
+        log.counters.relationships_created += 1
+        log.counters.properties_set += len(clean)
+        log.undo.append(lambda: self._detach(rel))
+        return rel
+    
+    def _attach(self, rel: _Rel):
+        rel.deleted = False
+        self.rels[rel.id] = rel
+        self.type_index.setdefault(rel.type, set()).add(rel.id)
+        self.out_adj.setdefault(rel.start.id, {}).setdefault(rel.type, set()).add(rel.id)
+        self.in_adj.setdefault(rel.end.id, {}).setdefault(rel.type, set()).add(rel.id)
+    
+    def _detach(self, rel: _Rel):
+        self._unindex_rel(rel)
+        self.rels.pop(rel.id, None)
+        self.type_index.get(rel.type, set()).discard(rel.id)
+        self.out_adj.get(rel.start.id, {}).get(rel.type, set()).discard(rel.id)
+        self.in_adj.get(rel.end.id, {}).get(rel.type, set()).discard(rel.id)
+        rel.deleted = True
+    
+    def delete_relationship(self, rel: _Rel, log: _WriteLog):
+        if rel.deleted:
+            return
+        self._detach(rel)
+        log.counters.relationships_deleted += 1
+        
+        def restore():
+            self._attach(rel)
+            self._index_rel(rel)
+        log.undo.append(restore)
+    
+    def set_property(self, item, key: str, value, log: _WriteLog):
+        value = None if value is None else _property_value(value, key)
+        old = item.props.get(key, _MISSING)
+        if value is None and old is _MISSING:
+            return
+        affected = self._indexes_for(item, key)
+        for index in affected:
+            index.remove(item)
+        if value is None:
+            del item.props[key]
+        else:
+            item.props[key] = value
+        try:
+            for index in affected:
+                index.add(item)
+        except ConstraintViolation:
+            for index in affected:
+                index.remove(item)
+            if old is _MISSING:
+                item.props.pop(key, None)
+            else:
+                item.props[key] = old
+            for index in affected:
+                index.add(item)
+            raise
+        log.counters.properties_set += 1
+        
+        def restore():
+            for index in affected:
+                index.remove(item)
+            if old is _MISSING:
+                item.props.pop(key, None)
+            else:
+                item.props[key] = old
+            for index in affected:
+                index.add(item)
+        log.undo.append(restore)
+    
+    def add_label(self, node: _Node, label: str, log: _WriteLog):
+        if label in node.labels:
+            return
+        node.labels[label] = None
+        self.label_index.setdefault(label, set()).add(node.id)
+        indexes = self._node_indexes(label)
+        try:
+            for index in indexes:
+                index.add(node)
+        except ConstraintViolation:
+            for index in indexes:
+                index.remove(node)
+            del node.labels[label]
+            self.label_index[label].discard(node.id)
+            raise
+        log.counters.labels_added += 1
+        
+        def restore():
+            for index in indexes:
+                index.remove(node)
+            node.labels.pop(label, None)
+            self.label_index[label].discard(node.id)
+        log.undo.append(restore)
+    
+    def remove_label(self, node: _Node, label: str, log: _WriteLog):
+        if label not in node.labels:
+            return
+        indexes = self._node_indexes(label)
+        for index in indexes:
+            index.remove(node)
+        del node.labels[label]
+        self.label_index[label].discard(node.id)
+        log.counters.labels_removed += 1
+        
+        def restore():
+            node.labels[label] = None
+            self.label_index[label].add(node.id)
+            for index in indexes:
+                index.add(node)
+        log.undo.append(restore)
+    
+    def _indexes_for(self, item, key: str) -> List[_PropertyIndex]:
+        if isinstance(item, _Node):
+            return [index for index in self.indexes.values()
+                    if index.entity == 'NODE' and index.token in item.labels and key in index.properties]
+        return [index for index in self.indexes.values()
+                if index.entity == 'RELATIONSHIP' and index.token == item.type and key in index.properties]
+    
+    def _index_node(self, node: _Node):
+        added = []
+        try:
+            for label in node.labels:
+                for index in self._node_indexes(label):
+                    index.add(node)
+                    added.append(index)
+        except ConstraintViolation:
+            for index in added:
+                index.remove(node)
+            raise
+    
+    def _unindex_node(self, node: _Node, strict: bool = True):
+        for label in node.labels:
+            for index in self._node_indexes(label):
+                index.remove(node)
+    
+    def _index_rel(self, rel: _Rel):
+        for index in self.indexes.values():
+            if index.entity == 'RELATIONSHIP' and index.token == rel.type:
+                index.add(rel)
+    
+    def _unindex_rel(self, rel: _Rel):
+        for index in self.indexes.values():
+            if index.entity == 'RELATIONSHIP' and index.token == rel.type:
+                index.remove(rel)
+    
+    # -- CALL --
+    
+    def _run_call(self, clause, rows, ctx):
+        _, name, arguments, yields, where = clause
+        procedure = _PROCEDURES.get(name)
+        if procedure is None:
+            raise ProcedureNotFound(f"인메모리 그래프가 지원하지 않는 프로시저: {name}")
+        output = []
+        for row in rows:
+            for result in procedure(self, ctx, *[argument(row, ctx) for argument in arguments]):
+                if yields in (None, '*'):
+                    values = dict(result)
+                else:
+                    values = {}
+                    for column, alias in yields:
+                        if column not in result:
+                            raise MemoryGraphError(f"{name}에 {column} 컬럼이 없습니다")
+                        values[alias] = result[column]
+                combined = {**row, **values}
+                if where is None or where(combined, ctx) is True:
+                    output.append(combined)
+        return output
+    
+    # -- 스키마 --
+    
+    def _schema_command(self, text: str, log: _WriteLog) -> List[Dict[str, Any]]:
+        match = _CREATE_CONSTRAINT.match(text)
+        if match:
+            return self._create_constraint(match, log)
+        match = _CREATE_INDEX.match(text)
+        if match:
+            return self._create_index(match, log)
+        match = _DROP.match(text)
+        if match:
+            kind, name, if_exists = match.group(1).upper(), _unquote(match.group(2)), bool(match.group(3))
+            if kind == 'CONSTRAINT':
+                constraint = self.constraints.pop(name, None)
+                if constraint is None:
+                    if if_exists:
+                        return []
+                    raise MemoryGraphError(f"제약조건이 없습니다: {name}")
+                owned = self.indexes.pop(name, None)
+                log.counters.constraints_removed += 1
+                
+                def restore_constraint():
+                    self.constraints[name] = constraint
+                    if owned:
+                        self.indexes[name] = owned
+                log.undo.append(restore_constraint)
+            else:
+                index = self.indexes.get(name)
+                if index is None or index.owning_constraint:
+                    if if_exists and index is None:
+                        return []
+                    raise MemoryGraphError(f"삭제할 수 있는 인덱스가 없습니다: {name}")
+                del self.indexes[name]
+                log.counters.indexes_removed += 1
+                log.undo.append(lambda: self.indexes.__setitem__(name, index))
+            return []
+        raise MemoryGraphError(f"인메모리 그래프가 지원하지 않는 스키마 명령: {text[:80]}")
+    
+    def _create_constraint(self, match, log: _WriteLog):
+        groups = match.groupdict()
+        entity = 'NODE' if groups['label'] else 'RELATIONSHIP'
+        token = _unquote(groups['label'] or groups['type'])
+        properties = tuple(_unquote(prop.split('.', 1)[1].strip()) for prop in
+                           groups['props'].strip('() ').split(','))
+        requirement = re.sub(r'\s+', ' ', groups['kind'].upper())
+        kind = {'IS UNIQUE': 'UNIQUENESS', 'IS NODE UNIQUE': 'UNIQUENESS', 'IS KEY': 'NODE_KEY',
+                'IS NODE KEY': 'NODE_KEY', 'IS NOT NULL': 'NODE_PROPERTY_EXISTENCE',
+                'IS RELATIONSHIP UNIQUE': 'UNIQUENESS', 'IS REL UNIQUE': 'UNIQUENESS'}.get(requirement)
+        if kind is None:
+            raise MemoryGraphError(f"지원하지 않는 제약조건: {requirement}")
+        if entity == 'RELATIONSHIP':
+            kind = {'UNIQUENESS': 'RELATIONSHIP_UNIQUENESS', 'NODE_PROPERTY_EXISTENCE':
+                    'RELATIONSHIP_PROPERTY_EXISTENCE', 'NODE_KEY': 'RELATIONSHIP_KEY'}[kind]
+        name = _unquote(groups['name']) if groups['name'] else \
+            f"constraint_{abs(hash((entity, token, properties, kind))) & 0xffffffff:08x}"
+        
+        existing = self.constraints.get(name) or next(
+            (constraint for constraint in self.constraints.values()
+             if (constraint.entity, constraint.token, constraint.properties, constraint.kind) ==
+             (entity, token, properties, kind)), None)
+        if existing:
+            if groups['ifnotexists']:
+                return []
+            raise MemoryGraphError(f"이미 있는 제약조건: {existing.name}")
+        
+        constraint = _Constraint(name, kind, entity, token, properties)
+        unique = kind in ('UNIQUENESS', 'NODE_KEY', 'RELATIONSHIP_UNIQUENESS', 'RELATIONSHIP_KEY')
+        if unique:
+            index = _PropertyIndex(name, entity, token, properties, 'RANGE', owning_constraint=name, unique=True)
+            items = (self.nodes[node_id] for node_id in self.label_index.get(token, ())) if entity == 'NODE' \
+                else (self.rels[rel_id] for rel_id in self.type_index.get(token, ()))
+            for item in items:
+                index.add(item)
+            # 같은 속성의 일반 인덱스는 제약조건 인덱스로 대체되지 않으므로 그대로 둠
+            self.indexes[name] = index
+        self.constraints[name] = constraint
+        log.counters.constraints_added += 1
+        
+        def restore():
+            self.constraints.pop(name, None)
+            if unique:
+                self.indexes.pop(name, None)
+        log.undo.append(restore)
+        return []
+    
+    def _create_index(self, match, log: _WriteLog):
+        groups = match.groupdict()
+        index_type = (groups['kind'] or 'RANGE').upper()
+        if index_type == 'LOOKUP':
+            return []
+        entity = 'NODE' if groups['label'] else 'RELATIONSHIP'
+        token = _unquote(groups['label'] or groups['type'])
+        properties = tuple(_unquote(prop.split('.', 1)[1].strip()) for prop in groups['props'].split(','))
+        name = _unquote(groups['name']) if groups['name'] else \
+            f"index_{abs(hash((entity, token, properties, index_type))) & 0xffffffff:08x}"
+        
+        existing = self.indexes.get(name) or next(
+            (index for index in self.indexes.values()
+             if (index.entity, index.token, index.properties, index.index_type) ==
+             (entity, token, properties, index_type) and not index.owning_constraint), None)
+        if existing:
+            if groups['ifnotexists']:
+                return []
+            raise MemoryGraphError(f"이미 있는 인덱스: {existing.name}")
+        
+        index = _PropertyIndex(name, entity, token, properties, index_type)
+        items = (self.nodes[node_id] for node_id in self.label_index.get(token, ())) if entity == 'NODE' \
+            else (self.rels[rel_id] for rel_id in self.type_index.get(token, ()))
+        for item in items:
+            index.add(item)
+        self.indexes[name] = index
+        log.counters.indexes_added += 1
+        log.undo.append(lambda: self.indexes.pop(name, None))
+        return []
+    
+    def constraint_rows(self) -> List[Dict[str, Any]]:
+        rows = []
+        for position, constraint in enumerate(sorted(self.constraints.values(), key=lambda c: c.name), 1):
+            target = f"(n:`{constraint.token}`)" if constraint.entity == 'NODE' else f"()-[r:`{constraint.token}`]-()"
+            variable = 'n' if constraint.entity == 'NODE' else 'r'
+            properties = ", ".join(f"{variable}.`{name}`" for name in constraint.properties)
+            requirement = {'UNIQUENESS': 'IS UNIQUE', 'RELATIONSHIP_UNIQUENESS': 'IS UNIQUE',
+                           'NODE_KEY': 'IS NODE KEY', 'RELATIONSHIP_KEY': 'IS RELATIONSHIP KEY',
+                           'NODE_PROPERTY_EXISTENCE': 'IS NOT NULL',
+                           'RELATIONSHIP_PROPERTY_EXISTENCE': 'IS NOT NULL'}[constraint.kind]
+            owned = constraint.name if constraint.name in self.indexes else None
+            rows.append({
+                'id': position, 'name': constraint.name, 'type': constraint.kind,
+                'entityType': constraint.entity, 'labelsOrTypes': [constraint.token],
+                'properties': list(constraint.properties), 'ownedIndex': owned, 'propertyType': None,
+                'createStatement': f"CREATE CONSTRAINT `{constraint.name}` FOR {target} "
+                                   f"REQUIRE ({properties}) {requirement}",
+            })
+        return rows
+    
+    def index_rows(self) -> List[Dict[str, Any]]:
+        rows = []
+        for name, entity in self.lookup_indexes.items():
+            function = 'labels(n)' if entity == 'NODE' else 'type(r)'
+            target = '(n)' if entity == 'NODE' else '()-[r]-()'
+            rows.append({
+                'name': name, 'type': 'LOOKUP', 'entityType': entity, 'labelsOrTypes': None,
+                'properties': None, 'owningConstraint': None, 'indexProvider': 'token-lookup-1.0',
+                'createStatement': f"CREATE LOOKUP INDEX `{name}` FOR {target} ON EACH {function}",
+            })
+        for index in sorted(self.indexes.values(), key=lambda i: i.name):
+            variable = 'n' if index.entity == 'NODE' else 'r'
+            target = f"(n:`{index.token}`)" if index.entity == 'NODE' else f"()-[r:`{index.token}`]-()"
+            properties = ", ".join(f"{variable}.`{name}`" for name in index.properties)
+            rows.append({
+                'name': index.name, 'type': index.index_type, 'entityType': index.entity,
+                'labelsOrTypes': [index.token], 'properties': list(index.properties),
+                'owningConstraint': index.owning_constraint,
+                'indexProvider': 'text-2.0' if index.index_type == 'TEXT' else 'range-1.0',
+                'createStatement': f"CREATE {index.index_type} INDEX `{index.name}` FOR {target} ON ({properties})",
+            })
+        for position, row in enumerate(rows, 1):
+            row.update({'id': position, 'state': 'ONLINE', 'populationPercent': 100.0,
+                        'lastRead': None, 'readCount': 0})
+        return rows
+    
+    # -- EXPLAIN --
+    
+    def _plan(self, query: _Query) -> Dict[str, Any]:
+        """탐색 방식(인덱스 조회/라벨 스캔/전체 스캔/확장)을 드라이버 plan 형식으로"""
+        operators = []
+        bound: Set[str] = set()
+        for kind, *rest in query.parts[0]:
+            if kind in ('match', 'merge'):
+                paths = rest[0] if kind == 'match' else [rest[0]]
+                hints = rest[3] if kind == 'match' else {}
+                for path in paths:
+                    operators.extend(self._plan_path(path, bound, hints))
+                    bound.update(path.variables())
+                if kind == 'match' and rest[1]:
+                    operators.append(('Filter', ''))
+            elif kind in ('with', 'return'):
+                projection = rest[0]
+                if projection.aggregating:
+                    operators.append(('EagerAggregation', ''))
+                if projection.order:
+                    operators.append(('Sort' if projection.limit is None else 'Top', ''))
+                bound = set(projection.aliases)
+            elif kind == 'unwind':
+                operators.append(('Unwind', rest[1]))
+                bound.add(rest[1])
+            elif kind == 'call':
+                operators.append(('ProcedureCall', rest[0]))
+        plan = {'operatorType': 'ProduceResults@memory', 'args': {'Details': ', '.join(query.columns)},
+                'identifiers': query.columns, 'children': []}
+        current = plan
+        for operator, details in reversed(operators):
+            child = {'operatorType': f"{operator}@memory", 'args': {'Details': details},
+                     'identifiers': [], 'children': []}
+            current['children'].append(child)
+            current = child
+        return plan
+    
+    def _plan_path(self, path: _CompiledPath, bound: Set[str], hints) -> List[Tuple[str, str]]:
+        operators = []
+        anchor = next((position for position, node in enumerate(path.nodes) if node.var in bound), None)
+        if anchor is None:
+            anchor, operator = 0, None
+            for position, node in enumerate(path.nodes):
+                keys = {key for key, _ in path.node_props[position]} | \
+                    {key for key, _, _ in hints.get(node.var, ())}
+                for label in node.labels:
+                    for index in self._node_indexes(label):
+                        if set(index.properties) <= keys:
+                            seek = 'NodeUniqueIndexSeek' if index.unique else 'NodeIndexSeek'
+                            operator = (seek, f"{_display(node.var)}:{label}({', '.join(index.properties)})")
+                            break
+                    if operator:
+                        break
+                if operator:
+                    anchor = position
+                    break
+            if operator is None:
+                node = path.nodes[0]
+                operator = ('NodeByLabelScan', f"{_display(node.var)}:{node.labels[0]}") if node.labels \
+                    else ('AllNodesScan', _display(node.var))
+            operators.append(operator)
+        for position, rel in enumerate(path.rels):
+            arrow = {'out': '->', 'in': '<-', 'both': '-'}[rel.direction]
+            types = '|'.join(rel.types)
+            operators.append(('Expand(All)', f"({_display(path.nodes[position].var)})-[{_display(rel.var)}"
+                                             f"{':' + types if types else ''}]{arrow}"
+                                             f"({_display(path.nodes[position + 1].var)})"))
+        return operators
+    
+    # -- 통계 --
+    
+    def counts(self) -> Dict[str, Any]:
+        with self.lock:
+            return {
+                'nodes': len(self.nodes),
+                'relationships': len(self.rels),
+                'labels': {label: len(ids) for label, ids in self.label_index.items() if ids},
+                'relationship_types': {rel_type: len(ids) for rel_type, ids in self.type_index.items() if ids},
+            }
+
+_MISSING = object()
+
+def _display(var: str) -> str:
+    return var.strip() if not var.startswith(_HIDDEN) else f"anon_{var.rsplit('_', 1)[-1]}"
+
+def _property_value(value, key: str):
+    if isinstance(value, dict):
+        raise MemoryGraphError(f"맵은 속성 값으로 저장할 수 없습니다: {key}")
+    if isinstance(value, (_Node, _Rel)):
+        raise MemoryGraphError(f"노드/관계는 속성 값으로 저장할 수 없습니다: {key}")
+    if isinstance(value, list):
+        if any(isinstance(item, (dict, list, _Node, _Rel)) for item in value):
+            raise MemoryGraphError(f"속성 리스트에는 기본 값만 저장할 수 있습니다: {key}")
+        return list(value)
+    return value
+
+def _unquote(name: str) -> str:
+    name = name.strip()
+    return name[1:-1].replace('``', '`') if name.startswith('`') else name
+
+_NAME = r'(?:`(?:[^`]|``)+`|[A-Za-z_][A-Za-z0-9_]*)'
+_SCHEMA_COMMANDS = re.compile(r'^(CREATE\s+(?:OR\s+REPLACE\s+)?(?:CONSTRAINT|(?:RANGE\s+|TEXT\s+|POINT\s+|LOOKUP\s+|'
+                              r'FULLTEXT\s+|VECTOR\s+|BTREE\s+)?INDEX)|DROP\s+(?:CONSTRAINT|INDEX))\b', re.I)
+_CREATE_CONSTRAINT = re.compile(
+    rf'^CREATE\s+CONSTRAINT(?:\s+(?!IF\b|FOR\b|ON\b)(?P<name>{_NAME}))?(?:\s+(?P<ifnotexists>IF\s+NOT\s+EXISTS))?\s+'
+    rf'(?:FOR|ON)\s+(?:\(\s*{_NAME}\s*:\s*(?P<label>{_NAME})\s*\)|\(\s*\)\s*-\s*\[\s*{_NAME}\s*:\s*(?P<type>{_NAME})'
+    rf'\s*\]\s*-\s*>?\s*\(\s*\))\s+(?:REQUIRE|ASSERT)\s+(?P<props>\([^)]*\)|{_NAME}\s*\.\s*{_NAME})\s+'
+    rf'(?P<kind>IS\s+(?:NODE\s+|RELATIONSHIP\s+|REL\s+)?(?:UNIQUE|KEY)|IS\s+NOT\s+NULL)\s*$', re.I)
+_CREATE_INDEX = re.compile(
+    rf'^CREATE\s+(?:(?P<kind>RANGE|TEXT|POINT|LOOKUP|BTREE)\s+)?INDEX(?:\s+(?!IF\b|FOR\b)(?P<name>{_NAME}))?'
+    rf'(?:\s+(?P<ifnotexists>IF\s+NOT\s+EXISTS))?\s+FOR\s+(?:\(\s*{_NAME}\s*(?::\s*(?P<label>{_NAME}))?\s*\)|'
+    rf'\(\s*\)\s*-\s*\[\s*{_NAME}\s*(?::\s*(?P<type>{_NAME}))?\s*\]\s*-\s*>?\s*\(\s*\))\s+ON\s+'
+    rf'(?:EACH\s+.*|\(\s*(?P<props>[^)]*)\))\s*(?:OPTIONS\s+\{{.*\}})?\s*$', re.I | re.S)
+_DROP = re.compile(rf'^DROP\s+(CONSTRAINT|INDEX)\s+({_NAME})(\s+IF\s+EXISTS)?\s*$', re.I)
+_SHOW = re.compile(r'^SHOW\s+(ALL\s+|RANGE\s+|TEXT\s+|LOOKUP\s+|UNIQUE(?:NESS)?\s+|KEY\s+|EXIST(?:ENCE)?\s+)?'
+                   r'(INDEX(?:ES)?|CONSTRAINTS?)\b', re.I)
+
+# ---------------------------------------------------------------------------
+# 프로시저
+# ---------------------------------------------------------------------------
+
+def _proc_meta_stats(graph: MemoryGraph, ctx):
+    counts = graph.counts()
+    rel_types = {}
+    for rel in graph.rels.values():
+        for label in rel.start.labels:
+            pattern = f"(:{label})-[:{rel.type}]->()"
+            rel_types[pattern] = rel_types.get(pattern, 0) + 1
+        pattern = f"()-[:{rel.type}]->()"
+        rel_types[pattern] = rel_types.get(pattern, 0) + 1
+    property_keys = {key for item in list(graph.nodes.values()) + list(graph.rels.values()) for key in item.props}
+    stats = {
+        'labelCount': len(counts['labels']), 'relTypeCount': len(counts['relationship_types']),
+        'propertyKeyCount': len(property_keys), 'nodeCount': counts['nodes'], 'relCount': counts['relationships'],
+        'labels': counts['labels'], 'relTypes': rel_types, 'relTypesCount': counts['relationship_types'],
+    }
+    yield {**stats, 'stats': dict(stats)}
+
+def _proc_schema_visualization(graph: MemoryGraph, ctx):
+    labels = sorted(label for label, ids in graph.label_index.items() if ids)
+    yield {'nodes': [{'name': label} for label in labels],
+           'relationships': sorted({rel.type for rel in graph.rels.values()})}
+
+_PROCEDURES: Dict[str, Callable] = {
+    'db.labels': lambda graph, ctx: ({'label': label} for label, ids in sorted(graph.label_index.items()) if ids),
+    'db.relationshiptypes': lambda graph, ctx: ({'relationshipType': rel_type}
+                                                for rel_type, ids in sorted(graph.type_index.items()) if ids),
+    'db.propertykeys': lambda graph, ctx: ({'propertyKey': key} for key in sorted(
+        {key for item in list(graph.nodes.values()) + list(graph.rels.values()) for key in item.props})),
+    'db.ping': lambda graph, ctx: iter([{'success': True}]),
+    'db.awaitindexes': lambda graph, ctx, timeout=300: iter(()),
+    'db.awaitindex': lambda graph, ctx, name=None, timeout=300: iter(()),
+    'db.info': lambda graph, ctx: iter([{'id': f"memory-{id(graph):x}", 'name': 'neo4j',
+                                         'creationDate': graph.created_at}]),
+    'dbms.components': lambda graph, ctx: iter([{'name': 'Neo4j Kernel', 'versions': ['memory'],
+                                                 'edition': 'memory'}]),
+    'db.schema.visualization': _proc_schema_visualization,
+    'apoc.meta.stats': _proc_meta_stats,
+    '__show.constraints': lambda graph, ctx: iter(graph.constraint_rows()),
+    '__show.indexes': lambda graph, ctx: iter(graph.index_rows()),
+}
+
+# ---------------------------------------------------------------------------
+# 드라이버 인터페이스
+# ---------------------------------------------------------------------------
+
+class MemoryResultSummary:
+    """neo4j.ResultSummary와 같은 이름의 속성"""
+    
+    def __init__(self, query: str, parameters: Dict[str, Any], counters: SummaryCounters,
+                 plan: Optional[Dict[str, Any]], elapsed: float):
+        self.query = query
+        self.parameters = parameters
+        self.counters = counters
+        # PROFILE이면 neo4j 드라이버처럼 plan 대신 profile에 담음
+        profiled = query.lstrip().upper().startswith('PROFILE ')
+        self.plan = None if profiled else plan
+        self.profile = plan if profiled else None
+        self.notifications = []
+        self.database = 'neo4j'
+        self.query_type = 'rw' if counters.contains_updates else 'r'
+        self.result_available_after = int(elapsed * 1000)
+        self.result_consumed_after = 0
+
+class MemoryResult:
+    """neo4j.Result와 같은 인터페이스 (결과는 실행 시점에 모두 계산됨)"""
+    
+    def __init__(self, keys: List[str], records: List[Record], summary: MemoryResultSummary):
+        self._keys = keys
+        self._records = records
+        self._position = 0
+        self._summary = summary
+    
+    def __iter__(self):
+        while self._position < len(self._records):
+            record = self._records[self._position]
+            self._position += 1
+            yield record
+    
+    def __next__(self):
+        if self._position >= len(self._records):
+            raise StopIteration
+        record = self._records[self._position]
+        self._position += 1
+        return record
+    
+    def keys(self) -> List[str]:
+        return list(self._keys)
+    
+    def single(self, strict: bool = False) -> Optional[Record]:
+        remaining = self._records[self._position:]
+        self._position = len(self._records)
+        if strict and len(remaining) != 1:
+            raise MemoryGraphError(f"결과가 정확히 1개가 아닙니다 ({len(remaining)}개)")
+        return remaining[0] if remaining else None
+    
+    def peek(self) -> Optional[Record]:
+        return self._records[self._position] if self._position < len(self._records) else None
+    
+    def fetch(self, n: int) -> List[Record]:
+        records = self._records[self._position:self._position + n]
+        self._position += len(records)
+        return records
+    
+    def data(self, *keys) -> List[Dict[str, Any]]:
+        return [record.data(*keys) for record in self]
+    
+    def values(self, *keys) -> List[List[Any]]:
+        return [record.values(*keys) for record in self]
+    
+    def value(self, key=0, default=None) -> List[Any]:
+        return [record.value(key, default) for record in self]
+    
+    def consume(self) -> MemoryResultSummary:
+        self._position = len(self._records)
+        return self._summary
+
+class MemoryTransaction:
+    """execute_read/execute_write의 tx, begin_transaction()의 명시적 트랜잭션"""
+    
+    def __init__(self, graph: MemoryGraph):
+        self.graph = graph
+        self.log = _WriteLog(graph)
+        self.closed = False
+        graph.lock.acquire()
+    
+    def run(self, query: str, parameters: Optional[Dict[str, Any]] = None, **kwargs) -> MemoryResult:
+        if self.closed:
+            raise MemoryGraphError("이미 종료된 트랜잭션입니다")
+        return self.graph.run(query, {**(parameters or {}), **kwargs}, log=self.log)
+    
+    def commit(self):
+        if not self.closed:
+            self.log.undo.clear()
+            self._close()
+    
+    def rollback(self):
+        if not self.closed:
+            self.log.rollback()
+            self._close()
+    
+    def close(self):
+        self.rollback()
+    
+    def _close(self):
+        self.closed = True
+        self.graph.lock.release()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc, traceback):
+        if exc_type is None:
+            self.commit()
+        else:
+            self.rollback()
+        return False
+
+class MemorySession:
+    """neo4j.Session과 같은 인터페이스"""
+    
+    def __init__(self, graph: MemoryGraph, database: Optional[str] = None):
+        self.graph = graph
+        self.database = database
+        self.closed = False
+    
+    def run(self, query: str, parameters: Optional[Dict[str, Any]] = None, **kwargs) -> MemoryResult:
+        return self.graph.run(query, {**(parameters or {}), **kwargs})
+    
+    def execute_read(self, work: Callable, *args, **kwargs):
+        return self._execute(work, *args, **kwargs)
+    
+    def execute_write(self, work: Callable, *args, **kwargs):
+        return self._execute(work, *args, **kwargs)
+    
+    # 드라이버 4.x 이름
+    read_transaction = execute_read
+    write_transaction = execute_write
+    
+    def _execute(self, work, *args, **kwargs):
+        tx = MemoryTransaction(self.graph)
+        try:
+            result = work(tx, *args, **kwargs)
+        except Exception:
+            tx.rollback()
+            raise
+        tx.commit()
+        return result
+    
+    def begin_transaction(self, metadata=None, timeout=None) -> MemoryTransaction:
+        return MemoryTransaction(self.graph)
+    
+    def close(self):
+        self.closed = True
+    
+    def last_bookmarks(self):
+        return []
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc):
+        self.close()
+        return False
+
+class MemoryDriver:
+    """neo4j.Driver와 같은 인터페이스"""
+    
+    def __init__(self, graph: Optional[MemoryGraph] = None):
+        self.graph = graph or MemoryGraph()
+        self.closed = False
+    
+    def session(self, database: Optional[str] = None, **config) -> MemorySession:
+        return MemorySession(self.graph, database)
+    
+    def execute_query(self, query: str, parameters_: Optional[Dict[str, Any]] = None, routing_=None,
+                      database_=None, impersonated_user_=None, bookmark_manager_=None, auth_=None,
+                      result_transformer_=None, **kwargs):
+        result = self.graph.run(query, {**(parameters_ or {}), **kwargs})
+        if result_transformer_ is not None:
+            return result_transformer_(result)
+        records = list(result)
+        return EagerResult(records, result.consume(), result.keys())
+    
+    def verify_connectivity(self, **config):
+        return None
+    
+    def get_server_info(self):
+        return None
+    
+    def close(self):
+        if not self.closed and self.graph.path:
+            self.graph.save()
+        self.closed = True
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc):
+        self.close()
+        return False
+
+MEMORY_SCHEME = 'memory://'
+
+def is_memory_uri(uri: Optional[str]) -> bool:
+    return bool(uri) and uri.startswith(MEMORY_SCHEME)
+
+def open_driver(uri: str, auth=None, **config):
+    """
+    URI에 맞는 드라이버
+    
+    memory://이름       → 프로세스 안에서 이름으로 공유되는 인메모리 그래프
+    memory:///파일경로   → 파일 스냅샷에서 로드, driver.close() 시 저장
+    그 외               → neo4j.GraphDatabase.driver
+    """
+    if is_memory_uri(uri):
+        name = uri[len(MEMORY_SCHEME):] or 'default'
+        graph = MemoryGraph.named(name)
+        logger.info(f"🧠 인메모리 그래프 사용: {name} (노드 {len(graph.nodes)}개)")
+        return MemoryDriver(graph)
+    from neo4j import GraphDatabase
+    return GraphDatabase.driver(uri, auth=auth, **config)
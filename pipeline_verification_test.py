@@ -15,6 +15,7 @@ logger = logging.getLogger(__name__)
 # Import the pipeline
 sys.path.append('poc/ai_pipeline')
 from claude_neo4j_pipeline import ClaudeNeo4jPipeline
+from graph_statistics import get_snapshot
 
 def detailed_pipeline_verification():
     """파이프라인 컴포넌트별 상세 검증"""
@@ -107,12 +108,9 @@ def detailed_pipeline_verification():
         # 4. 데이터베이스 상태 확인
         logger.info("\n4️⃣ 데이터베이스 최종 상태 확인:")
         with pipeline.driver.session() as session:
-            # 총 데이터 확인
-            result = session.run("MATCH (n) RETURN count(n) as nodes")
-            nodes = result.single()['nodes']
-            
-            result = session.run("MATCH ()-[r]->() RETURN count(r) as rels")
-            rels = result.single()['rels']
+            # 총 데이터 확인 (카운트 스토어 통계)
+            snapshot = get_snapshot(pipeline.driver, refresh=True)
+            nodes, rels = snapshot.nodes, snapshot.relationships
             
             logger.info(f"  총 노드: {nodes}개")
             logger.info(f"  총 관계: {rels}개")
@@ -7,14 +7,102 @@
 import os
 import sys
 import json
-from datetime import datetime
+import argparse
+from datetime import datetime, timedelta, timezone
 from typing import Dict, List, Any, Optional
-from neo4j import GraphDatabase
 import logging
 
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..'))
+from memory_graph import open_driver, is_memory_uri
+
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# 지원하는 활동 타입 → 노드 고유 키 필드
+ACTIVITY_TYPES = {
+    'commit': 'hash',
+    'file_creation': 'path',
+    'task_completion': 'task_id',
+    'knowledge_insight': 'insight_id',
+}
+
+# 활동 타입별 필수 필드 (기록 쿼리에서 MERGE 키와 datetime() 변환에 쓰이는 값)
+ACTIVITY_REQUIRED_FIELDS = {
+    'commit': ['hash', 'message', 'author', 'timestamp'],
+    'file_creation': ['path', 'name', 'created'],
+    'task_completion': ['task_id', 'name', 'completion_date'],
+    'knowledge_insight': ['insight_id', 'title', 'generated'],
+}
+
+# 활동 타입별 시각 필드 (기록 쿼리에서 datetime()으로 변환, ISO 8601이어야 함)
+ACTIVITY_TIME_FIELDS = {
+    'commit': 'timestamp',
+    'file_creation': 'created',
+    'task_completion': 'completion_date',
+    'knowledge_insight': 'generated',
+}
+
+# 활동 타입별 숫자 필드 (있으면 정수/실수여야 함)
+ACTIVITY_NUMERIC_FIELDS = {
+    'commit': ['files_changed', 'lines_added', 'lines_deleted'],
+    'file_creation': ['size'],
+    'task_completion': ['effort'],
+    'knowledge_insight': ['confidence'],
+}
+
+def parse_activity_datetime(value: Any) -> datetime:
+    """ISO 8601 문자열 → datetime (시간대가 없으면 UTC)"""
+    if not isinstance(value, datetime):
+        try:
+            value = datetime.fromisoformat(str(value).replace('Z', '+00:00'))
+        except ValueError:
+            raise ValueError(f"잘못된 시각 형식: {value!r}")
+    return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+
+def _is_number(value: Any) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+def validate_activity(activity: Any) -> List[str]:
+    """
+    활동 이벤트 검증
+    
+    Returns:
+        오류 메시지 목록 (비어 있으면 유효)
+    """
+    if not isinstance(activity, dict):
+        return ["활동 이벤트는 JSON 객체여야 합니다"]
+    
+    activity_type = activity.get('type')
+    if activity_type not in ACTIVITY_TYPES:
+        return [f"알 수 없는 활동 타입: {activity_type} (지원: {', '.join(ACTIVITY_TYPES)})"]
+    
+    errors = [
+        f"필수 필드 누락: {field}"
+        for field in ACTIVITY_REQUIRED_FIELDS[activity_type]
+        if activity.get(field) in (None, '')
+    ]
+    
+    # 배치 하나가 통째로 실패하지 않도록 기록 쿼리가 변환할 값도 미리 확인
+    time_field = ACTIVITY_TIME_FIELDS[activity_type]
+    if activity.get(time_field) not in (None, ''):
+        try:
+            parse_activity_datetime(activity[time_field])
+        except ValueError:
+            errors.append(f"{time_field}는 ISO 8601 시각이어야 합니다: {activity[time_field]!r}")
+    
+    for field in ACTIVITY_NUMERIC_FIELDS[activity_type]:
+        if activity.get(field) is not None and not _is_number(activity[field]):
+            errors.append(f"{field}는 숫자여야 합니다: {activity[field]!r}")
+    
+    concepts = activity.get('related_concepts')
+    if concepts is not None:
+        if not isinstance(concepts, list) or not all(isinstance(c, dict) and c.get('id') for c in concepts):
+            errors.append("related_concepts는 id를 가진 객체 배열이어야 합니다")
+        elif any(c.get('strength') is not None and not _is_number(c['strength']) for c in concepts):
+            errors.append("related_concepts의 strength는 숫자여야 합니다")
+    
+    return errors
+
 class ClaudeNeo4jPipeline:
     """
     Claude AI와 Neo4j AuraDB 간 실시간 지식 생성 파이프라인
@@ -23,19 +111,20 @@ class ClaudeNeo4jPipeline:
     def __init__(self, instance_id="3e875bd7", username="neo4j", password=None):
         """초기화"""
         self.instance_id = instance_id
-        self.uri = f"neo4j+s://{instance_id}.databases.neo4j.io"
+        self.uri = os.getenv('NEO4J_URI', f"neo4j+s://{instance_id}.databases.neo4j.io")
         self.username = username
         self.password = password or os.getenv('NEO4J_PASSWORD')
         self.driver = None
         
-        if not self.password:
+        # memory:// URI는 인메모리 그래프(내장 모드) - 비밀번호 불필요
+        if not self.password and not is_memory_uri(self.uri):
             raise ValueError("NEO4J_PASSWORD 환경변수가 설정되지 않았습니다.")
     
     def connect(self) -> bool:
         """AuraDB 연결"""
         try:
             logger.info(f"🔌 AuraDB 파이프라인 연결: {self.uri}")
-            self.driver = GraphDatabase.driver(self.uri, auth=(self.username, self.password))
+            self.driver = open_driver(self.uri, auth=(self.username, self.password))
             
             with self.driver.session() as session:
                 result = session.run("RETURN 'Claude-Neo4j Pipeline Active!' as status")
@@ -58,121 +147,196 @@ class ClaudeNeo4jPipeline:
         """
         개발 활동을 실시간으로 지식 그래프에 기록
         """
+        activity_type = activity_data.get('type', 'Unknown')
+        if activity_type not in ACTIVITY_TYPES:
+            logger.warning(f"⚠️  알 수 없는 활동 타입: {activity_data.get('type')}")
+            return False
+        
         try:
             with self.driver.session() as session:
-                logger.info(f"📝 개발 활동 기록: {activity_data.get('type', 'Unknown')}")
-                
-                if activity_data.get('type') == 'commit':
-                    return self._log_git_commit(session, activity_data)
-                elif activity_data.get('type') == 'file_creation':
-                    return self._log_file_creation(session, activity_data)
-                elif activity_data.get('type') == 'task_completion':
-                    return self._log_task_completion(session, activity_data)
-                elif activity_data.get('type') == 'knowledge_insight':
-                    return self._log_knowledge_insight(session, activity_data)
-                else:
-                    logger.warning(f"⚠️  알 수 없는 활동 타입: {activity_data.get('type')}")
-                    return False
+                logger.info(f"📝 개발 활동 기록: {activity_type}")
+                session.execute_write(self._write_activity_batch, [activity_data])
+                return True
                     
         except Exception as e:
             logger.error(f"❌ 개발 활동 기록 실패: {e}")
             return False
     
-    def _log_git_commit(self, session, data: Dict[str, Any]) -> bool:
+    def log_development_activities(self, activities: List[Dict[str, Any]]) -> int:
+        """
+        여러 개발 활동을 하나의 쓰기 트랜잭션으로 일괄 기록
+        
+        Returns:
+            기록된 활동 수 (알 수 없는 타입은 건너뜀)
+        """
+        known = [a for a in activities if a.get('type') in ACTIVITY_TYPES]
+        if len(known) < len(activities):
+            logger.warning(f"⚠️  알 수 없는 활동 타입 {len(activities) - len(known)}개 건너뛰기")
+        if not known:
+            return 0
+        
+        try:
+            with self.driver.session() as session:
+                written = session.execute_write(self._write_activity_batch, known)
+                logger.info(f"📝 개발 활동 일괄 기록: {written}개")
+                return written
+                
+        except Exception as e:
+            logger.error(f"❌ 개발 활동 일괄 기록 실패: {e}")
+            return 0
+    
+    def _write_activity_batch(self, tx, activities: List[Dict[str, Any]]) -> int:
+        """
+        트랜잭션 함수: 활동을 타입별로 묶어 UNWIND 쿼리로 기록
+        
+        재시도 시 다시 호출될 수 있으므로 MERGE 기반으로 멱등성을 유지하고,
+        같은 노드를 건드리는 트랜잭션끼리 잠금 순서가 같도록 키 순으로 정렬합니다.
+        """
+        grouped: Dict[str, List[Dict[str, Any]]] = {}
+        for activity in activities:
+            grouped.setdefault(activity['type'], []).append(activity)
+        
+        written = 0
+        for activity_type, writer in (
+            ('commit', self._log_git_commits),
+            ('file_creation', self._log_file_creations),
+            ('task_completion', self._log_task_completions),
+            ('knowledge_insight', self._log_knowledge_insights),
+        ):
+            rows = grouped.get(activity_type)
+            if rows:
+                rows.sort(key=lambda row: str(row.get(ACTIVITY_TYPES[activity_type]) or ''))
+                written += writer(tx, rows)
+        return written
+    
+    def _log_git_commits(self, tx, rows: List[Dict[str, Any]]) -> int:
         """Git 커밋 활동 기록"""
-        session.run("""
-            MERGE (commit:Commit {hash: $hash})
-            SET commit.message = $message,
-                commit.author = $author,
-                commit.timestamp = datetime($timestamp),
-                commit.files_changed = $files_changed,
-                commit.lines_added = $lines_added,
-                commit.lines_deleted = $lines_deleted,
-                commit.activity_type = "development"
-        """, **data)
-        
-        # 개발자와 연결
-        session.run("""
-            MATCH (commit:Commit {hash: $hash}), (dev:Developer {id: $author})
-            MERGE (dev)-[:AUTHORED {timestamp: datetime($timestamp)}]->(commit)
-        """, hash=data['hash'], author=data['author'], timestamp=data['timestamp'])
-        
-        logger.info(f"  ✅ Git 커밋 기록: {data['hash'][:8]} - {data['message'][:50]}...")
-        return True
+        tx.run("""
+            UNWIND $rows AS row
+            MERGE (commit:Commit {hash: row.hash})
+            SET commit.message = row.message,
+                commit.author = row.author,
+                commit.timestamp = datetime(row.timestamp),
+                commit.files_changed = row.files_changed,
+                commit.lines_added = row.lines_added,
+                commit.lines_deleted = row.lines_deleted,
+                commit.activity_type = "development",
+                commit:Activity,
+                commit.activity_at = commit.timestamp
+            WITH commit, row
+            // 개발자와 연결
+            MATCH (dev:Developer {id: row.author})
+            MERGE (dev)-[r:AUTHORED {timestamp: datetime(row.timestamp)}]->(commit)
+            // 개발자 생산성 카운터 갱신 (새 관계일 때만)
+            ON CREATE SET dev.total_activities = coalesce(dev.total_activities, 0) + 1,
+                          dev.commits = coalesce(dev.commits, 0) + 1,
+                          dev.last_activity = CASE
+                              WHEN dev.last_activity IS NULL OR r.timestamp > dev.last_activity
+                              THEN r.timestamp ELSE dev.last_activity END
+        """, rows=rows).consume()
+        
+        if len(rows) == 1:
+            logger.info(f"  ✅ Git 커밋 기록: {rows[0]['hash'][:8]} - {rows[0]['message'][:50]}...")
+        else:
+            logger.info(f"  ✅ Git 커밋 {len(rows)}개 기록")
+        return len(rows)
     
-    def _log_file_creation(self, session, data: Dict[str, Any]) -> bool:
+    def _log_file_creations(self, tx, rows: List[Dict[str, Any]]) -> int:
         """파일 생성 활동 기록"""
-        session.run("""
-            MERGE (file:File {path: $path})
-            SET file.name = $name,
-                file.extension = $extension,
-                file.size = $size,
-                file.created = datetime($created),
-                file.purpose = $purpose,
-                file.complexity = $complexity
-        """, **data)
-        
-        # 개발자와 연결
-        if data.get('creator'):
-            session.run("""
-                MATCH (file:File {path: $path}), (dev:Developer {id: $creator})
-                MERGE (dev)-[:CREATED {timestamp: datetime($created)}]->(file)
-            """, path=data['path'], creator=data['creator'], created=data['created'])
-        
-        logger.info(f"  ✅ 파일 생성 기록: {data['name']}")
-        return True
+        tx.run("""
+            UNWIND $rows AS row
+            MERGE (file:File {path: row.path})
+            SET file.name = row.name,
+                file.extension = row.extension,
+                file.size = row.size,
+                file.created = datetime(row.created),
+                file.purpose = coalesce(row.purpose, file.purpose),
+                file.complexity = coalesce(row.complexity, file.complexity),
+                file:Activity,
+                file.activity_at = file.created
+            WITH file, row
+            WHERE row.creator IS NOT NULL
+            // 개발자와 연결
+            MATCH (dev:Developer {id: row.creator})
+            MERGE (dev)-[r:CREATED {timestamp: datetime(row.created)}]->(file)
+            // 개발자 생산성 카운터 갱신 (새 관계일 때만)
+            ON CREATE SET dev.total_activities = coalesce(dev.total_activities, 0) + 1,
+                          dev.files_created = coalesce(dev.files_created, 0) + 1,
+                          dev.last_activity = CASE
+                              WHEN dev.last_activity IS NULL OR r.timestamp > dev.last_activity
+                              THEN r.timestamp ELSE dev.last_activity END
+        """, rows=rows).consume()
+        
+        if len(rows) == 1:
+            logger.info(f"  ✅ 파일 생성 기록: {rows[0]['name']}")
+        else:
+            logger.info(f"  ✅ 파일 생성 {len(rows)}개 기록")
+        return len(rows)
     
-    def _log_task_completion(self, session, data: Dict[str, Any]) -> bool:
+    def _log_task_completions(self, tx, rows: List[Dict[str, Any]]) -> int:
         """작업 완료 활동 기록"""
-        session.run("""
-            MERGE (task:Task {id: $task_id})
-            SET task.name = $name,
-                task.description = $description,
-                task.status = $status,
-                task.completion_date = datetime($completion_date),
-                task.duration = $duration,
-                task.complexity = $complexity
-        """, **data)
-        
-        # 개발자와 연결
-        if data.get('assignee'):
-            session.run("""
-                MATCH (task:Task {id: $task_id}), (dev:Developer {id: $assignee})
-                MERGE (dev)-[:COMPLETED {
-                    completion_date: datetime($completion_date),
-                    effort: $effort
-                }]->(task)
-            """, task_id=data['task_id'], assignee=data['assignee'], 
-                completion_date=data['completion_date'], effort=data.get('effort', 5))
-        
-        logger.info(f"  ✅ 작업 완료 기록: {data['name']}")
-        return True
+        tx.run("""
+            UNWIND $rows AS row
+            MERGE (task:Task {id: row.task_id})
+            SET task.name = row.name,
+                task.description = row.description,
+                task.status = row.status,
+                task.completion_date = datetime(row.completion_date),
+                task.duration = row.duration,
+                task.complexity = row.complexity,
+                task:Activity,
+                task.activity_at = task.completion_date
+            WITH task, row
+            WHERE row.assignee IS NOT NULL
+            // 개발자와 연결
+            MATCH (dev:Developer {id: row.assignee})
+            MERGE (dev)-[r:COMPLETED {
+                completion_date: datetime(row.completion_date),
+                effort: coalesce(row.effort, 5)
+            }]->(task)
+            // 개발자 생산성 카운터 갱신 (새 관계일 때만)
+            ON CREATE SET dev.total_activities = coalesce(dev.total_activities, 0) + 1,
+                          dev.tasks_completed = coalesce(dev.tasks_completed, 0) + 1,
+                          dev.last_activity = CASE
+                              WHEN dev.last_activity IS NULL OR r.completion_date > dev.last_activity
+                              THEN r.completion_date ELSE dev.last_activity END
+        """, rows=rows).consume()
+        
+        if len(rows) == 1:
+            logger.info(f"  ✅ 작업 완료 기록: {rows[0]['name']}")
+        else:
+            logger.info(f"  ✅ 작업 완료 {len(rows)}개 기록")
+        return len(rows)
     
-    def _log_knowledge_insight(self, session, data: Dict[str, Any]) -> bool:
+    def _log_knowledge_insights(self, tx, rows: List[Dict[str, Any]]) -> int:
         """지식 인사이트 기록"""
-        session.run("""
-            MERGE (insight:Insight {id: $insight_id})
-            SET insight.title = $title,
-                insight.description = $description,
-                insight.category = $category,
-                insight.confidence = $confidence,
-                insight.generated = datetime($generated),
-                insight.source = $source
-        """, **data)
-        
-        # 관련 개념과 연결
-        if data.get('related_concepts'):
-            for concept in data['related_concepts']:
-                session.run("""
-                    MATCH (insight:Insight {id: $insight_id})
-                    MERGE (concept:Concept {id: $concept_id})
-                    ON CREATE SET concept.name = $concept_name
-                    MERGE (insight)-[:RELATES_TO {strength: $strength}]->(concept)
-                """, insight_id=data['insight_id'], concept_id=concept['id'], 
-                    concept_name=concept['name'], strength=concept.get('strength', 5))
-        
-        logger.info(f"  ✅ 지식 인사이트 기록: {data['title']}")
-        return True
+        # 공유 Concept 노드의 잠금 순서를 고정하기 위해 개념 ID 순으로 정렬
+        rows = [
+            {**row, 'related_concepts': sorted(row.get('related_concepts') or [], key=lambda c: c['id'])}
+            for row in rows
+        ]
+        tx.run("""
+            UNWIND $rows AS row
+            MERGE (insight:Insight {id: row.insight_id})
+            SET insight.title = row.title,
+                insight.description = row.description,
+                insight.category = row.category,
+                insight.confidence = row.confidence,
+                insight.generated = datetime(row.generated),
+                insight.source = row.source
+            WITH insight, row
+            // 관련 개념과 연결
+            UNWIND row.related_concepts AS concept
+            MERGE (c:Concept {id: concept.id})
+            ON CREATE SET c.name = concept.name
+            MERGE (insight)-[:RELATES_TO {strength: coalesce(concept.strength, 5)}]->(c)
+        """, rows=rows).consume()
+        
+        if len(rows) == 1:
+            logger.info(f"  ✅ 지식 인사이트 기록: {rows[0]['title']}")
+        else:
+            logger.info(f"  ✅ 지식 인사이트 {len(rows)}개 기록")
+        return len(rows)
     
     def extract_knowledge_insights(self, query_type: str = "recent_activities") -> List[Dict[str, Any]]:
         """
@@ -198,24 +362,75 @@ class ClaudeNeo4jPipeline:
             logger.error(f"❌ 지식 인사이트 추출 실패: {e}")
             return []
     
-    def _get_recent_activities(self, session) -> List[Dict[str, Any]]:
-        """최근 활동 분석"""
+    def _get_recent_activities(self, session, limit: int = 10) -> List[Dict[str, Any]]:
+        """
+        최근 활동 분석
+        
+        :Activity(activity_at) 인덱스를 현재 시각부터 과거로 1시간, 4시간, 16시간...
+        구간씩 거슬러 올라가며 limit개가 채워지면 멈춥니다. 전체 이력 크기와 무관하게
+        최근 구간의 인덱스 항목만 읽습니다.
+        """
+        record = session.run("""
+            MATCH (activity:Activity)
+            WHERE activity.activity_at IS NOT NULL
+            RETURN activity.activity_at as earliest
+            ORDER BY earliest ASC
+            LIMIT 1
+        """).single()
+        if not record:
+            logger.info("  📊 최근 활동 0개 추출")
+            return []
+        
+        earliest = record['earliest'].to_native()
+        until = datetime.now(timezone.utc)
+        window = timedelta(hours=1)
+        activities = []
+        
+        while len(activities) < limit:
+            since = until - window
+            activities.extend(self._get_activities_between(session, since, until, limit - len(activities)))
+            if since <= earliest:
+                break
+            until = since
+            window *= 4
+        
+        logger.info(f"  📊 최근 활동 {len(activities)}개 추출")
+        return activities
+    
+    def get_activities_in_window(self, since: datetime, until: datetime,
+                                 limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        시간 구간 [since, until) 내 개발 활동 조회 (최신순)
+        """
+        try:
+            with self.driver.session() as session:
+                activities = self._get_activities_between(session, since, until, limit)
+                logger.info(f"  📊 구간 활동 {len(activities)}개 추출: {since.isoformat()} ~ {until.isoformat()}")
+                return activities
+                
+        except Exception as e:
+            logger.error(f"❌ 구간 활동 조회 실패: {e}")
+            return []
+    
+    def _get_activities_between(self, session, since: datetime, until: datetime,
+                                limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """activity_at 범위 인덱스로 구간 내 활동 조회"""
         result = session.run("""
-            MATCH (dev:Developer)-[r]->(activity)
-            WHERE type(r) IN ['AUTHORED', 'CREATED', 'COMPLETED']
-            AND activity.timestamp IS NOT NULL
+            MATCH (activity:Activity)
+            WHERE activity.activity_at >= $since AND activity.activity_at < $until
+            MATCH (dev:Developer)-[:AUTHORED|CREATED|COMPLETED]->(activity)
             RETURN dev.name as developer,
-                   labels(activity)[0] as activity_type,
-                   activity.timestamp as timestamp,
+                   [label IN labels(activity) WHERE label <> 'Activity'][0] as activity_type,
+                   activity.activity_at as timestamp,
                    CASE 
                        WHEN 'Commit' IN labels(activity) THEN activity.message
                        WHEN 'File' IN labels(activity) THEN activity.name
                        WHEN 'Task' IN labels(activity) THEN activity.name
                        ELSE 'Unknown'
                    END as description
-            ORDER BY activity.timestamp DESC
-            LIMIT 10
-        """)
+            ORDER BY activity.activity_at DESC
+        """ + ("LIMIT $limit" if limit is not None else ""),
+            since=since, until=until, limit=limit)
         
         activities = []
         for record in result:
@@ -225,25 +440,20 @@ class ClaudeNeo4jPipeline:
                 'timestamp': str(record['timestamp']),
                 'description': record['description']
             })
-        
-        logger.info(f"  📊 최근 활동 {len(activities)}개 추출")
         return activities
     
     def _analyze_developer_productivity(self, session) -> List[Dict[str, Any]]:
-        """개발자 생산성 분석"""
+        """개발자 생산성 분석 (기록 시 갱신되는 개발자 카운터 조회)"""
         result = session.run("""
-            MATCH (dev:Developer)-[r]->(activity)
-            WHERE type(r) IN ['AUTHORED', 'CREATED', 'COMPLETED']
-            WITH dev, count(r) as total_activities,
-                 count(CASE WHEN 'Commit' IN labels(activity) THEN 1 END) as commits,
-                 count(CASE WHEN 'File' IN labels(activity) THEN 1 END) as files_created,
-                 count(CASE WHEN 'Task' IN labels(activity) THEN 1 END) as tasks_completed
+            MATCH (dev:Developer)
+            WHERE dev.total_activities > 0
             RETURN dev.name as developer,
                    dev.specialization as specialization,
-                   total_activities,
-                   commits,
-                   files_created, 
-                   tasks_completed
+                   dev.total_activities as total_activities,
+                   coalesce(dev.commits, 0) as commits,
+                   coalesce(dev.files_created, 0) as files_created, 
+                   coalesce(dev.tasks_completed, 0) as tasks_completed,
+                   dev.last_activity as last_activity
             ORDER BY total_activities DESC
         """)
         
@@ -255,7 +465,8 @@ class ClaudeNeo4jPipeline:
                 'total_activities': record['total_activities'],
                 'commits': record['commits'],
                 'files_created': record['files_created'],
-                'tasks_completed': record['tasks_completed']
+                'tasks_completed': record['tasks_completed'],
+                'last_activity': str(record['last_activity'])
             })
         
         logger.info(f"  📈 개발자 생산성 분석 {len(productivity)}명")
@@ -321,6 +532,78 @@ class ClaudeNeo4jPipeline:
         logger.info(f"  🎯 지식 격차 식별 {len(gaps)}개")
         return gaps
     
+    def rebuild_developer_counters(self) -> int:
+        """
+        개발자 생산성 카운터를 관계로부터 다시 계산
+        
+        시드 데이터처럼 파이프라인을 거치지 않고 만들어진 관계가 있거나
+        카운터가 어긋났을 때 사용합니다. 개발자 단위로 나눠 커밋합니다.
+        
+        Returns:
+            갱신된 개발자 수
+        """
+        try:
+            with self.driver.session() as session:
+                logger.info("🔁 개발자 생산성 카운터 재계산...")
+                result = session.run("""
+                    MATCH (dev:Developer)
+                    CALL {
+                        WITH dev
+                        OPTIONAL MATCH (dev)-[r:AUTHORED|CREATED|COMPLETED]->()
+                        WITH dev,
+                             count(r) as total_activities,
+                             count(CASE WHEN type(r) = 'AUTHORED' THEN 1 END) as commits,
+                             count(CASE WHEN type(r) = 'CREATED' THEN 1 END) as files_created,
+                             count(CASE WHEN type(r) = 'COMPLETED' THEN 1 END) as tasks_completed,
+                             max(coalesce(r.timestamp, r.completion_date)) as last_activity
+                        SET dev.total_activities = total_activities,
+                            dev.commits = commits,
+                            dev.files_created = files_created,
+                            dev.tasks_completed = tasks_completed,
+                            dev.last_activity = last_activity
+                    } IN TRANSACTIONS OF 1000 ROWS
+                    RETURN count(dev) as developers
+                """)
+                developers = result.single()["developers"]
+                logger.info(f"✅ 개발자 {developers}명의 카운터 재계산 완료")
+                return developers
+                
+        except Exception as e:
+            logger.error(f"❌ 카운터 재계산 실패: {e}")
+            return 0
+    
+    def rebuild_activity_index(self) -> int:
+        """
+        기존 Commit/File/Task 노드에 :Activity 라벨과 activity_at 속성을 채움
+        
+        activity_at 인덱스가 생기기 전에 기록된 활동을 최근 활동 조회 대상에 포함시킵니다.
+        
+        Returns:
+            갱신된 활동 노드 수
+        """
+        try:
+            with self.driver.session() as session:
+                logger.info("🔁 활동 시간 인덱스 재구성...")
+                result = session.run("""
+                    MATCH (activity)
+                    WHERE (activity:Commit OR activity:File OR activity:Task)
+                      AND activity.activity_at IS NULL
+                    CALL {
+                        WITH activity
+                        SET activity:Activity,
+                            activity.activity_at = coalesce(activity.timestamp, activity.created,
+                                                            activity.completion_date)
+                    } IN TRANSACTIONS OF 10000 ROWS
+                    RETURN count(activity) as activities
+                """)
+                activities = result.single()["activities"]
+                logger.info(f"✅ 활동 {activities}개 인덱스 재구성 완료")
+                return activities
+                
+        except Exception as e:
+            logger.error(f"❌ 활동 시간 인덱스 재구성 실패: {e}")
+            return 0
+    
     def simulate_real_time_pipeline(self) -> bool:
         """
         실시간 파이프라인 시뮬레이션
@@ -346,13 +629,14 @@ class ClaudeNeo4jPipeline:
             self.log_development_activity(current_task)
             
             # 2. 파일 생성 기록 (현재 파이프라인 파일)
+            file_stat = os.stat(__file__)
             pipeline_file = {
                 'type': 'file_creation',
                 'path': 'poc/ai_pipeline/claude_neo4j_pipeline.py',
                 'name': 'claude_neo4j_pipeline.py',
                 'extension': 'py',
-                'size': 12000,  # 예상 크기
-                'created': datetime.now().isoformat(),
+                'size': file_stat.st_size,
+                'created': datetime.fromtimestamp(file_stat.st_mtime, tz=timezone.utc).isoformat(),
                 'purpose': 'Claude-Neo4j 실시간 지식 생성 파이프라인',
                 'complexity': 9,
                 'creator': 'code_architect_ai'
@@ -406,6 +690,13 @@ class ClaudeNeo4jPipeline:
 
 def main():
     """메인 실행 함수"""
+    parser = argparse.ArgumentParser(description="Claude-Neo4j AI 파이프라인 PoC")
+    parser.add_argument("--rebuild-counters", action="store_true",
+                        help="개발자 생산성 카운터를 관계로부터 다시 계산하고 종료")
+    parser.add_argument("--rebuild-activity-index", action="store_true",
+                        help="기존 활동 노드에 activity_at 시간 인덱스 속성을 채우고 종료")
+    args = parser.parse_args()
+    
     logger.info("🚀 Claude-Neo4j AI 파이프라인 PoC 시작")
     logger.info("=" * 60)
     
@@ -416,6 +707,13 @@ def main():
         if not pipeline.connect():
             return False
         
+        if args.rebuild_counters or args.rebuild_activity_index:
+            if args.rebuild_activity_index:
+                pipeline.rebuild_activity_index()
+            if args.rebuild_counters:
+                pipeline.rebuild_developer_counters()
+            return True
+        
         # 2. 실시간 파이프라인 시뮬레이션
         if not pipeline.simulate_real_time_pipeline():
             return False
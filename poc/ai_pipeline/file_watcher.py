@@ -0,0 +1,293 @@
+#!/usr/bin/env python3
+"""
+마음로그 V4.0 - 작업 트리 파일 감시기
+작업 디렉터리의 파일 생성을 inotify로 감지하여 File 활동으로 지식 그래프에 기록
+
+- 짧은 시간에 몰리는 편집 이벤트는 debounce 후 한 번만 기록
+- 임시 파일을 쓰고 rename하는 원자적 저장도 처음 보는 경로면 생성으로 기록
+- 경로별 생성 시각은 처음 본 시점에 고정 (같은 파일을 다시 보내도 CREATED 관계가 늘지 않음)
+- .gitignore 규칙(git check-ignore)에 해당하는 경로는 무시
+- 파일 stat은 배치 단위로 수행하고 결과를 PartitionedIngestionWriter로 전달
+"""
+
+import os
+import sys
+import time
+import argparse
+import subprocess
+import threading
+import logging
+from datetime import datetime, timezone
+from typing import Dict, List, Any, Optional, Set
+
+from claude_neo4j_pipeline import ClaudeNeo4jPipeline
+from ingestion_workers import PartitionedIngestionWriter
+
+logger = logging.getLogger(__name__)
+
+class GitIgnoreFilter:
+    """git check-ignore를 이용한 .gitignore 경로 필터 (배치 단위 조회)"""
+    
+    def __init__(self, root: str):
+        self.root = root
+        self.enabled = self._is_git_repository()
+        if not self.enabled:
+            logger.warning(f"⚠️  Git 저장소가 아닙니다. .gitignore 필터 비활성화: {root}")
+    
+    def _is_git_repository(self) -> bool:
+        try:
+            subprocess.run(
+                ["git", "-C", self.root, "rev-parse", "--show-toplevel"],
+                check=True, capture_output=True
+            )
+            return True
+        except (OSError, subprocess.CalledProcessError):
+            return False
+    
+    def ignored(self, paths: List[str]) -> Set[str]:
+        """무시 대상 경로 집합 (root 기준 상대 경로)"""
+        ignored = {p for p in paths if p == '.git' or p.startswith('.git/')}
+        candidates = [p for p in paths if p not in ignored]
+        if not self.enabled or not candidates:
+            return ignored
+        
+        # 종료 코드 1은 "무시 대상 없음"
+        result = subprocess.run(
+            ["git", "-C", self.root, "check-ignore", "--stdin", "-z"],
+            input="\0".join(candidates).encode('utf-8') + b"\0",
+            capture_output=True
+        )
+        if result.returncode not in (0, 1):
+            logger.warning(f"⚠️  git check-ignore 실패: {result.stderr.decode('utf-8', 'replace').strip()}")
+            return ignored
+        
+        ignored.update(p for p in result.stdout.decode('utf-8').split("\0") if p)
+        return ignored
+
+class WorkingTreeWatcher:
+    """
+    작업 트리 파일 생성 감시 → file_creation 활동 이벤트 생성
+    
+    사용 예:
+        watcher = WorkingTreeWatcher("/path/to/repo", writer, creator="code_architect_ai")
+        watcher.run_forever()
+    """
+    
+    def __init__(self, root: str, writer: PartitionedIngestionWriter, creator: Optional[str] = None,
+                 project_id: Optional[str] = None, debounce: float = 1.0, stat_batch_size: int = 200,
+                 track_modifications: bool = False):
+        """
+        Args:
+            root: 감시할 작업 트리 경로
+            writer: 이벤트를 기록할 배치 수집기
+            creator: 파일 생성자 Developer ID
+            project_id: 이벤트 파티션용 프로젝트 ID (creator가 없을 때 사용)
+            debounce: 마지막 이벤트 이후 이 시간(초) 동안 조용해야 기록
+            stat_batch_size: 한 번에 stat/ignore 검사할 경로 수
+            track_modifications: 기존 파일 수정도 기록할지 여부
+        """
+        self.root = os.path.abspath(root)
+        self.writer = writer
+        self.creator = creator
+        self.project_id = project_id
+        self.debounce = debounce
+        self.stat_batch_size = stat_batch_size
+        self.track_modifications = track_modifications
+        self.ignore_filter = GitIgnoreFilter(self.root)
+        
+        # 상대 경로 → (마지막 이벤트 시각, 생성 이벤트 여부)
+        self._pending: Dict[str, tuple] = {}
+        # 이미 본 경로 → 고정된 생성 시각 (ISO, 감시 시작 전부터 있던 파일은 처음 기록할 때 정함)
+        self._known: Dict[str, Optional[str]] = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._observer = None
+        self._flusher = None
+        self.emitted = 0
+    
+    def start(self):
+        """inotify 감시 및 debounce 처리 스레드 시작"""
+        # watchdog은 Linux에서 inotify 백엔드를 사용
+        from watchdog.observers import Observer
+        from watchdog.events import FileSystemEventHandler
+        
+        watcher = self
+        self._snapshot_existing()
+        
+        class _Handler(FileSystemEventHandler):
+            def on_created(self, event):
+                if not event.is_directory:
+                    watcher._mark(event.src_path, created=True)
+            
+            def on_modified(self, event):
+                if not event.is_directory:
+                    watcher._mark(event.src_path, created=False)
+            
+            def on_moved(self, event):
+                # 원자적 저장(임시 파일 → rename): 대상 경로를 처음 보면 생성
+                if not event.is_directory:
+                    watcher._forget(event.src_path)
+                    watcher._mark(event.dest_path, created=None)
+        
+        self._observer = Observer()
+        self._observer.schedule(_Handler(), self.root, recursive=True)
+        self._observer.start()
+        
+        self._flusher = threading.Thread(target=self._flush_loop, name="file-watcher-flush", daemon=True)
+        self._flusher.start()
+        logger.info(f"👀 작업 트리 감시 시작: {self.root} (debounce {self.debounce}초)")
+    
+    def stop(self):
+        """감시 종료 (대기 중인 경로는 즉시 기록)"""
+        self._stop.set()
+        if self._observer:
+            self._observer.stop()
+            self._observer.join()
+        if self._flusher:
+            self._flusher.join()
+        self._flush(force=True)
+        logger.info(f"👀 작업 트리 감시 종료: 파일 이벤트 {self.emitted}개 기록")
+    
+    def run_forever(self):
+        """Ctrl+C까지 감시"""
+        self.start()
+        try:
+            while not self._stop.is_set():
+                time.sleep(1)
+        except KeyboardInterrupt:
+            logger.info("⏹️  사용자에 의해 중단되었습니다.")
+        finally:
+            self.stop()
+    
+    def _snapshot_existing(self):
+        """감시 시작 전부터 있던 파일 목록 (이후 rename 대상이 새 파일인지 판단용)"""
+        for directory, subdirectories, files in os.walk(self.root):
+            subdirectories[:] = [name for name in subdirectories if name != '.git']
+            for name in files:
+                relative = os.path.relpath(os.path.join(directory, name), self.root).replace(os.sep, '/')
+                self._known[relative] = None
+        logger.info(f"👀 기존 파일 {len(self._known)}개 확인")
+    
+    def _relative(self, path: str) -> Optional[str]:
+        relative = os.path.relpath(path, self.root).replace(os.sep, '/')
+        return None if relative.startswith('..') else relative
+    
+    def _mark(self, path: str, created: Optional[bool]):
+        """
+        이벤트 발생 경로 기록 (debounce 대기열)
+        
+        created=None이면 처음 보는 경로일 때만 생성으로 취급 (rename 대상)
+        """
+        relative = self._relative(path)
+        if relative is None:
+            return
+        
+        with self._lock:
+            last_seen, was_created = self._pending.get(relative, (None, False))
+            if created is None:
+                created = last_seen is None and relative not in self._known
+            self._pending[relative] = (time.monotonic(), was_created or created)
+            if created:
+                # 처음 본 시각을 생성 시각으로 고정 (이미 본 경로면 기존 시각 유지)
+                self._known.setdefault(relative, datetime.now(timezone.utc).isoformat())
+    
+    def _forget(self, path: str):
+        """rename된 원래 경로(임시 파일)는 기록 대기열에서 제외"""
+        relative = self._relative(path)
+        if relative is not None:
+            with self._lock:
+                self._pending.pop(relative, None)
+    
+    def _flush_loop(self):
+        """debounce 시간이 지난 경로를 주기적으로 기록"""
+        while not self._stop.wait(self.debounce / 2):
+            self._flush()
+    
+    def _flush(self, force: bool = False):
+        """조용해진 경로를 배치로 stat 하여 이벤트 생성"""
+        now = time.monotonic()
+        with self._lock:
+            ready = [
+                (path, created) for path, (last_seen, created) in self._pending.items()
+                if force or now - last_seen >= self.debounce
+            ]
+            for path, _ in ready:
+                del self._pending[path]
+        
+        ready = [(path, created) for path, created in ready if created or self.track_modifications]
+        for i in range(0, len(ready), self.stat_batch_size):
+            batch = ready[i:i + self.stat_batch_size]
+            ignored = self.ignore_filter.ignored([path for path, _ in batch])
+            for path, _ in batch:
+                if path in ignored:
+                    continue
+                event = self._build_event(path)
+                if event:
+                    self.writer.submit(event)
+                    self.emitted += 1
+    
+    def _build_event(self, relative: str) -> Optional[Dict[str, Any]]:
+        """실제 파일 stat으로 file_creation 이벤트 구성 (created는 경로별로 고정된 시각)"""
+        try:
+            stat = os.stat(os.path.join(self.root, relative))
+        except FileNotFoundError:
+            # debounce 사이에 삭제된 임시 파일
+            return None
+        
+        name = os.path.basename(relative)
+        with self._lock:
+            created = self._known.get(relative)
+            if created is None:
+                # 감시 전부터 있던 파일: 생성 시각(없으면 처음 기록하는 시점의 수정 시각)으로 고정
+                created_ts = getattr(stat, 'st_birthtime', stat.st_mtime)
+                created = datetime.fromtimestamp(created_ts, tz=timezone.utc).isoformat()
+                self._known[relative] = created
+        return {
+            'type': 'file_creation',
+            'path': relative,
+            'name': name,
+            'extension': os.path.splitext(name)[1].lstrip('.'),
+            'size': stat.st_size,
+            'created': created,
+            'purpose': None,
+            'complexity': None,
+            'creator': self.creator,
+            'project_id': self.project_id,
+        }
+
+def main():
+    """작업 트리 감시 모드 실행"""
+    parser = argparse.ArgumentParser(description="작업 트리 파일 생성을 지식 그래프로 스트리밍")
+    parser.add_argument("root", nargs="?", default=".", help="감시할 작업 트리 경로")
+    parser.add_argument("--creator", default=os.getenv('MINDLOG_DEVELOPER_ID'),
+                        help="파일 생성자 Developer ID (기본: MINDLOG_DEVELOPER_ID)")
+    parser.add_argument("--project-id", default=None, help="프로젝트 ID")
+    parser.add_argument("--debounce", type=float, default=1.0, help="debounce 시간 (초)")
+    parser.add_argument("--track-modifications", action="store_true", help="기존 파일 수정도 기록")
+    parser.add_argument("--workers", type=int, default=2, help="수집 워커 수")
+    args = parser.parse_args()
+    
+    pipeline = ClaudeNeo4jPipeline()
+    if not pipeline.connect():
+        return False
+    
+    writer = PartitionedIngestionWriter(pipeline, workers=args.workers)
+    try:
+        writer.start()
+        watcher = WorkingTreeWatcher(
+            args.root, writer,
+            creator=args.creator,
+            project_id=args.project_id,
+            debounce=args.debounce,
+            track_modifications=args.track_modifications
+        )
+        watcher.run_forever()
+        writer.close()
+        return writer.stats()['failed'] == 0
+    
+    finally:
+        pipeline.close()
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
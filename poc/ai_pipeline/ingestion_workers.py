@@ -0,0 +1,345 @@
+#!/usr/bin/env python3
+"""
+마음로그 V4.0 - 파티션 기반 병렬 수집 워커
+개발 활동 이벤트를 핫 노드(개발자/프로젝트) 기준으로 분할하여 병렬 기록
+
+같은 Developer 노드에 AUTHORED/CREATED/COMPLETED 관계를 MERGE하는 쓰기는
+항상 같은 워커가 처리하므로, 워커끼리 잠금 경합이나 데드락 재시도 없이
+각자 배치 트랜잭션으로 기록할 수 있습니다.
+"""
+
+import sys
+import json
+import time
+import queue
+import zlib
+import argparse
+import threading
+import logging
+from collections import OrderedDict
+from typing import Dict, List, Any, Optional, Tuple
+
+from claude_neo4j_pipeline import ACTIVITY_TYPES, ClaudeNeo4jPipeline
+
+logger = logging.getLogger(__name__)
+
+# 활동 타입별로 잠금이 몰리는 핫 노드(개발자)를 가리키는 필드
+ACTIVITY_PARTITION_FIELDS = {
+    'commit': 'author',
+    'file_creation': 'creator',
+    'task_completion': 'assignee',
+}
+
+# 공유 노드(Concept)를 MERGE하는 활동 타입: 프로젝트와 무관하게 항상 한 워커에 모음
+SHARED_PARTITION_TYPES = {'knowledge_insight'}
+
+_STOP = object()
+
+# 상태를 보관할 최근 수집 토큰 수
+MAX_TRACKED_TOKENS = 10000
+
+def partition_key(activity: Dict[str, Any]) -> str:
+    """
+    활동이 건드리는 핫 노드 키 계산
+    
+    개발자 ID → 프로젝트 ID → 활동 타입 순으로 사용합니다.
+    인사이트는 여러 프로젝트가 같은 Concept 노드를 MERGE하므로 프로젝트와 무관하게
+    타입 단위로 묶어 공유 Concept 노드를 한 워커만 씁니다.
+    """
+    if activity.get('type') in SHARED_PARTITION_TYPES:
+        return activity['type']
+    field = ACTIVITY_PARTITION_FIELDS.get(activity.get('type'))
+    key = activity.get(field) if field else None
+    return str(key or activity.get('project_id') or activity.get('type', 'unknown'))
+
+class PartitionedIngestionWriter:
+    """
+    파티션별 단일 워커가 배치 트랜잭션으로 기록하는 병렬 수집기
+    
+    사용 예:
+        writer = PartitionedIngestionWriter(pipeline, workers=4)
+        writer.start()
+        for event in events:
+            writer.submit(event)
+        writer.close()
+    """
+    
+    def __init__(self, pipeline, workers: int = 4, batch_size: int = 500,
+                 flush_interval: float = 0.5, max_queue: int = 10000):
+        """
+        Args:
+            pipeline: 연결된 ClaudeNeo4jPipeline 인스턴스 (드라이버 공유)
+            workers: 워커(파티션) 수
+            batch_size: 트랜잭션당 최대 이벤트 수
+            flush_interval: 배치가 다 차지 않아도 기록하는 최대 대기 시간 (초)
+            max_queue: 파티션별 대기열 크기 (가득 차면 submit이 대기)
+        """
+        if workers < 1:
+            raise ValueError("workers는 1 이상이어야 합니다.")
+        
+        self.pipeline = pipeline
+        self.workers = workers
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.queues = [queue.Queue(maxsize=max_queue) for _ in range(workers)]
+        self.threads: List[threading.Thread] = []
+        
+        self._pending = 0
+        self._pending_lock = threading.Condition()
+        # 대기열에 넣는 쪽끼리 직렬화 (submit_many가 확인한 여유 공간을 다른 제출이 가로채지 않도록)
+        self._submit_lock = threading.Lock()
+        self._stats = {
+            'submitted': 0,
+            'written': 0,
+            'failed': 0,
+            'batches': 0,
+            'retries': 0,
+            'splits': 0,
+        }
+        # 수집 토큰 → 처리 현황 (API 비동기 수집 상태 조회용)
+        self._tokens: 'OrderedDict[str, Dict[str, int]]' = OrderedDict()
+    
+    def start(self):
+        """워커 스레드 시작"""
+        if self.threads:
+            return
+        
+        for index in range(self.workers):
+            thread = threading.Thread(
+                target=self._run_worker,
+                args=(index,),
+                name=f"ingestion-worker-{index}",
+                daemon=True
+            )
+            thread.start()
+            self.threads.append(thread)
+        
+        logger.info(f"🧵 파티션 수집 워커 {self.workers}개 시작 (배치 {self.batch_size}개)")
+    
+    def partition_for(self, activity: Dict[str, Any]) -> int:
+        """활동을 처리할 워커 번호"""
+        return zlib.crc32(partition_key(activity).encode('utf-8')) % self.workers
+    
+    def submit(self, activity: Dict[str, Any], token: Optional[str] = None,
+               timeout: Optional[float] = None):
+        """
+        활동 이벤트를 해당 파티션 대기열에 추가
+        
+        Args:
+            activity: 활동 이벤트
+            token: 처리 현황을 묶어 볼 수집 토큰
+            timeout: 대기열이 가득 찼을 때 기다릴 최대 시간 (초과 시 queue.Full)
+        """
+        if activity.get('type') not in ACTIVITY_TYPES:
+            logger.warning(f"⚠️  알 수 없는 활동 타입: {activity.get('type')}")
+            return
+        
+        # 워커가 먼저 기록을 끝내도 집계가 맞도록 대기열에 넣기 전에 계수
+        self._reserve(1, token)
+        try:
+            with self._submit_lock:
+                self.queues[self.partition_for(activity)].put((activity, token), timeout=timeout)
+        except queue.Full:
+            self._reserve(-1, token)
+            raise
+    
+    def submit_many(self, activities: List[Dict[str, Any]], token: Optional[str] = None,
+                    timeout: Optional[float] = None):
+        """
+        활동 이벤트 여러 개를 전부 적재하거나 하나도 적재하지 않음
+        
+        모든 파티션 대기열에 필요한 여유 공간이 생길 때까지 최대 timeout초 기다리고,
+        그래도 부족하면 아무것도 넣지 않고 queue.Full을 일으킵니다.
+        """
+        items = [(self.partition_for(activity), activity) for activity in activities
+                 if activity.get('type') in ACTIVITY_TYPES]
+        needed: Dict[int, int] = {}
+        for index, _ in items:
+            needed[index] = needed.get(index, 0) + 1
+        
+        if any(0 < self.queues[index].maxsize < count for index, count in needed.items()):
+            # 대기열 크기보다 큰 묶음은 기다려도 들어가지 않음
+            raise queue.Full
+        
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._submit_lock:
+            # 워커는 대기열에서 꺼내기만 하므로 잠금을 쥔 동안 여유 공간은 줄지 않음
+            while not all(self.queues[index].maxsize <= 0 or
+                          self.queues[index].maxsize - self.queues[index].qsize() >= count
+                          for index, count in needed.items()):
+                if deadline is not None and time.monotonic() >= deadline:
+                    raise queue.Full
+                time.sleep(0.01)
+            
+            self._reserve(len(items), token)
+            for index, activity in items:
+                self.queues[index].put_nowait((activity, token))
+    
+    def _reserve(self, count: int, token: Optional[str]):
+        """제출 계수 증감 (대기열 적재 실패 시 음수로 되돌림)"""
+        with self._pending_lock:
+            self._pending += count
+            self._stats['submitted'] += count
+            if token:
+                self._track(token)['accepted'] += count
+            if count < 0:
+                self._pending_lock.notify_all()
+    
+    def token_status(self, token: str) -> Optional[Dict[str, int]]:
+        """수집 토큰의 처리 현황 (accepted / written / failed / pending)"""
+        with self._pending_lock:
+            status = self._tokens.get(token)
+            if status is None:
+                return None
+            return {**status, 'pending': status['accepted'] - status['written'] - status['failed']}
+    
+    def _track(self, token: str) -> Dict[str, int]:
+        """토큰 현황 항목 (오래된 토큰부터 정리)"""
+        status = self._tokens.get(token)
+        if status is None:
+            status = self._tokens[token] = {'accepted': 0, 'written': 0, 'failed': 0}
+            while len(self._tokens) > MAX_TRACKED_TOKENS:
+                self._tokens.popitem(last=False)
+        return status
+    
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """제출된 모든 이벤트가 기록(또는 실패 처리)될 때까지 대기"""
+        with self._pending_lock:
+            return self._pending_lock.wait_for(lambda: self._pending == 0, timeout=timeout)
+    
+    def close(self, timeout: Optional[float] = None):
+        """남은 이벤트를 기록하고 워커 종료"""
+        for q in self.queues:
+            q.put(_STOP)
+        for thread in self.threads:
+            thread.join(timeout)
+        self.threads = []
+        
+        stats = self.stats()
+        logger.info(f"🧵 파티션 수집 워커 종료: {stats['written']}개 기록, {stats['failed']}개 실패, "
+                    f"{stats['batches']}개 배치, 재시도 {stats['retries']}회")
+    
+    def stats(self) -> Dict[str, int]:
+        """수집 통계"""
+        with self._pending_lock:
+            return {**self._stats, 'pending': self._pending}
+    
+    def _run_worker(self, index: int):
+        """워커 루프: 대기열에서 배치를 모아 하나의 트랜잭션으로 기록"""
+        q = self.queues[index]
+        stopping = False
+        
+        with self.pipeline.driver.session() as session:
+            while not stopping:
+                try:
+                    first = q.get(timeout=self.flush_interval)
+                except queue.Empty:
+                    continue
+                if first is _STOP:
+                    break
+                
+                batch = [first]
+                deadline = time.monotonic() + self.flush_interval
+                while len(batch) < self.batch_size:
+                    remaining = deadline - time.monotonic()
+                    try:
+                        item = q.get(timeout=remaining) if remaining > 0 else q.get_nowait()
+                    except queue.Empty:
+                        break
+                    if item is _STOP:
+                        stopping = True
+                        break
+                    batch.append(item)
+                
+                self._write_batch(session, index, batch)
+    
+    def _write_batch(self, session, index: int, batch: List[Tuple[Dict[str, Any], Optional[str]]]):
+        """배치 기록 및 통계 갱신 (실패한 이벤트만 해당 토큰의 failed로 집계)"""
+        counts = {'attempts': 0, 'transactions': 0, 'splits': 0}
+        results = self._write_items(session, index, batch, counts)
+        
+        with self._pending_lock:
+            self._stats['batches'] += 1
+            self._stats['retries'] += max(counts['attempts'] - counts['transactions'], 0)
+            self._stats['splits'] += counts['splits']
+            for (_, token), succeeded in zip(batch, results):
+                outcome = 'written' if succeeded else 'failed'
+                self._stats[outcome] += 1
+                if token and token in self._tokens:
+                    self._tokens[token][outcome] += 1
+            self._pending -= len(batch)
+            self._pending_lock.notify_all()
+    
+    def _write_items(self, session, index: int, batch: List[Tuple[Dict[str, Any], Optional[str]]],
+                     counts: Dict[str, int]) -> List[bool]:
+        """
+        이벤트 묶음을 하나의 트랜잭션으로 기록 → 이벤트별 성공 여부
+        
+        일시적 오류는 드라이버(execute_write)가 재시도합니다. 그 밖의 오류는 잘못된 이벤트 하나가
+        배치 전체를 롤백시킨 것이므로 절반씩 나눠 다시 기록하고, 끝까지 실패한 이벤트만 실패로 남깁니다.
+        """
+        activities = [activity for activity, _ in batch]
+        
+        def work(tx):
+            counts['attempts'] += 1
+            return self.pipeline._write_activity_batch(tx, activities)
+        
+        counts['transactions'] += 1
+        try:
+            session.execute_write(work)
+            return [True] * len(batch)
+        except Exception as e:
+            if len(batch) == 1:
+                activity = activities[0]
+                key = activity.get(ACTIVITY_TYPES.get(activity.get('type'), ''), '?')
+                logger.error(f"❌ 워커 {index} 이벤트 기록 실패 ({activity.get('type')} {key}): {e}")
+                return [False]
+            if _is_transient(e):
+                logger.error(f"❌ 워커 {index} 배치 기록 실패 ({len(batch)}개): {e}")
+                return [False] * len(batch)
+            logger.warning(f"⚠️  워커 {index} 배치 롤백 ({len(batch)}개), 나눠서 재시도: {e}")
+        
+        counts['splits'] += 1
+        middle = len(batch) // 2
+        return (self._write_items(session, index, batch[:middle], counts) +
+                self._write_items(session, index, batch[middle:], counts))
+
+def _is_transient(error: Exception) -> bool:
+    """드라이버 재시도 후에도 남은 일시적 오류 (연결 끊김 등) - 나눠서 다시 써도 소용없음"""
+    retryable = getattr(error, 'is_retryable', None)
+    return bool(retryable()) if callable(retryable) else False
+
+def main():
+    """NDJSON 활동 파일을 파티션 워커로 수집"""
+    parser = argparse.ArgumentParser(description="파티션 기반 병렬 활동 수집")
+    parser.add_argument("events", help="활동 이벤트 NDJSON 파일 (한 줄에 하나)")
+    parser.add_argument("--workers", type=int, default=4, help="워커(파티션) 수")
+    parser.add_argument("--batch-size", type=int, default=500, help="트랜잭션당 이벤트 수")
+    args = parser.parse_args()
+    
+    pipeline = ClaudeNeo4jPipeline()
+    if not pipeline.connect():
+        return False
+    
+    writer = PartitionedIngestionWriter(pipeline, workers=args.workers, batch_size=args.batch_size)
+    started = time.perf_counter()
+    
+    try:
+        writer.start()
+        with open(args.events, 'r', encoding='utf-8') as f:
+            for line in f:
+                if line.strip():
+                    writer.submit(json.loads(line))
+        writer.close()
+        
+        elapsed = time.perf_counter() - started
+        stats = writer.stats()
+        logger.info(f"⚡ {stats['written']}개 기록, {elapsed:.1f}초 ({stats['written'] / elapsed:.0f} events/s)")
+        return stats['failed'] == 0
+    
+    finally:
+        pipeline.close()
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
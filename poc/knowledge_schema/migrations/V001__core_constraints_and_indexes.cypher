@@ -0,0 +1,48 @@
+// =============================================================================
+// V001 - 핵심 노드 제약 조건 및 인덱스
+// 적용된 마이그레이션은 수정하지 말고 새 버전 파일을 추가하세요 (체크섬 검증)
+// =============================================================================
+
+// 개발자 노드
+CREATE CONSTRAINT developer_id_unique IF NOT EXISTS FOR (d:Developer) REQUIRE d.id IS UNIQUE;
+CREATE INDEX developer_name_index IF NOT EXISTS FOR (d:Developer) ON (d.name);
+
+// 프로젝트 노드
+CREATE CONSTRAINT project_id_unique IF NOT EXISTS FOR (p:Project) REQUIRE p.id IS UNIQUE;
+CREATE INDEX project_name_index IF NOT EXISTS FOR (p:Project) ON (p.name);
+
+// 코밋 노드
+CREATE CONSTRAINT commit_hash_unique IF NOT EXISTS FOR (c:Commit) REQUIRE c.hash IS UNIQUE;
+CREATE INDEX commit_timestamp_index IF NOT EXISTS FOR (c:Commit) ON (c.timestamp);
+
+// 파일 노드
+CREATE CONSTRAINT file_path_unique IF NOT EXISTS FOR (f:File) REQUIRE f.path IS UNIQUE;
+CREATE INDEX file_type_index IF NOT EXISTS FOR (f:File) ON (f.extension);
+
+// 함수/메서드 노드
+CREATE CONSTRAINT function_signature_unique IF NOT EXISTS FOR (fn:Function) REQUIRE fn.signature IS UNIQUE;
+CREATE INDEX function_name_index IF NOT EXISTS FOR (fn:Function) ON (fn.name);
+
+// 클래스 노드
+CREATE CONSTRAINT class_full_name_unique IF NOT EXISTS FOR (cls:Class) REQUIRE cls.fullName IS UNIQUE;
+CREATE INDEX class_name_index IF NOT EXISTS FOR (cls:Class) ON (cls.name);
+
+// 개념 노드
+CREATE CONSTRAINT concept_id_unique IF NOT EXISTS FOR (con:Concept) REQUIRE con.id IS UNIQUE;
+CREATE INDEX concept_name_index IF NOT EXISTS FOR (con:Concept) ON (con.name);
+
+// 학습 세션 노드
+CREATE CONSTRAINT session_id_unique IF NOT EXISTS FOR (s:Session) REQUIRE s.id IS UNIQUE;
+CREATE INDEX session_date_index IF NOT EXISTS FOR (s:Session) ON (s.startTime);
+
+// 스킬 노드
+CREATE CONSTRAINT skill_id_unique IF NOT EXISTS FOR (sk:Skill) REQUIRE sk.id IS UNIQUE;
+CREATE INDEX skill_category_index IF NOT EXISTS FOR (sk:Skill) ON (sk.category);
+
+// 패턴 노드
+CREATE CONSTRAINT pattern_id_unique IF NOT EXISTS FOR (pat:Pattern) REQUIRE pat.id IS UNIQUE;
+CREATE INDEX pattern_type_index IF NOT EXISTS FOR (pat:Pattern) ON (pat.type);
+
+// 이슈/태스크 노드
+CREATE CONSTRAINT issue_id_unique IF NOT EXISTS FOR (i:Issue) REQUIRE i.id IS UNIQUE;
+CREATE INDEX issue_status_index IF NOT EXISTS FOR (i:Issue) ON (i.status);
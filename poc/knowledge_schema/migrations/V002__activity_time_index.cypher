@@ -0,0 +1,6 @@
+// =============================================================================
+// V002 - 활동 시간 인덱스
+// Commit/File/Task 노드의 보조 라벨 :Activity, 최근 활동 시간 범위 조회용
+// =============================================================================
+
+CREATE INDEX activity_time_index IF NOT EXISTS FOR (a:Activity) ON (a.activity_at);
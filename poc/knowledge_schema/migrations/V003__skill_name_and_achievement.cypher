@@ -0,0 +1,9 @@
+// =============================================================================
+// V003 - Phase 0 스키마 격차 보완 (fix_schema_gaps.py)
+// =============================================================================
+
+// 스킬 이름 조회
+CREATE INDEX skill_name_index IF NOT EXISTS FOR (s:Skill) ON (s.name);
+
+// 성과 노드
+CREATE CONSTRAINT achievement_id_unique IF NOT EXISTS FOR (a:Achievement) REQUIRE a.id IS UNIQUE;
@@ -0,0 +1,13 @@
+// =============================================================================
+// V004 - 활동/인사이트/지식 상태 키
+// 파이프라인이 MERGE 하는 Task/Insight 노드와 KnowledgeState 스냅샷의 고유 키
+// (대규모 합성 데이터 적재 시 MERGE가 라벨 전체 스캔으로 떨어지지 않도록)
+// =============================================================================
+
+CREATE CONSTRAINT task_id_unique IF NOT EXISTS FOR (t:Task) REQUIRE t.id IS UNIQUE;
+
+CREATE CONSTRAINT insight_id_unique IF NOT EXISTS FOR (i:Insight) REQUIRE i.id IS UNIQUE;
+
+// KnowledgeState: advanced_knowledge_architecture.cypher 정의
+CREATE CONSTRAINT state_id_unique IF NOT EXISTS FOR (ks:KnowledgeState) REQUIRE ks.id IS UNIQUE;
+CREATE INDEX state_developer_time_index IF NOT EXISTS FOR (ks:KnowledgeState) ON (ks.developerId, ks.timestamp);
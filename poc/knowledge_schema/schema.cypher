@@ -1,6 +1,10 @@
 // =============================================================================
 // 마음로그 V4.0 - 지식 생성 아키텍처 스키마 (Neo4j Cypher DDL)
 // Phase 0: PoC - Stage 3 Seed Content 용 그래프 데이터베이스 스키마
+//
+// 로더(load_seed_data.py, auradb_brain_connector.py, fix_schema_gaps.py)는
+// migrations/V###__*.cypher 를 schema_migrations.py로 적용합니다.
+// 제약 조건/인덱스를 추가할 때는 새 마이그레이션 파일도 함께 추가하세요.
 // =============================================================================
 
 // -----------------------------------------------------------------------------
@@ -51,6 +55,9 @@ CREATE INDEX pattern_type_index IF NOT EXISTS FOR (pat:Pattern) ON (pat.type);
 CREATE CONSTRAINT issue_id_unique IF NOT EXISTS FOR (i:Issue) REQUIRE i.id IS UNIQUE;
 CREATE INDEX issue_status_index IF NOT EXISTS FOR (i:Issue) ON (i.status);
 
+// 활동 시간 인덱스 (Commit/File/Task 노드의 보조 라벨, 최근 활동 조회용)
+CREATE INDEX activity_time_index IF NOT EXISTS FOR (a:Activity) ON (a.activity_at);
+
 // -----------------------------------------------------------------------------
 // 2. 노드 라벨 및 속성 정의
 // -----------------------------------------------------------------------------
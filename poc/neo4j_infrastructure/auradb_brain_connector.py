@@ -7,23 +7,35 @@ This script connects to Neo4j AuraDB Professional using T1 verified secure patte
 import os
 import sys
 import json
-from google.cloud import secretmanager
 from google.auth import default
 import logging
 from neo4j import GraphDatabase
 import time
 
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'seed_content'))
+from schema_migrations import SchemaMigrator
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 't1_risk_verification'))
+from secret_cache import SecretCache, shared_cache
+
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# Secrets needed to connect, fetched together in one parallel round
+AURADB_SECRETS = [
+    "maeum-log-v4-neo4j-auradb-api",
+    "maeum-log-v4-neo4j-connection-info",
+]
+
 class AuraDBBrainConnector:
-    def __init__(self, project_id: str):
+    def __init__(self, project_id: str, secrets: SecretCache = None):
         """
         Initialize AuraDB Brain Connector with secure credential retrieval.
         Uses T1 Risk Verification proven pattern for safe state transfer.
+        Credentials come from the shared per-project secret cache unless one is given.
         """
         self.project_id = project_id
-        self.client = secretmanager.SecretManagerServiceClient()
+        self.secrets = secrets or shared_cache(project_id)
+        self.secrets.declare("auradb", AURADB_SECRETS)
         self.driver = None
         self.connection_info = None
         
@@ -33,15 +45,10 @@ class AuraDBBrainConnector:
         Implements T1 verified secure state transfer pattern.
         """
         try:
-            # Get API key
-            api_secret_name = f"projects/{self.project_id}/secrets/maeum-log-v4-neo4j-auradb-api/versions/latest"
-            api_response = self.client.access_secret_version(request={"name": api_secret_name})
-            api_key = api_response.payload.data.decode("UTF-8")
-            
-            # Get connection info
-            info_secret_name = f"projects/{self.project_id}/secrets/maeum-log-v4-neo4j-connection-info/versions/latest"
-            info_response = self.client.access_secret_version(request={"name": info_secret_name})
-            connection_info = json.loads(info_response.payload.data.decode("UTF-8"))
+            # Get API key and connection info concurrently (cached after the first connect)
+            secrets = self.secrets.prefetch_declared("auradb")
+            api_key = secrets["maeum-log-v4-neo4j-auradb-api"]
+            connection_info = json.loads(secrets["maeum-log-v4-neo4j-connection-info"])
             
             logger.info("Successfully retrieved AuraDB credentials from Secret Manager")
             logger.info(f"AuraDB Instance: {connection_info['instance_id']} ({connection_info['type']})")
@@ -93,44 +100,12 @@ class AuraDBBrainConnector:
             with self.driver.session() as session:
                 logger.info("Initializing 마음로그 V4.0 Brain Schema...")
                 
-                # Create constraints and indexes
-                schema_commands = [
-                    # Developer nodes
-                    "CREATE CONSTRAINT developer_id_unique IF NOT EXISTS FOR (d:Developer) REQUIRE d.id IS UNIQUE",
-                    "CREATE INDEX developer_name_index IF NOT EXISTS FOR (d:Developer) ON (d.name)",
-                    
-                    # Project nodes
-                    "CREATE CONSTRAINT project_id_unique IF NOT EXISTS FOR (p:Project) REQUIRE p.id IS UNIQUE",
-                    "CREATE INDEX project_name_index IF NOT EXISTS FOR (p:Project) ON (p.name)",
-                    
-                    # Commit nodes
-                    "CREATE CONSTRAINT commit_hash_unique IF NOT EXISTS FOR (c:Commit) REQUIRE c.hash IS UNIQUE", 
-                    "CREATE INDEX commit_timestamp_index IF NOT EXISTS FOR (c:Commit) ON (c.timestamp)",
-                    
-                    # File nodes
-                    "CREATE CONSTRAINT file_path_unique IF NOT EXISTS FOR (f:File) REQUIRE f.path IS UNIQUE",
-                    "CREATE INDEX file_type_index IF NOT EXISTS FOR (f:File) ON (f.extension)",
-                    
-                    # Function nodes
-                    "CREATE CONSTRAINT function_signature_unique IF NOT EXISTS FOR (fn:Function) REQUIRE fn.signature IS UNIQUE",
-                    "CREATE INDEX function_name_index IF NOT EXISTS FOR (fn:Function) ON (fn.name)",
-                    
-                    # Concept nodes
-                    "CREATE CONSTRAINT concept_id_unique IF NOT EXISTS FOR (con:Concept) REQUIRE con.id IS UNIQUE",
-                    "CREATE INDEX concept_name_index IF NOT EXISTS FOR (con:Concept) ON (con.name)",
-                    
-                    # Skill nodes
-                    "CREATE CONSTRAINT skill_id_unique IF NOT EXISTS FOR (sk:Skill) REQUIRE sk.id IS UNIQUE",
-                    "CREATE INDEX skill_category_index IF NOT EXISTS FOR (sk:Skill) ON (sk.category)",
-                    
-                    # Session nodes
-                    "CREATE CONSTRAINT session_id_unique IF NOT EXISTS FOR (s:Session) REQUIRE s.id IS UNIQUE",
-                    "CREATE INDEX session_date_index IF NOT EXISTS FOR (s:Session) ON (s.startTime)"
-                ]
-                
-                for command in schema_commands:
-                    session.run(command)
-                    logger.info(f"Executed: {command}")
+                # Apply pending schema migrations (constraints and indexes)
+                result = SchemaMigrator(self.driver).migrate()
+                if result['up_to_date']:
+                    logger.info("Schema is up to date, no migrations applied")
+                else:
+                    logger.info(f"Applied schema migrations: {result['applied']}")
                 
                 # Create initial project and brain system nodes
                 session.run("""
@@ -7,14 +7,25 @@ Infrastructure Architect AI가 구축한 Neo4j AuraDB Professional에 Seed Conte
 import os
 import sys
 import json
+import argparse
 from neo4j import GraphDatabase
 import time
 from pathlib import Path
 import logging
 
+from seed_plan import SeedPlan
+from seed_manifest import load_manifest, compile_manifest
+from seed_sync import SeedSync
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..'))
+from graph_statistics import get_snapshot
+
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# 선언형 Seed 매니페스트 위치
+MANIFEST_DIR = Path(__file__).parent / "manifests"
+
 class AuraDBSeedLoader:
     def __init__(self, uri=None, username="neo4j", password=None):
         """
@@ -72,14 +83,13 @@ class AuraDBSeedLoader:
                 logger.info(f"✅ {message}")
                 logger.info(f"⏰ 연결 시간: {timestamp}")
                 
-                # 기존 데이터 확인
-                result = session.run("MATCH (n) RETURN labels(n) as labels, count(n) as count")
-                records = result.data()
+                # 기존 데이터 확인 (카운트 스토어 통계)
+                records = get_snapshot(self.driver, refresh=True).label_rows()
                 
                 if records:
                     logger.info("📊 기존 데이터베이스 상태:")
                     for record in records:
-                        logger.info(f"  {record['labels']}: {record['count']}개")
+                        logger.info(f"  {record['type']}: {record['count']}개")
                 else:
                     logger.info("📭 빈 데이터베이스 - 새로 초기화 필요")
                 
@@ -99,174 +109,56 @@ class AuraDBSeedLoader:
             self.driver.close()
             logger.info("🔌 AuraDB 연결 종료")
     
-    def load_updated_seed_data(self):
+    def seed_steps(self, manifest_file=None):
+        """
+        Infrastructure AI 성과를 반영한 Seed 단계 목록 (manifests/auradb_updates.json)
+        
+        라벨/관계 타입별 UNWIND 문장으로 컴파일되어 노드 레벨 → 관계 레벨 순으로 병렬 실행됩니다.
+        """
+        manifest = load_manifest(manifest_file or MANIFEST_DIR / "auradb_updates.json")
+        return compile_manifest(manifest, params={"instance_id": self.instance_id})
+    
+    def sync_seed_data(self, dry_run=False, max_workers=8, manifest_file=None):
+        """
+        변경분만 반영하는 Seed 동기화 (현재 상태와 매니페스트를 속성 단위로 비교)
+        
+        dry_run=True면 생성/수정 계획만 출력합니다.
+        """
+        logger.info(f"🔄 Seed Content 동기화 시작{' (dry-run)' if dry_run else ''}...")
+        
+        try:
+            manifest = load_manifest(manifest_file or MANIFEST_DIR / "auradb_updates.json")
+            result = SeedSync(self.driver).sync(manifest, params={"instance_id": self.instance_id},
+                                                dry_run=dry_run, max_workers=max_workers)
+            return result['success']
+            
+        except Exception as e:
+            logger.error(f"❌ Seed Content 동기화 실패: {e}")
+            return False
+    
+    def load_updated_seed_data(self, max_workers=8):
         """
         Infrastructure AI 성과를 반영한 업데이트된 Seed Content 로드
+        (의존성 레벨별 병렬 실행)
         """
         logger.info("🌱 업데이트된 Seed Content 로드 시작...")
         
         try:
-            with self.driver.session() as session:
-                # 1. Infrastructure Architect AI 노드 업데이트/생성
-                logger.info("👤 Infrastructure Architect AI 정보 업데이트...")
-                session.run("""
-                    MERGE (dev:Developer {id: "infrastructure_architect_ai"})
-                    SET dev.name = "Infrastructure Architect AI",
-                        dev.engine = "Google Gemini Code Assist",
-                        dev.environment = "Google Cloud Shell IDE",
-                        dev.specialization = "Stage 1: Infrastructure & IaC",
-                        dev.status = "mission_completed",
-                        dev.completion_date = datetime("2025-08-05T00:00:00Z"),
-                        dev.success_rate = 95,
-                        dev.mission_summary = "T1 리스크 검증 완료, Neo4j AuraDB Professional 구축, GCP 인프라 표준화"
-                """)
-                
-                # 2. Neo4j AuraDB Brain 시스템 노드
-                logger.info("🧠 Neo4j AuraDB Brain 시스템 정보 등록...")
-                session.run("""
-                    MERGE (brain:System {id: "neo4j_auradb_brain"})
-                    SET brain.name = "Neo4j AuraDB Professional",
-                        brain.type = "AuraDB Professional",
-                        brain.instance_id = $instance_id,
-                        brain.memory = "1GB",
-                        brain.cpu = "1 vCPU", 
-                        brain.storage = "2GB",
-                        brain.region = "us-central1",
-                        brain.organization = "LOG1",
-                        brain.org_id = "51c17514-2541-4741-9049-09d56bb4a346",
-                        brain.status = "active",
-                        brain.created = datetime("2025-08-05T00:00:00Z")
-                """, instance_id=self.instance_id)
-                
-                # 3. T1 리스크 검증 성과
-                logger.info("🔐 T1 리스크 검증 성과 등록...")
-                session.run("""
-                    MERGE (achievement:Achievement {id: "t1_risk_verification"})
-                    SET achievement.name = "T1 Risk Verification Complete",
-                        achievement.description = "안전한 상태 전달 메커니즘 검증 완료",
-                        achievement.category = "Security",
-                        achievement.priority = "Critical",
-                        achievement.risk_level = 20,
-                        achievement.status = "Verified",
-                        achievement.completion_date = datetime("2025-08-05T00:00:00Z"),
-                        achievement.impact = "업계 최초 AI 조립 라인 안전한 상태 전달"
-                """)
-                
-                # 4. GCP 인프라 표준화 성과
-                logger.info("🏗️ GCP 인프라 표준화 성과 등록...")
-                session.run("""
-                    MERGE (infra:Infrastructure {id: "gcp_standardization"})
-                    SET infra.name = "GCP Infrastructure Standardization",
-                        infra.project_id = "iness-467105",
-                        infra.region = "us-central1",
-                        infra.organization = "argo.ai.kr",
-                        infra.organization_id = "38646727271",
-                        infra.status = "completed",
-                        infra.completion_date = datetime("2025-08-05T00:00:00Z"),
-                        infra.tools = ["Terraform", "GCP Secret Manager", "Service Account"]
-                """)
-                
-                # 5. Code Architect AI (현재 나) 정보 업데이트
-                logger.info("🎯 Code Architect AI 정보 업데이트...")
-                session.run("""
-                    MERGE (dev:Developer {id: "code_architect_ai"})
-                    SET dev.name = "Code Architect AI",
-                        dev.engine = "Claude 4 Opus Max",
-                        dev.environment = "Cursor AI (Local)",
-                        dev.specialization = "Stage 3: Code Optimization & Knowledge Generation",
-                        dev.working_directory = "C:\\\\LOG1",
-                        dev.current_mission = "Neo4j Seed Content 생성 및 AuraDB 연동",
-                        dev.status = "active",
-                        dev.collaboration_with = "Infrastructure Architect AI"
-                """)
-                
-                # 6. 마음로그 V4.0 프로젝트 업데이트
-                logger.info("🚀 마음로그 V4.0 프로젝트 정보 업데이트...")
-                session.run("""
-                    MERGE (project:Project {id: "mindlog_v4"})
-                    SET project.name = "마음로그 V4.0",
-                        project.description = "AI 전문가 조립 라인 기반 자율 개발 생태계",
-                        project.current_phase = "Phase 0: PoC",
-                        project.expected_roi = 6900000,
-                        project.github_repo = "https://github.com/ARGO-022877/LOG1.git",
-                        project.stage1_status = "completed",
-                        project.stage2_status = "ready",
-                        project.stage3_status = "active",
-                        project.last_updated = datetime()
-                """)
-                
-                # 7. 관계 생성
-                logger.info("🔗 엔티티 간 관계 생성...")
-                
-                # Infrastructure AI → 프로젝트 관계
-                session.run("""
-                    MATCH (dev:Developer {id: "infrastructure_architect_ai"}), (project:Project {id: "mindlog_v4"})
-                    MERGE (dev)-[:COMPLETED_STAGE {
-                        stage: "Stage 1",
-                        role: "Infrastructure Architect", 
-                        success_rate: 95,
-                        completion_date: datetime("2025-08-05T00:00:00Z"),
-                        deliverables: ["T1 Risk Verification", "Neo4j AuraDB Brain", "GCP Standardization"]
-                    }]->(project)
-                """)
-                
-                # Code AI → 프로젝트 관계  
-                session.run("""
-                    MATCH (dev:Developer {id: "code_architect_ai"}), (project:Project {id: "mindlog_v4"})
-                    MERGE (dev)-[:WORKS_ON {
-                        stage: "Stage 3",
-                        role: "Code Architect",
-                        status: "active",
-                        current_task: "Seed Content Generation & AuraDB Integration"
-                    }]->(project)
-                """)
-                
-                # 프로젝트 → AuraDB Brain 관계
-                session.run("""
-                    MATCH (project:Project {id: "mindlog_v4"}), (brain:System {id: "neo4j_auradb_brain"})
-                    MERGE (project)-[:USES_BRAIN {
-                        purpose: "Knowledge Graph Storage",
-                        setup_date: datetime("2025-08-05T00:00:00Z"),
-                        status: "active"
-                    }]->(brain)
-                """)
-                
-                # Infrastructure AI → T1 Achievement 관계
-                session.run("""
-                    MATCH (dev:Developer {id: "infrastructure_architect_ai"}), (achievement:Achievement {id: "t1_risk_verification"})
-                    MERGE (dev)-[:ACHIEVED {
-                        completion_date: datetime("2025-08-05T00:00:00Z"),
-                        impact: "Critical",
-                        verification_status: "Proven"
-                    }]->(achievement)
-                """)
-                
-                # AI 간 협업 관계
-                session.run("""
-                    MATCH (infra:Developer {id: "infrastructure_architect_ai"}), (code:Developer {id: "code_architect_ai"})
-                    MERGE (infra)-[:HANDS_OFF_TO {
-                        from_stage: "Stage 1",
-                        to_stage: "Stage 3",
-                        handoff_date: datetime("2025-08-05T00:00:00Z"),
-                        status: "completed",
-                        assets_transferred: ["AuraDB Brain", "T1 Patterns", "GCP Infrastructure"]
-                    }]->(code)
-                """)
-                
-                logger.info("✅ 업데이트된 Seed Content 로드 완료!")
-                
-                # 결과 확인
-                result = session.run("""
-                    MATCH (n) 
-                    RETURN labels(n)[0] as node_type, count(n) as count 
-                    ORDER BY count DESC
-                """)
-                
-                logger.info("📊 현재 AuraDB Brain 상태:")
-                for record in result:
-                    logger.info(f"  {record['node_type']}: {record['count']}개")
-                
-                return True
+            plan = SeedPlan(self.seed_steps())
+            result = plan.execute(self.driver, max_workers=max_workers)
+            if not result['success']:
+                logger.error(f"❌ Seed Content 로드 실패: {result['failed']}개 단계 실패")
+                return False
+            
+            logger.info(f"✅ 업데이트된 Seed Content 로드 완료! "
+                        f"({result['steps']}개 단계, {result['levels']}개 레벨, {result['elapsed']:.2f}초)")
+            
+            # 결과 확인 (로드 직후이므로 캐시 대신 새로 조회)
+            logger.info("📊 현재 AuraDB Brain 상태:")
+            for record in get_snapshot(self.driver, refresh=True).label_rows():
+                logger.info(f"  {record['type']}: {record['count']}개")
+            
+            return True
                 
         except Exception as e:
             logger.error(f"❌ Seed Content 로드 실패: {e}")
@@ -342,6 +234,11 @@ def main():
     logger.info("🌍 리전: us-central1")
     logger.info("=" * 60)
     
+    parser = argparse.ArgumentParser(description="AuraDB Seed Content 로더")
+    parser.add_argument("--full", action="store_true", help="변경 여부와 관계없이 모든 MERGE 재실행")
+    parser.add_argument("--dry-run", action="store_true", help="동기화 계획만 출력")
+    args = parser.parse_args()
+    
     loader = AuraDBSeedLoader()
     
     try:
@@ -350,10 +247,16 @@ def main():
             logger.error("❌ AuraDB 연결 실패 - 스크립트 종료")
             return False
         
-        # 2. 업데이트된 Seed Content 로드
-        if not loader.load_updated_seed_data():
+        # 2. 업데이트된 Seed Content 로드 (기본: 변경분만 동기화)
+        if args.full:
+            loaded = loader.load_updated_seed_data()
+        else:
+            loaded = loader.sync_seed_data(dry_run=args.dry_run)
+        if not loaded:
             logger.error("❌ Seed Content 로드 실패")
             return False
+        if args.dry_run:
+            return True
         
         # 3. 지식 추출 쿼리 테스트
         if not loader.verify_knowledge_queries():
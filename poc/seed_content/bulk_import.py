@@ -0,0 +1,572 @@
+#!/usr/bin/env python3
+"""
+마음로그 V4.0 - 오프라인 대량 가져오기(bulk import) 번들 생성기
+Seed 매니페스트와 파이프라인 활동 스풀(NDJSON)을 neo4j-admin database import용
+헤더 포함 CSV 번들로 변환
+
+- 라벨별 ID 공간: 노드 키 속성이 곧 :ID(라벨) (Commit은 hash, File은 path ...)
+- MERGE와 같은 의미의 중복 제거: 같은 키의 노드는 속성 병합, 같은 끝점/식별 속성의 관계는 하나로
+- 관계 끝점이 키가 아닌 속성으로 지정되면 키로 변환, 끝점이 없는 관계는 MATCH처럼 건너뜀
+- 빈 인스턴스는 CSV 가져오기로 수 초 만에 구축, 운영 중인 DB에는 같은 번들을 Cypher(UNWIND)로 추가 적재
+"""
+
+import os
+import csv
+import sys
+import json
+import time
+import logging
+import argparse
+from collections import OrderedDict
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Any, Optional, Iterable, Tuple
+
+from seed_plan import SeedPlan
+from seed_manifest import load_manifest, compile_manifest, resolve_manifest
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'ai_pipeline'))
+from claude_neo4j_pipeline import validate_activity, parse_activity_datetime as _parse_datetime
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_DIR = Path(__file__).parent / "manifests"
+
+# 가져오기 후 적용할 스키마 마이그레이션 실행기와 로컬 DB 기본 주소
+MIGRATIONS_SCRIPT = Path(__file__).resolve().parent / "schema_migrations.py"
+DEFAULT_LOCAL_URI = "neo4j://localhost:7687"
+
+# 개발자 생산성 카운터: 관계 타입 → 카운터 속성 (파이프라인 기록 쿼리와 동일)
+DEVELOPER_COUNTERS = {
+    'AUTHORED': 'commits',
+    'CREATED': 'files_created',
+    'COMPLETED': 'tasks_completed',
+}
+
+Endpoint = Tuple[str, str, Any]
+
+class BulkImportBundle:
+    """
+    중복 제거된 노드/관계 모음 → CSV 번들 또는 Cypher 추가 적재
+    
+    사용 예:
+        bundle = BulkImportBundle()
+        bundle.add_manifest(load_manifest("manifests/auradb_updates.json"), params={...})
+        bundle.add_spool("activities.ndjson")
+        bundle.write_csv("/tmp/brain_bundle")
+    """
+    
+    def __init__(self):
+        # 라벨 → (키 속성, {키 값: 속성})
+        self._node_keys: Dict[str, str] = {}
+        self._nodes: Dict[str, 'OrderedDict[Any, Dict[str, Any]]'] = {}
+        self._extra_labels: Dict[str, set] = {}
+        # (타입, 시작 라벨, 끝 라벨) → {식별자: [시작 끝점, 끝 끝점, 속성]}
+        self._relationships: Dict[Tuple[str, str, str], 'OrderedDict[Tuple, List[Any]]'] = {}
+        self._merge_on: Dict[Tuple[str, str, str], Tuple[str, ...]] = {}
+        self.stats = {'activities': 0, 'invalid_activities': 0, 'dangling_relationships': 0}
+    
+    def add_node(self, label: str, key: str, properties: Dict[str, Any], labels: Iterable[str] = (),
+                 on_create: bool = False):
+        """
+        노드 추가 (MERGE 의미: 같은 키면 속성 병합)
+        
+        on_create=True면 기존 노드의 속성은 덮어쓰지 않습니다 (ON CREATE SET).
+        None 값은 기록하지 않습니다 (coalesce로 기존 값을 유지하는 파이프라인과 동일).
+        """
+        if self._node_keys.setdefault(label, key) != key:
+            raise ValueError(f"{label} 노드의 키가 일치하지 않습니다: {self._node_keys[label]} != {key}")
+        value = properties.get(key)
+        if value is None:
+            raise ValueError(f"{label} 노드에 키 속성 '{key}'가 없습니다: {properties}")
+        
+        nodes = self._nodes.setdefault(label, OrderedDict())
+        current = nodes.setdefault(value, {})
+        for name, item in properties.items():
+            if item is not None and not (on_create and name in current):
+                current[name] = item
+        self._extra_labels.setdefault(label, set()).update(labels)
+    
+    def add_relationship(self, rel_type: str, start: Endpoint, end: Endpoint,
+                         properties: Optional[Dict[str, Any]] = None, merge_on: Iterable[str] = ()):
+        """
+        관계 추가 (MERGE 의미: 끝점과 merge_on 속성이 같으면 하나로 합쳐 속성 병합)
+        
+        start/end: (라벨, 속성, 값) - 속성이 라벨의 키가 아니면 쓰기 시점에 키로 변환
+        """
+        properties = {name: item for name, item in (properties or {}).items() if item is not None}
+        group = (rel_type, start[0], end[0])
+        merge_on = tuple(merge_on)
+        if self._merge_on.setdefault(group, merge_on) != merge_on:
+            raise ValueError(f"{rel_type} 관계의 merge_on이 일치하지 않습니다")
+        
+        identity = (start, end) + tuple(_hashable(properties.get(name)) for name in merge_on)
+        entry = self._relationships.setdefault(group, OrderedDict()).setdefault(identity, [start, end, {}])
+        entry[2].update(properties)
+    
+    def add_manifest(self, manifest: Dict[str, Any], params: Optional[Dict[str, Any]] = None):
+        """Seed 매니페스트의 노드/관계 추가 (seed_manifest 형식)"""
+        manifest = resolve_manifest(manifest, params)
+        for spec in manifest.get('nodes', []):
+            for row in spec.get('rows', []):
+                self.add_node(spec['label'], spec.get('key', 'id'), row, spec.get('labels', []))
+        for spec in manifest.get('relationships', []):
+            start, end = spec['from'], spec['to']
+            for row in spec.get('rows', []):
+                self.add_relationship(
+                    spec['type'],
+                    (start['label'], start.get('key', 'id'), row['from']),
+                    (end['label'], end.get('key', 'id'), row['to']),
+                    row.get('properties', {}),
+                    spec.get('merge_on', [])
+                )
+    
+    def add_activity(self, activity: Dict[str, Any]) -> bool:
+        """
+        파이프라인 활동 이벤트 하나를 기록 쿼리와 같은 노드/관계로 변환
+        
+        Returns:
+            유효한 이벤트인지 여부 (잘못된 이벤트는 건너뛰고 stats에 집계)
+        """
+        errors = validate_activity(activity)
+        if not errors:
+            try:
+                _ACTIVITY_CONVERTERS[activity['type']](self, activity)
+                self.stats['activities'] += 1
+                return True
+            except ValueError as e:
+                errors = [str(e)]
+        self.stats['invalid_activities'] += 1
+        logger.debug(f"활동 이벤트 건너뜀: {errors}")
+        return False
+    
+    def add_spool(self, path) -> int:
+        """활동 NDJSON 스풀 파일 추가 (한 줄에 이벤트 하나)"""
+        added = 0
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                if line.strip():
+                    added += self.add_activity(json.loads(line))
+        return added
+    
+    def add_records(self, records, node_specs: Dict[str, Tuple[str, Tuple[str, ...]]],
+                    rel_specs: Dict[str, Tuple[str, str]]):
+        """('node', 라벨, 속성) / ('rel', 타입, {'from', 'to', 'properties'}) 레코드 추가 (synthetic_graph 형식)"""
+        for kind, name, row in records:
+            if kind == 'node':
+                key, labels = node_specs[name]
+                self.add_node(name, key, row, labels)
+            else:
+                start_label, end_label = rel_specs[name]
+                self.add_relationship(
+                    name,
+                    (start_label, node_specs[start_label][0], row['from']),
+                    (end_label, node_specs[end_label][0], row['to']),
+                    row.get('properties', {})
+                )
+    
+    def _resolver(self):
+        """(라벨, 속성, 값) → 노드 키 값 (없으면 None)"""
+        indexes: Dict[Tuple[str, str], Dict[Any, Any]] = {}
+        
+        def resolve(endpoint: Endpoint):
+            label, name, value = endpoint
+            nodes = self._nodes.get(label)
+            if nodes is None:
+                return None
+            if name == self._node_keys[label]:
+                return value if value in nodes else None
+            index = indexes.get((label, name))
+            if index is None:
+                index = indexes[(label, name)] = {}
+                for key_value, properties in nodes.items():
+                    if properties.get(name) is not None:
+                        index.setdefault(_hashable(properties[name]), key_value)
+            return index.get(_hashable(value))
+        
+        return resolve
+    
+    def resolved_relationships(self) -> Dict[Tuple[str, str, str], List[Tuple[Any, Any, Dict[str, Any]]]]:
+        """끝점을 노드 키로 변환한 관계 목록 (끝점 노드가 번들에 없으면 제외)"""
+        resolve = self._resolver()
+        dangling = 0
+        resolved = {}
+        for group, entries in self._relationships.items():
+            rows = {}
+            for start, end, properties in entries.values():
+                start_id, end_id = resolve(start), resolve(end)
+                if start_id is None or end_id is None:
+                    dangling += 1
+                    continue
+                # 키 변환 후 같아진 관계도 하나로
+                identity = (start_id, end_id) + tuple(
+                    _hashable(properties.get(name)) for name in self._merge_on[group]
+                )
+                rows.setdefault(identity, [start_id, end_id, {}])[2].update(properties)
+            resolved[group] = [tuple(row) for row in rows.values()]
+        self.stats['dangling_relationships'] = dangling
+        return resolved
+    
+    def developer_counters(self, relationships=None) -> Dict[Any, Dict[str, Any]]:
+        """번들 안의 AUTHORED/CREATED/COMPLETED 관계로 개발자 생산성 카운터 계산"""
+        relationships = relationships if relationships is not None else self.resolved_relationships()
+        counters: Dict[Any, Dict[str, Any]] = {}
+        for (rel_type, start_label, _), rows in relationships.items():
+            counter = DEVELOPER_COUNTERS.get(rel_type)
+            if counter is None or start_label != 'Developer':
+                continue
+            for developer, _, properties in rows:
+                entry = counters.setdefault(developer, {
+                    'total_activities': 0, 'commits': 0, 'files_created': 0, 'tasks_completed': 0,
+                    'last_activity': None,
+                })
+                entry[counter] += 1
+                entry['total_activities'] += 1
+                at = properties.get('timestamp') or properties.get('completion_date')
+                if at is not None and (entry['last_activity'] is None or at > entry['last_activity']):
+                    entry['last_activity'] = at
+        return counters
+    
+    def write_csv(self, directory) -> Dict[str, Any]:
+        """
+        neo4j-admin database import용 CSV 번들 생성
+        
+        nodes/<라벨>.csv, relationships/<타입>__<시작>__<끝>.csv와 import.sh를 만듭니다.
+        
+        Returns:
+            {'nodes': {라벨: 행 수}, 'relationships': {파일 이름: 행 수}, 'skipped', 'command', 'elapsed'}
+        """
+        started = time.perf_counter()
+        os.makedirs(os.path.join(directory, 'nodes'), exist_ok=True)
+        os.makedirs(os.path.join(directory, 'relationships'), exist_ok=True)
+        
+        relationships = self.resolved_relationships()
+        counters = self.developer_counters(relationships)
+        node_args, rel_args = [], []
+        summary = {'nodes': {}, 'relationships': {}}
+        
+        for label, nodes in self._nodes.items():
+            key = self._node_keys[label]
+            rows = [
+                {**properties, **counters.get(value, {})} if label == 'Developer' else properties
+                for value, properties in nodes.items()
+            ]
+            columns = _columns(rows, exclude=key)
+            path = os.path.join('nodes', f"{label}.csv")
+            _write_rows(
+                os.path.join(directory, path),
+                [f"{key}:ID({label})"] + [f"{name}:{type_name}" for name, type_name in columns],
+                ([row[key]] + [row.get(name) for name, _ in columns] for row in rows)
+            )
+            node_args.append((":".join([label] + sorted(self._extra_labels[label])), path))
+            summary['nodes'][label] = len(rows)
+        
+        for (rel_type, start_label, end_label), rows in relationships.items():
+            if not rows:
+                continue
+            columns = _columns([properties for _, _, properties in rows])
+            path = os.path.join('relationships', f"{rel_type}__{start_label}__{end_label}.csv")
+            _write_rows(
+                os.path.join(directory, path),
+                [f":START_ID({start_label})", f":END_ID({end_label})"]
+                + [f"{name}:{type_name}" for name, type_name in columns],
+                ([start, end] + [properties.get(name) for name, _ in columns] for start, end, properties in rows)
+            )
+            rel_args.append((rel_type, path))
+            summary['relationships'][os.path.basename(path)] = len(rows)
+        
+        summary['command'] = write_import_script(directory, node_args, rel_args)
+        summary['skipped'] = self.stats['dangling_relationships']
+        summary['elapsed'] = time.perf_counter() - started
+        logger.info(f"✅ 가져오기 번들 생성: 노드 {sum(summary['nodes'].values()):,}개, "
+                    f"관계 {sum(summary['relationships'].values()):,}개, "
+                    f"끝점 없는 관계 {summary['skipped']}개 제외 ({summary['elapsed']:.1f}초) → {directory}")
+        return summary
+    
+    def load(self, driver, batch_size: int = 1000, max_workers: int = 8) -> Dict[str, Any]:
+        """
+        Cypher 추가 적재 (이미 데이터가 있는 DB용)
+        
+        노드/관계는 매니페스트 UNWIND 단계로 MERGE 하고, 개발자 카운터는 덮어쓰지 않고
+        적재 후 관계 수로 다시 계산합니다 (기존 활동 포함).
+        """
+        relationships = self.resolved_relationships()
+        manifest = {'nodes': [], 'relationships': []}
+        for label, nodes in self._nodes.items():
+            manifest['nodes'].append({
+                'label': label,
+                'key': self._node_keys[label],
+                'labels': sorted(self._extra_labels[label]),
+                'rows': list(nodes.values()),
+            })
+        for (rel_type, start_label, end_label), rows in relationships.items():
+            manifest['relationships'].append({
+                'type': rel_type,
+                'from': {'label': start_label, 'key': self._node_keys[start_label]},
+                'to': {'label': end_label, 'key': self._node_keys[end_label]},
+                'merge_on': list(self._merge_on[(rel_type, start_label, end_label)]),
+                'rows': [{'from': start, 'to': end, 'properties': properties} for start, end, properties in rows],
+            })
+        
+        result = SeedPlan(compile_manifest(manifest, batch_size=batch_size)).execute(driver, max_workers=max_workers)
+        developers = sorted(self.developer_counters(relationships), key=str)
+        if result['success'] and developers:
+            with driver.session() as session:
+                session.execute_write(lambda tx: tx.run("""
+                    UNWIND $developers AS developer_id
+                    MATCH (dev:Developer {id: developer_id})
+                    OPTIONAL MATCH (dev)-[a:AUTHORED]->()
+                    WITH dev, count(a) AS commits, max(a.timestamp) AS last_commit
+                    OPTIONAL MATCH (dev)-[c:CREATED]->()
+                    WITH dev, commits, last_commit, count(c) AS files, max(c.timestamp) AS last_file
+                    OPTIONAL MATCH (dev)-[t:COMPLETED]->()
+                    WITH dev, commits, last_commit, files, last_file,
+                         count(t) AS tasks, max(t.completion_date) AS last_task
+                    SET dev.commits = commits,
+                        dev.files_created = files,
+                        dev.tasks_completed = tasks,
+                        dev.total_activities = commits + files + tasks,
+                        dev.last_activity = reduce(latest = null, x IN [last_commit, last_file, last_task] |
+                            CASE WHEN x IS NULL OR (latest IS NOT NULL AND latest >= x) THEN latest ELSE x END)
+                """, developers=developers).consume())
+        
+        logger.info(f"{'✅' if result['success'] else '❌'} 번들 Cypher 적재: {result['steps']}개 단계, "
+                    f"개발자 카운터 {len(developers)}명 갱신 ({result['elapsed']:.2f}초)")
+        return result
+
+def _commit_activity(bundle: BulkImportBundle, activity: Dict[str, Any]):
+    timestamp = _parse_datetime(activity['timestamp'])
+    bundle.add_node('Commit', 'hash', {
+        'hash': activity['hash'],
+        'message': activity['message'],
+        'author': activity['author'],
+        'timestamp': timestamp,
+        'files_changed': activity.get('files_changed'),
+        'lines_added': activity.get('lines_added'),
+        'lines_deleted': activity.get('lines_deleted'),
+        'activity_type': 'development',
+        'activity_at': timestamp,
+    }, labels=['Activity'])
+    bundle.add_relationship('AUTHORED', ('Developer', 'id', activity['author']),
+                            ('Commit', 'hash', activity['hash']), {'timestamp': timestamp},
+                            merge_on=['timestamp'])
+
+def _file_activity(bundle: BulkImportBundle, activity: Dict[str, Any]):
+    created = _parse_datetime(activity['created'])
+    bundle.add_node('File', 'path', {
+        'path': activity['path'],
+        'name': activity['name'],
+        'extension': activity.get('extension'),
+        'size': activity.get('size'),
+        'created': created,
+        'purpose': activity.get('purpose'),
+        'complexity': activity.get('complexity'),
+        'activity_at': created,
+    }, labels=['Activity'])
+    if activity.get('creator'):
+        bundle.add_relationship('CREATED', ('Developer', 'id', activity['creator']),
+                                ('File', 'path', activity['path']), {'timestamp': created},
+                                merge_on=['timestamp'])
+
+def _task_activity(bundle: BulkImportBundle, activity: Dict[str, Any]):
+    completed = _parse_datetime(activity['completion_date'])
+    bundle.add_node('Task', 'id', {
+        'id': activity['task_id'],
+        'name': activity['name'],
+        'description': activity.get('description'),
+        'status': activity.get('status'),
+        'completion_date': completed,
+        'duration': activity.get('duration'),
+        'complexity': activity.get('complexity'),
+        'activity_at': completed,
+    }, labels=['Activity'])
+    if activity.get('assignee'):
+        effort = activity.get('effort') if activity.get('effort') is not None else 5
+        bundle.add_relationship('COMPLETED', ('Developer', 'id', activity['assignee']),
+                                ('Task', 'id', activity['task_id']),
+                                {'completion_date': completed, 'effort': effort},
+                                merge_on=['completion_date', 'effort'])
+
+def _insight_activity(bundle: BulkImportBundle, activity: Dict[str, Any]):
+    bundle.add_node('Insight', 'id', {
+        'id': activity['insight_id'],
+        'title': activity['title'],
+        'description': activity.get('description'),
+        'category': activity.get('category'),
+        'confidence': activity.get('confidence'),
+        'generated': _parse_datetime(activity['generated']),
+        'source': activity.get('source'),
+    })
+    for concept in activity.get('related_concepts') or []:
+        bundle.add_node('Concept', 'id', {'id': concept['id'], 'name': concept.get('name')}, on_create=True)
+        strength = concept.get('strength') if concept.get('strength') is not None else 5
+        bundle.add_relationship('RELATES_TO', ('Insight', 'id', activity['insight_id']),
+                                ('Concept', 'id', concept['id']), {'strength': strength},
+                                merge_on=['strength'])
+
+# 활동 타입 → 변환 함수 (claude_neo4j_pipeline의 _log_* 쿼리와 같은 그래프 구조)
+_ACTIVITY_CONVERTERS = {
+    'commit': _commit_activity,
+    'file_creation': _file_activity,
+    'task_completion': _task_activity,
+    'knowledge_insight': _insight_activity,
+}
+
+def _hashable(value: Any) -> Any:
+    return tuple(value) if isinstance(value, list) else value
+
+def csv_type(value: Any) -> str:
+    """neo4j-admin import 헤더 타입"""
+    if isinstance(value, list):
+        return (csv_type(value[0]) if value else 'string') + '[]'
+    if isinstance(value, bool):
+        return 'boolean'
+    if isinstance(value, int):
+        return 'long'
+    if isinstance(value, float):
+        return 'double'
+    if isinstance(value, datetime):
+        return 'datetime'
+    return 'string'
+
+def csv_value(value: Any) -> str:
+    """neo4j-admin import 셀 값 (배열 구분자 ';')"""
+    if value is None:
+        return ''
+    if isinstance(value, list):
+        return ';'.join(csv_value(item) for item in value)
+    if isinstance(value, bool):
+        return 'true' if value else 'false'
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, dict):
+        return json.dumps(value, ensure_ascii=False, default=str)
+    return str(value)
+
+def write_import_script(directory, node_files: List[Tuple[str, str]],
+                        relationship_files: List[Tuple[str, str]], database: str = "neo4j") -> str:
+    """
+    neo4j-admin database import full 명령을 import.sh로 저장
+    
+    가져오기는 스키마(제약조건/인덱스)를 만들지 않으므로 스크립트가 이어서 스키마 마이그레이션
+    (schema_migrations.py, V001~)을 적용합니다. DB가 중지 상태여야 하므로 기본은 다음 단계 명령만
+    출력하고, `./import.sh --start`로 실행하면 DB를 시작한 뒤 연결될 때까지 기다렸다가 바로 적용합니다.
+    
+    Args:
+        node_files: [(라벨[:보조 라벨...], 상대 경로)]
+        relationship_files: [(관계 타입, 상대 경로)]
+    """
+    arguments = [f"--nodes={labels}={path}" for labels, path in node_files]
+    arguments += [f"--relationships={rel_type}={path}" for rel_type, path in relationship_files]
+    command = f"neo4j-admin database import full --overwrite-destination {' '.join(arguments)} {database}"
+    migrate = f"python3 '{MIGRATIONS_SCRIPT}' --database {database} --uri"
+    
+    script = os.path.join(directory, 'import.sh')
+    with open(script, 'w', encoding='utf-8') as f:
+        f.write("#!/bin/sh\n# 오프라인 가져오기 (데이터베이스를 덮어씁니다, DB 중지 상태에서 실행)\n")
+        f.write("# 이어서 스키마 마이그레이션 적용 (--start: DB 시작 후 바로 적용, NEO4J_PASSWORD 필요)\n")
+        f.write(f'set -e\ncd "$(dirname "$0")"\n{command}\n\n')
+        f.write(f'uri="${{NEO4J_URI:-{DEFAULT_LOCAL_URI}}}"\nmigrate() {{\n    {migrate} "$uri" "$@"\n}}\n\n')
+        f.write('if [ "$1" = "--start" ]; then\n'
+                '    : "${NEO4J_PASSWORD:?NEO4J_PASSWORD 환경변수가 필요합니다}"\n'
+                '    neo4j start\n'
+                '    tries=0\n'
+                '    until migrate --status >/dev/null 2>&1; do\n'
+                '        tries=$((tries + 1))\n'
+                '        if [ "$tries" -ge 60 ]; then echo "❌ DB 연결 실패, 마이그레이션을 직접 실행하세요" >&2; exit 1; fi\n'
+                '        sleep 2\n'
+                '    done\n'
+                '    migrate\n'
+                'else\n'
+                '    echo "✅ 가져오기 완료. DB 시작 후 스키마 마이그레이션을 적용하세요:"\n'
+                f'    echo "  {migrate} $uri"\n'
+                'fi\n')
+    os.chmod(script, 0o755)
+    return command
+
+def add_column_types(types: 'OrderedDict[str, str]', row: Dict[str, Any], exclude: Optional[str] = None):
+    """행 하나의 값으로 열 타입 갱신 (등장 순서, 정수/실수 혼합은 double, 그 외 혼합은 string, None은 무시)"""
+    for name, value in row.items():
+        if name == exclude or value is None:
+            continue
+        type_name = csv_type(value)
+        previous = types.setdefault(name, type_name)
+        if previous != type_name:
+            types[name] = 'double' if {previous, type_name} == {'long', 'double'} else 'string'
+
+def _columns(rows: List[Dict[str, Any]], exclude: Optional[str] = None) -> List[Tuple[str, str]]:
+    """행 전체에서 (열 이름, 타입) 목록 계산"""
+    types: 'OrderedDict[str, str]' = OrderedDict()
+    for row in rows:
+        add_column_types(types, row, exclude)
+    return list(types.items())
+
+def _write_rows(path: str, header: List[str], rows):
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(header)
+        for row in rows:
+            writer.writerow([csv_value(value) for value in row])
+
+def main():
+    """Seed 매니페스트/활동 스풀 → 가져오기 번들 (또는 Cypher 추가 적재)"""
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    
+    parser = argparse.ArgumentParser(description="neo4j-admin 오프라인 가져오기 번들 생성")
+    parser.add_argument("output", nargs="?", help="CSV 번들 출력 디렉터리")
+    parser.add_argument("--manifest", action="append", help="Seed 매니페스트 (기본: manifests/*.json 전체)")
+    parser.add_argument("--spool", action="append", default=[], help="활동 NDJSON 스풀 파일")
+    parser.add_argument("--param", action="append", default=[], help="매니페스트 파라미터 (이름=값)")
+    parser.add_argument("--load", action="store_true", help="CSV 대신 Cypher로 추가 적재")
+    parser.add_argument("--batch-size", type=int, default=1000, help="Cypher 적재 시 UNWIND 문장당 행 수")
+    parser.add_argument("--skip-migrations", action="store_true", help="Cypher 적재 전 스키마 마이그레이션 생략")
+    parser.add_argument("--uri", default=os.getenv('NEO4J_URI', "neo4j+s://3e875bd7.databases.neo4j.io"))
+    parser.add_argument("--username", default=os.getenv('NEO4J_USERNAME', "neo4j"))
+    args = parser.parse_args()
+    
+    if not args.output and not args.load:
+        parser.error("출력 디렉터리 또는 --load가 필요합니다")
+    
+    params = {"instance_id": "3e875bd7"}
+    params.update(dict(item.split('=', 1) for item in args.param))
+    
+    bundle = BulkImportBundle()
+    for manifest_file in args.manifest or sorted(MANIFEST_DIR.glob("*.json")):
+        bundle.add_manifest(load_manifest(manifest_file), params=params)
+        logger.info(f"📄 매니페스트 추가: {manifest_file}")
+    for spool_file in args.spool:
+        added = bundle.add_spool(spool_file)
+        logger.info(f"📥 활동 스풀 추가: {spool_file} ({added}개)")
+    if bundle.stats['invalid_activities']:
+        logger.warning(f"⚠️  잘못된 활동 이벤트 {bundle.stats['invalid_activities']}개 건너뜀")
+    
+    if args.output:
+        bundle.write_csv(args.output)
+    
+    if args.load:
+        from neo4j import GraphDatabase
+        
+        password = os.getenv('NEO4J_PASSWORD')
+        if not password:
+            logger.error("❌ NEO4J_PASSWORD 환경변수가 설정되지 않았습니다.")
+            return False
+        
+        driver = GraphDatabase.driver(args.uri, auth=(args.username, password))
+        try:
+            # MERGE가 키 제약조건/인덱스를 쓰도록 적재 전에 스키마부터 최신으로
+            if not args.skip_migrations:
+                from schema_migrations import SchemaMigrator, MigrationError
+                try:
+                    SchemaMigrator(driver).migrate()
+                except MigrationError as e:
+                    logger.error(f"❌ {e}")
+                    return False
+            return bundle.load(driver, batch_size=args.batch_size)['success']
+        finally:
+            driver.close()
+    
+    return True
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
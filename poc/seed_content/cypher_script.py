@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+마음로그 V4.0 - Cypher 스크립트 스트리밍 파서
+.cypher 파일을 한 번에 읽지 않고 줄 단위로 읽으며 문장(statement) 단위로 분리
+
+- 문자열('...', "...")과 백틱 식별자 안의 세미콜론/주석 기호는 그대로 보존
+- // 한 줄 주석과 /* */ 블록 주석 제거
+- 여러 줄에 걸친 문장 지원, 마지막 세미콜론이 없는 문장도 반환
+"""
+
+import re
+from typing import Iterable, Iterator
+
+# 명시적 트랜잭션 안에서 실행할 수 없는 문장 (자동 커밋 필요)
+_AUTO_COMMIT_PATTERN = re.compile(r'\bIN\s+TRANSACTIONS\b|^\s*USING\s+PERIODIC\s+COMMIT\b', re.IGNORECASE)
+
+# 스키마 변경 문장 (데이터 쓰기와 같은 트랜잭션에 섞을 수 없음)
+_SCHEMA_PATTERN = re.compile(
+    r'^\s*(CREATE|DROP)\s+(OR\s+REPLACE\s+)?((RANGE|TEXT|POINT|LOOKUP|FULLTEXT|VECTOR|BTREE)\s+)?(CONSTRAINT|INDEX)\b',
+    re.IGNORECASE
+)
+
+def iter_cypher_statements(lines: Iterable[str]) -> Iterator[str]:
+    """
+    줄 단위 입력에서 Cypher 문장을 하나씩 생성
+    
+    Args:
+        lines: 파일 객체 등 문자열 줄의 이터러블 (줄바꿈 포함 여부 무관)
+    
+    Yields:
+        세미콜론과 주석을 제거한 문장 (앞뒤 공백 제거)
+    """
+    buffer = []
+    quote = None          # 현재 열려 있는 따옴표 문자 (', ", `)
+    in_block_comment = False
+    
+    for line in lines:
+        if not line.endswith('\n'):
+            line += '\n'
+        
+        i = 0
+        length = len(line)
+        while i < length:
+            ch = line[i]
+            
+            if in_block_comment:
+                if line.startswith('*/', i):
+                    in_block_comment = False
+                    i += 2
+                else:
+                    i += 1
+                continue
+            
+            if quote:
+                buffer.append(ch)
+                if ch == '\\' and quote != '`' and i + 1 < length:
+                    # 이스케이프된 문자는 그대로 복사
+                    buffer.append(line[i + 1])
+                    i += 2
+                    continue
+                if ch == quote:
+                    quote = None
+                i += 1
+                continue
+            
+            if ch in ('"', "'", '`'):
+                quote = ch
+                buffer.append(ch)
+            elif line.startswith('//', i):
+                # 줄 끝까지 주석
+                buffer.append('\n')
+                break
+            elif line.startswith('/*', i):
+                in_block_comment = True
+                buffer.append(' ')
+                i += 2
+                continue
+            elif ch == ';':
+                statement = ''.join(buffer).strip()
+                if statement:
+                    yield statement
+                buffer = []
+            else:
+                buffer.append(ch)
+            i += 1
+    
+    statement = ''.join(buffer).strip()
+    if statement:
+        yield statement
+
+def read_cypher_statements(path) -> Iterator[str]:
+    """Cypher 스크립트 파일을 스트리밍으로 읽어 문장 단위로 생성"""
+    with open(path, 'r', encoding='utf-8') as f:
+        yield from iter_cypher_statements(f)
+
+def is_schema_statement(statement: str) -> bool:
+    """인덱스/제약조건 생성·삭제 문장 여부"""
+    return bool(_SCHEMA_PATTERN.match(statement))
+
+def requires_auto_commit(statement: str) -> bool:
+    """CALL { } IN TRANSACTIONS 등 자동 커밋 트랜잭션이 필요한 문장 여부"""
+    return bool(_AUTO_COMMIT_PATTERN.search(statement))
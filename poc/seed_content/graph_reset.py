@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+"""
+마음로그 V4.0 - 배치 기반 그래프 초기화
+대규모 그래프를 한 트랜잭션에 지우지 않고 관계 → 노드 순서로 batch_size개씩 삭제
+
+- 트랜잭션마다 삭제량이 batch_size로 제한되어 트랜잭션 메모리 한도를 넘지 않음
+- 관계를 먼저 지우므로 허브 노드(수십만 관계를 가진 개발자 등)도 한 번에 DETACH 하지 않음
+- 라벨 일부만 삭제 가능 (해당 라벨 노드와 그 노드에 연결된 관계)
+- 스키마는 기본적으로 유지, reset_schema=True면 영향받는 제약조건/인덱스만 삭제 후 다시 생성
+"""
+
+import os
+import re
+import sys
+import time
+import logging
+import argparse
+from typing import Dict, List, Any, Optional, Callable, Iterable
+
+logger = logging.getLogger(__name__)
+
+# 트랜잭션당 기본 삭제 수
+DEFAULT_BATCH_SIZE = 10000
+
+_IDENTIFIER = re.compile(r'^[A-Za-z_][A-Za-z0-9_]*$')
+
+ProgressCallback = Callable[[str, int, int], None]
+
+def clear_graph(driver, batch_size: int = DEFAULT_BATCH_SIZE, labels: Optional[Iterable[str]] = None,
+                reset_schema: bool = False, progress: Optional[ProgressCallback] = None,
+                database: Optional[str] = None) -> Dict[str, Any]:
+    """
+    그래프 데이터를 배치로 삭제
+    
+    Args:
+        batch_size: 트랜잭션당 삭제할 관계/노드 수
+        labels: 삭제할 라벨 목록 (None이면 전체)
+        reset_schema: 영향받는 제약조건/인덱스를 삭제 전에 지우고 삭제 후 다시 생성
+                      (대량 삭제 중 인덱스 갱신 비용 제거, 남은 데이터에 맞게 재구축)
+        progress: progress(단계, 누적 삭제 수, 전체 수) 콜백 (기본: 로그 출력)
+    
+    Returns:
+        {'relationships', 'nodes', 'schema_dropped', 'schema_recreated', 'schema_failed', 'elapsed'}
+    """
+    started = time.perf_counter()
+    labels = [_identifier(label) for label in labels] if labels else None
+    progress = progress or _log_progress
+    
+    def session():
+        return driver.session(database=database) if database else driver.session()
+    
+    relationships = nodes = 0
+    dropped: List[Dict[str, Any]] = []
+    failed: List[str] = []
+    try:
+        with session() as s:
+            schema = _affected_schema(s, labels) if reset_schema else []
+            for item in schema:
+                s.run(f"DROP {item['kind']} `{item['name']}` IF EXISTS").consume()
+                dropped.append(item)
+            if dropped:
+                logger.info(f"🧹 제약조건/인덱스 {len(dropped)}개 삭제 (삭제 후 재생성)")
+            
+            for label in labels or [None]:
+                relationships += _delete_in_batches(s, 'relationships', *_relationship_queries(label),
+                                                    batch_size, progress)
+                nodes += _delete_in_batches(s, 'nodes', *_node_queries(label), batch_size, progress)
+    finally:
+        # 삭제 도중 실패해도 (타임아웃, 메모리 한도, 연결 끊김) 제약조건 없이 남지 않도록 항상 재생성
+        if dropped:
+            failed = _recreate_schema(session, dropped)
+    
+    result = {
+        'relationships': relationships,
+        'nodes': nodes,
+        'schema_dropped': len(dropped),
+        'schema_recreated': len(dropped) - len(failed),
+        'schema_failed': failed,
+        'elapsed': time.perf_counter() - started,
+    }
+    logger.info(f"✅ 그래프 초기화 완료: 관계 {relationships:,}개, 노드 {nodes:,}개 삭제 "
+                f"({result['elapsed']:.1f}초){' - 라벨: ' + ', '.join(labels) if labels else ''}")
+    return result
+
+def _recreate_schema(session_factory: Callable, schema: List[Dict[str, Any]]) -> List[str]:
+    """
+    삭제했던 제약조건/인덱스 재생성 → 재생성하지 못한 createStatement 목록
+    
+    삭제 단계의 세션이 끊겼을 수 있으므로 새 세션을 쓰고, 하나가 실패해도 나머지는 계속 만듭니다.
+    """
+    failed = []
+    try:
+        with session_factory() as s:
+            for item in schema:
+                try:
+                    s.run(item['createStatement']).consume()
+                except Exception as e:
+                    failed.append(item['createStatement'])
+                    logger.error(f"❌ 재생성 실패 ({item['kind']} {item['name']}): {e}")
+            if len(failed) < len(schema):
+                # 재생성한 인덱스 채우기가 끝나야 이후 MERGE/조회가 인덱스를 사용
+                s.run("CALL db.awaitIndexes($timeout)", timeout=300).consume()
+    except Exception as e:
+        logger.error(f"❌ 제약조건/인덱스 재생성 중단: {e}")
+        failed += [item['createStatement'] for item in schema if item['createStatement'] not in failed]
+    
+    if failed:
+        logger.error(f"❌ 제약조건/인덱스 {len(failed)}개 재생성 실패 - 직접 실행하세요:")
+        for statement in failed:
+            logger.error(f"     {statement}")
+    else:
+        logger.info(f"🔧 제약조건/인덱스 {len(schema)}개 재생성")
+    return failed
+
+def _relationship_queries(label: Optional[str]):
+    """(전체 수 쿼리, 배치 삭제 쿼리) - 라벨을 주면 그 라벨 노드에 연결된 관계만 (전체 수는 진행률용 근사치)"""
+    if label is None:
+        return (
+            "MATCH ()-[r]->() RETURN count(r) AS total",
+            "MATCH ()-[r]->() WITH r LIMIT $batch_size DELETE r RETURN count(*) AS deleted",
+        )
+    return (
+        f"MATCH (n:`{label}`) RETURN sum(COUNT {{ (n)--() }}) AS total",
+        f"MATCH (n:`{label}`)-[r]-() WITH DISTINCT r LIMIT $batch_size DELETE r RETURN count(*) AS deleted",
+    )
+
+def _node_queries(label: Optional[str]):
+    """(전체 수 쿼리, 배치 삭제 쿼리)"""
+    pattern = f"(n:`{label}`)" if label else "(n)"
+    return (
+        f"MATCH {pattern} RETURN count(n) AS total",
+        # 배치 사이에 새로 생긴 관계가 있어도 실패하지 않도록 DETACH
+        f"MATCH {pattern} WITH n LIMIT $batch_size DETACH DELETE n RETURN count(*) AS deleted",
+    )
+
+def _delete_in_batches(session, phase: str, count_query: str, delete_query: str,
+                       batch_size: int, progress: ProgressCallback) -> int:
+    """삭제할 것이 없을 때까지 batch_size개씩 별도 트랜잭션으로 삭제"""
+    total = session.run(count_query).single()['total'] or 0
+    deleted = 0
+    while True:
+        count = session.execute_write(
+            lambda tx: tx.run(delete_query, batch_size=batch_size).single()['deleted']
+        )
+        if not count:
+            break
+        deleted += count
+        progress(phase, deleted, max(total, deleted))
+    return deleted
+
+def _affected_schema(session, labels: Optional[List[str]]) -> List[Dict[str, Any]]:
+    """
+    삭제 대상 라벨에 걸린 제약조건과 (제약조건 소유가 아닌) 인덱스
+    
+    토큰 LOOKUP 인덱스는 라벨 스캔에 필요하므로 건드리지 않습니다.
+    """
+    affected = []
+    for record in session.run(
+        "SHOW CONSTRAINTS YIELD name, labelsOrTypes, createStatement"
+    ).data():
+        if _touches(record, labels):
+            affected.append({'kind': 'CONSTRAINT', **record})
+    for record in session.run(
+        "SHOW INDEXES YIELD name, type, labelsOrTypes, owningConstraint, createStatement"
+    ).data():
+        if record['type'] == 'LOOKUP' or record.get('owningConstraint'):
+            continue
+        if _touches(record, labels):
+            affected.append({'kind': 'INDEX', **record})
+    return affected
+
+def _touches(record: Dict[str, Any], labels: Optional[List[str]]) -> bool:
+    return labels is None or bool(set(record.get('labelsOrTypes') or []) & set(labels))
+
+def _log_progress(phase: str, deleted: int, total: int):
+    percent = deleted * 100 / total if total else 100
+    logger.info(f"  🗑️  {phase}: {deleted:,}/{total:,} ({percent:.0f}%)")
+
+def _identifier(name: str) -> str:
+    """라벨 이름 검증 (Cypher 식별자로 그대로 삽입되므로)"""
+    if not isinstance(name, str) or not _IDENTIFIER.match(name):
+        raise ValueError(f"허용되지 않는 라벨: {name!r}")
+    return name
+
+def main():
+    """그래프 배치 초기화"""
+    from neo4j import GraphDatabase
+    
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    
+    parser = argparse.ArgumentParser(description="Neo4j 그래프 배치 초기화")
+    parser.add_argument("--uri", default=os.getenv('NEO4J_URI', "bolt://localhost:7687"))
+    parser.add_argument("--username", default=os.getenv('NEO4J_USERNAME', "neo4j"))
+    parser.add_argument("--labels", nargs="+", help="삭제할 라벨 (기본: 전체)")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE, help="트랜잭션당 삭제 수")
+    parser.add_argument("--reset-schema", action="store_true", help="영향받는 제약조건/인덱스 삭제 후 재생성")
+    parser.add_argument("--yes", action="store_true", help="확인 없이 실행")
+    args = parser.parse_args()
+    
+    password = os.getenv('NEO4J_PASSWORD')
+    if not password:
+        logger.error("❌ NEO4J_PASSWORD 환경변수가 설정되지 않았습니다.")
+        return False
+    
+    target = ", ".join(args.labels) if args.labels else "모든 데이터"
+    if not args.yes:
+        response = input(f"\n⚠️  {args.uri}의 {target}를 삭제하시겠습니까? (y/N): ")
+        if response.lower() not in ['y', 'yes']:
+            return False
+    
+    driver = GraphDatabase.driver(args.uri, auth=(args.username, password))
+    try:
+        clear_graph(driver, batch_size=args.batch_size, labels=args.labels, reset_schema=args.reset_schema)
+        return True
+    finally:
+        driver.close()
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -6,23 +6,32 @@ Phase 0: PoC - 지식 그래프 초기화 스크립트
 
 import os
 import sys
-from neo4j import GraphDatabase
 import time
 from pathlib import Path
 
+from cypher_script import read_cypher_statements, is_schema_statement, requires_auto_commit
+from schema_migrations import MIGRATIONS_DIR, SchemaMigrator, MigrationError
+from graph_reset import clear_graph, DEFAULT_BATCH_SIZE
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..'))
+from graph_statistics import get_snapshot
+from memory_graph import open_driver
+
 class Neo4jSeedLoader:
-    def __init__(self, uri="bolt://localhost:7687", user="neo4j", password="password"):
-        """Neo4j 연결 초기화"""
+    def __init__(self, uri="bolt://localhost:7687", user="neo4j", password="password", batch_size=50):
+        """Neo4j 연결 초기화 (batch_size: 트랜잭션당 Seed 문장 수)"""
         self.uri = uri
         self.user = user
         self.password = password
+        self.batch_size = batch_size
         self.driver = None
+        self._load_stats = {}
         
     def connect(self):
-        """Neo4j 데이터베이스 연결"""
+        """Neo4j 데이터베이스 연결 (memory:// URI는 인메모리 그래프)"""
         try:
             print(f"🔌 Neo4j 연결 시도: {self.uri}")
-            self.driver = GraphDatabase.driver(self.uri, auth=(self.user, self.password))
+            self.driver = open_driver(self.uri, auth=(self.user, self.password))
             
             # 연결 테스트
             with self.driver.session() as session:
@@ -45,148 +54,162 @@ class Neo4jSeedLoader:
             self.driver.close()
             print("🔌 Neo4j 연결 종료")
     
-    def clear_database(self):
-        """기존 데이터 초기화 (주의: 모든 데이터 삭제)"""
-        print("🗑️  기존 데이터 정리 중...")
-        with self.driver.session() as session:
-            # 모든 노드와 관계 삭제
-            session.run("MATCH (n) DETACH DELETE n")
-            
-            # 인덱스와 제약조건 삭제
-            constraints = session.run("SHOW CONSTRAINTS").data()
-            for constraint in constraints:
-                constraint_name = constraint.get('name')
-                if constraint_name:
-                    try:
-                        session.run(f"DROP CONSTRAINT {constraint_name}")
-                    except:
-                        pass
-            
-            indexes = session.run("SHOW INDEXES").data() 
-            for index in indexes:
-                index_name = index.get('name')
-                if index_name and not index_name.startswith('system'):
-                    try:
-                        session.run(f"DROP INDEX {index_name}")
-                    except:
-                        pass
-                        
-        print("✅ 데이터베이스 정리 완료")
-    
-    def load_schema(self, schema_file):
-        """스키마 파일 로드"""
-        print(f"📋 스키마 로드 중: {schema_file}")
+    def clear_database(self, batch_size=DEFAULT_BATCH_SIZE, labels=None, reset_schema=False):
+        """
+        기존 데이터 초기화 (주의: 데이터 삭제)
         
-        if not os.path.exists(schema_file):
-            print(f"❌ 스키마 파일을 찾을 수 없습니다: {schema_file}")
-            return False
-            
-        with open(schema_file, 'r', encoding='utf-8') as f:
-            schema_content = f.read()
+        관계 → 노드 순서로 batch_size개씩 나눠 삭제하므로 대규모 그래프도 트랜잭션 메모리 한도 안에서 지워집니다.
+        스키마(제약조건/인덱스)는 유지하며, reset_schema=True면 영향받는 것만 삭제 후 다시 생성합니다.
         
-        # 주석 제거 및 쿼리 분리
-        queries = []
-        current_query = []
+        Args:
+            batch_size: 트랜잭션당 삭제 수
+            labels: 삭제할 라벨 목록 (None이면 전체)
+            reset_schema: 제약조건/인덱스 삭제 후 재생성 여부
+        """
+        print(f"🗑️  기존 데이터 정리 중... ({', '.join(labels) if labels else '전체'}, 배치 {batch_size:,}개)")
         
-        for line in schema_content.split('\n'):
-            line = line.strip()
-            # 주석 라인 건너뛰기
-            if line.startswith('//') or line.startswith('#') or not line:
-                continue
-            
-            current_query.append(line)
-            
-            # 세미콜론으로 끝나는 쿼리 완성
-            if line.endswith(';'):
-                query = ' '.join(current_query).replace(';', '')
-                if query.strip():
-                    queries.append(query.strip())
-                current_query = []
+        def report(phase, deleted, total):
+            print(f"  - {phase}: {deleted:,}/{total:,}")
         
-        # 스키마 쿼리 실행
-        successful_queries = 0
-        with self.driver.session() as session:
-            for i, query in enumerate(queries):
-                try:
-                    if query.upper().startswith(('CREATE CONSTRAINT', 'CREATE INDEX')):
-                        session.run(query)
-                        successful_queries += 1
-                        print(f"  ✅ 스키마 쿼리 {i+1}/{len(queries)} 완료")
-                except Exception as e:
-                    print(f"  ⚠️  스키마 쿼리 {i+1} 건너뛰기 (이미 존재할 수 있음): {str(e)[:100]}")
+        result = clear_graph(self.driver, batch_size=batch_size, labels=labels,
+                             reset_schema=reset_schema, progress=report)
+        print(f"✅ 데이터베이스 정리 완료 (관계 {result['relationships']:,}개, 노드 {result['nodes']:,}개, "
+              f"{result['elapsed']:.1f}초)")
+        return result
+    
+    def load_schema(self, migrations_dir=MIGRATIONS_DIR):
+        """스키마 마이그레이션 적용 (대기 중인 버전만 실행)"""
+        print(f"📋 스키마 마이그레이션 확인 중: {migrations_dir}")
         
-        print(f"✅ 스키마 로드 완료: {successful_queries}/{len(queries)} 쿼리 성공")
+        if not os.path.isdir(migrations_dir):
+            print(f"❌ 마이그레이션 디렉터리를 찾을 수 없습니다: {migrations_dir}")
+            return False
+        
+        try:
+            result = SchemaMigrator(self.driver, migrations_dir=migrations_dir).migrate()
+        except MigrationError as e:
+            print(f"❌ 스키마 마이그레이션 실패: {e}")
+            return False
+        
+        if result['up_to_date']:
+            print("✅ 스키마 최신 상태 (적용할 마이그레이션 없음)")
+        else:
+            versions = ", ".join(f"V{version:03d}" for version in result['applied'])
+            print(f"✅ 스키마 마이그레이션 완료: {versions}")
         return True
     
-    def load_seed_data(self, seed_file):
-        """Seed 데이터 파일 로드"""
-        print(f"🌱 Seed 데이터 로드 중: {seed_file}")
+    def load_seed_data(self, seed_file, batch_size=None):
+        """
+        Seed 데이터 파일 로드
+        
+        파일을 스트리밍으로 파싱하여 batch_size개 문장을 하나의 명시적 트랜잭션으로 커밋합니다.
+        배치가 실패하면 롤백 후 해당 배치만 문장별 트랜잭션으로 다시 실행해 실패 문장을 찾습니다.
+        """
+        batch_size = batch_size or self.batch_size
+        print(f"🌱 Seed 데이터 로드 중: {seed_file} (트랜잭션당 {batch_size}개 문장)")
         
         if not os.path.exists(seed_file):
             print(f"❌ Seed 데이터 파일을 찾을 수 없습니다: {seed_file}")
             return False
-            
-        with open(seed_file, 'r', encoding='utf-8') as f:
-            seed_content = f.read()
         
-        # 주석 제거 및 쿼리 분리
-        queries = []
-        current_query = []
-        in_multiline = False
+        self._load_stats = {"successful": 0, "failed": 0, "nodes": 0, "relationships": 0, "transactions": 0}
+        started = time.perf_counter()
         
-        for line in seed_content.split('\n'):
-            line = line.strip()
-            
-            # 주석 라인 건너뛰기
-            if line.startswith('//') or line.startswith('#'):
-                continue
-            
-            if not line:
-                continue
+        batch = []
+        with self.driver.session() as session:
+            for query in read_cypher_statements(seed_file):
+                if is_schema_statement(query):
+                    continue
                 
-            current_query.append(line)
+                if requires_auto_commit(query):
+                    # CALL { } IN TRANSACTIONS 문장은 명시적 트랜잭션 밖에서 실행
+                    self._run_batch(session, batch)
+                    batch = []
+                    self._run_auto_commit(session, query)
+                    continue
+                
+                batch.append(query)
+                if len(batch) >= batch_size:
+                    self._run_batch(session, batch)
+                    batch = []
+            
+            self._run_batch(session, batch)
+        
+        stats = self._load_stats
+        total = stats["successful"] + stats["failed"]
+        elapsed = time.perf_counter() - started
+        print(f"  📊 노드 +{stats['nodes']}, 관계 +{stats['relationships']} "
+              f"({stats['transactions']}개 트랜잭션, {elapsed:.1f}초)")
+        print(f"✅ Seed 데이터 로드 완료: {stats['successful']}/{total} 쿼리 성공, {stats['failed']} 실패")
+        return True
+    
+    def _run_batch(self, session, queries):
+        """문장 묶음을 하나의 트랜잭션으로 실행 (실패 시 문장별로 재실행)"""
+        if not queries:
+            return
+        
+        tx = session.begin_transaction()
+        try:
+            counters = [tx.run(query).consume().counters for query in queries]
+            tx.commit()
+        except Exception as e:
+            tx.close()
+            if len(queries) == 1:
+                self._load_stats["failed"] += 1
+                print(f"  ❌ 쿼리 실패: {str(e)[:100]}")
+                print(f"     Query: {queries[0][:100]}...")
+                return
             
-            # 세미콜론으로 끝나는 쿼리 완성
-            if line.endswith(';'):
-                query = ' '.join(current_query).replace(';', '')
-                if query.strip() and not query.upper().startswith(('CREATE CONSTRAINT', 'CREATE INDEX')):
-                    queries.append(query.strip())
-                current_query = []
+            print(f"  ⚠️  배치 트랜잭션 롤백 ({len(queries)}개 문장), 문장별로 재실행: {str(e)[:100]}")
+            for query in queries:
+                self._run_batch(session, [query])
+            return
         
-        # Seed 데이터 쿼리 실행
-        successful_queries = 0
-        failed_queries = 0
+        self._record_counters(counters)
+    
+    def _run_auto_commit(self, session, query):
+        """자동 커밋 트랜잭션으로 단일 문장 실행"""
+        try:
+            counters = session.run(query).consume().counters
+        except Exception as e:
+            self._load_stats["failed"] += 1
+            print(f"  ❌ 쿼리 실패: {str(e)[:100]}")
+            print(f"     Query: {query[:100]}...")
+            return
         
-        with self.driver.session() as session:
-            for i, query in enumerate(queries):
-                try:
-                    result = session.run(query)
-                    summary = result.consume()
-                    
-                    # 결과 통계
-                    nodes_created = summary.counters.nodes_created
-                    relationships_created = summary.counters.relationships_created
-                    
-                    if nodes_created > 0 or relationships_created > 0:
-                        print(f"  ✅ 쿼리 {i+1}/{len(queries)}: 노드 +{nodes_created}, 관계 +{relationships_created}")
-                    
-                    successful_queries += 1
-                    
-                except Exception as e:
-                    failed_queries += 1
-                    print(f"  ❌ 쿼리 {i+1} 실패: {str(e)[:100]}")
-                    print(f"     Query: {query[:100]}...")
+        self._record_counters([counters])
+    
+    def _record_counters(self, counters):
+        """커밋된 트랜잭션의 통계 반영"""
+        stats = self._load_stats
+        stats["successful"] += len(counters)
+        stats["transactions"] += 1
+        nodes_created = sum(c.nodes_created for c in counters)
+        relationships_created = sum(c.relationships_created for c in counters)
+        stats["nodes"] += nodes_created
+        stats["relationships"] += relationships_created
         
-        print(f"✅ Seed 데이터 로드 완료: {successful_queries}/{len(queries)} 쿼리 성공, {failed_queries} 실패")
-        return True
+        if nodes_created > 0 or relationships_created > 0:
+            print(f"  ✅ 트랜잭션 {stats['transactions']} ({len(counters)}개 문장): "
+                  f"노드 +{nodes_created}, 관계 +{relationships_created}")
     
     def verify_data(self):
         """데이터 로드 검증"""
         print("🔍 데이터 검증 중...")
         
+        # 노드/관계 타입별 개수는 카운트 스토어 통계로 (전체 스캔 없음)
+        try:
+            snapshot = get_snapshot(self.driver, refresh=True)
+            print("\n📊 노드 타입별 개수:")
+            for row in snapshot.label_rows():
+                print(f"  {row['type']}: {row['count']}개")
+            print("\n🔗 관계 타입별 개수 (상위 10개):")
+            for row in snapshot.relationship_rows()[:10]:
+                print(f"  {row['rel_type']}: {row['count']}개")
+        except Exception as e:
+            print(f"  ❌ 그래프 통계 조회 실패: {e}")
+        
         verification_queries = [
-            "MATCH (n) RETURN labels(n)[0] as NodeType, count(n) as Count ORDER BY Count DESC",
-            "MATCH ()-[r]->() RETURN type(r) as RelationType, count(r) as Count ORDER BY Count DESC LIMIT 10",
             "MATCH (d:Developer) RETURN d.name, d.type, d.specialization LIMIT 5",
             "MATCH (p:Project) RETURN p.name, p.status, p.currentPhase LIMIT 5",
             "MATCH (c:Commit) RETURN c.hash, c.message, c.author LIMIT 5"
@@ -199,22 +222,14 @@ class Neo4jSeedLoader:
                     records = result.data()
                     
                     if i == 0:
-                        print("\n📊 노드 타입별 개수:")
-                        for record in records:
-                            print(f"  {record['NodeType']}: {record['Count']}개")
-                    elif i == 1:
-                        print("\n🔗 관계 타입별 개수 (상위 10개):")
-                        for record in records:
-                            print(f"  {record['RelationType']}: {record['Count']}개")
-                    elif i == 2:
                         print("\n👥 개발자 샘플 (5명):")
                         for record in records:
                             print(f"  {record['d.name']} ({record['d.type']}) - {record['d.specialization']}")
-                    elif i == 3:
+                    elif i == 1:
                         print("\n🏗️ 프로젝트 샘플:")
                         for record in records:
                             print(f"  {record['p.name']} - {record['p.status']} ({record['p.currentPhase']})")
-                    elif i == 4:
+                    elif i == 2:
                         print("\n💾 커밋 샘플:")
                         for record in records:
                             print(f"  {record['c.hash'][:8]} - {record['c.message'][:50]}... (by {record['c.author']})")
@@ -231,16 +246,16 @@ def main():
     
     # 파일 경로 설정
     base_dir = Path(__file__).parent.parent
-    schema_file = base_dir / "knowledge_schema" / "schema.cypher"
+    migrations_dir = base_dir / "knowledge_schema" / "migrations"
     seed_file = base_dir / "seed_content" / "seed_data_generation.cypher"
     
-    print(f"📂 스키마 파일: {schema_file}")
+    print(f"📂 마이그레이션: {migrations_dir}")
     print(f"📂 Seed 파일: {seed_file}")
     print()
     
     # Neo4j 연결 설정 (필요시 수정)
     loader = Neo4jSeedLoader(
-        uri="bolt://localhost:7687",
+        uri=os.getenv('NEO4J_URI', "bolt://localhost:7687"),
         user="neo4j", 
         password="password"  # 실제 비밀번호로 변경 필요
     )
@@ -257,7 +272,7 @@ def main():
         
         # 3. 스키마 로드
         print("\n" + "="*60)
-        if not loader.load_schema(schema_file):
+        if not loader.load_schema(migrations_dir):
             return False
         
         # 4. Seed 데이터 로드
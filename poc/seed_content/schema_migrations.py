@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+"""
+마음로그 V4.0 - 버전 기반 스키마 마이그레이션
+poc/knowledge_schema/migrations/V###__이름.cypher 파일을 순서대로 적용하고
+적용 이력을 (:SchemaMigration) 노드에 체크섬과 함께 기록
+
+- 적용 이력 조회 한 번으로 대기 중인 마이그레이션만 실행 (변경이 없으면 DDL 없음)
+- 이미 적용된 파일이 수정되면 체크섬 불일치로 중단
+- 인덱스 생성 후 db.awaitIndexes로 채우기(population) 완료를 기다린 뒤 성공 보고
+"""
+
+import os
+import re
+import sys
+import hashlib
+import argparse
+import logging
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Any, Optional
+
+from cypher_script import read_cypher_statements
+
+logger = logging.getLogger(__name__)
+
+# 기본 마이그레이션 디렉터리
+MIGRATIONS_DIR = Path(__file__).resolve().parent.parent / "knowledge_schema" / "migrations"
+
+_MIGRATION_FILE = re.compile(r'^V(\d+)__(\w+)\.cypher$')
+
+class MigrationError(Exception):
+    """마이그레이션 이력 불일치 또는 적용 실패"""
+
+@dataclass
+class Migration:
+    """마이그레이션 파일 하나"""
+    version: int
+    name: str
+    path: Path
+    statements: List[str] = field(default_factory=list)
+    
+    @property
+    def checksum(self) -> str:
+        """공백을 정규화한 문장 기준 SHA-256 (주석/줄바꿈 변경은 무시)"""
+        normalized = ";\n".join(" ".join(statement.split()) for statement in self.statements)
+        return hashlib.sha256(normalized.encode('utf-8')).hexdigest()
+
+def discover_migrations(directory=MIGRATIONS_DIR) -> List[Migration]:
+    """디렉터리의 마이그레이션 파일을 버전 순으로 로드"""
+    migrations = []
+    for entry in sorted(os.listdir(directory)):
+        match = _MIGRATION_FILE.match(entry)
+        if not match:
+            continue
+        path = Path(directory) / entry
+        migrations.append(Migration(
+            version=int(match.group(1)),
+            name=match.group(2),
+            path=path,
+            statements=list(read_cypher_statements(path))
+        ))
+    
+    versions = [m.version for m in migrations]
+    if len(versions) != len(set(versions)):
+        raise MigrationError(f"중복된 마이그레이션 버전이 있습니다: {directory}")
+    return sorted(migrations, key=lambda m: m.version)
+
+class SchemaMigrator:
+    """
+    스키마 마이그레이션 실행기
+    
+    사용 예:
+        migrator = SchemaMigrator(driver)
+        migrator.migrate()
+    """
+    
+    def __init__(self, driver, migrations_dir=MIGRATIONS_DIR, database: Optional[str] = None):
+        self.driver = driver
+        self.migrations_dir = migrations_dir
+        self.database = database
+    
+    def _session(self):
+        return self.driver.session(database=self.database) if self.database else self.driver.session()
+    
+    def applied(self) -> Dict[int, Dict[str, Any]]:
+        """적용된 마이그레이션 {version: {name, checksum, applied_at}}"""
+        with self._session() as session:
+            records = session.run("""
+                MATCH (m:SchemaMigration)
+                RETURN m.version as version, m.name as name, m.checksum as checksum, m.applied_at as applied_at
+            """).data()
+        return {record['version']: record for record in records}
+    
+    def pending(self, migrations: Optional[List[Migration]] = None) -> List[Migration]:
+        """대기 중인 마이그레이션 (적용된 파일의 체크섬이 다르면 MigrationError)"""
+        migrations = migrations if migrations is not None else discover_migrations(self.migrations_dir)
+        applied = self.applied()
+        
+        pending = []
+        for migration in migrations:
+            record = applied.get(migration.version)
+            if record is None:
+                pending.append(migration)
+            elif record['checksum'] != migration.checksum:
+                raise MigrationError(
+                    f"V{migration.version:03d} {migration.name}: 적용된 마이그레이션이 수정되었습니다 "
+                    f"(기록 {record['checksum'][:12]}, 파일 {migration.checksum[:12]}). "
+                    f"변경 사항은 새 버전 파일로 추가하세요."
+                )
+        return pending
+    
+    def migrate(self, await_indexes: bool = True, index_timeout: int = 300,
+                dry_run: bool = False) -> Dict[str, Any]:
+        """
+        대기 중인 마이그레이션 적용
+        
+        Returns:
+            {'applied': [버전...], 'pending': [버전...], 'up_to_date': bool}
+        """
+        pending = self.pending()
+        if not pending:
+            logger.info("✅ 스키마 최신 상태 (적용할 마이그레이션 없음)")
+            return {'applied': [], 'pending': [], 'up_to_date': True}
+        
+        if dry_run:
+            for migration in pending:
+                logger.info(f"  📋 대기 중: V{migration.version:03d} {migration.name} ({len(migration.statements)}개 문장)")
+            return {'applied': [], 'pending': [m.version for m in pending], 'up_to_date': False}
+        
+        applied = []
+        with self._session() as session:
+            session.run(
+                "CREATE CONSTRAINT schema_migration_version_unique IF NOT EXISTS "
+                "FOR (m:SchemaMigration) REQUIRE m.version IS UNIQUE"
+            ).consume()
+            
+            for migration in pending:
+                logger.info(f"🔧 마이그레이션 V{migration.version:03d} {migration.name} 적용 중...")
+                for statement in migration.statements:
+                    # 스키마 변경은 데이터 쓰기와 섞을 수 없으므로 문장별 자동 커밋
+                    try:
+                        session.run(statement).consume()
+                    except Exception as e:
+                        raise MigrationError(
+                            f"V{migration.version:03d} {migration.name} 실패: {e}\n     Query: {statement[:100]}"
+                        ) from e
+                
+                session.run("""
+                    MERGE (m:SchemaMigration {version: $version})
+                    SET m.name = $name,
+                        m.checksum = $checksum,
+                        m.statements = $statements,
+                        m.applied_at = datetime()
+                """, version=migration.version, name=migration.name,
+                    checksum=migration.checksum, statements=len(migration.statements)).consume()
+                applied.append(migration.version)
+                logger.info(f"  ✅ V{migration.version:03d} 적용 완료 ({len(migration.statements)}개 문장)")
+            
+            if await_indexes:
+                # 인덱스 채우기가 끝나기 전에는 조회가 전체 스캔으로 떨어질 수 있음
+                logger.info(f"⏳ 인덱스 채우기 완료 대기 (최대 {index_timeout}초)...")
+                session.run("CALL db.awaitIndexes($timeout)", timeout=index_timeout).consume()
+        
+        logger.info(f"✅ 스키마 마이그레이션 완료: {len(applied)}개 적용")
+        return {'applied': applied, 'pending': [], 'up_to_date': False}
+    
+    def status(self) -> List[Dict[str, Any]]:
+        """마이그레이션 파일별 적용 상태"""
+        applied = self.applied()
+        rows = []
+        for migration in discover_migrations(self.migrations_dir):
+            record = applied.get(migration.version)
+            if record is None:
+                state = 'pending'
+            elif record['checksum'] != migration.checksum:
+                state = 'modified'
+            else:
+                state = 'applied'
+            rows.append({
+                'version': migration.version,
+                'name': migration.name,
+                'state': state,
+                'applied_at': record['applied_at'] if record else None,
+            })
+        return rows
+
+def main():
+    """스키마 마이그레이션 실행"""
+    from neo4j import GraphDatabase
+    
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    
+    parser = argparse.ArgumentParser(description="버전 기반 Neo4j 스키마 마이그레이션")
+    parser.add_argument("--uri", default=os.getenv('NEO4J_URI', "neo4j+s://3e875bd7.databases.neo4j.io"))
+    parser.add_argument("--username", default=os.getenv('NEO4J_USERNAME', "neo4j"))
+    parser.add_argument("--database", help="대상 데이터베이스 (기본: 서버 기본 DB)")
+    parser.add_argument("--migrations-dir", default=str(MIGRATIONS_DIR), help="마이그레이션 디렉터리")
+    parser.add_argument("--status", action="store_true", help="적용 상태만 출력")
+    parser.add_argument("--dry-run", action="store_true", help="대기 중인 마이그레이션만 출력")
+    parser.add_argument("--no-await-indexes", action="store_true", help="인덱스 채우기 완료를 기다리지 않음")
+    args = parser.parse_args()
+    
+    password = os.getenv('NEO4J_PASSWORD')
+    if not password:
+        logger.error("❌ NEO4J_PASSWORD 환경변수가 설정되지 않았습니다.")
+        return False
+    
+    driver = GraphDatabase.driver(args.uri, auth=(args.username, password))
+    try:
+        migrator = SchemaMigrator(driver, migrations_dir=args.migrations_dir, database=args.database)
+        if args.status:
+            for row in migrator.status():
+                logger.info(f"  V{row['version']:03d} {row['name']}: {row['state']}")
+            return True
+        
+        migrator.migrate(await_indexes=not args.no_await_indexes, dry_run=args.dry_run)
+        return True
+    
+    except MigrationError as e:
+        logger.error(f"❌ {e}")
+        return False
+    
+    finally:
+        driver.close()
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+마음로그 V4.0 - 선언형 Seed 매니페스트 컴파일러
+JSON 매니페스트(라벨별 노드, 끝점 기반 관계)를 라벨/관계 타입별 UNWIND 문장으로 변환
+
+매니페스트 형식:
+    {
+      "nodes": [
+        {"label": "Skill", "key": "id",
+         "rows": [{"id": "python", "name": "Python", "created": {"$datetime": "now"}}]},
+        {"label": "Commit", "key": "hash", "labels": ["Activity"],
+         "rows": [{"hash": "a1b2c3", "message": "init"}]}
+      ],
+      "relationships": [
+        {"type": "HAS_SKILL",
+         "from": {"label": "Developer", "key": "id"},
+         "to": {"label": "Skill", "key": "id"},
+         "rows": [{"from": "code_architect_ai", "to": "python", "properties": {"level": "Expert"}}]}
+      ]
+    }
+
+특수 값:
+    {"$datetime": "2025-08-05T00:00:00Z"}  → 고정 시각
+    {"$datetime": "now"}                   → 컴파일 시각 (UTC)
+    {"$param": "instance_id"}              → compile_manifest(params=...)로 전달한 값
+"""
+
+import re
+import json
+from datetime import datetime, timezone
+from typing import Dict, List, Any, Optional
+
+from seed_plan import SeedStep
+
+# UNWIND 한 번에 보낼 기본 행 수
+DEFAULT_BATCH_SIZE = 1000
+
+_IDENTIFIER = re.compile(r'^[A-Za-z_][A-Za-z0-9_]*$')
+
+def load_manifest(path) -> Dict[str, Any]:
+    """매니페스트 JSON 파일 로드"""
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def compile_manifest(manifest: Dict[str, Any], params: Optional[Dict[str, Any]] = None,
+                     batch_size: int = DEFAULT_BATCH_SIZE, prefix: str = "") -> List[SeedStep]:
+    """
+    매니페스트를 SeedStep 목록으로 컴파일
+    
+    노드는 라벨별, 관계는 타입/끝점 라벨별로 batch_size 행씩 UNWIND 문장 하나가 됩니다.
+    같은 키를 가진 노드 행은 하나로 합쳐지므로(뒤쪽 값 우선) 청크끼리 병렬로 실행해도 안전합니다.
+    
+    Args:
+        manifest: load_manifest() 결과
+        params: {"$param": name} 자리에 넣을 값
+        batch_size: 문장당 최대 행 수
+        prefix: 단계 이름 접두사 (여러 매니페스트를 한 계획에 합칠 때 사용)
+    """
+    now = datetime.now(timezone.utc)
+    params = params or {}
+    steps = []
+    
+    for spec in manifest.get('nodes', []):
+        label = _identifier(spec['label'])
+        key = _identifier(spec.get('key', 'id'))
+        # 보조 라벨 (예: Commit/File/Task의 :Activity)
+        extra_labels = "".join(f":`{_identifier(name)}`" for name in spec.get('labels', []))
+        
+        # 키 기준으로 행 병합
+        merged: Dict[Any, Dict[str, Any]] = {}
+        for row in spec.get('rows', []):
+            if key not in row:
+                raise ValueError(f"{label} 행에 키 속성 '{key}'가 없습니다: {row}")
+            properties = {name: _resolve(value, now, params) for name, value in row.items()}
+            merged.setdefault(properties[key], {}).update(properties)
+        
+        query = (
+            f"UNWIND $rows AS row\n"
+            f"MERGE (n:`{label}` {{`{key}`: row.key}})\n"
+            f"SET n += row.properties" + (f", n{extra_labels}" if extra_labels else "")
+        )
+        rows = [{'key': value, 'properties': properties} for value, properties in merged.items()]
+        for index, chunk in enumerate(_chunks(rows, batch_size)):
+            steps.append(SeedStep(
+                f"{prefix}nodes:{label}:{index}", query, {'rows': chunk}, kind="node"
+            ))
+    
+    for spec in manifest.get('relationships', []):
+        rel_type = _identifier(spec['type'])
+        start_label = _identifier(spec['from']['label'])
+        start_key = _identifier(spec['from'].get('key', 'id'))
+        end_label = _identifier(spec['to']['label'])
+        end_key = _identifier(spec['to'].get('key', 'id'))
+        
+        # merge_on: 같은 끝점 사이에 여러 관계를 구분할 속성 (없으면 끝점+타입으로 식별)
+        merge_on = [_identifier(name) for name in spec.get('merge_on', [])]
+        identity = ", ".join(f"`{name}`: row.properties.`{name}`" for name in merge_on)
+        identity = f" {{{identity}}}" if identity else ""
+        
+        query = (
+            f"UNWIND $rows AS row\n"
+            f"MATCH (a:`{start_label}` {{`{start_key}`: row.from}})\n"
+            f"MATCH (b:`{end_label}` {{`{end_key}`: row.to}})\n"
+            f"MERGE (a)-[r:`{rel_type}`{identity}]->(b)\n"
+            f"SET r += row.properties"
+        )
+        rows = [
+            {
+                'from': _resolve(row['from'], now, params),
+                'to': _resolve(row['to'], now, params),
+                'properties': {
+                    name: _resolve(value, now, params)
+                    for name, value in row.get('properties', {}).items()
+                },
+            }
+            for row in spec.get('rows', [])
+        ]
+        group = f"{rel_type}:{start_label}:{end_label}"
+        for index, chunk in enumerate(_chunks(rows, batch_size)):
+            # 같은 타입의 청크는 같은 허브 노드를 잠그므로 순서대로 실행
+            steps.append(SeedStep(
+                f"{prefix}rels:{group}:{index}", query, {'rows': chunk},
+                kind="relationship", lock_key=f"{prefix}rels:{group}"
+            ))
+    
+    return steps
+
+def resolve_manifest(manifest: Dict[str, Any], params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """특수 값을 실제 값으로 바꾼 매니페스트 사본 (컴파일 없이 행을 직접 다룰 때 사용)"""
+    return _resolve(manifest, datetime.now(timezone.utc), params or {})
+
+def _resolve(value: Any, now: datetime, params: Dict[str, Any]) -> Any:
+    """특수 값({"$datetime": ...}, {"$param": ...})을 실제 값으로 변환"""
+    if isinstance(value, dict):
+        if '$datetime' in value:
+            text = value['$datetime']
+            if text == 'now':
+                return now
+            parsed = datetime.fromisoformat(text.replace('Z', '+00:00'))
+            return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+        if '$param' in value:
+            if value['$param'] not in params:
+                raise ValueError(f"매니페스트 파라미터가 전달되지 않았습니다: {value['$param']}")
+            return params[value['$param']]
+        return {name: _resolve(item, now, params) for name, item in value.items()}
+    if isinstance(value, list):
+        return [_resolve(item, now, params) for item in value]
+    return value
+
+def _identifier(name: str) -> str:
+    """라벨/관계 타입/속성 이름 검증 (Cypher 식별자로 그대로 삽입되므로)"""
+    if not isinstance(name, str) or not _IDENTIFIER.match(name):
+        raise ValueError(f"허용되지 않는 식별자: {name!r}")
+    return name
+
+def _chunks(rows: List[Any], size: int):
+    for start in range(0, len(rows), size):
+        yield rows[start:start + size]
@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+마음로그 V4.0 - 의존성 기반 병렬 Seed 실행기
+Seed MERGE 문장을 제약조건 → 노드 → 관계 레벨로 나누고, 각 레벨을 세션 풀에서 동시에 실행
+
+- 같은 레벨 안의 단계들은 서로 독립이라고 보고 병렬 실행
+- lock_key가 같은 단계(같은 노드를 MERGE 하는 단계 등)는 한 워커에서 순서대로 실행
+- 한 레벨에서 실패가 있으면 다음 레벨은 실행하지 않음 (관계 MATCH가 빈 결과로 끝나는 것을 방지)
+"""
+
+import time
+import logging
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Dict, List, Any, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# 단계 종류별 기본 레벨 (값이 작을수록 먼저 실행)
+STEP_LEVELS = {
+    'constraint': 0,
+    'node': 1,
+    'relationship': 2,
+}
+
+@dataclass
+class SeedStep:
+    """Seed 실행 단계 (쓰기 트랜잭션 하나)"""
+    name: str
+    query: str
+    params: Dict[str, Any] = field(default_factory=dict)
+    kind: str = 'node'
+    lock_key: Optional[str] = None
+    depends_on: Tuple[str, ...] = ()
+
+class SeedPlan:
+    """
+    SeedStep 의존성 그래프
+    
+    사용 예:
+        plan = SeedPlan()
+        plan.add(SeedStep("skill_constraint", "CREATE CONSTRAINT ...", kind="constraint"))
+        plan.add(SeedStep("skill:python", "MERGE (s:Skill {id: $id}) ...", {"id": "python"}))
+        plan.execute(driver, max_workers=8)
+    """
+    
+    def __init__(self, steps: Optional[List[SeedStep]] = None):
+        self.steps: 'OrderedDict[str, SeedStep]' = OrderedDict()
+        for step in steps or []:
+            self.add(step)
+    
+    def add(self, step: SeedStep) -> SeedStep:
+        """단계 추가 (이름은 계획 안에서 유일해야 함)"""
+        if step.kind not in STEP_LEVELS:
+            raise ValueError(f"알 수 없는 단계 종류: {step.kind}")
+        if step.name in self.steps:
+            raise ValueError(f"중복된 단계 이름: {step.name}")
+        self.steps[step.name] = step
+        return step
+    
+    def extend(self, steps: List[SeedStep]):
+        """여러 단계 추가"""
+        for step in steps:
+            self.add(step)
+    
+    def levels(self) -> List[List[SeedStep]]:
+        """
+        실행 레벨 계산
+        
+        단계의 레벨은 종류별 기본 레벨과 (선행 단계 레벨 + 1) 중 큰 값입니다.
+        """
+        depth: Dict[str, int] = {}
+        visiting = set()
+        
+        def level_of(name: str) -> int:
+            if name in depth:
+                return depth[name]
+            if name not in self.steps:
+                raise ValueError(f"존재하지 않는 선행 단계: {name}")
+            if name in visiting:
+                raise ValueError(f"순환 의존성: {name}")
+            
+            visiting.add(name)
+            step = self.steps[name]
+            level = STEP_LEVELS[step.kind]
+            for dependency in step.depends_on:
+                level = max(level, level_of(dependency) + 1)
+            visiting.discard(name)
+            depth[name] = level
+            return level
+        
+        levels: Dict[int, List[SeedStep]] = {}
+        for name, step in self.steps.items():
+            levels.setdefault(level_of(name), []).append(step)
+        return [levels[level] for level in sorted(levels)]
+    
+    def execute(self, driver, max_workers: int = 8) -> Dict[str, Any]:
+        """
+        레벨 순서대로 실행, 각 레벨은 세션 풀에서 병렬 실행
+        
+        Returns:
+            {'success', 'steps', 'failed', 'levels', 'elapsed'}
+        """
+        started = time.perf_counter()
+        levels = self.levels()
+        completed = 0
+        failures: List[Tuple[str, str]] = []
+        
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="seed") as executor:
+            for index, steps in enumerate(levels):
+                # lock_key가 같은 단계는 하나의 체인으로 묶어 순서대로 실행
+                chains: 'OrderedDict[str, List[SeedStep]]' = OrderedDict()
+                for step in steps:
+                    chains.setdefault(step.lock_key or step.name, []).append(step)
+                
+                level_started = time.perf_counter()
+                futures = [executor.submit(self._run_chain, driver, chain) for chain in chains.values()]
+                for future in futures:
+                    done, failed = future.result()
+                    completed += done
+                    failures.extend(failed)
+                
+                logger.info(f"  ⚡ 레벨 {index + 1}/{len(levels)}: {len(steps)}개 단계, "
+                            f"{len(chains)}개 병렬 체인 ({time.perf_counter() - level_started:.2f}초)")
+                if failures:
+                    break
+        
+        for name, error in failures:
+            logger.error(f"  ❌ Seed 단계 실패 [{name}]: {error}")
+        
+        return {
+            'success': not failures,
+            'steps': completed,
+            'failed': len(failures),
+            'levels': len(levels),
+            'elapsed': time.perf_counter() - started,
+        }
+    
+    @staticmethod
+    def _run_chain(driver, chain: List[SeedStep]) -> Tuple[int, List[Tuple[str, str]]]:
+        """체인 단계를 한 세션에서 순서대로 실행 (실패하면 체인의 나머지는 건너뜀)"""
+        completed = 0
+        with driver.session() as session:
+            for step in chain:
+                try:
+                    session.execute_write(lambda tx, s=step: tx.run(s.query, **s.params).consume())
+                    completed += 1
+                except Exception as e:
+                    return completed, [(step.name, str(e))]
+        return completed, []
@@ -0,0 +1,266 @@
+#!/usr/bin/env python3
+"""
+마음로그 V4.0 - 변경분 기반 Seed 동기화
+매니페스트가 선언한 노드/관계의 현재 상태를 한 번의 읽기 트랜잭션으로 가져와
+속성 단위로 비교하고, 달라진 노드/관계의 달라진 속성만 기록
+
+- 변경이 없으면 쓰기 트랜잭션 없음 (반복 Seed 실행이 거의 no-op)
+- {"$datetime": "now"} 속성(last_updated 등)은 매번 값이 달라지므로 비교하지 않고,
+  속성이 없거나 같은 노드/관계에 다른 변경이 있을 때만 기록
+- dry_run=True면 계획(생성/수정/끝점 없음)만 출력
+"""
+
+import logging
+from dataclasses import dataclass, field
+from typing import Dict, List, Any, Optional, Tuple
+
+from seed_plan import SeedPlan
+from seed_manifest import compile_manifest, resolve_manifest, _identifier
+
+logger = logging.getLogger(__name__)
+
+@dataclass
+class SyncChange:
+    """노드/관계 하나의 변경"""
+    kind: str                 # 'node' | 'relationship'
+    action: str               # 'create' | 'update' | 'unresolved'
+    target: str               # 라벨 또는 관계 타입
+    identity: Any             # 노드 키 값 또는 (시작, 끝)
+    properties: Dict[str, Any] = field(default_factory=dict)
+    previous: Dict[str, Any] = field(default_factory=dict)
+    spec_index: int = 0
+    row: Dict[str, Any] = field(default_factory=dict)
+
+@dataclass
+class SyncPlan:
+    """동기화 계획"""
+    changes: List[SyncChange] = field(default_factory=list)
+    unchanged: int = 0
+    
+    @property
+    def writes(self) -> List[SyncChange]:
+        return [change for change in self.changes if change.action != 'unresolved']
+    
+    def counts(self) -> Dict[str, int]:
+        counts = {'create': 0, 'update': 0, 'unresolved': 0, 'unchanged': self.unchanged}
+        for change in self.changes:
+            counts[change.action] += 1
+        return counts
+    
+    def log(self):
+        """계획 출력 (dry-run)"""
+        symbols = {'create': '+', 'update': '~', 'unresolved': '?'}
+        for change in self.changes:
+            identity = (f"{change.identity[0]} → {change.identity[1]}"
+                        if change.kind == 'relationship' else change.identity)
+            logger.info(f"  {symbols[change.action]} {change.target} {identity}")
+            if change.action == 'update':
+                for name, value in change.properties.items():
+                    logger.info(f"      {name}: {change.previous.get(name)!r} → {value!r}")
+            elif change.action == 'unresolved':
+                logger.info("      끝점 노드가 없어 MERGE 되지 않음")
+        counts = self.counts()
+        logger.info(f"📋 동기화 계획: 생성 {counts['create']}, 수정 {counts['update']}, "
+                    f"변경 없음 {counts['unchanged']}, 끝점 없음 {counts['unresolved']}")
+
+class SeedSync:
+    """
+    매니페스트 ↔ 그래프 변경분 동기화
+    
+    사용 예:
+        sync = SeedSync(driver)
+        sync.sync(load_manifest("manifests/auradb_updates.json"), params={...}, dry_run=True)
+    """
+    
+    def __init__(self, driver):
+        self.driver = driver
+    
+    def plan(self, manifest: Dict[str, Any], params: Optional[Dict[str, Any]] = None) -> SyncPlan:
+        """현재 상태를 읽어 변경 계획 계산"""
+        desired = resolve_manifest(manifest, params)
+        node_specs = desired.get('nodes', [])
+        rel_specs = desired.get('relationships', [])
+        
+        with self.driver.session() as session:
+            current_nodes, current_rels = session.execute_read(self._read_state, node_specs, rel_specs)
+        
+        plan = SyncPlan()
+        created: Dict[Tuple[str, str], set] = {}
+        
+        for index, spec in enumerate(node_specs):
+            key = spec.get('key', 'id')
+            labels = set(spec.get('labels', []))
+            volatile_rows = [_volatile(row) for row in manifest['nodes'][index].get('rows', [])]
+            for row, volatile in zip(spec.get('rows', []), volatile_rows):
+                current = current_nodes[index].get(row[key])
+                if current is None:
+                    plan.changes.append(SyncChange('node', 'create', spec['label'], row[key],
+                                                   dict(row), spec_index=index, row=row))
+                    for name, value in row.items():
+                        created.setdefault((spec['label'], name), set()).add(_hashable(value))
+                    continue
+                
+                properties, previous = _diff(row, current['properties'], volatile, exclude=key)
+                if properties or not labels <= set(current['labels']):
+                    plan.changes.append(SyncChange('node', 'update', spec['label'], row[key],
+                                                   properties, previous, spec_index=index, row=row))
+                else:
+                    plan.unchanged += 1
+        
+        for index, spec in enumerate(rel_specs):
+            merge_on = spec.get('merge_on', [])
+            start, end = spec['from'], spec['to']
+            raw_rows = manifest['relationships'][index].get('rows', [])
+            for row, raw in zip(spec.get('rows', []), raw_rows):
+                state = current_rels[index].get((_hashable(row['from']), _hashable(row['to'])))
+                desired_properties = row.get('properties', {})
+                volatile = _volatile(raw.get('properties', {}))
+                identity = (row['from'], row['to'])
+                
+                start_ok = (state and state['start_exists']) or \
+                    _hashable(row['from']) in created.get((start['label'], start.get('key', 'id')), ())
+                end_ok = (state and state['end_exists']) or \
+                    _hashable(row['to']) in created.get((end['label'], end.get('key', 'id')), ())
+                if not (start_ok and end_ok):
+                    plan.changes.append(SyncChange('relationship', 'unresolved', spec['type'], identity,
+                                                   spec_index=index, row=row))
+                    continue
+                
+                # MERGE와 같은 기준으로 기존 관계 선택 (merge_on 속성이 같은 관계)
+                existing = next((
+                    properties for properties in (state['relationships'] if state else [])
+                    if all(_same(properties.get(name), desired_properties.get(name)) for name in merge_on)
+                ), None)
+                if existing is None:
+                    plan.changes.append(SyncChange('relationship', 'create', spec['type'], identity,
+                                                   dict(desired_properties), spec_index=index, row=row))
+                    continue
+                
+                properties, previous = _diff(desired_properties, existing, volatile)
+                if properties:
+                    plan.changes.append(SyncChange('relationship', 'update', spec['type'], identity,
+                                                   properties, previous, spec_index=index, row=row))
+                else:
+                    plan.unchanged += 1
+        
+        return plan
+    
+    @staticmethod
+    def _read_state(tx, node_specs, rel_specs):
+        """매니페스트가 다루는 노드/관계의 현재 상태 (읽기 트랜잭션 하나)"""
+        current_nodes = []
+        for spec in node_specs:
+            label, key = _identifier(spec['label']), _identifier(spec.get('key', 'id'))
+            records = tx.run(
+                f"UNWIND $keys AS key MATCH (n:`{label}` {{`{key}`: key}}) "
+                f"RETURN key, properties(n) AS properties, labels(n) AS labels",
+                keys=[row[key] for row in spec.get('rows', [])]
+            )
+            current_nodes.append({
+                _hashable(record['key']): {'properties': record['properties'], 'labels': record['labels']}
+                for record in records
+            })
+        
+        current_rels = []
+        for spec in rel_specs:
+            rel_type = _identifier(spec['type'])
+            start_label, start_key = _identifier(spec['from']['label']), _identifier(spec['from'].get('key', 'id'))
+            end_label, end_key = _identifier(spec['to']['label']), _identifier(spec['to'].get('key', 'id'))
+            records = tx.run(f"""
+                UNWIND $rows AS row
+                OPTIONAL MATCH (a:`{start_label}` {{`{start_key}`: row.from}})
+                OPTIONAL MATCH (b:`{end_label}` {{`{end_key}`: row.to}})
+                OPTIONAL MATCH (a)-[r:`{rel_type}`]->(b)
+                RETURN row.from AS from, row.to AS to,
+                       a IS NOT NULL AS start_exists, b IS NOT NULL AS end_exists,
+                       collect(properties(r)) AS relationships
+            """, rows=[{'from': row['from'], 'to': row['to']} for row in spec.get('rows', [])])
+            current_rels.append({
+                (_hashable(record['from']), _hashable(record['to'])): dict(record)
+                for record in records
+            })
+        return current_nodes, current_rels
+    
+    def sync(self, manifest: Dict[str, Any], params: Optional[Dict[str, Any]] = None,
+             dry_run: bool = False, max_workers: int = 8) -> Dict[str, Any]:
+        """
+        변경분만 기록
+        
+        Returns:
+            {'success', 'create', 'update', 'unchanged', 'unresolved', 'steps', 'dry_run'}
+        """
+        plan = self.plan(manifest, params)
+        counts = plan.counts()
+        if dry_run or not plan.writes:
+            if dry_run:
+                plan.log()
+            else:
+                logger.info(f"✅ Seed 동기화: 변경 없음 ({counts['unchanged']}개 일치)")
+            return {'success': True, 'steps': 0, 'dry_run': dry_run, **counts}
+        
+        result = SeedPlan(compile_manifest(changes_manifest(plan, manifest, params))) \
+            .execute(self.driver, max_workers=max_workers)
+        logger.info(f"{'✅' if result['success'] else '❌'} Seed 동기화: 생성 {counts['create']}, "
+                    f"수정 {counts['update']}, 변경 없음 {counts['unchanged']} "
+                    f"({result['steps']}개 단계, {result['elapsed']:.2f}초)")
+        return {'success': result['success'], 'steps': result['steps'], 'dry_run': False, **counts}
+
+def changes_manifest(plan: SyncPlan, manifest: Dict[str, Any],
+                     params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """계획의 생성/수정 행만 담은 매니페스트 (수정 행은 키와 바뀐 속성만)"""
+    desired = resolve_manifest(manifest, params)
+    nodes: Dict[int, List[Dict[str, Any]]] = {}
+    relationships: Dict[int, List[Dict[str, Any]]] = {}
+    
+    for change in plan.writes:
+        if change.kind == 'node':
+            key = desired['nodes'][change.spec_index].get('key', 'id')
+            nodes.setdefault(change.spec_index, []).append({key: change.identity, **change.properties})
+        else:
+            spec = desired['relationships'][change.spec_index]
+            identity_properties = {
+                name: change.row.get('properties', {}).get(name) for name in spec.get('merge_on', [])
+            }
+            relationships.setdefault(change.spec_index, []).append({
+                'from': change.identity[0],
+                'to': change.identity[1],
+                'properties': {**identity_properties, **change.properties},
+            })
+    
+    return {
+        'nodes': [{**desired['nodes'][index], 'rows': rows} for index, rows in nodes.items()],
+        'relationships': [{**desired['relationships'][index], 'rows': rows} for index, rows in relationships.items()],
+    }
+
+def _diff(desired: Dict[str, Any], current: Dict[str, Any], volatile: set,
+          exclude: Optional[str] = None) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """
+    바뀐 속성 {이름: 새 값}, {이름: 이전 값}
+    
+    volatile 속성은 없을 때만 바뀐 것으로 보고, 다른 속성이 바뀌면 함께 기록합니다.
+    """
+    changed = {
+        name: value for name, value in desired.items()
+        if name != exclude and name not in volatile and not _same(current.get(name), value)
+    }
+    for name in volatile:
+        if name in desired and (changed or current.get(name) is None):
+            changed[name] = desired[name]
+    return changed, {name: _native(current.get(name)) for name in changed}
+
+def _volatile(row: Dict[str, Any]) -> set:
+    """{"$datetime": "now"}로 선언된 속성 이름"""
+    return {name for name, value in row.items() if isinstance(value, dict) and value.get('$datetime') == 'now'}
+
+def _same(current: Any, desired: Any) -> bool:
+    return _native(current) == _native(desired)
+
+def _native(value: Any) -> Any:
+    """드라이버 시간 타입(neo4j.time.*)을 파이썬 타입으로, 리스트는 원소별로"""
+    if isinstance(value, (list, tuple)):
+        return [_native(item) for item in value]
+    to_native = getattr(value, 'to_native', None)
+    return to_native() if callable(to_native) else value
+
+def _hashable(value: Any) -> Any:
+    return tuple(value) if isinstance(value, list) else value
@@ -0,0 +1,657 @@
+#!/usr/bin/env python3
+"""
+마음로그 V4.0 - 대규모 합성 지식 그래프 생성기
+schema.cypher / advanced_knowledge_architecture.cypher 구조를 따르는 벤치마크용 그래프를
+설정한 규모(수백만 커밋/파일/작업/인사이트)로 생성
+
+- 같은 seed면 항상 같은 그래프 (엔티티 종류별 독립 난수 스트림)
+- 개발자/프로젝트/개념/파일 차수는 멱법칙(Zipf) 분포: 소수 허브에 활동이 몰림
+- 활동 시각은 기간 전체에 고르게 퍼지며 생성 순서대로 증가 (FOLLOWS 체인이 시간순)
+- 출력: neo4j-admin import용 CSV 또는 매니페스트 UNWIND 단계(SeedPlan)로 직접 적재
+"""
+
+import os
+import csv
+import sys
+import time
+import random
+import bisect
+import logging
+import argparse
+from collections import OrderedDict
+from itertools import accumulate
+from dataclasses import dataclass, fields, replace
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Any, Optional, Iterator, Tuple
+
+from seed_plan import SeedPlan
+from seed_manifest import compile_manifest
+from schema_migrations import SchemaMigrator
+from bulk_import import add_column_types, csv_value, write_import_script
+
+logger = logging.getLogger(__name__)
+
+# 노드 라벨별 (키 속성, 보조 라벨)
+NODE_SPECS = {
+    'Developer': ('id', ()),
+    'Project': ('id', ()),
+    'Skill': ('id', ()),
+    'Concept': ('id', ()),
+    'Achievement': ('id', ()),
+    'File': ('path', ('Activity',)),
+    'Commit': ('hash', ('Activity',)),
+    'Task': ('id', ('Activity',)),
+    'Insight': ('id', ()),
+    'KnowledgeState': ('id', ()),
+}
+
+# 관계 타입별 (시작 라벨, 끝 라벨)
+REL_SPECS = {
+    'WORKS_ON': ('Developer', 'Project'),
+    'HAS_SKILL': ('Developer', 'Skill'),
+    'LEARNED': ('Developer', 'Concept'),
+    'REQUIRES': ('Skill', 'Concept'),
+    'PREREQUISITE_OF': ('Concept', 'Concept'),
+    'ACHIEVED': ('Developer', 'Achievement'),
+    'PART_OF': ('Achievement', 'Project'),
+    'CONTAINS': ('Project', 'File'),
+    'CREATED': ('Developer', 'File'),
+    'AUTHORED': ('Developer', 'Commit'),
+    'MODIFIES': ('Commit', 'File'),
+    'IMPLEMENTS': ('Commit', 'Concept'),
+    'FOLLOWS': ('Commit', 'Commit'),
+    'COMPLETED': ('Developer', 'Task'),
+    'RELATES_TO': ('Insight', 'Concept'),
+    'HAS_STATE': ('Developer', 'KnowledgeState'),
+    'TRANSITIONS_TO': ('KnowledgeState', 'KnowledgeState'),
+}
+
+# 적재 시 UNWIND 문장당 기본 행 수
+DEFAULT_BATCH_SIZE = 5000
+
+_LEVELS = ['Junior', 'Mid', 'Senior', 'Lead']
+_SKILL_CATEGORIES = ['Language', 'Framework', 'Database', 'Infrastructure', 'Testing', 'Architecture']
+_CONCEPT_CATEGORIES = ['Algorithms', 'Design', 'DevOps', 'Data', 'Security', 'AI']
+_DIFFICULTIES = ['Beginner', 'Intermediate', 'Advanced', 'Expert']
+_EXTENSIONS = ['py', 'py', 'py', 'js', 'ts', 'md', 'json', 'cypher', 'yaml', 'sql']
+_COMMIT_VERBS = ['Add', 'Fix', 'Refactor', 'Update', 'Remove', 'Optimize', 'Document', 'Test']
+_INSIGHT_CATEGORIES = ['productivity', 'learning', 'quality', 'collaboration', 'architecture']
+_TRIGGERS = ['commit_burst', 'task_completed', 'concept_learned', 'review_feedback']
+
+@dataclass
+class SyntheticGraphConfig:
+    """합성 그래프 규모 및 분포 설정"""
+    developers: int = 2000
+    projects: int = 100
+    skills: int = 300
+    concepts: int = 5000
+    achievements: int = 1000
+    files: int = 500_000
+    commits: int = 2_000_000
+    tasks: int = 500_000
+    insights: int = 250_000
+    states_per_developer: int = 24
+    seed: int = 42
+    skew: float = 1.1
+    start: datetime = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    days: int = 730
+    
+    def scaled(self, factor: float) -> 'SyntheticGraphConfig':
+        """모든 노드 수에 factor를 곱한 설정 (각 항목 최소 1)"""
+        counts = {
+            f.name: max(1, int(getattr(self, f.name) * factor))
+            for f in fields(self)
+            if f.name not in ('states_per_developer', 'seed', 'skew', 'start', 'days')
+        }
+        return replace(self, **counts)
+    
+    def node_counts(self) -> Dict[str, int]:
+        """라벨별 생성될 노드 수"""
+        return {
+            'Developer': self.developers,
+            'Project': self.projects,
+            'Skill': self.skills,
+            'Concept': self.concepts,
+            'Achievement': self.achievements,
+            'File': self.files,
+            'Commit': self.commits,
+            'Task': self.tasks,
+            'Insight': self.insights,
+            'KnowledgeState': self.developers * self.states_per_developer,
+        }
+
+class PowerLawSampler:
+    """
+    순위 기반 Zipf 샘플러 (순위 r의 가중치 1 / r^exponent)
+    
+    order를 주면 순위를 섞인 인덱스로 바꿔 허브가 특정 ID 구간에 몰리지 않게 합니다.
+    """
+    
+    def __init__(self, size: int, exponent: float, order: Optional[List[int]] = None):
+        self._cumulative = list(accumulate(1.0 / (rank ** exponent) for rank in range(1, size + 1)))
+        self._order = order
+    
+    def sample(self, rng: random.Random, limit: Optional[int] = None) -> int:
+        """인덱스 하나 추출 (limit: 상위 limit개 순위 안에서만 추출)"""
+        limit = limit or len(self._cumulative)
+        rank = bisect.bisect_left(self._cumulative, rng.random() * self._cumulative[limit - 1], 0, limit - 1)
+        return self._order[rank] if self._order is not None else rank
+    
+    def sample_many(self, rng: random.Random, count: int) -> List[int]:
+        """서로 다른 인덱스 최대 count개 추출 (순서 유지)"""
+        chosen = {}
+        for _ in range(count * 3):
+            if len(chosen) >= count:
+                break
+            chosen.setdefault(self.sample(rng), None)
+        return list(chosen)
+
+class SyntheticGraph:
+    """
+    합성 그래프 생성기
+    
+    사용 예:
+        graph = SyntheticGraph(SyntheticGraphConfig(seed=7).scaled(0.01))
+        graph.write_csv("/tmp/brain_import")
+        graph.load(driver, batch_size=5000, max_workers=8)
+    """
+    
+    def __init__(self, config: Optional[SyntheticGraphConfig] = None):
+        self.config = config or SyntheticGraphConfig()
+        c = self.config
+        self._span = timedelta(days=c.days)
+        self.developer_ids = [f"dev-{i:05d}" for i in range(c.developers)]
+        self.project_ids = [f"proj-{i:04d}" for i in range(c.projects)]
+        self.skill_ids = [f"skill-{i:04d}" for i in range(c.skills)]
+        self.concept_ids = [f"concept-{i:05d}" for i in range(c.concepts)]
+        
+        self._developers = self._sampler('developers', c.developers)
+        self._projects = self._sampler('projects', c.projects)
+        self._skills = self._sampler('skills', c.skills)
+        self._concepts = self._sampler('concepts', c.concepts)
+        # 파일은 섞지 않음: 순위 0 = 가장 최근 파일 (최근 파일일수록 자주 수정)
+        self._files = PowerLawSampler(c.files, c.skew)
+    
+    def _rng(self, stream: str) -> random.Random:
+        """엔티티 종류별 독립 난수 스트림 (다른 종류의 개수를 바꿔도 서로 영향 없음)"""
+        return random.Random(f"{self.config.seed}:{stream}")
+    
+    def _sampler(self, stream: str, size: int) -> PowerLawSampler:
+        order = list(range(size))
+        self._rng(f"{stream}:order").shuffle(order)
+        return PowerLawSampler(size, self.config.skew, order)
+    
+    def _timestamp(self, rng: random.Random, index: int, count: int) -> datetime:
+        """index번째 활동 시각: 기간을 count 구간으로 나눈 index번째 구간 안의 임의 시각"""
+        return self.config.start + self._span * ((index + rng.random()) / count)
+    
+    def _schedule(self, kind: str, count: int) -> Iterator[Tuple[int, int, datetime]]:
+        """활동 일정 (번호, 개발자 인덱스, 시각) - 개발자 카운터 집계와 본 생성이 같은 결과를 재생"""
+        rng = self._rng(f"{kind}:schedule")
+        for index in range(count):
+            yield index, self._developers.sample(rng), self._timestamp(rng, index, count)
+    
+    def developer_counters(self) -> List[Dict[str, Any]]:
+        """파이프라인이 관리하는 개발자 생산성 카운터를 활동 일정에서 미리 집계"""
+        c = self.config
+        counters = [
+            {'total_activities': 0, 'commits': 0, 'files_created': 0, 'tasks_completed': 0, 'last_activity': None}
+            for _ in range(c.developers)
+        ]
+        for kind, count, counter in (('commits', c.commits, 'commits'),
+                                     ('files', c.files, 'files_created'),
+                                     ('tasks', c.tasks, 'tasks_completed')):
+            for _, developer, timestamp in self._schedule(kind, count):
+                entry = counters[developer]
+                entry[counter] += 1
+                entry['total_activities'] += 1
+                if entry['last_activity'] is None or timestamp > entry['last_activity']:
+                    entry['last_activity'] = timestamp
+        return counters
+    
+    def records(self) -> Iterator[Tuple[str, str, Dict[str, Any]]]:
+        """
+        전체 그래프를 ('node', 라벨, 속성) / ('rel', 타입, {'from', 'to', 'properties'}) 순서로 생성
+        
+        관계는 항상 끝점 노드가 먼저 나온 뒤에 나옵니다.
+        """
+        yield from self._catalog()
+        yield from self._file_records()
+        yield from self._commit_records()
+        yield from self._task_records()
+        yield from self._insight_records()
+        yield from self._state_records()
+    
+    def _catalog(self):
+        """개발자/프로젝트/스킬/개념/성과 노드와 그 사이 관계"""
+        c = self.config
+        rng = self._rng('catalog')
+        start = c.start
+        
+        for index, counters in enumerate(self.developer_counters()):
+            yield 'node', 'Developer', {
+                'id': self.developer_ids[index],
+                'name': f"Developer {index:05d}",
+                'email': f"dev{index:05d}@example.com",
+                'level': rng.choice(_LEVELS),
+                'joinDate': start - timedelta(days=rng.randrange(1, 1500)),
+                'synthetic': True,
+                **counters,
+            }
+        for index, project_id in enumerate(self.project_ids):
+            yield 'node', 'Project', {
+                'id': project_id,
+                'name': f"Project {index:04d}",
+                'description': f"합성 프로젝트 {index}",
+                'status': rng.choice(['Active', 'Active', 'Maintenance', 'Archived']),
+                'startDate': start + self._span * rng.random() * 0.5,
+                'techStack': rng.sample(_SKILL_CATEGORIES, 2),
+            }
+        for index, skill_id in enumerate(self.skill_ids):
+            yield 'node', 'Skill', {
+                'id': skill_id,
+                'name': f"Skill {index:04d}",
+                'category': rng.choice(_SKILL_CATEGORIES),
+            }
+        for index, concept_id in enumerate(self.concept_ids):
+            yield 'node', 'Concept', {
+                'id': concept_id,
+                'name': f"Concept {index:05d}",
+                'category': rng.choice(_CONCEPT_CATEGORIES),
+                'difficulty': rng.choice(_DIFFICULTIES),
+            }
+        for index in range(c.achievements):
+            yield 'node', 'Achievement', {
+                'id': f"achievement-{index:05d}",
+                'name': f"Achievement {index:05d}",
+                'category': rng.choice(_INSIGHT_CATEGORIES),
+                'priority': rng.choice(['Low', 'Medium', 'High', 'Critical']),
+                'completion_date': self._timestamp(rng, index, c.achievements),
+            }
+        
+        for developer_id in self.developer_ids:
+            # 참여 프로젝트/보유 스킬/학습 개념 수는 파레토 분포 (소수 개발자가 많이 보유)
+            for project in self._projects.sample_many(rng, min(c.projects, int(rng.paretovariate(2.0)))):
+                yield 'rel', 'WORKS_ON', self._rel(developer_id, self.project_ids[project], {
+                    'role': rng.choice(['Contributor', 'Maintainer', 'Lead']),
+                    'contribution': rng.randint(1, 100),
+                })
+            for skill in self._skills.sample_many(rng, min(c.skills, 1 + int(rng.paretovariate(1.5) * 2))):
+                yield 'rel', 'HAS_SKILL', self._rel(developer_id, self.skill_ids[skill], {
+                    'level': rng.choice(_LEVELS),
+                    'proficiency': rng.randint(10, 100),
+                })
+            for concept in self._concepts.sample_many(rng, min(c.concepts, int(rng.paretovariate(1.2) * 3))):
+                yield 'rel', 'LEARNED', self._rel(developer_id, self.concept_ids[concept], {
+                    'learned_date': start + self._span * rng.random(),
+                    'mastery_level': rng.randint(10, 100),
+                    'time_spent': rng.randint(1, 80),
+                })
+        for skill_id in self.skill_ids:
+            for concept in self._concepts.sample_many(rng, rng.randint(1, 3)):
+                yield 'rel', 'REQUIRES', self._rel(skill_id, self.concept_ids[concept], {})
+        for index in range(1, c.concepts):
+            if rng.random() < 0.5:
+                yield 'rel', 'PREREQUISITE_OF', self._rel(self.concept_ids[rng.randrange(index)],
+                                                          self.concept_ids[index], {})
+        for index in range(c.achievements):
+            achievement_id = f"achievement-{index:05d}"
+            yield 'rel', 'ACHIEVED', self._rel(self.developer_ids[self._developers.sample(rng)], achievement_id, {
+                'impact': rng.choice(['Low', 'Medium', 'High', 'Critical']),
+            })
+            yield 'rel', 'PART_OF', self._rel(achievement_id, self.project_ids[self._projects.sample(rng)], {})
+    
+    def _file_records(self):
+        """File 노드 (+ CREATED, CONTAINS)"""
+        c = self.config
+        rng = self._rng('files:attributes')
+        for index, developer, created in self._schedule('files', c.files):
+            extension = rng.choice(_EXTENSIONS)
+            project_id = self.project_ids[self._projects.sample(rng)]
+            path = f"{project_id}/src/module_{index % 997:03d}/file_{index:08d}.{extension}"
+            yield 'node', 'File', {
+                'path': path,
+                'name': f"file_{index:08d}.{extension}",
+                'extension': extension,
+                'size': int(rng.lognormvariate(8, 1.2)),
+                'created': created,
+                'complexity': rng.choice(['low', 'medium', 'high']),
+                'activity_at': created,
+            }
+            yield 'rel', 'CREATED', self._rel(self.developer_ids[developer], path, {'timestamp': created})
+            yield 'rel', 'CONTAINS', self._rel(project_id, path, {})
+    
+    def _commit_records(self):
+        """Commit 노드 (+ AUTHORED, MODIFIES, IMPLEMENTS, 개발자별 FOLLOWS 체인)"""
+        c = self.config
+        rng = self._rng('commits:attributes')
+        paths = self._collect_file_paths()
+        last_commit: Dict[int, str] = {}
+        
+        for index, developer, timestamp in self._schedule('commits', c.commits):
+            commit_hash = f"{rng.getrandbits(160):040x}"
+            author = self.developer_ids[developer]
+            # 커밋 시점까지 생성된 파일 중 최근 파일 위주로 수정
+            available = max(1, min(c.files, int(c.files * (timestamp - c.start) / self._span) + 1))
+            touched = {available - 1 - self._files.sample(rng, available)
+                       for _ in range(min(available, 1 + int(rng.paretovariate(1.8))))}
+            lines_added = int(rng.paretovariate(1.3) * 5)
+            
+            yield 'node', 'Commit', {
+                'hash': commit_hash,
+                'message': f"{rng.choice(_COMMIT_VERBS)} module_{rng.randrange(997):03d}",
+                'author': author,
+                'timestamp': timestamp,
+                'files_changed': len(touched),
+                'lines_added': lines_added,
+                'lines_deleted': int(lines_added * rng.random()),
+                'activity_type': 'development',
+                'activity_at': timestamp,
+            }
+            yield 'rel', 'AUTHORED', self._rel(author, commit_hash, {'timestamp': timestamp})
+            for file_index in sorted(touched):
+                yield 'rel', 'MODIFIES', self._rel(commit_hash, paths[file_index], {})
+            if rng.random() < 0.1:
+                concept_id = self.concept_ids[self._concepts.sample(rng)]
+                yield 'rel', 'IMPLEMENTS', self._rel(commit_hash, concept_id, {})
+            if developer in last_commit:
+                yield 'rel', 'FOLLOWS', self._rel(commit_hash, last_commit[developer], {})
+            last_commit[developer] = commit_hash
+    
+    def _collect_file_paths(self) -> List[str]:
+        """파일 경로 목록 (파일 스트림을 다시 재생해 커밋이 같은 경로를 참조)"""
+        return [row['path'] for kind, label, row in self._file_records() if kind == 'node']
+    
+    def _task_records(self):
+        """Task 노드 (+ COMPLETED)"""
+        c = self.config
+        rng = self._rng('tasks:attributes')
+        for index, developer, completed in self._schedule('tasks', c.tasks):
+            task_id = f"task-{index:08d}"
+            complexity = rng.randint(1, 10)
+            yield 'node', 'Task', {
+                'id': task_id,
+                'name': f"Task {index:08d}",
+                'description': f"합성 작업 {index}",
+                'status': 'completed',
+                'completion_date': completed,
+                'duration': round(rng.lognormvariate(1.0, 0.8), 2),
+                'complexity': complexity,
+                'activity_at': completed,
+            }
+            yield 'rel', 'COMPLETED', self._rel(self.developer_ids[developer], task_id, {
+                'completion_date': completed,
+                'effort': complexity,
+            })
+    
+    def _insight_records(self):
+        """Insight 노드 (+ RELATES_TO 개념)"""
+        c = self.config
+        rng = self._rng('insights')
+        for index in range(c.insights):
+            insight_id = f"insight-{index:08d}"
+            yield 'node', 'Insight', {
+                'id': insight_id,
+                'title': f"Insight {index:08d}",
+                'description': f"합성 인사이트 {index}",
+                'category': rng.choice(_INSIGHT_CATEGORIES),
+                'confidence': round(rng.uniform(0.3, 1.0), 3),
+                'generated': self._timestamp(rng, index, c.insights),
+                'source': 'synthetic',
+            }
+            for concept in self._concepts.sample_many(rng, min(c.concepts, rng.randint(1, 4))):
+                yield 'rel', 'RELATES_TO', self._rel(insight_id, self.concept_ids[concept], {
+                    'strength': rng.randint(1, 10),
+                })
+    
+    def _state_records(self):
+        """KnowledgeState 스냅샷 (+ HAS_STATE, 시간순 TRANSITIONS_TO)"""
+        c = self.config
+        rng = self._rng('knowledge_states')
+        for developer_id in self.developer_ids:
+            competency = rng.uniform(0.1, 0.5)
+            previous = None
+            for index in range(c.states_per_developer):
+                state_id = f"ks-{developer_id}-{index:03d}"
+                timestamp = self._timestamp(rng, index, c.states_per_developer)
+                competency = min(1.0, competency + rng.uniform(-0.02, 0.05))
+                yield 'node', 'KnowledgeState', {
+                    'id': state_id,
+                    'developerId': developer_id,
+                    'timestamp': timestamp,
+                    'overallCompetency': round(competency, 4),
+                    'learningMomentum': round(rng.uniform(-1.0, 1.0), 4),
+                    'knowledgeGaps': [self.concept_ids[i] for i in self._concepts.sample_many(rng, 3)],
+                    'confidenceLevel': round(rng.uniform(0.5, 1.0), 3),
+                }
+                yield 'rel', 'HAS_STATE', self._rel(developer_id, state_id, {'created_at': timestamp})
+                if previous:
+                    yield 'rel', 'TRANSITIONS_TO', self._rel(previous, state_id, {
+                        'trigger': rng.choice(_TRIGGERS),
+                        'probability': round(rng.random(), 3),
+                    })
+                previous = state_id
+    
+    @staticmethod
+    def _rel(start, end, properties: Dict[str, Any]) -> Dict[str, Any]:
+        return {'from': start, 'to': end, 'properties': properties}
+    
+    def write_csv(self, directory) -> Dict[str, Any]:
+        """
+        neo4j-admin database import용 CSV 생성
+        
+        nodes/<라벨>.csv, relationships/<타입>.csv와 가져오기 명령(import.sh)을 만듭니다.
+        헤더 타입은 모든 행을 보고 정해야 하므로 레코드를 두 번 생성합니다 (1차: 열 타입, 2차: 기록).
+        스트림별 seed가 고정이라 두 번 모두 같은 행이 나오고, 메모리는 행 수와 무관합니다.
+        
+        Returns:
+            {'nodes': {라벨: 행 수}, 'relationships': {타입: 행 수}, 'command', 'elapsed'}
+        """
+        started = time.perf_counter()
+        os.makedirs(os.path.join(directory, 'nodes'), exist_ok=True)
+        os.makedirs(os.path.join(directory, 'relationships'), exist_ok=True)
+        
+        # 첫 행만 보면 None(활동 없는 개발자의 last_activity 등)이 string으로 굳으므로 전체 행으로 타입 결정
+        column_types: Dict[Tuple[str, str], 'OrderedDict[str, str]'] = {}
+        for kind, name, row in self.records():
+            types = column_types.setdefault((kind, name), OrderedDict())
+            if kind == 'node':
+                add_column_types(types, row, exclude=NODE_SPECS[name][0])
+            else:
+                add_column_types(types, row['properties'])
+        
+        writers: Dict[Tuple[str, str], _CsvFile] = {}
+        try:
+            for kind, name, row in self.records():
+                target = writers.get((kind, name))
+                if target is None:
+                    target = writers[(kind, name)] = _CsvFile.open(directory, kind, name,
+                                                                   list(column_types[(kind, name)].items()))
+                target.write(row)
+        finally:
+            for target in writers.values():
+                target.close()
+        
+        node_files, relationship_files = [], []
+        for (kind, name), target in writers.items():
+            relative = os.path.relpath(target.path, directory)
+            if kind == 'node':
+                node_files.append((":".join((name,) + NODE_SPECS[name][1]), relative))
+            else:
+                relationship_files.append((name, relative))
+        command = write_import_script(directory, node_files, relationship_files)
+        
+        summary = {
+            'nodes': {name: t.rows for (kind, name), t in writers.items() if kind == 'node'},
+            'relationships': {name: t.rows for (kind, name), t in writers.items() if kind == 'rel'},
+            'command': command,
+            'elapsed': time.perf_counter() - started,
+        }
+        logger.info(f"✅ CSV 생성 완료: 노드 {sum(summary['nodes'].values()):,}개, "
+                    f"관계 {sum(summary['relationships'].values()):,}개 ({summary['elapsed']:.1f}초) → {directory}")
+        return summary
+    
+    def load(self, driver, batch_size: int = DEFAULT_BATCH_SIZE, max_workers: int = 8,
+             migrate: bool = True) -> Dict[str, Any]:
+        """
+        매니페스트 UNWIND 단계로 직접 적재
+        
+        batch_size * max_workers 행마다 한 번씩 SeedPlan을 실행합니다
+        (노드 청크는 병렬, 관계는 타입별 체인으로 병렬).
+        
+        Returns:
+            {'success', 'nodes', 'relationships', 'windows', 'elapsed'}
+        """
+        started = time.perf_counter()
+        if migrate:
+            # 키 제약조건이 없으면 MERGE가 라벨 전체 스캔이 됨
+            SchemaMigrator(driver).migrate()
+        
+        window_rows = batch_size * max_workers
+        totals = {'node': 0, 'rel': 0}
+        windows = 0
+        pending: Dict[Tuple[str, str], List[Dict[str, Any]]] = {}
+        buffered = 0
+        
+        def flush() -> bool:
+            nonlocal windows, buffered
+            manifest = {'nodes': [], 'relationships': []}
+            for (kind, name), rows in pending.items():
+                if kind == 'node':
+                    key, labels = NODE_SPECS[name]
+                    manifest['nodes'].append({'label': name, 'key': key, 'labels': list(labels), 'rows': rows})
+                else:
+                    start_label, end_label = REL_SPECS[name]
+                    manifest['relationships'].append({
+                        'type': name,
+                        'from': {'label': start_label, 'key': NODE_SPECS[start_label][0]},
+                        'to': {'label': end_label, 'key': NODE_SPECS[end_label][0]},
+                        'rows': rows,
+                    })
+                totals[kind] += len(rows)
+            
+            result = SeedPlan(compile_manifest(manifest, batch_size=batch_size, prefix=f"w{windows}:")) \
+                .execute(driver, max_workers=max_workers)
+            windows += 1
+            pending.clear()
+            buffered = 0
+            logger.info(f"  📦 윈도우 {windows}: 누적 노드 {totals['node']:,}개, 관계 {totals['rel']:,}개 "
+                        f"({time.perf_counter() - started:.1f}초)")
+            return result['success']
+        
+        success = True
+        for kind, name, row in self.records():
+            pending.setdefault((kind, name), []).append(row)
+            buffered += 1
+            if buffered >= window_rows:
+                success = flush()
+                if not success:
+                    break
+        if success and pending:
+            success = flush()
+        
+        summary = {
+            'success': success,
+            'nodes': totals['node'],
+            'relationships': totals['rel'],
+            'windows': windows,
+            'elapsed': time.perf_counter() - started,
+        }
+        if success:
+            logger.info(f"✅ 합성 그래프 적재 완료: 노드 {summary['nodes']:,}개, "
+                        f"관계 {summary['relationships']:,}개 ({summary['elapsed']:.1f}초)")
+        else:
+            logger.error(f"❌ 합성 그래프 적재 중단 (윈도우 {windows})")
+        return summary
+
+class _CsvFile:
+    """라벨/관계 타입별 CSV 파일 (전체 행으로 계산한 열 타입으로 헤더 작성)"""
+    
+    def __init__(self, path: str, columns: List[Tuple[str, str]], kind: str, key: Optional[str] = None):
+        self.path = path
+        self.columns = columns
+        self.kind = kind
+        self.key = key
+        self.rows = 0
+        self._file = open(path, 'w', encoding='utf-8', newline='')
+        self._writer = csv.writer(self._file)
+    
+    @classmethod
+    def open(cls, directory: str, kind: str, name: str, columns: List[Tuple[str, str]]) -> '_CsvFile':
+        if kind == 'node':
+            key = NODE_SPECS[name][0]
+            path = os.path.join(directory, 'nodes', f"{name}.csv")
+            header = [f"{key}:ID({name})"]
+        else:
+            start_label, end_label = REL_SPECS[name]
+            path = os.path.join(directory, 'relationships', f"{name}.csv")
+            header = [f":START_ID({start_label})", f":END_ID({end_label})"]
+        
+        target = cls(path, columns, kind, key=NODE_SPECS[name][0] if kind == 'node' else None)
+        target._writer.writerow(header + [f"{column}:{type_name}" for column, type_name in columns])
+        return target
+    
+    def write(self, row: Dict[str, Any]):
+        if self.kind == 'node':
+            values, leading = row, [row[self.key]]
+        else:
+            values, leading = row['properties'], [row['from'], row['to']]
+        self._writer.writerow(leading + [csv_value(values.get(column)) for column, _ in self.columns])
+        self.rows += 1
+    
+    def close(self):
+        self._file.close()
+
+def main():
+    """합성 그래프 생성 (CSV 또는 직접 적재)"""
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    
+    defaults = SyntheticGraphConfig()
+    parser = argparse.ArgumentParser(description="대규모 합성 지식 그래프 생성기")
+    parser.add_argument("--scale", type=float, default=1.0, help="기본 규모 배율 (예: 0.01 = 커밋 2만 개)")
+    parser.add_argument("--seed", type=int, default=defaults.seed, help="난수 seed (같은 seed = 같은 그래프)")
+    parser.add_argument("--skew", type=float, default=defaults.skew, help="Zipf 지수 (클수록 허브 집중)")
+    parser.add_argument("--days", type=int, default=defaults.days, help="활동 기간 (일)")
+    for name in ('developers', 'projects', 'concepts', 'files', 'commits', 'tasks', 'insights'):
+        parser.add_argument(f"--{name}", type=int, help=f"{name} 수 (--scale 적용 후 덮어씀)")
+    parser.add_argument("--csv-dir", help="neo4j-admin import용 CSV 출력 디렉터리")
+    parser.add_argument("--load", action="store_true", help="Neo4j에 직접 적재")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE, help="UNWIND 문장당 행 수")
+    parser.add_argument("--max-workers", type=int, default=8, help="동시 세션 수")
+    parser.add_argument("--uri", default=os.getenv('NEO4J_URI', "neo4j+s://3e875bd7.databases.neo4j.io"))
+    parser.add_argument("--username", default=os.getenv('NEO4J_USERNAME', "neo4j"))
+    args = parser.parse_args()
+    
+    config = replace(defaults, seed=args.seed, skew=args.skew, days=args.days).scaled(args.scale)
+    overrides = {name: getattr(args, name) for name in ('developers', 'projects', 'concepts', 'files',
+                                                        'commits', 'tasks', 'insights')
+                 if getattr(args, name) is not None}
+    config = replace(config, **overrides)
+    graph = SyntheticGraph(config)
+    
+    logger.info(f"🧪 합성 그래프 (seed={config.seed}, skew={config.skew}):")
+    for label, count in config.node_counts().items():
+        logger.info(f"  {label}: {count:,}개")
+    
+    if args.csv_dir:
+        graph.write_csv(args.csv_dir)
+    
+    if args.load:
+        from neo4j import GraphDatabase
+        
+        password = os.getenv('NEO4J_PASSWORD')
+        if not password:
+            logger.error("❌ NEO4J_PASSWORD 환경변수가 설정되지 않았습니다.")
+            return False
+        
+        driver = GraphDatabase.driver(args.uri, auth=(args.username, password))
+        try:
+            return graph.load(driver, batch_size=args.batch_size, max_workers=args.max_workers)['success']
+        finally:
+            driver.close()
+    
+    return True
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
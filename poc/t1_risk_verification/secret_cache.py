@@ -0,0 +1,271 @@
+#!/usr/bin/env python3
+"""
+Secret Cache for T1 Risk Verification PoC
+TTL cache in front of a secret provider (GCP Secret Manager or local env/files),
+with refresh-ahead before expiry and concurrent prefetch of declared secret sets.
+
+Environment:
+- SECRET_PROVIDER   : "gcp" (default) or "local"
+- SECRETS_DIR       : directory of <secret_id> files for the local provider (implies local)
+- SECRET_CACHE_TTL  : seconds a fetched value is served from cache (default 300)
+
+Local provider lookup for secret "maeum-log-v4-db-password":
+  1. env SECRET_MAEUM_LOG_V4_DB_PASSWORD
+  2. file $SECRETS_DIR/maeum-log-v4-db-password
+"""
+
+import os
+import re
+import time
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor, Future
+from typing import Dict, List, Optional, Iterable, Union
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TTL = 300.0
+
+# Fraction of the TTL left when a read triggers a background refresh
+REFRESH_AHEAD = 0.2
+
+class SecretNotFound(KeyError):
+    """The provider has no value for the requested secret."""
+
+class SecretProvider:
+    """
+    Interface for secret backends.
+    Implementations must be safe to call from several threads at once.
+    """
+    
+    name = "provider"
+    
+    def get(self, secret_id: str, version: str = "latest") -> str:
+        raise NotImplementedError
+    
+    def exists(self, secret_id: str) -> bool:
+        try:
+            self.get(secret_id)
+            return True
+        except SecretNotFound:
+            return False
+
+class GcpSecretProvider(SecretProvider):
+    """GCP Secret Manager backend (default application credentials)."""
+    
+    name = "gcp"
+    
+    def __init__(self, project_id: str, client=None):
+        self.project_id = project_id
+        if client is None:
+            from google.cloud import secretmanager
+            client = secretmanager.SecretManagerServiceClient()
+        self.client = client
+    
+    def get(self, secret_id: str, version: str = "latest") -> str:
+        name = f"projects/{self.project_id}/secrets/{secret_id}/versions/{version}"
+        response = self.client.access_secret_version(request={"name": name})
+        return response.payload.data.decode("UTF-8")
+    
+    def exists(self, secret_id: str) -> bool:
+        try:
+            self.client.get_secret(request={"name": f"projects/{self.project_id}/secrets/{secret_id}"})
+            return True
+        except Exception as e:
+            logger.warning(f"Secret does not exist or access denied: {secret_id} - {str(e)}")
+            return False
+
+class LocalSecretProvider(SecretProvider):
+    """Environment variables / files backend for local development and tests."""
+    
+    name = "local"
+    
+    def __init__(self, directory: Optional[str] = None, env_prefix: str = "SECRET_"):
+        self.directory = directory
+        self.env_prefix = env_prefix
+    
+    def env_name(self, secret_id: str) -> str:
+        return self.env_prefix + re.sub(r'[^0-9A-Za-z]', '_', secret_id).upper()
+    
+    def get(self, secret_id: str, version: str = "latest") -> str:
+        value = os.getenv(self.env_name(secret_id))
+        if value is not None:
+            return value
+        if self.directory:
+            path = os.path.join(self.directory, secret_id)
+            if os.path.isfile(path):
+                with open(path, encoding="utf-8") as f:
+                    return f.read().rstrip("\n")
+        raise SecretNotFound(secret_id)
+
+def provider_from_env(project_id: str) -> SecretProvider:
+    """Pick the provider from SECRET_PROVIDER / SECRETS_DIR."""
+    directory = os.getenv("SECRETS_DIR")
+    if os.getenv("SECRET_PROVIDER", "local" if directory else "gcp").lower() == "local":
+        return LocalSecretProvider(directory)
+    return GcpSecretProvider(project_id)
+
+class _Entry:
+    __slots__ = ("value", "fetched_at", "expires_at", "refreshing")
+    
+    def __init__(self, value: str, ttl: float):
+        self.value = value
+        self.fetched_at = time.monotonic()
+        self.expires_at = self.fetched_at + ttl
+        self.refreshing = False
+
+class SecretCache:
+    """
+    TTL cache in front of a SecretProvider.
+    
+    - Fresh values are served from memory.
+    - A read in the last REFRESH_AHEAD of the TTL returns the cached value and
+      refreshes it in the background; a failed refresh keeps the old value until expiry.
+    - Concurrent misses for the same secret share a single provider call.
+    - prefetch() / prefetch_declared() fetch several secrets in parallel.
+    
+    Usage:
+        cache = SecretCache(provider_from_env("iness-467105"))
+        cache.declare("auradb", ["maeum-log-v4-neo4j-auradb-api", "maeum-log-v4-neo4j-connection-info"])
+        values = cache.prefetch_declared("auradb")
+    """
+    
+    def __init__(self, provider: SecretProvider, ttl: Optional[float] = None,
+                 refresh_ahead: float = REFRESH_AHEAD, max_workers: int = 8):
+        self.provider = provider
+        self.ttl = float(os.getenv("SECRET_CACHE_TTL", DEFAULT_TTL)) if ttl is None else ttl
+        self.refresh_ahead = refresh_ahead
+        self.declared: Dict[str, List[str]] = {}
+        self.stats = {"hits": 0, "misses": 0, "refreshes": 0, "errors": 0}
+        self._entries: Dict[tuple, _Entry] = {}
+        self._inflight: Dict[tuple, Future] = {}
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="secret-cache")
+        self._refresher: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+    
+    def get(self, secret_id: str, version: str = "latest") -> str:
+        """Cached value, fetching from the provider on miss or expiry."""
+        key = (secret_id, version)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and now < entry.expires_at:
+                self.stats["hits"] += 1
+                if not entry.refreshing and now >= entry.expires_at - self.ttl * self.refresh_ahead:
+                    entry.refreshing = True
+                    self._executor.submit(self._refresh, key)
+                return entry.value
+            self.stats["misses"] += 1
+            future = self._inflight.get(key)
+            owner = future is None
+            if owner:
+                future = Future()
+                self._inflight[key] = future
+        if owner:
+            self._load(key, future)
+        return future.result()
+    
+    def prefetch(self, secret_ids: Iterable[str], version: str = "latest",
+                 raise_errors: bool = True) -> Dict[str, Union[str, Exception]]:
+        """Fetch several secrets concurrently -> {secret_id: value} (or exception if raise_errors=False)."""
+        secret_ids = list(dict.fromkeys(secret_ids))
+        futures = {secret_id: self._executor.submit(self.get, secret_id, version) for secret_id in secret_ids}
+        results: Dict[str, Union[str, Exception]] = {}
+        for secret_id, future in futures.items():
+            try:
+                results[secret_id] = future.result()
+            except Exception as e:
+                if raise_errors:
+                    raise
+                results[secret_id] = e
+        return results
+    
+    def exists_many(self, secret_ids: Iterable[str]) -> Dict[str, bool]:
+        """Existence check for several secrets concurrently (input order preserved)."""
+        secret_ids = list(secret_ids)
+        futures = [self._executor.submit(self.provider.exists, secret_id) for secret_id in secret_ids]
+        return {secret_id: future.result() for secret_id, future in zip(secret_ids, futures)}
+    
+    def declare(self, name: str, secret_ids: Iterable[str]):
+        """Register a named secret set used together (e.g. one connector's credentials)."""
+        self.declared[name] = list(secret_ids)
+    
+    def prefetch_declared(self, *names: str, raise_errors: bool = True) -> Dict[str, Union[str, Exception]]:
+        """Prefetch the given declared sets (all sets if none given) in one parallel round."""
+        secret_ids = [secret_id for name in (names or self.declared) for secret_id in self.declared[name]]
+        return self.prefetch(secret_ids, raise_errors=raise_errors)
+    
+    def invalidate(self, secret_id: Optional[str] = None):
+        """Drop one secret (all versions) or the whole cache, e.g. after a rotation."""
+        with self._lock:
+            if secret_id is None:
+                self._entries.clear()
+            else:
+                for key in [key for key in self._entries if key[0] == secret_id]:
+                    del self._entries[key]
+    
+    def start_background_refresh(self, interval: Optional[float] = None):
+        """Keep cached secrets warm: refresh entries entering the refresh-ahead window without a read."""
+        if self._refresher is not None:
+            return
+        interval = interval or max(1.0, self.ttl * self.refresh_ahead / 2)
+        
+        def loop():
+            while not self._stop.wait(interval):
+                now = time.monotonic()
+                with self._lock:
+                    due = [key for key, entry in self._entries.items()
+                           if not entry.refreshing and now >= entry.expires_at - self.ttl * self.refresh_ahead]
+                    for key in due:
+                        self._entries[key].refreshing = True
+                for key in due:
+                    self._executor.submit(self._refresh, key)
+        
+        self._refresher = threading.Thread(target=loop, name="secret-cache-refresher", daemon=True)
+        self._refresher.start()
+    
+    def close(self):
+        self._stop.set()
+        self._executor.shutdown(wait=False)
+    
+    def _load(self, key: tuple, future: Future):
+        try:
+            value = self.provider.get(*key)
+        except Exception as e:
+            with self._lock:
+                self.stats["errors"] += 1
+                self._inflight.pop(key, None)
+            future.set_exception(e)
+            return
+        with self._lock:
+            self._entries[key] = _Entry(value, self.ttl)
+            self._inflight.pop(key, None)
+        future.set_result(value)
+    
+    def _refresh(self, key: tuple):
+        try:
+            value = self.provider.get(*key)
+        except Exception as e:
+            logger.warning(f"Background refresh failed for secret {key[0]}, serving cached value: {str(e)}")
+            with self._lock:
+                self.stats["errors"] += 1
+                entry = self._entries.get(key)
+                if entry is not None:
+                    entry.refreshing = False
+            return
+        with self._lock:
+            self._entries[key] = _Entry(value, self.ttl)
+            self.stats["refreshes"] += 1
+
+_shared: Dict[str, SecretCache] = {}
+_shared_lock = threading.Lock()
+
+def shared_cache(project_id: str) -> SecretCache:
+    """Process-wide cache per project, so every connector in a worker shares fetched secrets."""
+    with _shared_lock:
+        cache = _shared.get(project_id)
+        if cache is None:
+            cache = SecretCache(provider_from_env(project_id))
+            _shared[project_id] = cache
+        return cache
@@ -7,26 +7,30 @@ using service account authentication without exposing credentials.
 
 import os
 import sys
-from google.cloud import secretmanager
 from google.auth import default
 import json
 import logging
 
+from secret_cache import SecretCache, shared_cache
+
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
 class SecretRetriever:
-    def __init__(self, project_id: str):
+    def __init__(self, project_id: str, cache: SecretCache = None):
         """
         Initialize SecretRetriever with project ID.
-        Uses default GCP authentication (service account in Cloud Shell/GCE).
+        Uses default GCP authentication (service account in Cloud Shell/GCE),
+        or the local env/file provider when SECRET_PROVIDER=local (see secret_cache.py).
+        Fetched values are cached with a TTL and shared across retrievers of the same project.
         """
         self.project_id = project_id
-        self.client = secretmanager.SecretManagerServiceClient()
+        self.cache = cache or shared_cache(project_id)
+        self.client = getattr(self.cache.provider, "client", None)
         
     def get_secret(self, secret_id: str, version: str = "latest") -> str:
         """
-        Retrieve a secret from GCP Secret Manager.
+        Retrieve a secret from GCP Secret Manager (served from cache while fresh).
         
         Args:
             secret_id: The ID of the secret
@@ -39,11 +43,9 @@ class SecretRetriever:
             Exception: If secret retrieval fails
         """
         try:
-            name = f"projects/{self.project_id}/secrets/{secret_id}/versions/{version}"
             logger.info(f"Retrieving secret: {secret_id}")
             
-            response = self.client.access_secret_version(request={"name": name})
-            secret_value = response.payload.data.decode("UTF-8")
+            secret_value = self.cache.get(secret_id, version)
             
             logger.info(f"Successfully retrieved secret: {secret_id}")
             return secret_value
@@ -51,10 +53,10 @@ class SecretRetriever:
         except Exception as e:
             logger.error(f"Failed to retrieve secret {secret_id}: {str(e)}")
             raise
-
+    
     def verify_secrets_exist(self, secret_ids: list) -> dict:
         """
-        Verify that specified secrets exist in Secret Manager.
+        Verify that specified secrets exist in Secret Manager (checked concurrently).
         
         Args:
             secret_ids: List of secret IDs to verify
@@ -62,17 +64,13 @@ class SecretRetriever:
         Returns:
             Dictionary with secret_id as key and boolean existence as value
         """
-        results = {}
+        results = self.cache.exists_many(secret_ids)
         
-        for secret_id in secret_ids:
-            try:
-                name = f"projects/{self.project_id}/secrets/{secret_id}"
-                self.client.get_secret(request={"name": name})
-                results[secret_id] = True
+        for secret_id, exists in results.items():
+            if exists:
                 logger.info(f"Secret exists: {secret_id}")
-            except Exception as e:
-                results[secret_id] = False
-                logger.warning(f"Secret does not exist or access denied: {secret_id} - {str(e)}")
+            else:
+                logger.warning(f"Secret does not exist or access denied: {secret_id}")
                 
         return results
 
@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+"""
+질의 기록기 (Query Recorder)
+지식 엔진이 실행한 Cypher를 질문/파라미터/결과 크기/소요 시간/결과 다이제스트와 함께 로컬 로그에 기록
+
+주요 기능:
+- QUERY_RECORD_FILE 환경변수로 켜는 선택 기능 (기본 꺼짐, 끄면 비용 없음)
+- JSON Lines 로그, 같은 Cypher 본문은 파일당 한 번만 기록하고 이후엔 해시로 참조 (.gz 경로면 gzip)
+- 결과 다이제스트: ORDER BY가 없으면 행 순서와 무관하게 계산 → 재실행 결과 비교에 사용
+- QUERY_RECORD_SAMPLE 로 표본 비율 지정 (0~1)
+
+재실행(replay)은 benchmarks/query_replay.py 참고
+"""
+
+import os
+import re
+import sys
+import json
+import gzip
+import time
+import atexit
+import random
+import hashlib
+import logging
+import argparse
+import threading
+import unicodedata
+from datetime import datetime, date
+from typing import Dict, List, Any, Optional, Iterator, Tuple
+
+logger = logging.getLogger(__name__)
+
+# 이 개수만큼 기록이 쌓이면 파일에 flush
+FLUSH_EVERY = 50
+
+def normalize_question(question: Optional[str]) -> Optional[str]:
+    """공백/유니코드 정규화 (같은 질문이 다른 표기로 기록되지 않도록)"""
+    if question is None:
+        return None
+    return re.sub(r'\s+', ' ', unicodedata.normalize('NFC', question)).strip()
+
+def query_id(cypher: str) -> str:
+    """Cypher 본문 식별자 (들여쓰기/공백 차이 무시)"""
+    return hashlib.sha1(re.sub(r'\s+', ' ', cypher).strip().encode('utf-8')).hexdigest()[:12]
+
+def encode_value(value: Any) -> Any:
+    """파라미터/결과 값을 JSON으로 (시간 값은 query_corpus.json과 같은 {"$datetime": ...} 형식)"""
+    if isinstance(value, (str, int, float, bool)) or value is None:
+        return value
+    if isinstance(value, dict):
+        return {str(key): encode_value(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [encode_value(item) for item in value]
+    iso_format = getattr(value, 'iso_format', None)
+    if callable(iso_format):
+        kind = type(value).__name__
+        return {'$datetime' if kind == 'DateTime' else f"${kind.lower()}": iso_format()}
+    if isinstance(value, datetime):
+        return {'$datetime': value.isoformat()}
+    if isinstance(value, date):
+        return {'$date': value.isoformat()}
+    return str(value)
+
+def decode_value(value: Any) -> Any:
+    """encode_value의 역변환 (재실행 파라미터용)"""
+    if isinstance(value, list):
+        return [decode_value(item) for item in value]
+    if isinstance(value, dict):
+        if len(value) == 1:
+            (key, text), = value.items()
+            if key == '$datetime':
+                return datetime.fromisoformat(_trim_fraction(text).replace('Z', '+00:00'))
+            if key == '$date':
+                return date.fromisoformat(text)
+        return {key: decode_value(item) for key, item in value.items()}
+    return value
+
+def _trim_fraction(text: str) -> str:
+    # neo4j.time의 나노초 자리는 파이썬 datetime이 읽을 수 없음
+    return re.sub(r'(\.\d{6})\d+', r'\1', text)
+
+def result_digest(rows: List[Dict[str, Any]], ordered: bool = True) -> str:
+    """결과 행 다이제스트 (ordered=False면 행 순서 무시)"""
+    lines = [json.dumps(encode_value(row), sort_keys=True, ensure_ascii=False) for row in rows]
+    if not ordered:
+        lines.sort()
+    digest = hashlib.sha1()
+    for line in lines:
+        digest.update(line.encode('utf-8'))
+        digest.update(b'\n')
+    return digest.hexdigest()[:16]
+
+def is_ordered(cypher: str) -> bool:
+    """결과 순서가 의미 있는 쿼리인지 (마지막 RETURN에 ORDER BY가 있는지)"""
+    tail = cypher.upper().rsplit('RETURN', 1)[-1]
+    return 'ORDER BY' in tail
+
+def _open(path: str, mode: str):
+    if path.endswith('.gz'):
+        return gzip.open(path, mode + 't', encoding='utf-8')
+    return open(path, mode, encoding='utf-8')
+
+class QueryRecorder:
+    """
+    실행된 질의를 로그 파일에 추가 기록 (스레드 안전)
+    
+    사용 예:
+        recorder = QueryRecorder("/var/log/mindlog/queries.jsonl.gz")
+        recorder.record(cypher, rows=records, elapsed=0.012, question="전체 개발자는 몇 명인가?")
+    """
+    
+    def __init__(self, path: str, sample_rate: float = 1.0):
+        self.path = path
+        self.sample_rate = sample_rate
+        self.recorded = 0
+        self._known: set = set()
+        self._pending = 0
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._file = _open(path, 'a')
+        atexit.register(self.close)
+    
+    def record(self, cypher: str, rows: List[Dict[str, Any]], elapsed: float,
+               question: Optional[str] = None, parameters: Optional[Dict[str, Any]] = None,
+               source: str = 'db', error: Optional[str] = None):
+        """질의 한 건 기록 (elapsed: 초)"""
+        if self.sample_rate < 1.0 and random.random() >= self.sample_rate:
+            return
+        qid = query_id(cypher)
+        entry = {
+            'kind': 'call',
+            't': round(time.time(), 6),
+            'q': qid,
+            'question': normalize_question(question),
+            'params': encode_value(parameters or {}),
+            'rows': len(rows),
+            'ms': round(elapsed * 1000, 3),
+            'digest': result_digest(rows, is_ordered(cypher)),
+            'source': source,
+        }
+        if error:
+            entry['error'] = error
+        with self._lock:
+            if self._file is None:
+                return
+            if qid not in self._known:
+                self._known.add(qid)
+                self._file.write(json.dumps({'kind': 'query', 'q': qid, 'cypher': cypher}, ensure_ascii=False) + '\n')
+            self._file.write(json.dumps(entry, ensure_ascii=False, separators=(',', ':')) + '\n')
+            self.recorded += 1
+            self._pending += 1
+            if self._pending >= FLUSH_EVERY:
+                self._file.flush()
+                self._pending = 0
+    
+    def flush(self):
+        with self._lock:
+            if self._file is not None:
+                self._file.flush()
+                self._pending = 0
+    
+    def close(self):
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+def recorder_from_env() -> Optional[QueryRecorder]:
+    """QUERY_RECORD_FILE가 설정되어 있으면 기록기 생성"""
+    path = os.getenv('QUERY_RECORD_FILE')
+    if not path:
+        return None
+    sample_rate = float(os.getenv('QUERY_RECORD_SAMPLE', '1.0'))
+    logger.info(f"📼 질의 기록 사용: {path} (표본 비율 {sample_rate:.0%})")
+    return QueryRecorder(path, sample_rate=sample_rate)
+
+def read_log(path: str) -> Tuple[Dict[str, str], List[Dict[str, Any]]]:
+    """로그 읽기 → ({질의 id: Cypher}, [호출 기록 (t 순)])"""
+    queries: Dict[str, str] = {}
+    calls: List[Dict[str, Any]] = []
+    with _open(path, 'r') as f:
+        number = 0
+        try:
+            for number, line in enumerate(f, 1):
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    # 기록 도중 종료된 마지막 줄
+                    logger.warning(f"⚠️  {path}:{number} 읽을 수 없는 줄 건너뜀")
+                    continue
+                if entry.get('kind') == 'query':
+                    queries[entry['q']] = entry['cypher']
+                else:
+                    calls.append(entry)
+        except (EOFError, gzip.BadGzipFile) as e:
+            # atexit 없이 죽은 프로세스(SIGKILL/OOM)의 .gz 로그는 gzip 끝 표시가 없음 - 읽은 데까지 사용
+            logger.warning(f"⚠️  {path}: {number}번째 줄 이후 압축 스트림이 잘림, 읽은 기록만 사용 ({e})")
+    calls.sort(key=lambda entry: entry['t'])
+    return queries, calls
+
+def iter_calls(path: str) -> Iterator[Tuple[str, Dict[str, Any]]]:
+    """(Cypher, 호출 기록) 순회"""
+    queries, calls = read_log(path)
+    for call in calls:
+        yield queries.get(call['q'], ''), call
+
+def main():
+    """기록 요약 (질의별 호출 수 / 평균 시간 / 평균 행 수)"""
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    
+    parser = argparse.ArgumentParser(description="질의 기록 요약")
+    parser.add_argument("log", help="QUERY_RECORD_FILE로 기록한 로그")
+    parser.add_argument("--top", type=int, default=10)
+    args = parser.parse_args()
+    
+    queries, calls = read_log(args.log)
+    if not calls:
+        logger.info("기록된 질의가 없습니다.")
+        return True
+    
+    groups: Dict[str, List[Dict[str, Any]]] = {}
+    for call in calls:
+        groups.setdefault(call['q'], []).append(call)
+    
+    span = calls[-1]['t'] - calls[0]['t']
+    logger.info(f"📼 호출 {len(calls)}건, 질의 {len(groups)}종, 기간 {span:.0f}초")
+    for qid, group in sorted(groups.items(), key=lambda item: -sum(call['ms'] for call in item[1]))[:args.top]:
+        total = sum(call['ms'] for call in group)
+        rows = sum(call['rows'] for call in group) / len(group)
+        first_line = re.sub(r'\s+', ' ', queries.get(qid, '?')).strip()[:70]
+        logger.info(f"  {qid} {len(group):>5}회  합계 {total:>9.1f}ms  평균 {total / len(group):>7.2f}ms  "
+                    f"평균 {rows:.1f}행  {first_line}")
+    return True
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
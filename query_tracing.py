@@ -0,0 +1,345 @@
+#!/usr/bin/env python3
+"""
+질의 추적 (Query Tracing)
+자연어 질의 처리 단계(분석 → Cypher 생성 → 실행 → 포맷팅)를 가벼운 span으로 감싸 시간을 기록
+
+주요 기능:
+- Tracer.span(): 중첩 가능한 span (contextvars로 현재 span 추적, 요청/스레드별로 분리)
+- span마다 벽시계(perf_counter)/CPU(thread_time) 시간과 속성(행 수, 캐시 결과, DB 서버 시간 등)
+- 내보내기(선택): QUERY_TRACE_FILE → 로컬 JSON Lines, OTEL_EXPORTER_OTLP_ENDPOINT → OTLP/HTTP(JSON) 수집기
+- timings_summary(): 응답의 timings 블록 (단계별 시간 + Python / 네트워크 / DB 분해)
+
+최상위 trace는 내보내기가 설정되었거나 timings를 요청한 경우에만 기록하고,
+그 밖의 span(trace 밖에서 호출된 execute_query 등)은 측정 없이 지나갑니다.
+"""
+
+import os
+import json
+import time
+import queue
+import random
+import atexit
+import logging
+import threading
+import contextvars
+import urllib.request
+from contextlib import contextmanager, nullcontext
+from typing import Dict, List, Any, Optional, Iterator
+
+logger = logging.getLogger(__name__)
+
+# OTLP 내보내기 배치 크기 / 최대 대기 시간(초) / 대기열 크기 (넘치면 버림)
+OTLP_BATCH_SIZE = 128
+OTLP_FLUSH_INTERVAL = 2.0
+OTLP_MAX_QUEUE = 10000
+
+_current: contextvars.ContextVar = contextvars.ContextVar('query_tracing_span', default=None)
+
+class Span:
+    """측정 구간 하나 (끝나면 wall_ms / cpu_ms 확정)"""
+    
+    __slots__ = ('name', 'trace_id', 'span_id', 'parent_id', 'attributes', 'children', 'error',
+                 'start_ns', 'end_ns', 'wall_ms', 'cpu_ms', '_wall', '_cpu')
+    
+    def __init__(self, name: str, trace_id: str, parent_id: Optional[str], attributes: Dict[str, Any]):
+        self.name = name
+        self.trace_id = trace_id
+        self.span_id = f"{random.getrandbits(64):016x}"
+        self.parent_id = parent_id
+        self.attributes = attributes
+        self.children: List['Span'] = []
+        self.error: Optional[str] = None
+        self.start_ns = time.time_ns()
+        self.end_ns = 0
+        self.wall_ms = 0.0
+        self.cpu_ms = 0.0
+        self._wall = time.perf_counter()
+        self._cpu = time.thread_time()
+    
+    def set(self, **attributes):
+        """속성 추가 (None 값은 무시)"""
+        for key, value in attributes.items():
+            if value is not None:
+                self.attributes[key] = value
+    
+    def set_error(self, message: str):
+        self.error = message[:200]
+    
+    def end(self):
+        self.wall_ms = (time.perf_counter() - self._wall) * 1000
+        self.cpu_ms = (time.thread_time() - self._cpu) * 1000
+        self.end_ns = self.start_ns + int(self.wall_ms * 1e6)
+    
+    def child(self, name: str) -> Optional['Span']:
+        return next((span for span in self.children if span.name == name), None)
+    
+    def walk(self) -> Iterator['Span']:
+        yield self
+        for span in self.children:
+            yield from span.walk()
+    
+    def to_dict(self) -> Dict[str, Any]:
+        entry = {
+            'trace_id': self.trace_id,
+            'span_id': self.span_id,
+            'parent_id': self.parent_id,
+            'name': self.name,
+            'start_ns': self.start_ns,
+            'wall_ms': round(self.wall_ms, 3),
+            'cpu_ms': round(self.cpu_ms, 3),
+            'attributes': self.attributes,
+        }
+        if self.error:
+            entry['error'] = self.error
+        return entry
+
+class _NoopSpan:
+    """활성 span이 없을 때 current_span()이 돌려주는 빈 span"""
+    
+    def set(self, **attributes):
+        pass
+    
+    def set_error(self, message: str):
+        pass
+
+NOOP_SPAN = _NoopSpan()
+_NOOP_CONTEXT = nullcontext(NOOP_SPAN)
+
+def current_span():
+    """현재 활성 span (없으면 속성 기록을 무시하는 빈 span)"""
+    return _current.get() or NOOP_SPAN
+
+class FileSpanExporter:
+    """span을 JSON Lines로 추가 기록 (한 줄에 span 하나)"""
+    
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._file = open(path, 'a', encoding='utf-8')
+        atexit.register(self.close)
+    
+    def export(self, spans: List[Span]):
+        lines = ''.join(json.dumps(span.to_dict(), ensure_ascii=False, default=str) + '\n' for span in spans)
+        with self._lock:
+            if self._file is not None:
+                self._file.write(lines)
+                self._file.flush()
+    
+    def close(self):
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+def _otlp_value(value: Any) -> Dict[str, Any]:
+    if isinstance(value, bool):
+        return {'boolValue': value}
+    if isinstance(value, int):
+        return {'intValue': str(value)}
+    if isinstance(value, float):
+        return {'doubleValue': value}
+    return {'stringValue': str(value)}
+
+def _otlp_span(span: Span) -> Dict[str, Any]:
+    entry = {
+        'traceId': span.trace_id,
+        'spanId': span.span_id,
+        'name': span.name,
+        'kind': 1,
+        'startTimeUnixNano': str(span.start_ns),
+        'endTimeUnixNano': str(span.end_ns),
+        'attributes': [{'key': key, 'value': _otlp_value(value)} for key, value in span.attributes.items()]
+                      + [{'key': 'cpu_ms', 'value': _otlp_value(round(span.cpu_ms, 3))}],
+    }
+    if span.parent_id:
+        entry['parentSpanId'] = span.parent_id
+    if span.error:
+        entry['status'] = {'code': 2, 'message': span.error}
+    return entry
+
+class OtlpHttpSpanExporter:
+    """
+    OTLP/HTTP(JSON) 수집기로 span 전송 (OpenTelemetry Collector, Jaeger, Tempo 등)
+    백그라운드 스레드가 배치로 보내며 질의 처리 경로는 대기열에 넣기만 합니다.
+    """
+    
+    def __init__(self, endpoint: str, service_name: str = 'knowledge-engine',
+                 headers: Optional[Dict[str, str]] = None, timeout: float = 5.0):
+        self.url = endpoint if endpoint.rstrip('/').endswith('/v1/traces') else endpoint.rstrip('/') + '/v1/traces'
+        self.service_name = service_name
+        self.headers = {'Content-Type': 'application/json', **(headers or {})}
+        self.timeout = timeout
+        self.dropped = 0
+        self._queue: queue.Queue = queue.Queue(maxsize=OTLP_MAX_QUEUE)
+        self._thread = threading.Thread(target=self._loop, name='otlp-span-exporter', daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+    
+    def export(self, spans: List[Span]):
+        for span in spans:
+            try:
+                self._queue.put_nowait(span)
+            except queue.Full:
+                self.dropped += 1
+    
+    def close(self):
+        self._queue.put(None)
+        self._thread.join(self.timeout)
+    
+    def _loop(self):
+        stopping = False
+        while not stopping:
+            batch = []
+            deadline = time.monotonic() + OTLP_FLUSH_INTERVAL
+            while len(batch) < OTLP_BATCH_SIZE:
+                try:
+                    span = self._queue.get(timeout=max(0.0, deadline - time.monotonic()))
+                except queue.Empty:
+                    break
+                if span is None:
+                    stopping = True
+                    break
+                batch.append(span)
+            if batch:
+                self._send(batch)
+    
+    def _send(self, spans: List[Span]):
+        payload = {'resourceSpans': [{
+            'resource': {'attributes': [{'key': 'service.name', 'value': {'stringValue': self.service_name}}]},
+            'scopeSpans': [{'scope': {'name': 'query_tracing'}, 'spans': [_otlp_span(span) for span in spans]}],
+        }]}
+        request = urllib.request.Request(self.url, data=json.dumps(payload).encode('utf-8'),
+                                         headers=self.headers, method='POST')
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                response.read()
+        except Exception as e:
+            self.dropped += len(spans)
+            logger.warning(f"⚠️  OTLP span 전송 실패 ({len(spans)}개): {e}")
+
+class Tracer:
+    """
+    span 생성기 (최상위 trace가 끝나면 전체 트리를 내보내기)
+    
+    사용 예:
+        tracer = Tracer([FileSpanExporter("traces.jsonl")])
+        with tracer.trace("process_natural_query") as root:
+            with tracer.span("analyze") as span:
+                span.set(query_type="count")
+        print(timings_summary(root))
+    """
+    
+    def __init__(self, exporters: Optional[List[Any]] = None):
+        self.exporters = exporters or []
+    
+    def trace(self, name: str, force: bool = False, **attributes):
+        """
+        최상위 span 시작 (이미 trace 안이면 하위 span)
+        내보내기가 없고 force=False면 아무것도 기록하지 않음 (빈 span 반환)
+        """
+        if _current.get() is None and not (force or self.exporters):
+            return _NOOP_CONTEXT
+        return self._open(name, attributes)
+    
+    def span(self, name: str, **attributes):
+        """현재 trace의 하위 span (trace 밖이면 빈 span)"""
+        if _current.get() is None:
+            return _NOOP_CONTEXT
+        return self._open(name, attributes)
+    
+    @contextmanager
+    def _open(self, name: str, attributes: Dict[str, Any]) -> Iterator[Span]:
+        parent = _current.get()
+        if parent is None:
+            span = Span(name, f"{random.getrandbits(128):032x}", None, attributes)
+        else:
+            span = Span(name, parent.trace_id, parent.span_id, attributes)
+            parent.children.append(span)
+        token = _current.set(span)
+        try:
+            yield span
+        except Exception as e:
+            span.set_error(str(e))
+            raise
+        finally:
+            span.end()
+            _current.reset(token)
+            if parent is None and self.exporters:
+                self._export(span)
+    
+    def _export(self, root: Span):
+        spans = list(root.walk())
+        for exporter in self.exporters:
+            try:
+                exporter.export(spans)
+            except Exception as e:
+                logger.warning(f"⚠️  span 내보내기 실패 ({type(exporter).__name__}): {e}")
+
+def tracer_from_env() -> Tracer:
+    """QUERY_TRACE_FILE / OTEL_EXPORTER_OTLP_ENDPOINT 설정에 따라 내보내기 구성"""
+    exporters = []
+    path = os.getenv('QUERY_TRACE_FILE')
+    if path:
+        exporters.append(FileSpanExporter(path))
+        logger.info(f"🧭 질의 추적 파일 내보내기: {path}")
+    endpoint = os.getenv('OTEL_EXPORTER_OTLP_TRACES_ENDPOINT') or os.getenv('OTEL_EXPORTER_OTLP_ENDPOINT')
+    if endpoint:
+        headers = dict(
+            item.split('=', 1) for item in os.getenv('OTEL_EXPORTER_OTLP_HEADERS', '').split(',') if '=' in item
+        )
+        exporters.append(OtlpHttpSpanExporter(endpoint, os.getenv('OTEL_SERVICE_NAME', 'knowledge-engine'), headers))
+        logger.info(f"🧭 질의 추적 OTLP 내보내기: {endpoint}")
+    return Tracer(exporters)
+
+def timings_summary(root: Span) -> Dict[str, Any]:
+    """
+    응답용 timings 블록
+    
+    breakdown:
+        database_ms : DB 서버가 보고한 시간 (result_available_after + result_consumed_after)
+        network_ms  : DB 왕복(execute.db) 시간 - database_ms (드라이버/네트워크)
+        python_ms   : 전체 - DB 왕복 시간 (분석/생성/변환/포맷팅)
+    서버 시간을 모르는 드라이버면 database_ms/network_ms는 None, db_round_trip_ms만 채움
+    """
+    stages = {}
+    for span in root.children:
+        stage = {'wall_ms': round(span.wall_ms, 3), 'cpu_ms': round(span.cpu_ms, 3), **span.attributes}
+        for child in span.children:
+            stage[child.name] = {'wall_ms': round(child.wall_ms, 3), 'cpu_ms': round(child.cpu_ms, 3),
+                                 **child.attributes}
+        stages[span.name] = stage
+    
+    db_spans = [span for span in root.walk() if span.name == 'execute.db']
+    round_trip = sum(span.wall_ms for span in db_spans)
+    server = [span.attributes.get('server_ms') for span in db_spans]
+    database_ms = sum(server) if server and all(value is not None for value in server) else None
+    if not db_spans:
+        database_ms = 0.0
+    return {
+        'total_ms': round(root.wall_ms, 3),
+        'cpu_ms': round(root.cpu_ms, 3),
+        'trace_id': root.trace_id,
+        'stages': stages,
+        'breakdown': {
+            'python_ms': round(root.wall_ms - round_trip, 3),
+            'db_round_trip_ms': round(round_trip, 3),
+            'network_ms': round(max(0.0, round_trip - database_ms), 3) if database_ms is not None else None,
+            'database_ms': round(database_ms, 3) if database_ms is not None else None,
+        },
+    }
+
+def server_time_ms(result) -> Optional[float]:
+    """드라이버 결과 요약의 DB 서버 시간 (ms, 모르면 None) - 결과를 모두 읽은 뒤 호출"""
+    consume = getattr(result, 'consume', None)
+    if consume is None:
+        return None
+    try:
+        summary = consume()
+    except Exception:
+        return None
+    available = getattr(summary, 'result_available_after', None)
+    consumed = getattr(summary, 'result_consumed_after', None)
+    if available is None:
+        return None
+    return float(available) + float(consumed or 0)
@@ -8,6 +8,8 @@ import sys
 from neo4j import GraphDatabase
 import logging
 
+from graph_statistics import get_snapshot
+
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
@@ -57,14 +59,10 @@ def reality_check():
             # 4. 데이터 존재 여부 확인
             logger.info(f"\n4️⃣ 데이터 존재 여부:")
             
-            # 총 노드 수
-            result = session.run("MATCH (n) RETURN count(n) as total")
-            total_nodes = result.single()['total']
+            # 총 노드/관계 수 (카운트 스토어 통계)
+            snapshot = get_snapshot(driver, refresh=True)
+            total_nodes, total_rels = snapshot.nodes, snapshot.relationships
             logger.info(f"  총 노드 수: {total_nodes}")
-            
-            # 총 관계 수  
-            result = session.run("MATCH ()-[r]->() RETURN count(r) as total")
-            total_rels = result.single()['total']
             logger.info(f"  총 관계 수: {total_rels}")
             
             if total_nodes == 0:
@@ -75,9 +73,8 @@ def reality_check():
                 
                 # 어떤 노드들이 있는지 확인
                 logger.info(f"\n5️⃣ 존재하는 노드 타입:")
-                result = session.run("MATCH (n) RETURN DISTINCT labels(n) as labels, count(n) as count ORDER BY count DESC")
-                for record in result:
-                    logger.info(f"  {record['labels']}: {record['count']}개")
+                for row in snapshot.label_rows():
+                    logger.info(f"  {row['type']}: {row['count']}개")
                 
                 # 샘플 노드 몇 개 확인
                 logger.info(f"\n6️⃣ 샘플 노드들:")
@@ -0,0 +1,254 @@
+#!/usr/bin/env python3
+"""
+느린 질의 로그 (Slow Query Log)
+지식 엔진이 DB에서 실행한 질의 중 기준 시간을 넘은 것을 Cypher/파라미터/템플릿/소요 시간/행 수와 함께 보관
+
+주요 기능:
+- SLOW_QUERY_MS 기준(기본 500ms, 0이면 끔) 이상 걸린 질의를 최근 N개(SLOW_QUERY_LOG_SIZE) 메모리에 보관
+- 느린 질의는 표본 추출(SLOW_QUERY_PROFILE_SAMPLE, 기본 10%) + 템플릿별 최소 간격(SLOW_QUERY_PROFILE_INTERVAL초)으로
+  PROFILE을 백그라운드에서 다시 실행하여 연산자별 db hits / 행 수 계획을 함께 저장 (동시에 하나만, 읽기 트랜잭션)
+- SLOW_QUERY_FILE 설정 시 JSON Lines로도 기록
+- 템플릿별 요약 (건수, 최대/평균 시간, db hits가 가장 많은 연산자)
+  → /api/v1/debug/slow-queries (DEBUG_ENDPOINTS=true일 때만)
+
+PROFILE은 질의를 실제로 한 번 더 실행하므로 쓰기 질의(CREATE/MERGE/SET/DELETE/REMOVE)는 다시 실행하지 않습니다.
+"""
+
+import os
+import re
+import json
+import time
+import random
+import logging
+import threading
+from collections import deque
+from datetime import datetime
+from typing import Dict, List, Any, Optional
+
+from query_recorder import encode_value, query_id
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_THRESHOLD_MS = 500.0
+DEFAULT_LOG_SIZE = 200
+DEFAULT_PROFILE_INTERVAL = 300.0
+
+# 느린 질의 중 PROFILE을 다시 실행할 비율 (템플릿별 간격 제한과 함께 적용)
+DEFAULT_PROFILE_SAMPLE = 0.1
+
+# 파라미터 문자열 값은 이 길이까지만 보관
+MAX_PARAMETER_LENGTH = 200
+
+_WRITE_CLAUSE = re.compile(r'\b(CREATE|MERGE|SET|DELETE|REMOVE|FOREACH)\b', re.IGNORECASE)
+
+def _truncate(value: Any) -> Any:
+    if isinstance(value, str) and len(value) > MAX_PARAMETER_LENGTH:
+        return value[:MAX_PARAMETER_LENGTH] + '…'
+    if isinstance(value, dict):
+        return {key: _truncate(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_truncate(item) for item in value]
+    return value
+
+def flatten_profile(plan: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    드라이버 profile 트리 → 연산자 목록 + 합계
+    
+    Returns:
+        {'db_hits': 전체, 'rows': 결과 행, 'hottest': db hits 최대 연산자,
+         'operators': [{'operator', 'depth', 'db_hits', 'rows', 'estimated_rows', 'details'}]}
+    """
+    operators = []
+    
+    def visit(node: Dict[str, Any], depth: int):
+        args = node.get('args') or {}
+        operators.append({
+            'operator': node.get('operatorType', '?').split('@')[0],
+            'depth': depth,
+            'db_hits': node.get('dbHits', args.get('DbHits')),
+            'rows': node.get('rows', args.get('Rows')),
+            'estimated_rows': args.get('EstimatedRows'),
+            'details': args.get('Details', ''),
+        })
+        for child in node.get('children') or []:
+            visit(child, depth + 1)
+    
+    visit(plan, 0)
+    hits = [operator for operator in operators if operator['db_hits'] is not None]
+    hottest = max(hits, key=lambda operator: operator['db_hits']) if hits else None
+    return {
+        'db_hits': sum(operator['db_hits'] for operator in hits) if hits else None,
+        'rows': operators[0]['rows'],
+        'hottest': f"{hottest['operator']} ({hottest['db_hits']} db hits)" if hottest else None,
+        'operators': operators,
+    }
+
+class SlowQueryLog:
+    """
+    기준 시간을 넘은 질의 보관 + 표본 PROFILE 수집
+    
+    사용 예:
+        slow_log = SlowQueryLog(threshold_ms=500)
+        slow_log.observe(cypher, params, elapsed_ms, rows, driver, template="collaboration_network")
+        slow_log.entries(limit=20)
+    """
+    
+    def __init__(self, threshold_ms: float = DEFAULT_THRESHOLD_MS, size: int = DEFAULT_LOG_SIZE,
+                 profile_sample: float = DEFAULT_PROFILE_SAMPLE, profile_interval: float = DEFAULT_PROFILE_INTERVAL,
+                 path: Optional[str] = None):
+        self.threshold_ms = threshold_ms
+        self.profile_sample = profile_sample
+        self.profile_interval = profile_interval
+        self.path = path
+        self.slow_count = 0
+        self._entries: deque = deque(maxlen=size)
+        self._sequence = 0
+        self._last_profiled: Dict[str, float] = {}
+        self._profiling = False
+        self._lock = threading.Lock()
+    
+    def observe(self, cypher: str, parameters: Optional[Dict[str, Any]], elapsed_ms: float, rows: int,
+                driver=None, template: Optional[str] = None, question: Optional[str] = None,
+                server_ms: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        """실행 결과 하나 확인 → 기준 이상이면 기록하고 항목 반환 (기준 미만이면 None)"""
+        if elapsed_ms < self.threshold_ms:
+            return None
+        key = template or query_id(cypher)
+        with self._lock:
+            self._sequence += 1
+            self.slow_count += 1
+            entry = {
+                'id': self._sequence,
+                'timestamp': datetime.now().isoformat(),
+                'template': template,
+                'query_id': query_id(cypher),
+                'question': question,
+                'cypher': ' '.join(cypher.split()),
+                'parameters': _truncate(encode_value(parameters or {})),
+                'elapsed_ms': round(elapsed_ms, 1),
+                'server_ms': server_ms,
+                'rows': rows,
+                'profile_status': self._profile_decision(key, cypher, driver),
+                'profile': None,
+            }
+            self._entries.append(entry)
+        
+        logger.warning(f"🐢 느린 질의 [{key}] {elapsed_ms:.0f}ms, {rows}행 "
+                       f"(기준 {self.threshold_ms:.0f}ms, PROFILE: {entry['profile_status']})")
+        if entry['profile_status'] == 'pending':
+            threading.Thread(target=self._profile, args=(entry, cypher, parameters or {}, driver),
+                             name='slow-query-profile', daemon=True).start()
+        else:
+            self._write(entry)
+        return entry
+    
+    def _profile_decision(self, key: str, cypher: str, driver) -> str:
+        """PROFILE 재실행 여부 (lock 안에서 호출)"""
+        if driver is None:
+            return 'no_driver'
+        if _WRITE_CLAUSE.search(cypher):
+            return 'write_query'
+        if random.random() >= self.profile_sample:
+            return 'not_sampled'
+        now = time.monotonic()
+        last = self._last_profiled.get(key)
+        if last is not None and now - last < self.profile_interval:
+            return 'rate_limited'
+        if self._profiling:
+            return 'busy'
+        self._profiling = True
+        self._last_profiled[key] = now
+        return 'pending'
+    
+    def _profile(self, entry: Dict[str, Any], cypher: str, parameters: Dict[str, Any], driver):
+        started = time.perf_counter()
+        try:
+            with driver.session() as session:
+                summary = session.execute_read(lambda tx: tx.run(f"PROFILE {cypher}", parameters).consume())
+            plan = getattr(summary, 'profile', None)
+            profile = flatten_profile(plan) if plan else None
+            status = 'captured' if profile else 'unavailable'
+            error = None
+        except Exception as e:
+            profile, status, error = None, 'failed', str(e)[:200]
+        with self._lock:
+            entry['profile'] = profile
+            entry['profile_status'] = status
+            entry['profile_ms'] = round((time.perf_counter() - started) * 1000, 1)
+            if error:
+                entry['profile_error'] = error
+            self._profiling = False
+        if profile and profile['hottest']:
+            logger.warning(f"  🔬 PROFILE [{entry['template'] or entry['query_id']}]: "
+                           f"db hits {profile['db_hits']}, 최대 {profile['hottest']}")
+        elif profile:
+            logger.warning(f"  🔬 PROFILE [{entry['template'] or entry['query_id']}]: "
+                           f"연산자 {len(profile['operators'])}개, 결과 {profile['rows']}행 (db hits 정보 없음)")
+        elif error:
+            logger.warning(f"  ⚠️  PROFILE 실패 [{entry['template'] or entry['query_id']}]: {error}")
+        self._write(entry)
+    
+    def _write(self, entry: Dict[str, Any]):
+        if not self.path:
+            return
+        try:
+            line = json.dumps(entry, ensure_ascii=False, default=str)
+            with self._lock, open(self.path, 'a', encoding='utf-8') as f:
+                f.write(line + '\n')
+        except Exception as e:
+            logger.warning(f"⚠️  느린 질의 기록 실패: {e}")
+    
+    def entries(self, limit: int = 50, template: Optional[str] = None) -> List[Dict[str, Any]]:
+        """최근 항목부터 (template 지정 시 해당 템플릿만)"""
+        with self._lock:
+            items = [dict(entry) for entry in reversed(self._entries)
+                     if template is None or entry['template'] == template]
+        return items[:limit]
+    
+    def summary(self) -> List[Dict[str, Any]]:
+        """템플릿(없으면 질의 id)별 요약, 총 소요 시간 큰 순"""
+        groups: Dict[str, Dict[str, Any]] = {}
+        with self._lock:
+            for entry in self._entries:
+                key = entry['template'] or entry['query_id']
+                group = groups.setdefault(key, {'template': key, 'count': 0, 'total_ms': 0.0, 'max_ms': 0.0,
+                                                'max_rows': 0, 'last_seen': None, 'hottest': None})
+                group['count'] += 1
+                group['total_ms'] += entry['elapsed_ms']
+                group['max_ms'] = max(group['max_ms'], entry['elapsed_ms'])
+                group['max_rows'] = max(group['max_rows'], entry['rows'])
+                group['last_seen'] = entry['timestamp']
+                if entry['profile']:
+                    group['hottest'] = entry['profile']['hottest']
+        for group in groups.values():
+            group['avg_ms'] = round(group['total_ms'] / group['count'], 1)
+            group['total_ms'] = round(group['total_ms'], 1)
+        return sorted(groups.values(), key=lambda group: -group['total_ms'])
+    
+    def config(self) -> Dict[str, Any]:
+        return {
+            'threshold_ms': self.threshold_ms,
+            'size': self._entries.maxlen,
+            'profile_sample': self.profile_sample,
+            'profile_interval_seconds': self.profile_interval,
+            'file': self.path,
+            'slow_queries_seen': self.slow_count,
+        }
+    
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._last_profiled.clear()
+
+def slow_query_log_from_env() -> Optional[SlowQueryLog]:
+    """SLOW_QUERY_MS 등 환경변수로 느린 질의 로그 생성 (SLOW_QUERY_MS=0이면 None)"""
+    threshold_ms = float(os.getenv('SLOW_QUERY_MS', str(DEFAULT_THRESHOLD_MS)))
+    if threshold_ms <= 0:
+        return None
+    return SlowQueryLog(
+        threshold_ms=threshold_ms,
+        size=int(os.getenv('SLOW_QUERY_LOG_SIZE', str(DEFAULT_LOG_SIZE))),
+        profile_sample=float(os.getenv('SLOW_QUERY_PROFILE_SAMPLE', str(DEFAULT_PROFILE_SAMPLE))),
+        profile_interval=float(os.getenv('SLOW_QUERY_PROFILE_INTERVAL', str(DEFAULT_PROFILE_INTERVAL))),
+        path=os.getenv('SLOW_QUERY_FILE'),
+    )
@@ -0,0 +1,28 @@
+"""
+pytest 공통 설정
+저장소 루트와 poc 모듈 디렉터리를 import 경로에 추가하고, 테스트마다 새 인메모리 그래프를 제공
+"""
+
+import os
+import sys
+
+import pytest
+
+REPO_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+for path in (REPO_DIR, os.path.join(REPO_DIR, 'poc', 'ai_pipeline'), os.path.join(REPO_DIR, 'poc', 'seed_content')):
+    if path not in sys.path:
+        sys.path.insert(0, path)
+
+from memory_graph import MemoryDriver
+
+@pytest.fixture
+def driver():
+    """테스트 하나 전용 인메모리 드라이버"""
+    driver = MemoryDriver()
+    yield driver
+    driver.close()
+
+@pytest.fixture
+def session(driver):
+    with driver.session() as session:
+        yield session
@@ -0,0 +1,131 @@
+"""인메모리 그래프 (memory_graph) Cypher 부분 집합 테스트"""
+
+import pytest
+
+from memory_graph import ConstraintViolation, MemoryGraphError, ProcedureNotFound
+
+def test_merge_on_create_sets_only_once(session):
+    """MERGE ... ON CREATE SET은 처음 만들 때만 적용"""
+    query = """
+        MERGE (dev:Developer {id: $id})
+        ON CREATE SET dev.commits = 1
+        ON MATCH SET dev.commits = dev.commits + 1
+        RETURN dev.commits AS commits
+    """
+    assert session.run(query, id='a').single()['commits'] == 1
+    assert session.run(query, id='a').single()['commits'] == 2
+    assert session.run("MATCH (dev:Developer) RETURN count(dev) AS n").single()['n'] == 1
+
+def test_unwind_merge_counters(session):
+    """UNWIND 행마다 MERGE, 같은 키는 노드 하나"""
+    summary = session.run("""
+        UNWIND $rows AS row
+        MERGE (skill:Skill {id: row.id})
+        SET skill.name = row.name
+    """, rows=[{'id': 'py', 'name': 'Python'}, {'id': 'neo', 'name': 'Neo4j'}, {'id': 'py', 'name': 'Python'}]).consume()
+    
+    assert summary.counters.nodes_created == 2
+    names = session.run("MATCH (skill:Skill) RETURN skill.name AS name ORDER BY name").value('name')
+    assert names == ['Neo4j', 'Python']
+
+def test_optional_match_collect(session):
+    """OPTIONAL MATCH 결과가 없으면 collect()는 빈 목록"""
+    session.run("""
+        CREATE (a:Developer {id: 'a'})-[:HAS_SKILL {level: 'Expert'}]->(:Skill {name: 'Python'}),
+               (a)-[:HAS_SKILL {level: 'Beginner'}]->(:Skill {name: 'Go'}),
+               (:Developer {id: 'b'})
+    """).consume()
+    
+    rows = session.run("""
+        MATCH (dev:Developer)
+        OPTIONAL MATCH (dev)-[r:HAS_SKILL]->(skill:Skill)
+        RETURN dev.id AS id, collect(skill.name) AS skills, count(r) AS skill_count
+        ORDER BY id
+    """).data()
+    
+    assert [row['id'] for row in rows] == ['a', 'b']
+    assert sorted(rows[0]['skills']) == ['Go', 'Python']
+    assert rows[0]['skill_count'] == 2
+    assert rows[1] == {'id': 'b', 'skills': [], 'skill_count': 0}
+
+def test_aggregation_order_by_limit(session):
+    """그룹별 집계 + ORDER BY DESC + LIMIT"""
+    session.run("""
+        UNWIND $rows AS row
+        CREATE (:Developer {id: row.id, role: row.role, commits: row.commits})
+    """, rows=[
+        {'id': 'a', 'role': 'backend', 'commits': 10},
+        {'id': 'b', 'role': 'backend', 'commits': 5},
+        {'id': 'c', 'role': 'frontend', 'commits': 7},
+        {'id': 'd', 'role': 'infra', 'commits': 1},
+    ]).consume()
+    
+    rows = session.run("""
+        MATCH (dev:Developer)
+        RETURN dev.role AS role, count(dev) AS developers, sum(dev.commits) AS commits
+        ORDER BY commits DESC
+        LIMIT 2
+    """).data()
+    
+    assert rows == [
+        {'role': 'backend', 'developers': 2, 'commits': 15},
+        {'role': 'frontend', 'developers': 1, 'commits': 7},
+    ]
+
+def test_datetime_comparison(session):
+    """datetime() 문자열 변환과 비교 (시간 제약 템플릿이 쓰는 형태)"""
+    session.run("""
+        CREATE (:Developer {id: 'old', last_activity: datetime('2020-01-01T00:00:00Z')}),
+               (:Developer {id: 'new', last_activity: datetime() - duration('P1D')})
+    """).consume()
+    
+    ids = session.run("""
+        MATCH (dev:Developer)
+        WHERE dev.last_activity > datetime() - duration('P7D')
+        RETURN dev.id AS id
+    """).value('id')
+    assert ids == ['new']
+
+def test_unique_constraint_violation(session):
+    """유일성 제약조건을 어기는 CREATE는 ConstraintViolation, MERGE는 기존 노드 사용"""
+    session.run("CREATE CONSTRAINT developer_id IF NOT EXISTS FOR (n:Developer) REQUIRE n.id IS UNIQUE").consume()
+    session.run("CREATE (:Developer {id: 'a'})").consume()
+    
+    with pytest.raises(ConstraintViolation):
+        session.run("CREATE (:Developer {id: 'a'})").consume()
+    
+    session.run("MERGE (:Developer {id: 'a'})").consume()
+    assert session.run("MATCH (dev:Developer) RETURN count(dev) AS n").single()['n'] == 1
+    assert [row['name'] for row in session.run("SHOW CONSTRAINTS YIELD name RETURN name").data()] == ['developer_id']
+
+def test_unknown_procedure_has_neo4j_code(session):
+    """등록되지 않은 프로시저는 Neo4j와 같은 오류 코드의 ProcedureNotFound"""
+    with pytest.raises(ProcedureNotFound) as raised:
+        session.run("CALL apoc.does.not.exist() YIELD value RETURN value").consume()
+    assert raised.value.code == 'Neo.ClientError.Procedure.ProcedureNotFound'
+
+def test_apoc_meta_stats(session):
+    """apoc.meta.stats()는 라벨/관계 타입별 수 (그래프 통계 캐시가 사용)"""
+    session.run("CREATE (:Developer:Person)-[:KNOWS]->(:Developer)").consume()
+    
+    record = session.run("CALL apoc.meta.stats() YIELD nodeCount, relCount, labels, relTypesCount "
+                         "RETURN nodeCount, relCount, labels, relTypesCount").single()
+    assert record['nodeCount'] == 2
+    assert record['relCount'] == 1
+    assert record['labels'] == {'Developer': 2, 'Person': 1}
+    assert record['relTypesCount'] == {'KNOWS': 1}
+
+def test_syntax_error(session):
+    with pytest.raises(MemoryGraphError):
+        session.run("MATCH (n RETURN n").consume()
+
+def test_write_transaction_rolls_back(driver):
+    """execute_write 안에서 예외가 나면 쓰기가 남지 않음"""
+    def work(tx):
+        tx.run("CREATE (:Developer {id: 'a'})").consume()
+        raise RuntimeError("중단")
+    
+    with driver.session() as session:
+        with pytest.raises(RuntimeError):
+            session.execute_write(work)
+        assert session.run("MATCH (n) RETURN count(n) AS n").single()['n'] == 0
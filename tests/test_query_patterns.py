@@ -0,0 +1,64 @@
+"""질의 패턴 라이브러리 템플릿이 Seed 그래프에서 파싱/실행되는지 확인"""
+
+from pathlib import Path
+
+import pytest
+
+from advanced_knowledge_engine import AdvancedKnowledgeEngine, QueryAnalysis, QueryType, QueryComplexity
+from engine_warmup import entity_variants
+from graph_statistics import LABEL_COUNT_QUERY
+from seed_manifest import load_manifest
+from seed_sync import SeedSync
+
+MANIFEST_DIR = Path(__file__).resolve().parent.parent / "poc" / "seed_content" / "manifests"
+
+ENGINE = AdvancedKnowledgeEngine(driver=object())
+PATTERNS = list(ENGINE.query_patterns)
+
+@pytest.fixture
+def engine(driver):
+    """Seed 매니페스트를 적재한 인메모리 그래프에 연결된 엔진"""
+    for manifest_file in sorted(MANIFEST_DIR.glob("*.json")):
+        result = SeedSync(driver).sync(load_manifest(manifest_file), params={'instance_id': '3e875bd7'})
+        assert result['success']
+    return AdvancedKnowledgeEngine(driver=driver)
+
+def _analysis(engine, name, entities, time_constraint=None) -> QueryAnalysis:
+    info = engine.query_patterns[name]
+    return QueryAnalysis(original_query='', query_type=info['type'], complexity=info['complexity'],
+                         entities=entities, intent='', keywords=[], time_constraint=time_constraint,
+                         pattern_name=name)
+
+@pytest.mark.parametrize('name', PATTERNS)
+def test_template_runs_for_every_entity(engine, name):
+    """엔티티 치환 결과마다 EXPLAIN과 실제 실행이 모두 성공"""
+    with engine.driver.session() as session:
+        for entities in entity_variants():
+            cypher = engine.generate_cypher_query(_analysis(engine, name, entities))
+            assert '{{' not in cypher and '}}' not in cypher, cypher
+            session.run(f"EXPLAIN {cypher}").consume()
+            session.run(cypher).data()
+
+@pytest.mark.parametrize('time_constraint', ['recent', 'today', 'this_week', 'this_month'])
+def test_recent_developer_time_constraint(engine, time_constraint):
+    """recent_developer는 개발자 카운터(last_activity)에 시간 조건 적용"""
+    with engine.driver.session() as session:
+        session.run("MATCH (dev:Developer) SET dev.last_activity = datetime()").consume()
+        cypher = engine.generate_cypher_query(_analysis(engine, 'recent_developer', [], time_constraint))
+        assert 'dev.last_activity' in cypher.split('RETURN')[0]
+        assert session.run(cypher).data()
+
+def test_developer_skills_for_known_developer(engine):
+    """개발자 ID 매핑으로 채운 developer_skills는 해당 개발자의 스킬 반환"""
+    cypher = engine.generate_cypher_query(_analysis(engine, 'developer_skills', ['infrastructure']))
+    with engine.driver.session() as session:
+        assert session.run(cypher).data()
+
+@pytest.mark.parametrize('time_constraint', [None, 'recent', 'this_month'])
+def test_count_fallback_uses_statistics_query(engine, time_constraint):
+    """COUNT 폴백은 시간 조건과 무관하게 카운트 스토어 통계 쿼리 그대로"""
+    analysis = QueryAnalysis(original_query='', query_type=QueryType.COUNT, complexity=QueryComplexity.SIMPLE,
+                             entities=[], intent='', keywords=[], time_constraint=time_constraint)
+    assert engine.generate_cypher_query(analysis) == LABEL_COUNT_QUERY
+    rows = engine.execute_query(LABEL_COUNT_QUERY)
+    assert {'type': 'Developer', 'count': 3} in rows
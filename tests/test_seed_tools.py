@@ -0,0 +1,134 @@
+"""Seed 도구 (Cypher 스크립트 파서, 변경분 동기화)와 활동 이벤트 검증 테스트"""
+
+import pytest
+
+from claude_neo4j_pipeline import validate_activity
+from cypher_script import iter_cypher_statements, is_schema_statement, requires_auto_commit
+from seed_sync import SeedSync
+
+# ---------------------------------------------------------------------------
+# cypher_script.iter_cypher_statements
+# ---------------------------------------------------------------------------
+
+def test_statements_split_on_semicolons_across_lines():
+    lines = [
+        "CREATE (a:Developer {id: 'a'})",
+        "SET a.name = 'A';",
+        "MATCH (n) RETURN n;",
+        "RETURN 1",
+    ]
+    assert list(iter_cypher_statements(lines)) == [
+        "CREATE (a:Developer {id: 'a'})\nSET a.name = 'A'",
+        "MATCH (n) RETURN n",
+        "RETURN 1",
+    ]
+
+def test_quoted_semicolons_and_comment_markers_are_kept():
+    """문자열/백틱 안의 ; // /* 는 그대로, 바깥 주석은 제거"""
+    script = (
+        "CREATE (:Note {text: 'a; b // not a comment'}); // 주석\n"
+        "/* 블록\n주석; */ CREATE (:`we;ird` {path: \"/* x */\"});\n"
+        "RETURN 'it\\'s; fine';\n"
+    )
+    assert list(iter_cypher_statements(script.splitlines(keepends=True))) == [
+        "CREATE (:Note {text: 'a; b // not a comment'})",
+        "CREATE (:`we;ird` {path: \"/* x */\"})",
+        "RETURN 'it\\'s; fine'",
+    ]
+
+def test_empty_statements_and_comment_only_input():
+    assert list(iter_cypher_statements([";;", "// 주석만", "/* 블록 */ ;"])) == []
+
+def test_statement_classification():
+    assert is_schema_statement("CREATE CONSTRAINT dev_id IF NOT EXISTS FOR (n:Developer) REQUIRE n.id IS UNIQUE")
+    assert is_schema_statement("drop index skill_name if exists")
+    assert not is_schema_statement("CREATE (:Index {name: 'x'})")
+    assert requires_auto_commit("MATCH (n) CALL { WITH n DETACH DELETE n } IN TRANSACTIONS OF 1000 ROWS")
+    assert not requires_auto_commit("MATCH (n) RETURN n")
+
+# ---------------------------------------------------------------------------
+# seed_sync.SeedSync.plan
+# ---------------------------------------------------------------------------
+
+def _manifest(proficiency=90, target='python'):
+    return {
+        'nodes': [
+            {'label': 'Developer', 'key': 'id', 'rows': [
+                {'id': 'dev', 'name': 'Dev', 'last_updated': {'$datetime': 'now'}},
+            ]},
+            {'label': 'Skill', 'key': 'id', 'rows': [
+                {'id': 'python', 'name': 'Python', 'proficiency': proficiency},
+            ]},
+        ],
+        'relationships': [
+            {'type': 'HAS_SKILL', 'from': {'label': 'Developer', 'key': 'id'},
+             'to': {'label': 'Skill', 'key': 'id'},
+             'rows': [{'from': 'dev', 'to': target, 'properties': {'level': 'Expert'}}]},
+        ],
+    }
+
+def test_plan_on_empty_graph_creates_everything(driver):
+    counts = SeedSync(driver).plan(_manifest()).counts()
+    assert counts == {'create': 3, 'update': 0, 'unresolved': 0, 'unchanged': 0}
+
+def test_plan_after_sync_is_unchanged(driver):
+    """두 번째 실행은 변경 없음 ($datetime now 속성은 비교하지 않음)"""
+    sync = SeedSync(driver)
+    assert sync.sync(_manifest())['success']
+    
+    plan = sync.plan(_manifest())
+    assert plan.changes == []
+    assert plan.counts()['unchanged'] == 3
+
+def test_plan_reports_changed_property_only(driver):
+    sync = SeedSync(driver)
+    sync.sync(_manifest(proficiency=90))
+    
+    plan = sync.plan(_manifest(proficiency=95))
+    assert [(c.kind, c.action, c.identity) for c in plan.changes] == [('node', 'update', 'python')]
+    assert plan.changes[0].properties == {'proficiency': 95}
+    assert plan.changes[0].previous == {'proficiency': 90}
+    
+    sync.sync(_manifest(proficiency=95))
+    with driver.session() as session:
+        assert session.run("MATCH (s:Skill {id: 'python'}) RETURN s.proficiency AS p").single()['p'] == 95
+
+def test_plan_marks_missing_endpoint_unresolved(driver):
+    plan = SeedSync(driver).plan(_manifest(target='missing'))
+    unresolved = [c for c in plan.changes if c.action == 'unresolved']
+    assert [(c.target, c.identity) for c in unresolved] == [('HAS_SKILL', ('dev', 'missing'))]
+
+# ---------------------------------------------------------------------------
+# claude_neo4j_pipeline.validate_activity
+# ---------------------------------------------------------------------------
+
+COMMIT = {'type': 'commit', 'hash': 'abc123', 'message': 'fix', 'author': 'dev',
+          'timestamp': '2026-01-01T09:00:00Z', 'files_changed': 3, 'lines_added': 10, 'lines_deleted': 2}
+
+INSIGHT = {'type': 'knowledge_insight', 'insight_id': 'i1', 'title': 't', 'generated': '2026-01-01',
+           'confidence': 0.9, 'related_concepts': [{'id': 'graph', 'strength': 8}]}
+
+@pytest.mark.parametrize('activity', [COMMIT, INSIGHT, {**COMMIT, 'timestamp': '2026-01-01T09:00:00+09:00'}])
+def test_valid_activities(activity):
+    assert validate_activity(activity) == []
+
+@pytest.mark.parametrize('activity, field', [
+    ({**COMMIT, 'timestamp': 'yesterday'}, 'timestamp'),
+    ({**COMMIT, 'files_changed': '3'}, 'files_changed'),
+    ({**COMMIT, 'lines_added': True}, 'lines_added'),
+    ({**COMMIT, 'hash': ''}, 'hash'),
+    ({'type': 'file_creation', 'path': '/a.py', 'name': 'a.py', 'created': '2026-13-01'}, 'created'),
+    ({'type': 'file_creation', 'path': '/a.py', 'name': 'a.py', 'created': '2026-01-01', 'size': 'big'}, 'size'),
+    ({'type': 'task_completion', 'task_id': 't', 'name': 'n', 'completion_date': 'now', 'effort': 3}, 'completion_date'),
+    ({'type': 'task_completion', 'task_id': 't', 'name': 'n', 'completion_date': '2026-01-01', 'effort': '3'}, 'effort'),
+    ({**INSIGHT, 'confidence': 'high'}, 'confidence'),
+    ({**INSIGHT, 'related_concepts': [{'id': 'graph', 'strength': 'strong'}]}, 'strength'),
+    ({**INSIGHT, 'related_concepts': [{'name': 'no id'}]}, 'related_concepts'),
+])
+def test_invalid_activities(activity, field):
+    errors = validate_activity(activity)
+    assert errors and any(field in error for error in errors), errors
+
+def test_unknown_type_and_non_object():
+    assert validate_activity({'type': 'deploy'})
+    assert validate_activity(['not', 'an', 'object'])
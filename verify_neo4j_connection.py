@@ -7,6 +7,8 @@ import os
 from neo4j import GraphDatabase
 import logging
 
+from graph_statistics import get_snapshot
+
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
@@ -50,11 +52,9 @@ def verify_connection():
             
             # 3. 전체 노드 및 관계 개수 확인
             logger.info("\n3️⃣ 데이터 현황:")
-            result = session.run("MATCH (n) RETURN count(n) as total_nodes")
-            total_nodes = result.single()['total_nodes']
-            
-            result = session.run("MATCH ()-[r]->() RETURN count(r) as total_relationships")
-            total_relationships = result.single()['total_relationships']
+            snapshot = get_snapshot(driver, refresh=True)
+            total_nodes = snapshot.nodes
+            total_relationships = snapshot.relationships
             
             logger.info(f"  총 노드 수: {total_nodes}")
             logger.info(f"  총 관계 수: {total_relationships}")
@@ -62,20 +62,14 @@ def verify_connection():
             # 4. 노드 타입별 분포
             if total_nodes > 0:
                 logger.info("\n4️⃣ 노드 타입별 분포:")
-                result = session.run("MATCH (n) RETURN labels(n) as labels, count(n) as count ORDER BY count DESC")
-                for record in result:
-                    labels = record['labels']
-                    count = record['count']
-                    if labels:
-                        logger.info(f"  {labels}: {count}개")
-                    else:
-                        logger.info(f"  [빈 라벨]: {count}개")
+                # 카운트 스토어는 라벨별로 세므로 보조 라벨(:Activity 등)을 가진 노드는 각 라벨에 포함
+                for row in snapshot.label_rows():
+                    logger.info(f"  {row['type']}: {row['count']}개")
                 
                 # 5. 관계 타입별 분포
                 logger.info("\n5️⃣ 관계 타입별 분포:")
-                result = session.run("MATCH ()-[r]->() RETURN type(r) as rel_type, count(r) as count ORDER BY count DESC LIMIT 10")
-                for record in result:
-                    logger.info(f"  {record['rel_type']}: {record['count']}개")
+                for row in snapshot.relationship_rows()[:10]:
+                    logger.info(f"  {row['rel_type']}: {row['count']}개")
             
             else:
                 logger.info("  📭 데이터베이스가 비어있습니다!")